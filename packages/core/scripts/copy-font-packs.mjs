@@ -0,0 +1,34 @@
+#!/usr/bin/env node
+/**
+ * Copy the binary font packs into dist/ after `tsc`.
+ *
+ * `bundle-woff2-fonts.py --format pack` / `bundle-ttf-fonts.py --format pack`
+ * write src/font/data/{woff2,ttf}-pack/*.fontpack next to a generated
+ * manifest.ts, which loads them with `new URL('./<family>.fontpack',
+ * import.meta.url)`. tsc only emits the manifest, so without this step the
+ * built loader points at files that aren't in dist/. Pack directories that
+ * haven't been generated are skipped.
+ *
+ * Run with: node scripts/copy-font-packs.mjs (part of `pnpm build`)
+ */
+
+import fs from 'node:fs';
+import path from 'node:path';
+import { fileURLToPath } from 'node:url';
+
+const root = path.resolve(path.dirname(fileURLToPath(import.meta.url)), '..');
+const PACK_DIRS = ['woff2-pack', 'ttf-pack'];
+
+let copied = 0;
+for (const dir of PACK_DIRS) {
+  const src = path.join(root, 'src', 'font', 'data', dir);
+  if (!fs.existsSync(src)) continue;
+  const dest = path.join(root, 'dist', 'font', 'data', dir);
+  fs.mkdirSync(dest, { recursive: true });
+  for (const name of fs.readdirSync(src)) {
+    if (!name.endsWith('.fontpack')) continue;
+    fs.copyFileSync(path.join(src, name), path.join(dest, name));
+    copied++;
+  }
+}
+if (copied > 0) console.log(`Copied ${copied} font pack${copied === 1 ? '' : 's'} to dist/font/data/`);
@@ -0,0 +1,160 @@
+import { describe, it, expect, vi, afterEach } from 'vitest';
+import {
+  decodeCoverage,
+  hasBundledFont,
+  loadBundledFont,
+  loadBundledFonts,
+  parseVariantKey,
+  parseUnicodeRange,
+  setBundledFontSource,
+  shardDescriptors,
+  unicodeRangeCovers,
+} from '../bundled-font-loader.js';
+import type { BundledFontPackModule } from '../bundled-font-loader.js';
+import * as fontLoader from '../font-loader.js';
+
+// Mock loadFont — it uses FontFace API which is unavailable in Node.js
+vi.mock('../font-loader.js', () => ({
+  loadFont: vi.fn().mockResolvedValue(true),
+}));
+
+describe('parseVariantKey', () => {
+  it('parses single-word subsets', () => {
+    expect(parseVariantKey('latin-700-italic')).toEqual({
+      subset: 'latin',
+      weight: '700',
+      style: 'italic',
+    });
+  });
+
+  it('reads weight and style from the end for hyphenated subsets', () => {
+    expect(parseVariantKey('latin-ext-400-normal')).toEqual({
+      subset: 'latin-ext',
+      weight: '400',
+      style: 'normal',
+    });
+    expect(parseVariantKey('arrows-math-700-normal').subset).toBe('arrows-math');
+  });
+
+  it('falls back to regular for short keys', () => {
+    expect(parseVariantKey('latin')).toEqual({ subset: 'latin', weight: '400', style: 'normal' });
+  });
+});
+
+describe('parseUnicodeRange', () => {
+  it('parses single codepoints and ranges', () => {
+    expect(parseUnicodeRange('U+0020-00FF, U+FEFF')).toEqual([
+      [0x20, 0xff],
+      [0xfeff, 0xfeff],
+    ]);
+  });
+
+  it('expands wildcard ranges', () => {
+    expect(parseUnicodeRange('U+4??')).toEqual([[0x400, 0x4ff]]);
+  });
+
+  it('ignores malformed tokens', () => {
+    expect(parseUnicodeRange('bogus, U+2190-21FF')).toEqual([[0x2190, 0x21ff]]);
+  });
+});
+
+describe('unicodeRangeCovers', () => {
+  const latinExt = 'U+0100-024F';
+
+  it('returns true when any character is in range', () => {
+    expect(unicodeRangeCovers(latinExt, 'Hello Łódź')).toBe(true);
+  });
+
+  it('returns false when no character is in range', () => {
+    expect(unicodeRangeCovers(latinExt, 'Hello world')).toBe(false);
+    expect(unicodeRangeCovers(latinExt, '')).toBe(false);
+  });
+});
+
+describe('shardDescriptors', () => {
+  it('uses the weight and style of static shards', () => {
+    expect(shardDescriptors('latin-700-italic', { unicodeRange: 'U+0000-00FF' })).toEqual({
+      weight: '700',
+      style: 'italic',
+      unicodeRange: 'U+0000-00FF',
+    });
+    expect(shardDescriptors('latin-400-normal', {})).toEqual({});
+  });
+
+  it('uses the wght axis of variable shards', () => {
+    expect(shardDescriptors('latin-var-normal', { axes: { wght: [300, 800] } })).toEqual({
+      weight: '300 800',
+    });
+  });
+
+  it('falls back to a numeric weight range for variable shards without wght', () => {
+    expect(shardDescriptors('latin-var-italic', { axes: { wdth: [75, 100] } })).toEqual({
+      weight: '100 900',
+      style: 'italic',
+    });
+    expect(shardDescriptors('latin-var-normal', {}).weight).toBe('100 900');
+  });
+});
+
+describe('decodeCoverage', () => {
+  it('maps bits to codepoints in range order', () => {
+    // Bits 0, 2 and 3 of U+0041-0043, U+0061: A, C and a.
+    expect([...decodeCoverage('U+0041-0043, U+0061', 'DQ==')]).toEqual([0x41, 0x43, 0x61]);
+  });
+
+  it('returns an empty set for an empty bitmap', () => {
+    expect(decodeCoverage('U+0100-0107', 'AA==').size).toBe(0);
+  });
+});
+
+describe('font pack source', () => {
+  const packs: BundledFontPackModule = {
+    BUNDLED_FONT_PACKS: {
+      carlito: { registerAs: 'Carlito', variants: ['regular', 'boldItalic'] },
+      calibri: { registerAs: 'Calibri', variants: ['regular', 'boldItalic'] },
+    },
+    loadBundledFontPack: vi.fn(async (family: string, variant: string) =>
+      family.toLowerCase() === 'carlito' || family.toLowerCase() === 'calibri'
+        ? new TextEncoder().encode(variant)
+        : null,
+    ),
+  };
+
+  afterEach(() => {
+    setBundledFontSource('companion');
+    vi.unstubAllGlobals();
+    vi.clearAllMocks();
+  });
+
+  it('registers every pack variant with its weight and style', async () => {
+    vi.stubGlobal('document', {});
+    setBundledFontSource('pack', async () => packs);
+
+    expect(await loadBundledFont('Calibri')).toBe(true);
+    expect(packs.loadBundledFontPack).toHaveBeenCalledWith('calibri', 'regular');
+    expect(packs.loadBundledFontPack).toHaveBeenCalledWith('calibri', 'boldItalic');
+    expect(fontLoader.loadFont).toHaveBeenCalledWith('Calibri', expect.any(ArrayBuffer), {});
+    expect(fontLoader.loadFont).toHaveBeenCalledWith('Calibri', expect.any(ArrayBuffer), {
+      weight: '700',
+      style: 'italic',
+    });
+    expect(hasBundledFont('Carlito')).toBe(true);
+    expect(hasBundledFont('Roboto')).toBe(false);
+  });
+
+  it('only loads families the packs hold', async () => {
+    vi.stubGlobal('document', {});
+    setBundledFontSource('pack', async () => packs);
+
+    const results = await loadBundledFonts(['Carlito', 'Roboto']);
+    expect([...results]).toEqual([['Carlito', true]]);
+  });
+
+  it('reports no fonts when the pack manifest is missing', async () => {
+    vi.stubGlobal('document', {});
+    setBundledFontSource('pack', () => Promise.reject(new Error('not generated')));
+
+    expect(await loadBundledFont('Carlito')).toBe(false);
+    expect(hasBundledFont('Carlito')).toBe(false);
+  });
+});
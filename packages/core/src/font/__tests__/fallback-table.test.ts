@@ -0,0 +1,39 @@
+import { describe, it, expect } from 'vitest';
+import { decodeFallbackTable } from '../fallback-table.js';
+import { getBundledFallbackFamily } from '../bundled-font-loader.js';
+
+describe('decodeFallbackTable', () => {
+  const table = {
+    families: ['noto-sans', 'noto-sans-symbols'],
+    ranges: [
+      [0x20, 0x7e, 0],
+      [0x2190, 0x2192, 1],
+      [0x2600, 0x2600, 1],
+    ] as Array<[number, number, number]>,
+  };
+
+  it('maps every codepoint of each run to its family', () => {
+    const lookup = decodeFallbackTable(table);
+    expect(lookup.get(0x41)).toBe('noto-sans');
+    expect(lookup.get(0x7e)).toBe('noto-sans');
+    expect(lookup.get(0x2191)).toBe('noto-sans-symbols');
+    expect(lookup.get(0x2600)).toBe('noto-sans-symbols');
+    expect(lookup.size).toBe(0x7e - 0x20 + 1 + 3 + 1);
+  });
+
+  it('leaves codepoints outside the runs unmapped', () => {
+    const lookup = decodeFallbackTable(table);
+    expect(lookup.has(0x7f)).toBe(false);
+    expect(lookup.has(0x2193)).toBe(false);
+  });
+
+  it('skips runs with an unknown family index', () => {
+    expect(decodeFallbackTable({ families: [], ranges: [[0x20, 0x21, 3]] }).size).toBe(0);
+  });
+});
+
+describe('getBundledFallbackFamily', () => {
+  it('returns undefined before the companion package is detected', () => {
+    expect(getBundledFallbackFamily(0x2603)).toBeUndefined();
+  });
+});
@@ -1,5 +1,5 @@
 import { describe, it, expect, vi, afterEach } from 'vitest';
-import { FontCache } from '../font-cache.js';
+import { FontCache, verifyIntegrity } from '../font-cache.js';
 
 describe('FontCache', () => {
   afterEach(() => {
@@ -68,9 +68,42 @@ describe('FontCache', () => {
     expect(result).toBeNull();
   });
 
+  it('getFromPersist evicts an entry that fails its integrity check', async () => {
+    const store = {
+      match: vi.fn().mockResolvedValue(new Response(new TextEncoder().encode('abd'))),
+      delete: vi.fn().mockResolvedValue(true),
+    };
+    vi.stubGlobal('caches', { open: vi.fn().mockResolvedValue(store) });
+
+    const cache = new FontCache('test-cache', true);
+    const integrity = 'sha256-ungWv48Bz+pBQUDeXa4iI7ADYaOWF3qctBD/YfIAFa0=';
+    const result = await cache.getFromPersist('https://example.com/font.woff2', integrity);
+    expect(result).toBeNull();
+    expect(store.delete).toHaveBeenCalledWith('https://example.com/font.woff2');
+  });
+
   it('defaults cache name to opendockit-fonts-v1', () => {
     // Just verify construction does not throw
     const cache = new FontCache();
     expect(cache.get('anything', 400, 'normal')).toBeNull();
   });
 });
+
+describe('verifyIntegrity', () => {
+  const abc = new TextEncoder().encode('abc');
+  const abcIntegrity = 'sha256-ungWv48Bz+pBQUDeXa4iI7ADYaOWF3qctBD/YfIAFa0=';
+
+  it('accepts bytes matching a sha256 SRI value', async () => {
+    expect(await verifyIntegrity(abc, abcIntegrity)).toBe(true);
+    expect(await verifyIntegrity(abc.buffer, abcIntegrity)).toBe(true);
+  });
+
+  it('rejects bytes that do not match', async () => {
+    expect(await verifyIntegrity(new TextEncoder().encode('abd'), abcIntegrity)).toBe(false);
+  });
+
+  it('rejects malformed values', async () => {
+    expect(await verifyIntegrity(abc, 'md5-kAFQmDzST7DWlj99KOF/cg==')).toBe(false);
+    expect(await verifyIntegrity(abc, 'not an integrity value')).toBe(false);
+  });
+});
@@ -154,6 +154,23 @@ describe('FontMetricsDB', () => {
       const w2 = db.measureText('A', 'testfont', 10, false, false);
       expect(w1).toBe(w2);
     });
+
+    it('applies pair kerning between consecutive codepoints', () => {
+      // 'AB' kerned by -50: (600 + 650 - 50) / 1000 * 10 = 12
+      db.loadFontMetrics({
+        ...REGULAR_FACE,
+        kerning: {
+          unitsPerEm: 1000,
+          keys: new Uint32Array([(65 << 16) | 66]),
+          values: new Int16Array([-50]),
+        },
+      });
+      expect(db.measureText('AB', 'TestFont', 10, false, false)).toBe(12);
+      // 'BA' has no pair entry
+      expect(db.measureText('BA', 'TestFont', 10, false, false)).toBe(12.5);
+      // Kerning only applies to adjacent codepoints
+      expect(db.measureText('A B', 'TestFont', 10, false, false)).toBe(15);
+    });
   });
 
   describe('getVerticalMetrics', () => {
@@ -0,0 +1,114 @@
+import { describe, it, expect, vi, afterEach } from 'vitest';
+import { readFontPackIndex, getFontPackVariant, loadFontPackVariant } from '../font-pack.js';
+
+/** Build a pack the way scripts/font_pipeline/fontpack.py lays it out. */
+function buildPack(variants: Array<[string, number[]]>): Uint8Array {
+  const align = (n: number) => Math.ceil(n / 8) * 8;
+  const dataOffset = align(16 + variants.length * 56);
+  let size = dataOffset;
+  const offsets: number[] = [];
+  for (const [, data] of variants) {
+    offsets.push(size);
+    size = align(size + data.length);
+  }
+
+  const bytes = new Uint8Array(size);
+  const view = new DataView(bytes.buffer);
+  bytes.set([0x4f, 0x44, 0x46, 0x50]); // "ODFP"
+  view.setUint16(4, 1, true);
+  view.setUint8(6, 2); // ttf
+  view.setUint16(8, variants.length, true);
+  view.setUint32(12, dataOffset, true);
+
+  variants.forEach(([name, data], i) => {
+    const base = 16 + i * 56;
+    for (let j = 0; j < name.length; j++) bytes[base + j] = name.charCodeAt(j);
+    view.setUint32(base + 16, offsets[i], true);
+    view.setUint32(base + 20, data.length, true);
+    bytes[base + 24] = 0xab; // first byte of the hash
+    bytes.set(data, offsets[i]);
+  });
+  return bytes;
+}
+
+describe('readFontPackIndex', () => {
+  it('parses flavor, data offset and entries in pack order', () => {
+    const pack = buildPack([
+      ['regular', [1, 2, 3]],
+      ['boldItalic', [4, 5, 6, 7, 8, 9, 10, 11, 12]],
+    ]);
+    const index = readFontPackIndex(pack);
+
+    expect(index.flavor).toBe('ttf');
+    expect(index.dataOffset).toBe(128);
+    expect([...index.entries.keys()]).toEqual(['regular', 'boldItalic']);
+    expect(index.entries.get('regular')).toMatchObject({ offset: 128, length: 3 });
+    expect(index.entries.get('boldItalic')).toMatchObject({ offset: 136, length: 9 });
+    expect(index.entries.get('regular')!.sha256).toMatch(/^ab0{62}$/);
+  });
+
+  it('rejects data that is not a font pack', () => {
+    expect(() => readFontPackIndex(new Uint8Array(32))).toThrow(/not a version 1 pack/);
+    expect(() => readFontPackIndex(new Uint8Array(4))).toThrow(/truncated header/);
+  });
+
+  it('rejects a truncated index', () => {
+    const pack = buildPack([['regular', [1]]]);
+    expect(() => readFontPackIndex(pack.subarray(0, 40))).toThrow(/truncated index/);
+  });
+});
+
+describe('getFontPackVariant', () => {
+  it('returns a zero-copy view of the variant bytes', () => {
+    const pack = buildPack([
+      ['regular', [1, 2, 3]],
+      ['bold', [7, 8]],
+    ]);
+    const bold = getFontPackVariant(pack.buffer, 'bold')!;
+
+    expect([...bold]).toEqual([7, 8]);
+    expect(bold.buffer).toBe(pack.buffer);
+  });
+
+  it('returns null for unknown variants', () => {
+    expect(getFontPackVariant(buildPack([['regular', [1]]]), 'italic')).toBeNull();
+  });
+});
+
+describe('loadFontPackVariant', () => {
+  afterEach(() => {
+    vi.unstubAllGlobals();
+  });
+
+  it('range-fetches only the index and the requested variant', async () => {
+    const pack = buildPack([
+      ['regular', [1, 2, 3]],
+      ['bold', [7, 8]],
+    ]);
+    const fetchMock = vi.fn(async (_url: string, init: RequestInit) => {
+      const range = (init.headers as Record<string, string>).Range;
+      const [start, end] = range.replace('bytes=', '').split('-').map(Number);
+      return new Response(pack.slice(start, end + 1), { status: 206 });
+    });
+    vi.stubGlobal('fetch', fetchMock);
+
+    const bold = await loadFontPackVariant('https://example.test/a.fontpack', 'bold');
+
+    expect([...bold!]).toEqual([7, 8]);
+    expect(fetchMock).toHaveBeenCalledTimes(2);
+    expect(fetchMock.mock.calls[1][1].headers).toEqual({ Range: 'bytes=136-137' });
+  });
+
+  it('handles servers that ignore Range', async () => {
+    const pack = buildPack([['regular', [1, 2, 3]]]);
+    vi.stubGlobal('fetch', vi.fn(async () => new Response(pack.slice(), { status: 200 })));
+
+    const regular = await loadFontPackVariant('https://example.test/b.fontpack', 'regular');
+    expect([...regular!]).toEqual([1, 2, 3]);
+  });
+
+  it('returns null when the fetch fails', async () => {
+    vi.stubGlobal('fetch', vi.fn(async () => new Response(null, { status: 404 })));
+    expect(await loadFontPackVariant('https://example.test/c.fontpack', 'regular')).toBeNull();
+  });
+});
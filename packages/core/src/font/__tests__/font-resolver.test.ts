@@ -13,6 +13,71 @@ vi.mock('../cdn-fetcher.js', () => ({
   fetchFromGoogleFonts: vi.fn().mockResolvedValue(false),
 }));
 
+// Companion package with Carlito split into unicode-range shards
+vi.mock('@opendockit/fonts', () => ({
+  getBasePath: () => 'https://cdn.example.com/companion/',
+  getManifest: () => ({
+    families: {
+      carlito: {
+        displayName: 'Carlito',
+        substituteFor: 'Calibri',
+        woff2: {
+          'latin-400-normal': {
+            file: 'woff2/carlito-latin-400-normal.woff2',
+            size: 16,
+            unicodeRange: 'U+0000-00FF',
+          },
+          'latin-ext-400-normal': {
+            file: 'woff2/carlito-latin-ext-400-normal.woff2',
+            size: 16,
+            unicodeRange: 'U+0100-024F',
+          },
+          'latin-700-normal': {
+            file: 'woff2/carlito-latin-700-normal.woff2',
+            size: 16,
+            unicodeRange: 'U+0000-00FF',
+          },
+          'latin-var-normal': {
+            file: 'woff2/carlito-latin-var-normal.woff2',
+            size: 32,
+            unicodeRange: 'U+0000-00FF',
+            axes: { wght: [100, 900] },
+          },
+          'latin-var-italic': {
+            file: 'woff2/carlito-latin-var-italic.woff2',
+            size: 32,
+            unicodeRange: 'U+0000-00FF',
+            axes: { wght: [100, 900] },
+          },
+        },
+      },
+      lato: {
+        displayName: 'Lato',
+        woff2: {
+          'latin-400-normal': {
+            file: 'woff2/lato-latin-400-normal.woff2',
+            size: 3,
+            // SRI hash of the bytes "abc"
+            integrity: 'sha256-ungWv48Bz+pBQUDeXa4iI7ADYaOWF3qctBD/YfIAFa0=',
+          },
+        },
+      },
+      'noto-sans-symbols': {
+        displayName: 'Noto Sans Symbols',
+        woff2: {
+          'symbols-400-normal': {
+            file: 'woff2/noto-sans-symbols-symbols-400-normal.woff2',
+            size: 16,
+            unicodeRange: 'U+2190-21FF',
+          },
+        },
+      },
+    },
+    // Arrows fall back to Noto Sans Symbols
+    fallback: { families: ['noto-sans-symbols'], ranges: [[0x2190, 0x21ff, 0]] },
+  }),
+}));
+
 describe('FontResolver', () => {
   beforeEach(() => {
     vi.clearAllMocks();
@@ -319,6 +384,162 @@ describe('FontResolver', () => {
     });
   });
 
+  // ── Companion package ─────────────────────────────────────────────────
+
+  describe('companion package', () => {
+    it('registers every shard of the face with its unicode-range', async () => {
+      vi.stubGlobal(
+        'fetch',
+        vi.fn().mockResolvedValue({
+          ok: true,
+          arrayBuffer: () => Promise.resolve(new ArrayBuffer(16)),
+        }),
+      );
+
+      const resolver = new FontResolver();
+      await resolver.detectCompanion();
+      const result = await resolver.resolve('Carlito', 400, 'normal');
+      expect(result).toBe(true);
+      expect(resolver.getStatus().get('carlito|400|normal')?.source).toBe('companion');
+
+      const urls = vi.mocked(fetch).mock.calls.map((call) => call[0]);
+      expect(urls.sort()).toEqual([
+        'https://cdn.example.com/companion/woff2/carlito-latin-400-normal.woff2',
+        'https://cdn.example.com/companion/woff2/carlito-latin-ext-400-normal.woff2',
+        'https://cdn.example.com/companion/woff2/carlito-latin-var-normal.woff2',
+      ]);
+
+      const descriptors = vi.mocked(fontLoader.loadFont).mock.calls.map((call) => call[2]);
+      expect(descriptors).toHaveLength(3);
+      expect(descriptors).toContainEqual({ unicodeRange: 'U+0000-00FF' });
+      expect(descriptors).toContainEqual({ unicodeRange: 'U+0100-024F' });
+      expect(descriptors).toContainEqual({ weight: '100 900', unicodeRange: 'U+0000-00FF' });
+
+      expect(cdnFetcher.fetchFromFontsource).not.toHaveBeenCalled();
+    });
+
+    it('skips shards that fail to load', async () => {
+      vi.stubGlobal(
+        'fetch',
+        vi.fn().mockImplementation((url: string) =>
+          Promise.resolve(
+            url.includes('-var-')
+              ? { ok: false }
+              : { ok: true, arrayBuffer: () => Promise.resolve(new ArrayBuffer(16)) },
+          ),
+        ),
+      );
+
+      const resolver = new FontResolver();
+      await resolver.detectCompanion();
+      const result = await resolver.resolve('Carlito', 700, 'normal');
+      expect(result).toBe(true);
+      expect(fontLoader.loadFont).toHaveBeenCalledTimes(1);
+      expect(fontLoader.loadFont).toHaveBeenCalledWith('Carlito', expect.any(ArrayBuffer), {
+        weight: '700',
+        unicodeRange: 'U+0000-00FF',
+      });
+    });
+  });
+
+  // ── Bundled fallback table ────────────────────────────────────────────
+
+  describe('fallback families', () => {
+    it('looks up the fallback family for a codepoint', async () => {
+      const resolver = new FontResolver();
+      expect(resolver.fallbackFamily(0x2192)).toBeUndefined();
+
+      await resolver.detectCompanion();
+      expect(resolver.fallbackFamily(0x2192)).toBe('Noto Sans Symbols');
+      expect(resolver.fallbackFamily(0x41)).toBeUndefined();
+    });
+
+    it('resolves the fallback families for missing characters', async () => {
+      vi.stubGlobal(
+        'fetch',
+        vi.fn().mockResolvedValue({
+          ok: true,
+          arrayBuffer: () => Promise.resolve(new ArrayBuffer(16)),
+        }),
+      );
+
+      const resolver = new FontResolver();
+      await resolver.detectCompanion();
+      expect(await resolver.resolveFallback('A\u2192\u2190')).toEqual(['Noto Sans Symbols']);
+
+      const urls = vi.mocked(fetch).mock.calls.map((call) => call[0]);
+      expect(urls).toEqual([
+        'https://cdn.example.com/companion/woff2/noto-sans-symbols-symbols-400-normal.woff2',
+      ]);
+      expect(fontLoader.loadFont).toHaveBeenCalledWith(
+        'Noto Sans Symbols',
+        expect.any(ArrayBuffer),
+        { unicodeRange: 'U+2190-21FF' },
+      );
+      expect(resolver.isAvailableOffline('Noto Sans Symbols')).toBe(true);
+    });
+
+    it('returns nothing when no bundled family covers the text', async () => {
+      const resolver = new FontResolver();
+      await resolver.detectCompanion();
+      expect(await resolver.resolveFallback('AB')).toEqual([]);
+    });
+  });
+
+  // ── CacheStorage integrity ────────────────────────────────────────────
+
+  describe('persisted companion files', () => {
+    const latoUrl = 'https://cdn.example.com/companion/woff2/lato-latin-400-normal.woff2';
+
+    function stubCacheStorage(entries: Map<string, ArrayBuffer>) {
+      const store = {
+        match: vi.fn(async (url: string) => {
+          const data = entries.get(url);
+          return data ? new Response(data) : undefined;
+        }),
+        put: vi.fn(async (url: string, response: Response) => {
+          entries.set(url, await response.arrayBuffer());
+        }),
+        delete: vi.fn(async (url: string) => entries.delete(url)),
+      };
+      vi.stubGlobal('caches', { open: vi.fn().mockResolvedValue(store) });
+      return store;
+    }
+
+    it('uses a persisted copy that matches the manifest integrity', async () => {
+      stubCacheStorage(new Map([[latoUrl, new TextEncoder().encode('abc').buffer]]));
+      vi.stubGlobal('fetch', vi.fn());
+
+      const resolver = new FontResolver();
+      await resolver.detectCompanion();
+      expect(await resolver.resolve('Lato')).toBe(true);
+      expect(fetch).not.toHaveBeenCalled();
+    });
+
+    it('evicts a persisted copy with a mismatched hash and fetches it again', async () => {
+      const entries = new Map([[latoUrl, new TextEncoder().encode('abd').buffer]]);
+      const store = stubCacheStorage(entries);
+      vi.stubGlobal(
+        'fetch',
+        vi.fn().mockResolvedValue({
+          ok: true,
+          arrayBuffer: () => Promise.resolve(new TextEncoder().encode('abc').buffer),
+        }),
+      );
+
+      const resolver = new FontResolver();
+      await resolver.detectCompanion();
+      expect(await resolver.resolve('Lato')).toBe(true);
+
+      expect(store.delete).toHaveBeenCalledWith(latoUrl);
+      expect(fetch).toHaveBeenCalledTimes(1);
+      expect(fetch).toHaveBeenCalledWith(latoUrl, {
+        integrity: 'sha256-ungWv48Bz+pBQUDeXa4iI7ADYaOWF3qctBD/YfIAFa0=',
+      });
+      expect(new TextDecoder().decode(entries.get(latoUrl))).toBe('abc');
+    });
+  });
+
   // ── Base URL ──────────────────────────────────────────────────────────
 
   describe('fontBaseURL', () => {
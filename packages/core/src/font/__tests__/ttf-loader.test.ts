@@ -6,8 +6,9 @@
  * all load calls return null and hasTTFBundle returns false.
  */
 
-import { describe, it, expect, beforeEach } from 'vitest';
-import { loadTTF, clearTTFCache, hasTTFBundle } from '../ttf-loader.js';
+import { describe, it, expect, beforeEach, afterEach, vi } from 'vitest';
+import { loadTTF, clearTTFCache, hasTTFBundle, setTTFSource } from '../ttf-loader.js';
+import type { BundledTTFPackModule } from '../ttf-loader.js';
 
 describe('hasTTFBundle (no companion)', () => {
   it('returns false when companion is not detected', () => {
@@ -44,3 +45,39 @@ describe('clearTTFCache', () => {
     expect(() => clearTTFCache()).not.toThrow();
   });
 });
+
+describe('loadTTF (font pack source)', () => {
+  const packs: BundledTTFPackModule = {
+    BUNDLED_TTF_PACKS: { carlito: { variants: ['regular', 'bold'] } },
+    loadBundledTTFPack: vi.fn(async (_family: string, variant: string) =>
+      new TextEncoder().encode(variant),
+    ),
+  };
+
+  beforeEach(() => {
+    setTTFSource('pack', async () => packs);
+  });
+
+  afterEach(() => {
+    setTTFSource('companion');
+    vi.clearAllMocks();
+  });
+
+  it('reads the matching variant from the pack', async () => {
+    const bytes = await loadTTF('Carlito', true, false);
+    expect(new TextDecoder().decode(bytes!)).toBe('bold');
+    expect(packs.loadBundledTTFPack).toHaveBeenCalledWith('Carlito', 'bold');
+    expect(hasTTFBundle('carlito')).toBe(true);
+  });
+
+  it('falls back to an available variant and caches the result', async () => {
+    const first = await loadTTF('Carlito', false, true);
+    expect(new TextDecoder().decode(first!)).toBe('regular');
+    expect(await loadTTF('Carlito', false, true)).toBe(first);
+    expect(packs.loadBundledTTFPack).toHaveBeenCalledTimes(1);
+  });
+
+  it('returns null for families without a pack', async () => {
+    expect(await loadTTF('nonexistent-font', false, false)).toBeNull();
+  });
+});
@@ -3,6 +3,7 @@ import {
   variationSettingsCSS,
   styleToVariationAxes,
   isVariableFontFilename,
+  weightRangeDescriptor,
 } from '../variable-font.js';
 import type { VariationAxes } from '../variable-font.js';
 import { FontResolver } from '../font-resolver.js';
@@ -117,6 +118,24 @@ describe('isVariableFontFilename', () => {
   });
 });
 
+// ---------------------------------------------------------------------------
+// weightRangeDescriptor
+// ---------------------------------------------------------------------------
+
+describe('weightRangeDescriptor', () => {
+  it('formats the wght range as a CSS weight range', () => {
+    expect(weightRangeDescriptor({ wght: [400, 700] })).toBe('400 700');
+  });
+
+  it('ignores axes other than wght', () => {
+    expect(weightRangeDescriptor({ wdth: [75, 100] })).toBeUndefined();
+  });
+
+  it('returns undefined for static fonts', () => {
+    expect(weightRangeDescriptor(undefined)).toBeUndefined();
+  });
+});
+
 // ---------------------------------------------------------------------------
 // FontResolver accepts preferVariableFonts config
 // ---------------------------------------------------------------------------
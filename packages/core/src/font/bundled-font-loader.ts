@@ -7,23 +7,49 @@
  *
  * Substitute mappings are handled transparently: requesting "Calibri"
  * loads the Carlito WOFF2 and registers the font under "Calibri".
+ *
+ * Companion WOFF2 faces may be split into unicode-range shards ("latin",
+ * "latin-ext", "symbols", ...). Each shard is registered with its
+ * unicode-range descriptor, and callers that pass the document text only
+ * fetch the shards that text needs. Variable shards ("latin-var-normal")
+ * carry their axis ranges and are registered with a weight range.
+ *
+ * The manifest's `fallback` table names, per codepoint, a bundled family that
+ * covers it (see fallback-table.ts); {@link getBundledFallbackFamily} reads it.
+ *
+ * {@link setBundledFontSource}('pack') switches to the binary font packs
+ * built into core (`bundle-woff2-fonts.py --format pack`, data/woff2-pack/):
+ * faces are range-fetched from the packs through their generated manifest
+ * and registered whole, with no companion package installed.
  */
 
+import { decodeFallbackTable } from './fallback-table.js';
+import type { FallbackTable } from './fallback-table.js';
 import { loadFont } from './font-loader.js';
+import { weightRangeDescriptor } from './variable-font.js';
 
 // ---------------------------------------------------------------------------
 // Companion package detection
 // ---------------------------------------------------------------------------
 
 interface CompanionInfo {
-  manifest: { families: Record<string, CompanionFamilyEntry> };
+  manifest: { families: Record<string, CompanionFamilyEntry>; fallback?: FallbackTable };
   basePath: string;
 }
 
 interface CompanionFamilyEntry {
   displayName: string;
   substituteFor?: string;
-  woff2: Record<string, { file: string; size: number }>;
+  woff2: Record<string, CompanionWoff2Entry>;
+}
+
+interface CompanionWoff2Entry {
+  file: string;
+  size: number;
+  unicodeRange?: string;
+  axes?: Record<string, [number, number]>;
+  integrity?: string;
+  coverage?: string;
 }
 
 /** Cached companion detection promise — evaluated once. */
@@ -32,6 +58,9 @@ let companionPromise: Promise<CompanionInfo | null> | null = null;
 /** Synchronous cache of the companion manifest (populated after first async detection). */
 let cachedManifest: CompanionInfo['manifest'] | null = null;
 
+/** Decoded manifest fallback table, built on first lookup. */
+let fallbackLookup: Map<number, string> | null = null;
+
 async function getCompanion(): Promise<CompanionInfo | null> {
   if (!companionPromise) {
     companionPromise = (async () => {
@@ -49,13 +78,226 @@ async function getCompanion(): Promise<CompanionInfo | null> {
   return companionPromise;
 }
 
+// ---------------------------------------------------------------------------
+// Binary font packs
+// ---------------------------------------------------------------------------
+
+/** Where bundled faces are loaded from. */
+export type BundledFontSource = 'companion' | 'pack';
+
+/** The generated data/woff2-pack/manifest.ts module. */
+export interface BundledFontPackModule {
+  BUNDLED_FONT_PACKS: Record<string, { registerAs: string; variants: string[] }>;
+  loadBundledFontPack(family: string, variant: string): Promise<Uint8Array | null>;
+}
+
+/** Pack manifest, relative to this module. Imported by variable: it may not be generated. */
+const PACK_MANIFEST = './data/woff2-pack/manifest.js';
+
+/** FontFace descriptors of the pack variant names (FONT_FAMILIES variants). */
+const PACK_VARIANT_DESCRIPTORS: Record<string, FontFaceDescriptors> = {
+  regular: {},
+  bold: { weight: '700' },
+  italic: { style: 'italic' },
+  boldItalic: { weight: '700', style: 'italic' },
+};
+
+let source: BundledFontSource = 'companion';
+let importPacks = (): Promise<BundledFontPackModule> =>
+  import(/* webpackIgnore: true */ /* @vite-ignore */ PACK_MANIFEST);
+
+/** Cached pack manifest import — evaluated once per source setting. */
+let packPromise: Promise<BundledFontPackModule | null> | null = null;
+
+/** Synchronous cache of the pack manifest (populated after first async load). */
+let cachedPacks: BundledFontPackModule['BUNDLED_FONT_PACKS'] | null = null;
+
+/**
+ * Choose where {@link loadBundledFont} reads bundled faces from.
+ *
+ * 'companion' (default) uses the @opendockit/fonts package. 'pack' uses the
+ * binary font packs generated into core. `load` overrides how their
+ * manifest is imported, e.g. with an import the app's bundler can follow
+ * (by default it is imported at runtime from next to this module). Resets
+ * the loaded-family bookkeeping.
+ */
+export function setBundledFontSource(
+  next: BundledFontSource,
+  load?: () => Promise<BundledFontPackModule>,
+): void {
+  source = next;
+  if (load) importPacks = load;
+  packPromise = null;
+  cachedPacks = null;
+  loadedFamilies.clear();
+  loadedShards.clear();
+}
+
+async function getPacks(): Promise<BundledFontPackModule | null> {
+  if (!packPromise) {
+    packPromise = (async () => {
+      try {
+        const mod = await importPacks();
+        cachedPacks = mod.BUNDLED_FONT_PACKS;
+        return mod;
+      } catch {
+        return null;
+      }
+    })();
+  }
+  return packPromise;
+}
+
+/** Register every variant of a family from its pack; true if any loaded. */
+async function loadFromPacks(key: string): Promise<boolean> {
+  const packs = await getPacks();
+  const entry = packs?.BUNDLED_FONT_PACKS[key];
+  if (!packs || !entry) return false;
+
+  const results = await Promise.all(
+    entry.variants.map(async (variant) => {
+      const bytes = await packs.loadBundledFontPack(key, variant);
+      if (!bytes) return false;
+      const buffer =
+        bytes.byteOffset === 0 && bytes.byteLength === bytes.buffer.byteLength
+          ? (bytes.buffer as ArrayBuffer)
+          : (bytes.slice().buffer as ArrayBuffer);
+      return loadFont(entry.registerAs, buffer, PACK_VARIANT_DESCRIPTORS[variant] ?? {});
+    }),
+  );
+  return results.some(Boolean);
+}
+
+// ---------------------------------------------------------------------------
+// Variant keys and unicode ranges
+// ---------------------------------------------------------------------------
+
+/**
+ * Parse a companion WOFF2 variant key ("{subset}-{weight}-{style}").
+ *
+ * Subset names may themselves contain hyphens ("latin-ext"), so weight and
+ * style are read from the end of the key.
+ */
+export function parseVariantKey(variantKey: string): {
+  subset: string;
+  weight: string;
+  style: string;
+} {
+  const parts = variantKey.split('-');
+  if (parts.length < 3) {
+    return { subset: parts[0] ?? '', weight: parts[1] || '400', style: 'normal' };
+  }
+  return {
+    subset: parts.slice(0, -2).join('-'),
+    weight: parts[parts.length - 2] || '400',
+    style: parts[parts.length - 1] || 'normal',
+  };
+}
+
+/** CSS font-weight range for a variable shard whose manifest entry has no wght axis. */
+const DEFAULT_VARIABLE_WEIGHT = '100 900';
+
+/**
+ * FontFace descriptors for a companion shard: weight and style from its
+ * variant key, a weight range for variable shards, and its unicode-range.
+ */
+export function shardDescriptors(
+  variantKey: string,
+  variant: { unicodeRange?: string; axes?: Record<string, [number, number]> },
+): FontFaceDescriptors {
+  const { weight, style } = parseVariantKey(variantKey);
+  const descriptors: FontFaceDescriptors = {};
+  const weightRange = weightRangeDescriptor(variant.axes);
+  if (weightRange) descriptors.weight = weightRange;
+  else if (weight === 'var') descriptors.weight = DEFAULT_VARIABLE_WEIGHT;
+  else if (weight !== '400') descriptors.weight = weight;
+  if (style !== 'normal') descriptors.style = style;
+  if (variant.unicodeRange) descriptors.unicodeRange = variant.unicodeRange;
+  return descriptors;
+}
+
+/**
+ * Parse a CSS unicode-range value ("U+0020-00FF, U+FEFF") into inclusive
+ * [start, end] codepoint pairs. Wildcard forms ("U+4??") are expanded.
+ */
+export function parseUnicodeRange(range: string): Array<[number, number]> {
+  const result: Array<[number, number]> = [];
+  for (const token of range.split(',')) {
+    const match = /^\s*U\+([0-9A-F?]+)(?:-([0-9A-F]+))?\s*$/i.exec(token);
+    if (!match) continue;
+    const [, start, end] = match;
+    if (end !== undefined) {
+      result.push([parseInt(start, 16), parseInt(end, 16)]);
+    } else if (start.includes('?')) {
+      result.push([
+        parseInt(start.replace(/\?/g, '0'), 16),
+        parseInt(start.replace(/\?/g, 'F'), 16),
+      ]);
+    } else {
+      const cp = parseInt(start, 16);
+      result.push([cp, cp]);
+    }
+  }
+  return result;
+}
+
+/**
+ * Decode a manifest `coverage` bitmap into the codepoints a shard maps.
+ *
+ * Bit i (least significant bit first) stands for the i-th codepoint of the
+ * shard's unicode-range, in the order the range is written.
+ */
+export function decodeCoverage(range: string, coverage: string): Set<number> {
+  const bits = Uint8Array.from(atob(coverage), (ch) => ch.charCodeAt(0));
+  const result = new Set<number>();
+  let i = 0;
+  for (const [start, end] of parseUnicodeRange(range)) {
+    for (let cp = start; cp <= end; cp++, i++) {
+      if (bits[i >> 3] & (1 << (i & 7))) result.add(cp);
+    }
+  }
+  return result;
+}
+
+/**
+ * Whether a companion shard is needed for `text`: some character is mapped
+ * by the shard (per its `coverage` bitmap) or, without one, falls inside its
+ * unicode-range.
+ */
+function shardCovers(variant: CompanionWoff2Entry, text: string): boolean {
+  if (!variant.unicodeRange) return true;
+  if (!variant.coverage) return unicodeRangeCovers(variant.unicodeRange, text);
+  const mapped = decodeCoverage(variant.unicodeRange, variant.coverage);
+  for (const ch of text) {
+    if (mapped.has(ch.codePointAt(0)!)) return true;
+  }
+  return false;
+}
+
+/** Check whether any character of `text` falls inside a CSS unicode-range. */
+export function unicodeRangeCovers(range: string, text: string): boolean {
+  const ranges = parseUnicodeRange(range);
+  for (const ch of text) {
+    const cp = ch.codePointAt(0)!;
+    if (ranges.some(([start, end]) => cp >= start && cp <= end)) return true;
+  }
+  return false;
+}
+
 // ---------------------------------------------------------------------------
 // Public API
 // ---------------------------------------------------------------------------
 
-/** Track which families have been loaded. */
+/** Track which families have been fully loaded (every shard). */
 const loadedFamilies = new Set<string>();
 
+/**
+ * Track individually loaded shards (for text-driven partial loads), keyed by
+ * family and file: a file shared between families is registered once per
+ * family name.
+ */
+const loadedShards = new Set<string>();
+
 /**
  * Check if a font family has bundled WOFF2 data available.
  *
@@ -65,10 +307,27 @@ const loadedFamilies = new Set<string>();
  * async detection).
  */
 export function hasBundledFont(family: string): boolean {
+  if (source === 'pack') return !!cachedPacks && family.toLowerCase() in cachedPacks;
   if (!cachedManifest) return false;
   return family.toLowerCase() in cachedManifest.families;
 }
 
+/**
+ * Bundled family to fall back to for a character another font lacks.
+ *
+ * Returns the companion family id (e.g. "noto-sans-symbols") of the first
+ * family, in fallback order, whose regular face maps `codepoint`. Pass it to
+ * {@link loadBundledFont}. Returns undefined if no bundled family covers the
+ * codepoint, or the companion package hasn't been detected yet. This is a
+ * synchronous check, like {@link hasBundledFont}. Constant time after the
+ * first call.
+ */
+export function getBundledFallbackFamily(codepoint: number): string | undefined {
+  if (!cachedManifest?.fallback) return undefined;
+  fallbackLookup ??= decodeFallbackTable(cachedManifest.fallback);
+  return fallbackLookup.get(codepoint);
+}
+
 /**
  * Load a single bundled font family from the companion package.
  *
@@ -79,50 +338,65 @@ export function hasBundledFont(family: string): boolean {
  * substitutes) or the displayName.
  *
  * @param family - Font family name (e.g., "Calibri", "Roboto").
+ * @param text - Optional text the font will render. When given, only the
+ *   unicode-range shards covering that text are fetched; other shards are
+ *   fetched by later calls that need them. Font packs hold no shards, so
+ *   the pack source ignores it.
  * @returns true if at least one variant was loaded.
  */
-export async function loadBundledFont(family: string): Promise<boolean> {
+export async function loadBundledFont(family: string, text?: string): Promise<boolean> {
   if (typeof document === 'undefined') return false;
 
   const key = family.toLowerCase();
   if (loadedFamilies.has(key)) return true;
 
+  if (source === 'pack') {
+    loadedFamilies.add(key);
+    const ok = await loadFromPacks(key);
+    if (!ok) loadedFamilies.delete(key);
+    return ok;
+  }
+
   const companion = await getCompanion();
   if (!companion) return false;
 
   const entry = companion.manifest.families[key];
   if (!entry) return false;
 
-  loadedFamilies.add(key);
+  const variants = Object.entries(entry.woff2);
+  const wanted = variants.filter(([, variant]) => text === undefined || shardCovers(variant, text));
+  const shardKey = (file: string) => `${key}:${file}`;
+  const pending = wanted.filter(([, variant]) => !loadedShards.has(shardKey(variant.file)));
+  const alreadyLoaded = wanted.length > pending.length;
+
+  if (text === undefined) loadedFamilies.add(key);
+  for (const [, variant] of pending) loadedShards.add(shardKey(variant.file));
 
   try {
     const registerName = entry.substituteFor || entry.displayName;
 
     const results = await Promise.all(
-      Object.entries(entry.woff2).map(async ([variantKey, variant]) => {
+      pending.map(async ([variantKey, variant]) => {
         try {
           const url = new URL(variant.file, companion.basePath).href;
-          const response = await fetch(url);
-          if (!response.ok) return false;
+          const response = await fetch(
+            url,
+            variant.integrity ? { integrity: variant.integrity } : undefined,
+          );
+          if (!response.ok) throw new Error(`HTTP ${response.status}`);
           const buffer = await response.arrayBuffer();
 
-          // Parse weight and style from variant key: "latin-400-normal"
-          const parts = variantKey.split('-');
-          const weight = parts[1] || '400';
-          const style = parts[2] || 'normal';
-
-          const descriptors: FontFaceDescriptors = {};
-          if (weight !== '400') descriptors.weight = weight;
-          if (style !== 'normal') descriptors.style = style;
-
-          return loadFont(registerName, buffer, descriptors);
+          const ok = await loadFont(registerName, buffer, shardDescriptors(variantKey, variant));
+          if (!ok) loadedShards.delete(shardKey(variant.file));
+          return ok;
         } catch {
+          loadedShards.delete(shardKey(variant.file));
           return false;
         }
       }),
     );
 
-    return results.some(Boolean);
+    return alreadyLoaded || results.some(Boolean);
   } catch {
     loadedFamilies.delete(key);
     return false;
@@ -136,19 +410,25 @@ export async function loadBundledFont(family: string): Promise<boolean> {
  * skips already-loaded families, and loads all remaining in parallel.
  *
  * @param families - Font family names to attempt loading.
+ * @param text - Optional document text; limits fetching to the unicode-range
+ *   shards it needs (see {@link loadBundledFont}).
  * @returns Map of family name -> success boolean (only for available families).
  */
 export async function loadBundledFonts(
   families: string[],
+  text?: string,
 ): Promise<Map<string, boolean>> {
   const results = new Map<string, boolean>();
 
-  // Trigger companion detection early
-  const companion = await getCompanion();
+  // Trigger companion (or pack manifest) detection early
+  const available =
+    source === 'pack'
+      ? (await getPacks())?.BUNDLED_FONT_PACKS
+      : (await getCompanion())?.manifest.families;
 
   const toLoad = families.filter((f) => {
     const key = f.toLowerCase();
-    if (!companion || !(key in companion.manifest.families)) return false;
+    if (!available || !(key in available)) return false;
     if (loadedFamilies.has(key)) {
       results.set(f, true);
       return false;
@@ -160,7 +440,7 @@ export async function loadBundledFonts(
 
   await Promise.all(
     toLoad.map(async (family) => {
-      const ok = await loadBundledFont(family);
+      const ok = await loadBundledFont(family, text);
       results.set(family, ok);
     }),
   );
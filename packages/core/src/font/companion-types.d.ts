@@ -8,6 +8,17 @@ declare module '@opendockit/fonts' {
   interface FontVariantEntry {
     file: string;
     size: number;
+    unicodeRange?: string;
+    axes?: Record<string, [number, number]>;
+    integrity?: string;
+    glyphs?: number;
+    coverage?: string;
+  }
+
+  interface FontVariableGroup {
+    source: string;
+    axes: Record<string, [number, number]>;
+    instances: Record<string, Record<string, number>>;
   }
 
   interface FontFamilyEntry {
@@ -16,14 +27,23 @@ declare module '@opendockit/fonts' {
     license: string;
     woff2: Record<string, FontVariantEntry>;
     ttf: Record<string, FontVariantEntry>;
+    metrics?: Record<string, FontVariantEntry>;
+    kerning?: Record<string, FontVariantEntry>;
+    variable?: Record<string, FontVariableGroup>;
     weights: number[];
     styles: string[];
     subsets: string[];
   }
 
+  interface FontFallbackTable {
+    families: string[];
+    ranges: Array<[number, number, number]>;
+  }
+
   interface FontManifest {
     version: number;
     families: Record<string, FontFamilyEntry>;
+    fallback?: FontFallbackTable;
   }
 
   export function getManifest(): FontManifest;
@@ -0,0 +1,67 @@
+import { describe, it, expect } from 'vitest';
+import { decodeKerningTable, getKerningAdjustment } from '../kerning-decoder.js';
+
+/** Encode [left, right, value] triples like scripts/font_pipeline/kerning.py. */
+function encodeTable(pairs: [number, number, number][], unitsPerEm = 1000): Uint8Array {
+  const bin = new Uint8Array(12 + pairs.length * 6);
+  const view = new DataView(bin.buffer);
+  bin.set([0x4f, 0x44, 0x4b, 0x4e]); // "ODKN"
+  view.setUint16(4, 1, true);
+  view.setUint16(6, unitsPerEm, true);
+  view.setUint32(8, pairs.length, true);
+  pairs.forEach(([left, right, value], i) => {
+    view.setUint32(12 + i * 4, ((left << 16) | right) >>> 0, true);
+    view.setInt16(12 + pairs.length * 4 + i * 2, value, true);
+  });
+  return bin;
+}
+
+describe('kerning-decoder', () => {
+  const PAIRS: [number, number, number][] = [
+    [0x41, 0x56, -80], // AV
+    [0x46, 0x2e, -120], // F.
+    [0x54, 0x6f, -60], // To
+    [0x56, 0x41, -80], // VA
+    [0x2019, 0x73, 15],
+  ];
+
+  it('decodes header and pairs', () => {
+    const table = decodeKerningTable(encodeTable(PAIRS, 2048));
+    expect(table.unitsPerEm).toBe(2048);
+    expect(table.keys.length).toBe(5);
+    expect(table.keys[0]).toBe((0x41 << 16) | 0x56);
+    expect(Array.from(table.values)).toEqual([-80, -120, -60, -80, 15]);
+  });
+
+  it('decodes a table at an unaligned offset', () => {
+    const bin = encodeTable(PAIRS);
+    const padded = new Uint8Array(bin.length + 1);
+    padded.set(bin, 1);
+    const table = decodeKerningTable(padded.subarray(1));
+    expect(getKerningAdjustment(table, 0x54, 0x6f)).toBe(-60);
+  });
+
+  it('looks up every pair and misses unknown ones', () => {
+    const table = decodeKerningTable(encodeTable(PAIRS));
+    for (const [left, right, value] of PAIRS) {
+      expect(getKerningAdjustment(table, left, right)).toBe(value);
+    }
+    expect(getKerningAdjustment(table, 0x56, 0x56)).toBe(0);
+    expect(getKerningAdjustment(table, 0x20, 0x41)).toBe(0);
+    expect(getKerningAdjustment(table, 0x1f600, 0x41)).toBe(0);
+  });
+
+  it('handles an empty table', () => {
+    const table = decodeKerningTable(encodeTable([]));
+    expect(getKerningAdjustment(table, 0x41, 0x56)).toBe(0);
+  });
+
+  it('rejects bad magic and truncated data', () => {
+    const bin = encodeTable(PAIRS);
+    expect(() => decodeKerningTable(bin.subarray(0, 8))).toThrow(/truncated header/);
+    expect(() => decodeKerningTable(bin.subarray(0, bin.length - 1))).toThrow(/truncated pairs/);
+    const bad = bin.slice();
+    bad[0] = 0;
+    expect(() => decodeKerningTable(bad)).toThrow(/not a version 1 table/);
+  });
+});
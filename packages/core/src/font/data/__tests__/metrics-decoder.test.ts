@@ -2,6 +2,7 @@ import { describe, it, expect } from 'vitest';
 import { statSync } from 'node:fs';
 import { resolve, dirname } from 'node:path';
 import { fileURLToPath } from 'node:url';
+import { decodeMetricsBytes } from '../metrics-decoder.js';
 
 const __dirname = dirname(fileURLToPath(import.meta.url));
 
@@ -85,3 +86,33 @@ describe('metrics-decoder', () => {
     }
   });
 });
+
+describe('decodeMetricsBytes', () => {
+  // One-face table as written by scripts/font_pipeline/metrics.py for the
+  // @opendockit/fonts package (metrics/{family}-{variant}.bin).
+  // prettier-ignore
+  const table = new Uint8Array([
+    1, 1, 9, 84, 101, 115, 116, 32, 83, 97, 110, 115, 1, 232, 7, 192, 12, 143, 3, 248, 10, 3,
+    154, 153, 153, 63, 205, 204, 76, 62, 250, 1, 3, 32, 250, 1, 33, 216, 4, 1, 226, 4,
+  ]);
+
+  it('decodes a per-face table into a one-face bundle', () => {
+    const bundle = decodeMetricsBytes(table);
+    expect(bundle.version).toBe(1);
+    expect(Object.keys(bundle.fonts)).toEqual(['test sans']);
+
+    const [face] = bundle.fonts['test sans'];
+    expect(face).toEqual({
+      family: 'Test Sans',
+      style: 'bold',
+      unitsPerEm: 1000,
+      ascender: 800,
+      descender: -200,
+      capHeight: 700,
+      lineHeight: 1.2,
+      lineGap: 0.2,
+      widths: { 32: 250, 65: 600, 66: 610 },
+      defaultWidth: 250,
+    });
+  });
+});
@@ -0,0 +1,77 @@
+/**
+ * Decoder and lookup for flattened pair-kerning tables.
+ *
+ * Each table holds one face's GPOS/kern pair adjustments resolved at build
+ * time to codepoint pairs, so text layout can apply kerning without shipping
+ * or parsing GPOS. Tables are the per-face `kerning/*.kern` files in the
+ * @opendockit/fonts package, written by scripts/font_pipeline/kerning.py.
+ *
+ * Binary format (little-endian):
+ *   [4 bytes]    magic "ODKN"
+ *   [u16]        version
+ *   [u16]        unitsPerEm
+ *   [u32]        pair count N
+ *   [N x u32]    keys: (left codepoint << 16) | right codepoint, ascending
+ *   [N x i16]    advance adjustment in font units, same order as keys
+ */
+
+/** A face's pair-kerning table, keyed by BMP codepoint pair. */
+export interface KerningTable {
+  /** Font design units per em the adjustments are expressed in. */
+  unitsPerEm: number;
+  /** Sorted pair keys: `(left << 16) | right`. */
+  keys: Uint32Array;
+  /** Advance adjustment of the left character, parallel to `keys`. */
+  values: Int16Array;
+}
+
+const MAGIC = 0x4e4b444f; // "ODKN" read as a little-endian u32
+const VERSION = 1;
+const HEADER_SIZE = 12;
+
+/** Decode a binary pair-kerning table. */
+export function decodeKerningTable(bin: Uint8Array): KerningTable {
+  if (bin.byteLength < HEADER_SIZE) {
+    throw new Error('Kerning table: truncated header');
+  }
+  const view = new DataView(bin.buffer, bin.byteOffset, bin.byteLength);
+  if (view.getUint32(0, true) !== MAGIC || view.getUint16(4, true) !== VERSION) {
+    throw new Error(`Kerning table: not a version ${VERSION} table`);
+  }
+  const unitsPerEm = view.getUint16(6, true);
+  const count = view.getUint32(8, true);
+  if (bin.byteLength < HEADER_SIZE + count * 6) {
+    throw new Error('Kerning table: truncated pairs');
+  }
+
+  const keys = new Uint32Array(count);
+  const values = new Int16Array(count);
+  const valuesOffset = HEADER_SIZE + count * 4;
+  for (let i = 0; i < count; i++) {
+    keys[i] = view.getUint32(HEADER_SIZE + i * 4, true);
+    values[i] = view.getInt16(valuesOffset + i * 2, true);
+  }
+  return { unitsPerEm, keys, values };
+}
+
+/**
+ * Kerning adjustment between two codepoints, in font units.
+ *
+ * Binary search over the sorted keys; returns 0 for pairs without
+ * kerning (including any non-BMP codepoint).
+ */
+export function getKerningAdjustment(table: KerningTable, left: number, right: number): number {
+  if (left > 0xffff || right > 0xffff) return 0;
+  const key = ((left << 16) | right) >>> 0;
+  const keys = table.keys;
+  let lo = 0;
+  let hi = keys.length - 1;
+  while (lo <= hi) {
+    const mid = (lo + hi) >>> 1;
+    const k = keys[mid];
+    if (k < key) lo = mid + 1;
+    else if (k > key) hi = mid - 1;
+    else return table.values[mid];
+  }
+  return 0;
+}
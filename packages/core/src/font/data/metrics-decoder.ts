@@ -1,6 +1,11 @@
 /**
  * Decoder for delta+varint-encoded font metrics binary data.
  *
+ * The same format is used for the base64-wrapped metrics-bundle.ts and for
+ * the per-face `metrics/*.bin` tables in the @opendockit/fonts package (a
+ * per-face table is a bundle with a face count of 1). Both are written by
+ * scripts/font_pipeline/metrics.py.
+ *
  * Binary format:
  *   [1 byte]  version
  *   [varint]  face count
@@ -33,7 +38,11 @@ const STYLE_NAMES: readonly FontFaceMetrics['style'][] = [
 
 /** Decode a base64-encoded metrics bundle. */
 export function decodeMetricsBundle(base64: string): FontMetricsBundle {
-  const bin = base64ToBytes(base64);
+  return decodeMetricsBytes(base64ToBytes(base64));
+}
+
+/** Decode a binary metrics bundle or per-face metrics table. */
+export function decodeMetricsBytes(bin: Uint8Array): FontMetricsBundle {
   let offset = 0;
 
   // Version
@@ -0,0 +1,34 @@
+/**
+ * Codepoint → fallback family lookup for bundled fonts.
+ *
+ * The @opendockit/fonts manifest carries a `fallback` table, built by
+ * scripts/font_pipeline/coverage.py from the cmap of every bundled face. For
+ * each bundle codepoint it names the first family, in fallback order, that
+ * maps the codepoint. The table is stored as runs:
+ *
+ *   { families: ["noto-sans", ...], ranges: [[start, end, familyIndex], ...] }
+ *
+ * Ranges are inclusive, sorted and non-overlapping. Codepoints no bundled
+ * family covers are absent. Decoding expands the runs into a map once, so a
+ * renderer that meets a character its font lacks finds a face to fall back to
+ * in O(1) instead of probing fonts.
+ */
+
+/** Manifest `fallback` table: runs of codepoints sharing a fallback family. */
+export interface FallbackTable {
+  /** Companion family ids (manifest keys), in fallback order. */
+  families: string[];
+  /** Inclusive `[start, end, index into families]` runs, ascending. */
+  ranges: Array<[number, number, number]>;
+}
+
+/** Expand a fallback table into a codepoint → family id map. */
+export function decodeFallbackTable(table: FallbackTable): Map<number, string> {
+  const lookup = new Map<number, string>();
+  for (const [start, end, index] of table.ranges) {
+    const family = table.families[index];
+    if (family === undefined) continue;
+    for (let cp = start; cp <= end; cp++) lookup.set(cp, family);
+  }
+  return lookup;
+}
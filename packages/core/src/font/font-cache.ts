@@ -2,9 +2,34 @@
  * Two-level font cache: in-memory Map + browser CacheStorage.
  *
  * Memory is checked first (instant). CacheStorage is checked second
- * (persists across page loads). No external dependencies.
+ * (persists across page loads). Persisted entries can be validated against
+ * a Subresource Integrity value (the companion manifest's `integrity`)
+ * without refetching. No external dependencies.
  */
 
+const SRI_ALGORITHMS: Record<string, string> = {
+  sha256: 'SHA-256',
+  sha384: 'SHA-384',
+  sha512: 'SHA-512',
+};
+
+/**
+ * Check bytes against a Subresource Integrity value ("sha256-<base64>").
+ *
+ * Returns false for malformed values or when Web Crypto is unavailable.
+ */
+export async function verifyIntegrity(
+  data: ArrayBuffer | Uint8Array,
+  integrity: string,
+): Promise<boolean> {
+  const match = /^(sha256|sha384|sha512)-([A-Za-z0-9+/]+={0,2})$/.exec(integrity.trim());
+  if (!match || typeof crypto === 'undefined' || !crypto.subtle) return false;
+  const digest = new Uint8Array(await crypto.subtle.digest(SRI_ALGORITHMS[match[1]], data));
+  let binary = '';
+  for (const byte of digest) binary += String.fromCharCode(byte);
+  return btoa(binary) === match[2];
+}
+
 export class FontCache {
   private _memory = new Map<string, ArrayBuffer>();
   private _cacheName: string;
@@ -34,29 +59,43 @@ export class FontCache {
     url?: string,
   ): Promise<void> {
     this._memory.set(this._key(family, weight, style), data);
+    if (url) await this.putPersist(url, data);
+  }
 
-    if (this._persistEnabled && url) {
-      try {
-        const cache = await caches.open(this._cacheName);
-        await cache.put(
-          url,
-          new Response(data, {
-            headers: { 'Content-Type': 'font/woff2' },
-          }),
-        );
-      } catch {
-        // CacheStorage unavailable or quota exceeded — silently skip
-      }
+  /** Store in CacheStorage only, keyed by URL. */
+  async putPersist(url: string, data: ArrayBuffer, contentType = 'font/woff2'): Promise<void> {
+    if (!this._persistEnabled) return;
+    try {
+      const cache = await caches.open(this._cacheName);
+      await cache.put(
+        url,
+        new Response(data, {
+          headers: { 'Content-Type': contentType },
+        }),
+      );
+    } catch {
+      // CacheStorage unavailable or quota exceeded — silently skip
     }
   }
 
-  /** Check CacheStorage for a previously cached URL. */
-  async getFromPersist(url: string): Promise<ArrayBuffer | null> {
+  /**
+   * Check CacheStorage for a previously cached URL.
+   *
+   * With `integrity`, an entry whose bytes don't match is evicted and
+   * treated as a miss.
+   */
+  async getFromPersist(url: string, integrity?: string): Promise<ArrayBuffer | null> {
     if (!this._persistEnabled) return null;
     try {
       const cache = await caches.open(this._cacheName);
       const response = await cache.match(url);
-      return response ? response.arrayBuffer() : null;
+      if (!response) return null;
+      const data = await response.arrayBuffer();
+      if (integrity && !(await verifyIntegrity(data, integrity))) {
+        await cache.delete(url);
+        return null;
+      }
+      return data;
     } catch {
       return null;
     }
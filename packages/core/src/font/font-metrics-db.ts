@@ -11,6 +11,9 @@
  * by Apache POI, pdf.js, and many other open-source projects.
  */
 
+import { getKerningAdjustment } from './data/kerning-decoder.js';
+import type { KerningTable } from './data/kerning-decoder.js';
+
 // ---------------------------------------------------------------------------
 // Public types
 // ---------------------------------------------------------------------------
@@ -47,6 +50,11 @@ export interface FontFaceMetrics {
   widths: Record<string, number>;
   /** Default advance width for unmapped codepoints. */
   defaultWidth: number;
+  /**
+   * Pair-kerning adjustments in font units, applied between consecutive
+   * codepoints by measureText(). Absent for faces without kerning data.
+   */
+  kerning?: KerningTable;
 }
 
 /** A bundle of font metrics for multiple families. */
@@ -122,11 +130,15 @@ export class FontMetricsDB {
     const face = this._resolveFace(family, bold, italic);
     if (!face) return undefined;
 
+    const kerning = face.kerning;
     let totalWidth = 0;
+    let prev = -1;
     for (let i = 0; i < text.length; i++) {
       const cp = text.codePointAt(i)!;
       const w = face.widths[cp] ?? face.defaultWidth;
       totalWidth += w;
+      if (kerning && prev >= 0) totalWidth += getKerningAdjustment(kerning, prev, cp);
+      prev = cp;
       // Skip low surrogate for astral codepoints
       if (cp > 0xffff) i++;
     }
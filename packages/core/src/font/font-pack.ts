@@ -0,0 +1,178 @@
+/**
+ * Font pack reader — zero-copy access to binary font packs.
+ *
+ * A font pack holds every variant of one family (raw WOFF2 or TTF bytes)
+ * behind a small index, so fonts ship without base64 overhead or giant
+ * string literals. Packs are produced by `scripts/bundle-woff2-fonts.py
+ * --format pack` / `bundle-ttf-fonts.py --format pack`; the layout is
+ * documented in `scripts/font_pipeline/fontpack.py`:
+ *
+ *   header  16 bytes   "ODFP", u16 version, u8 flavor, u8 0, u16 count, u16 0, u32 dataOffset
+ *   index   count × 56 name[16], u32 offset, u32 length, sha256[32]
+ *   data    payloads, 8-byte aligned
+ *
+ * Variants are returned as `Uint8Array` views into the pack buffer (no copy).
+ * Over HTTP, {@link loadFontPackVariant} range-fetches the index and then only
+ * the requested variant.
+ *
+ * @module font-pack
+ */
+
+// ---------------------------------------------------------------------------
+// Format
+// ---------------------------------------------------------------------------
+
+const MAGIC = 'ODFP';
+const VERSION = 1;
+const HEADER_SIZE = 16;
+const ENTRY_SIZE = 56;
+const NAME_SIZE = 16;
+
+/** Bytes requested up front when range-fetching; covers the index of a 4-variant pack. */
+const INDEX_PREFETCH_BYTES = 512;
+
+const FLAVORS: Record<number, FontPackFlavor> = { 1: 'woff2', 2: 'ttf' };
+
+export type FontPackFlavor = 'woff2' | 'ttf';
+
+export interface FontPackEntry {
+  /** Byte offset of the variant from the start of the pack. */
+  offset: number;
+  /** Length of the variant in bytes. */
+  length: number;
+  /** Lowercase hex SHA-256 of the variant bytes. */
+  sha256: string;
+}
+
+export interface FontPackIndex {
+  flavor: FontPackFlavor;
+  /** Offset of the first payload (= bytes needed to read the whole index). */
+  dataOffset: number;
+  /** Variant name → location in the pack, in pack order. */
+  entries: Map<string, FontPackEntry>;
+}
+
+function toBytes(data: ArrayBuffer | Uint8Array): Uint8Array {
+  return data instanceof Uint8Array ? data : new Uint8Array(data);
+}
+
+function readHeader(bytes: Uint8Array): { view: DataView; count: number; dataOffset: number } {
+  if (bytes.byteLength < HEADER_SIZE) {
+    throw new Error('Font pack: truncated header');
+  }
+  const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+  const magic = String.fromCharCode(bytes[0], bytes[1], bytes[2], bytes[3]);
+  if (magic !== MAGIC || view.getUint16(4, true) !== VERSION) {
+    throw new Error(`Font pack: not a version ${VERSION} pack`);
+  }
+  return { view, count: view.getUint16(8, true), dataOffset: view.getUint32(12, true) };
+}
+
+// ---------------------------------------------------------------------------
+// Public API
+// ---------------------------------------------------------------------------
+
+/**
+ * Parse a pack's header and index.
+ *
+ * `data` only needs to contain the first `dataOffset` bytes of the pack.
+ * Throws if the data is not a font pack or the index is truncated.
+ */
+export function readFontPackIndex(data: ArrayBuffer | Uint8Array): FontPackIndex {
+  const bytes = toBytes(data);
+  const { view, count, dataOffset } = readHeader(bytes);
+  if (bytes.byteLength < HEADER_SIZE + count * ENTRY_SIZE) {
+    throw new Error('Font pack: truncated index');
+  }
+
+  const entries = new Map<string, FontPackEntry>();
+  for (let i = 0; i < count; i++) {
+    const base = HEADER_SIZE + i * ENTRY_SIZE;
+    let name = '';
+    for (let j = 0; j < NAME_SIZE && bytes[base + j] !== 0; j++) {
+      name += String.fromCharCode(bytes[base + j]);
+    }
+    let sha256 = '';
+    for (let j = 0; j < 32; j++) {
+      sha256 += bytes[base + NAME_SIZE + 8 + j].toString(16).padStart(2, '0');
+    }
+    entries.set(name, {
+      offset: view.getUint32(base + NAME_SIZE, true),
+      length: view.getUint32(base + NAME_SIZE + 4, true),
+      sha256,
+    });
+  }
+
+  return { flavor: FLAVORS[view.getUint8(6)] ?? 'woff2', dataOffset, entries };
+}
+
+/**
+ * Get one variant's bytes from a fully loaded pack.
+ *
+ * Returns a view into `pack` (no copy), or null if the pack has no such
+ * variant. Pass a previously parsed `index` to skip re-reading it.
+ */
+export function getFontPackVariant(
+  pack: ArrayBuffer | Uint8Array,
+  variant: string,
+  index?: FontPackIndex,
+): Uint8Array | null {
+  const bytes = toBytes(pack);
+  const entry = (index ?? readFontPackIndex(bytes)).entries.get(variant);
+  if (!entry || entry.offset + entry.length > bytes.byteLength) return null;
+  return bytes.subarray(entry.offset, entry.offset + entry.length);
+}
+
+/** Cached pack indices by URL (range-fetch path). */
+const indexCache = new Map<string, Promise<FontPackIndex | null>>();
+
+async function fetchRange(url: string, start: number, end: number): Promise<Uint8Array | null> {
+  const response = await fetch(url, { headers: { Range: `bytes=${start}-${end - 1}` } });
+  if (!response.ok) return null;
+  const bytes = new Uint8Array(await response.arrayBuffer());
+  // 200 means the server ignored the Range header and sent the whole pack.
+  return response.status === 206 ? bytes : bytes.subarray(start, end);
+}
+
+async function fetchIndex(url: string): Promise<FontPackIndex | null> {
+  let head = await fetchRange(url, 0, INDEX_PREFETCH_BYTES);
+  if (!head) return null;
+  const { dataOffset } = readHeader(head);
+  if (head.byteLength < dataOffset) {
+    head = await fetchRange(url, 0, dataOffset);
+    if (!head) return null;
+  }
+  return readFontPackIndex(head);
+}
+
+/**
+ * Load one variant from a pack served over HTTP.
+ *
+ * Range-fetches the pack index (cached per URL) and then only the variant's
+ * bytes; servers that ignore `Range` still work, at the cost of a full
+ * download. Returns null if the variant is missing or any fetch fails.
+ */
+export async function loadFontPackVariant(
+  url: string | URL,
+  variant: string,
+): Promise<Uint8Array | null> {
+  const href = url.toString();
+  try {
+    let indexPromise = indexCache.get(href);
+    if (!indexPromise) {
+      indexPromise = fetchIndex(href);
+      indexCache.set(href, indexPromise);
+    }
+    const index = await indexPromise;
+    if (!index) {
+      indexCache.delete(href);
+      return null;
+    }
+    const entry = index.entries.get(variant);
+    if (!entry) return null;
+    return await fetchRange(href, entry.offset, entry.offset + entry.length);
+  } catch {
+    indexCache.delete(href);
+    return null;
+  }
+}
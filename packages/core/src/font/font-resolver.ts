@@ -11,9 +11,16 @@
  *   7. Google Fonts CSS
  *   8. System fallback (return false)
  *
+ * For characters a font lacks, {@link FontResolver.resolveFallback} picks
+ * bundled families from the companion manifest's `fallback` table (an O(1)
+ * lookup per character) and resolves them through the same pipeline.
+ *
  * No external dependencies. Uses only built-in browser APIs + internal modules.
  */
 
+import { parseVariantKey } from './bundled-font-loader.js';
+import { decodeFallbackTable } from './fallback-table.js';
+import type { FallbackTable } from './fallback-table.js';
 import { loadFont } from './font-loader.js';
 import { FontCache } from './font-cache.js';
 import { fetchFromFontsource, fetchFromGoogleFonts } from './cdn-fetcher.js';
@@ -28,6 +35,7 @@ import {
   isVariableFontFilename,
   styleToVariationAxes,
   variationSettingsCSS,
+  weightRangeDescriptor,
 } from './variable-font.js';
 import type { VariationAxes } from './variable-font.js';
 
@@ -40,12 +48,28 @@ interface CompanionModule {
       {
         displayName: string;
         substituteFor?: string;
-        woff2: Record<string, { file: string; size: number }>;
+        woff2: Record<string, CompanionWoff2Entry>;
       }
     >;
+    fallback?: FallbackTable;
   };
 }
 
+/** One companion WOFF2 file: a whole face or one unicode-range shard of it. */
+interface CompanionWoff2Entry {
+  file: string;
+  size: number;
+  unicodeRange?: string;
+  axes?: Record<string, [number, number]>;
+  integrity?: string;
+}
+
+/** A fetched companion shard, ready to register. */
+interface CompanionShard {
+  buffer: ArrayBuffer;
+  variant: CompanionWoff2Entry;
+}
+
 export class FontResolver {
   private _config: FontConfig;
   private _cache: FontCache;
@@ -54,6 +78,8 @@ export class FontResolver {
   private _companionManifest: CompanionModule['getManifest'] extends () => infer R ? R : never =
     null as never;
   private _resolving = new Map<string, Promise<boolean>>();
+  /** Decoded manifest fallback table, built on first lookup. */
+  private _fallbackLookup: Map<number, string> | null = null;
 
   constructor(config: FontConfig = {}) {
     this._config = config;
@@ -73,6 +99,7 @@ export class FontResolver {
       )) as CompanionModule;
       this._companionBasePath = companion.getBasePath();
       this._companionManifest = companion.getManifest();
+      this._fallbackLookup = null;
     } catch {
       // Companion package not installed — proceed without it
     }
@@ -178,12 +205,48 @@ export class FontResolver {
     return [...families];
   }
 
+  /**
+   * Bundled family to fall back to for a character other fonts lack.
+   *
+   * Returns the display name of the first family, in fallback order, whose
+   * regular face maps `codepoint`, from the companion manifest's `fallback`
+   * table. Undefined if no bundled family covers it or no companion was
+   * detected. Constant time after the first call.
+   */
+  fallbackFamily(codepoint: number): string | undefined {
+    const manifest = this._companionManifest;
+    if (!manifest?.fallback) return undefined;
+    this._fallbackLookup ??= decodeFallbackTable(manifest.fallback);
+    const id = this._fallbackLookup.get(codepoint);
+    return id === undefined ? undefined : manifest.families[id]?.displayName;
+  }
+
+  /**
+   * Resolve the bundled fallback families for characters a font lacks.
+   *
+   * Pass the characters the primary font can't render. Each is looked up
+   * with {@link fallbackFamily}, and every family found is resolved like
+   * {@link resolve}. Returns the families that resolved, in order of first
+   * use, ready to append to a CSS font-family list.
+   */
+  async resolveFallback(
+    missing: string,
+    weight: number = 400,
+    style: string = 'normal'
+  ): Promise<string[]> {
+    const families: string[] = [];
+    for (const ch of missing) {
+      const family = this.fallbackFamily(ch.codePointAt(0)!);
+      if (family && !families.includes(family)) families.push(family);
+    }
+    const resolved = await Promise.all(families.map((f) => this.resolve(f, weight, style)));
+    return families.filter((_, i) => resolved[i]);
+  }
+
   /** Check if a family is available without network access. */
   isAvailableOffline(family: string): boolean {
-    const key = family.toLowerCase();
     if (this._cache.get(family, 400, 'normal')) return true;
-    if (this._companionManifest?.families?.[key]) return true;
-    return false;
+    return this._companionEntry(family) !== undefined;
   }
 
   /** Get resolution status for diagnostics. */
@@ -212,19 +275,16 @@ export class FontResolver {
 
     // 2. Companion package
     if (this._companionManifest) {
-      const companionResult = await this._loadFromCompanion(
-        family,
-        weight,
-        style,
-      );
-      if (companionResult) {
-        const axes = this._buildVariationAxes(
-          companionResult.filename,
-          weight,
-          style,
-        );
-        await this._register(family, companionResult.buffer, weight, style, axes);
-        await this._cache.put(family, weight, style, companionResult.buffer);
+      const shards = await this._loadFromCompanion(family, weight, style);
+      if (shards.length > 0) {
+        for (const { buffer, variant } of shards) {
+          const axes = this._buildVariationAxes(variant.file, weight, style);
+          await this._register(family, buffer, weight, style, axes, variant);
+        }
+        // The memory cache holds one buffer per face: only a whole face fits.
+        if (shards.length === 1 && !shards[0].variant.unicodeRange) {
+          await this._cache.put(family, weight, style, shards[0].buffer);
+        }
         this._recordStatus(key, family, true, 'companion', start);
         return true;
       }
@@ -305,32 +365,74 @@ export class FontResolver {
     return false;
   }
 
+  /**
+   * Companion manifest entry for a family: by manifest key ("barlow-light")
+   * or, case-insensitively, by display name ("Barlow Light").
+   */
+  private _companionEntry(family: string) {
+    const families = this._companionManifest?.families;
+    if (!families) return undefined;
+    const key = family.toLowerCase();
+    return (
+      families[key] ??
+      Object.values(families).find((entry) => entry.displayName.toLowerCase() === key)
+    );
+  }
+
   private _fontsourceUrl(entry: SubstitutionEntry, weight: number, style: string): string {
     return `https://cdn.jsdelivr.net/fontsource/fonts/${entry.fontsourceId}@latest/latin-${weight}-${style}.woff2`;
   }
 
+  /**
+   * Fetch every companion shard of a face: the static "{subset}-{weight}-{style}"
+   * entries plus any "{subset}-var-{style}" entry whose weight axis covers
+   * `weight`. Shards that fail to load are skipped.
+   *
+   * Shards are persisted by URL. A persisted copy that fails the manifest's
+   * integrity check is evicted and fetched again.
+   */
   private async _loadFromCompanion(
     family: string,
     weight: number,
     style: string,
-  ): Promise<{ buffer: ArrayBuffer; filename: string } | null> {
-    if (!this._companionManifest || !this._companionBasePath) return null;
-    const key = family.toLowerCase();
-    const entry = this._companionManifest.families[key];
-    if (!entry) return null;
-
-    const variantKey = `latin-${weight}-${style}`;
-    const variant = entry.woff2[variantKey];
-    if (!variant) return null;
-
-    try {
-      const url = new URL(variant.file, this._companionBasePath).href;
-      const response = await fetch(url);
-      if (!response.ok) return null;
-      return { buffer: await response.arrayBuffer(), filename: variant.file };
-    } catch {
-      return null;
-    }
+  ): Promise<CompanionShard[]> {
+    if (!this._companionBasePath) return [];
+    const entry = this._companionEntry(family);
+    if (!entry) return [];
+
+    const variants = Object.entries(entry.woff2)
+      .filter(([variantKey, variant]) => {
+        const parsed = parseVariantKey(variantKey);
+        if (parsed.style !== style) return false;
+        if (parsed.weight === 'var') {
+          const range = variant.axes?.wght;
+          return !range || (weight >= range[0] && weight <= range[1]);
+        }
+        return parsed.weight === String(weight);
+      })
+      .map(([, variant]) => variant);
+
+    const basePath = this._companionBasePath;
+    const shards = await Promise.all(
+      variants.map(async (variant): Promise<CompanionShard | null> => {
+        try {
+          const url = new URL(variant.file, basePath).href;
+          const persisted = await this._cache.getFromPersist(url, variant.integrity);
+          if (persisted) return { buffer: persisted, variant };
+          const response = await fetch(
+            url,
+            variant.integrity ? { integrity: variant.integrity } : undefined,
+          );
+          if (!response.ok) return null;
+          const buffer = await response.arrayBuffer();
+          await this._cache.putPersist(url, buffer);
+          return { buffer, variant };
+        } catch {
+          return null;
+        }
+      }),
+    );
+    return shards.filter((shard): shard is CompanionShard => shard !== null);
   }
 
   private async _loadFromBaseURL(
@@ -367,10 +469,14 @@ export class FontResolver {
     weight: number,
     style: string,
     variableAxes?: VariationAxes,
+    shard?: CompanionWoff2Entry,
   ): Promise<void> {
     const descriptors: Record<string, string> = {};
-    if (weight !== 400) descriptors.weight = String(weight);
+    const weightRange = weightRangeDescriptor(shard?.axes);
+    if (weightRange) descriptors.weight = weightRange;
+    else if (weight !== 400) descriptors.weight = String(weight);
     if (style !== 'normal') descriptors.style = style;
+    if (shard?.unicodeRange) descriptors.unicodeRange = shard.unicodeRange;
     if (variableAxes) {
       const settings = variationSettingsCSS(variableAxes);
       if (settings) {
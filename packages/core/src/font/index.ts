@@ -16,6 +16,9 @@ export { isFontAvailable, loadFont, ensureFontLoaded } from './font-loader.js';
 
 export { FontMetricsDB } from './font-metrics-db.js';
 export type { FontFaceMetrics, FontMetricsBundle } from './font-metrics-db.js';
+export { decodeMetricsBytes } from './data/metrics-decoder.js';
+export { decodeKerningTable, getKerningAdjustment } from './data/kerning-decoder.js';
+export type { KerningTable } from './data/kerning-decoder.js';
 
 export { extractFontFromEot, deobfuscateOdttf } from './eot-parser.js';
 
@@ -29,19 +32,30 @@ export {
 } from './font-cdn-loader.js';
 
 export {
+  getBundledFallbackFamily,
   hasBundledFont,
   loadBundledFont,
   loadBundledFonts,
+  parseVariantKey,
+  parseUnicodeRange,
+  setBundledFontSource,
+  unicodeRangeCovers,
 } from './bundled-font-loader.js';
+export type { BundledFontPackModule, BundledFontSource } from './bundled-font-loader.js';
 
 export {
   hasTTFBundle,
   loadTTF,
   clearTTFCache,
+  setTTFSource,
 } from './ttf-loader.js';
+export type { BundledTTFPackModule } from './ttf-loader.js';
+
+export { decodeFallbackTable } from './fallback-table.js';
+export type { FallbackTable } from './fallback-table.js';
 
 export { FontResolver } from './font-resolver.js';
-export { FontCache } from './font-cache.js';
+export { FontCache, verifyIntegrity } from './font-cache.js';
 export { fetchFromFontsource, fetchFromGoogleFonts } from './cdn-fetcher.js';
 export type {
   FontConfig,
@@ -58,7 +72,11 @@ export {
   variationSettingsCSS,
   styleToVariationAxes,
   isVariableFontFilename,
+  weightRangeDescriptor,
 } from './variable-font.js';
 export type { VariationAxes } from './variable-font.js';
 
 export { subsetFont, isSubsetAvailable } from './subset.js';
+
+export { readFontPackIndex, getFontPackVariant, loadFontPackVariant } from './font-pack.js';
+export type { FontPackIndex, FontPackEntry, FontPackFlavor } from './font-pack.js';
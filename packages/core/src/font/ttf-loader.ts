@@ -3,11 +3,17 @@
  *
  * Loads TTF data from the @opendockit/fonts companion package when installed.
  * If the companion package is not available, returns null.
- * Decoded bytes are cached for repeated access.
+ * Decoded bytes are cached for repeated access, and persisted in
+ * CacheStorage (checked against the manifest's integrity hash) across page
+ * loads. {@link setTTFSource}('pack') reads the binary TTF packs built into
+ * core (`bundle-ttf-fonts.py --format pack`, data/ttf-pack/) instead.
  *
  * @module ttf-loader
  */
 
+import type { BundledFontSource } from './bundled-font-loader.js';
+import { FontCache } from './font-cache.js';
+
 // ---------------------------------------------------------------------------
 // Companion package detection
 // ---------------------------------------------------------------------------
@@ -20,7 +26,7 @@ interface CompanionInfo {
 interface CompanionFamilyEntry {
   displayName: string;
   substituteFor?: string;
-  ttf: Record<string, { file: string; size: number }>;
+  ttf: Record<string, { file: string; size: number; integrity?: string }>;
 }
 
 /** Cached companion detection promise — evaluated once. */
@@ -46,6 +52,61 @@ async function getCompanion(): Promise<CompanionInfo | null> {
   return companionPromise;
 }
 
+// ---------------------------------------------------------------------------
+// Binary font packs
+// ---------------------------------------------------------------------------
+
+/** The generated data/ttf-pack/manifest.ts module. */
+export interface BundledTTFPackModule {
+  BUNDLED_TTF_PACKS: Record<string, { variants: string[] }>;
+  loadBundledTTFPack(family: string, variant: string): Promise<Uint8Array | null>;
+}
+
+/** Pack manifest, relative to this module. Imported by variable: it may not be generated. */
+const PACK_MANIFEST = './data/ttf-pack/manifest.js';
+
+let source: BundledFontSource = 'companion';
+let importPacks = (): Promise<BundledTTFPackModule> =>
+  import(/* webpackIgnore: true */ /* @vite-ignore */ PACK_MANIFEST);
+
+/** Cached pack manifest import — evaluated once per source setting. */
+let packPromise: Promise<BundledTTFPackModule | null> | null = null;
+
+/** Synchronous cache of the pack manifest (populated after first async load). */
+let cachedPacks: BundledTTFPackModule['BUNDLED_TTF_PACKS'] | null = null;
+
+/**
+ * Choose where {@link loadTTF} reads TTF bytes from: the @opendockit/fonts
+ * package ('companion', default) or the binary TTF packs generated into core
+ * ('pack'). `load` overrides how the pack manifest is imported. Clears the
+ * TTF cache.
+ */
+export function setTTFSource(
+  next: BundledFontSource,
+  load?: () => Promise<BundledTTFPackModule>,
+): void {
+  source = next;
+  if (load) importPacks = load;
+  packPromise = null;
+  cachedPacks = null;
+  cache.clear();
+}
+
+async function getPacks(): Promise<BundledTTFPackModule | null> {
+  if (!packPromise) {
+    packPromise = (async () => {
+      try {
+        const mod = await importPacks();
+        cachedPacks = mod.BUNDLED_TTF_PACKS;
+        return mod;
+      } catch {
+        return null;
+      }
+    })();
+  }
+  return packPromise;
+}
+
 // ---------------------------------------------------------------------------
 // Cache
 // ---------------------------------------------------------------------------
@@ -53,6 +114,9 @@ async function getCompanion(): Promise<CompanionInfo | null> {
 /** family|bold|italic -> decoded Uint8Array */
 const cache = new Map<string, Uint8Array>();
 
+/** CacheStorage copies of fetched TTF files, keyed by URL. */
+const persistCache = new FontCache();
+
 // ---------------------------------------------------------------------------
 // Public API
 // ---------------------------------------------------------------------------
@@ -64,6 +128,9 @@ const cache = new Map<string, Uint8Array>();
  * detected and contains TTF data for the requested family.
  */
 export function hasTTFBundle(family: string): boolean {
+  if (source === 'pack') {
+    return (cachedPacks?.[family.toLowerCase()]?.variants.length ?? 0) > 0;
+  }
   if (!cachedManifest) return false;
   const entry = cachedManifest.families[family.toLowerCase()];
   if (!entry) return false;
@@ -102,8 +169,9 @@ function resolveVariant(
 /**
  * Load raw TrueType font bytes for PDF embedding.
  *
- * Fetches TTF from the @opendockit/fonts companion package, and caches
- * the result. Returns `null` if the companion is not installed or if
+ * Fetches TTF from the @opendockit/fonts companion package (or a persisted
+ * copy that passes its integrity check), or from core's TTF packs after
+ * `setTTFSource('pack')`, and caches the result. Returns `null` if the companion is not installed or if
  * no TTF bundle is available for the font.
  *
  * @param family - Font family name (e.g., "Carlito", "Calibri", "Roboto")
@@ -120,6 +188,17 @@ export async function loadTTF(
   const cached = cache.get(key);
   if (cached) return cached;
 
+  if (source === 'pack') {
+    const packs = await getPacks();
+    const entry = packs?.BUNDLED_TTF_PACKS[family.toLowerCase()];
+    if (!packs || !entry) return null;
+    const variant = resolveVariant(bold, italic, entry.variants);
+    if (!variant) return null;
+    const bytes = await packs.loadBundledTTFPack(family, variant);
+    if (bytes) cache.set(key, bytes);
+    return bytes;
+  }
+
   const companion = await getCompanion();
   if (!companion) return null;
 
@@ -135,9 +214,16 @@ export async function loadTTF(
 
   try {
     const url = new URL(ttfEntry.file, companion.basePath).href;
-    const response = await fetch(url);
-    if (!response.ok) return null;
-    const buffer = await response.arrayBuffer();
+    let buffer = await persistCache.getFromPersist(url, ttfEntry.integrity);
+    if (!buffer) {
+      const response = await fetch(
+        url,
+        ttfEntry.integrity ? { integrity: ttfEntry.integrity } : undefined,
+      );
+      if (!response.ok) return null;
+      buffer = await response.arrayBuffer();
+      await persistCache.putPersist(url, buffer, 'font/ttf');
+    }
     const bytes = new Uint8Array(buffer);
     cache.set(key, bytes);
     return bytes;
@@ -68,6 +68,21 @@ export function styleToVariationAxes(
   return axes;
 }
 
+/**
+ * CSS font-weight descriptor for a variable font file's weight range.
+ *
+ * Companion-package variable WOFF2 shards list the axis ranges they keep
+ * (e.g. `{ wght: [400, 700] }`); registering them with weight "400 700"
+ * lets the browser pick the wght for each requested weight. Returns
+ * undefined when there is no wght range (static fonts).
+ */
+export function weightRangeDescriptor(
+  axes: Record<string, [number, number]> | undefined,
+): string | undefined {
+  const range = axes?.wght;
+  return range ? `${range[0]} ${range[1]}` : undefined;
+}
+
 /**
  * Check if a font family name suggests a variable font.
  * Variable fonts typically have "[wght]" or "[wght,wdth]" in the filename,
@@ -0,0 +1,15 @@
+import { describe, it, expect } from 'vitest';
+import { loadOfflineMetrics } from '../index.js';
+
+describe('loadOfflineMetrics()', () => {
+  it('returns an empty bundle with empty manifest (no families)', async () => {
+    await expect(loadOfflineMetrics()).resolves.toEqual({ version: 1, fonts: {} });
+  });
+
+  it('ignores families that do not exist', async () => {
+    await expect(loadOfflineMetrics(['NonExistentFont'])).resolves.toEqual({
+      version: 1,
+      fonts: {},
+    });
+  });
+});
@@ -1,10 +1,23 @@
-import { loadFont } from '@opendockit/core/font';
-import type { FontManifest } from './types.js';
+import {
+  decodeKerningTable,
+  decodeMetricsBytes,
+  loadFont,
+  parseVariantKey,
+  weightRangeDescriptor,
+} from '@opendockit/core/font';
+import type { FontMetricsBundle } from '@opendockit/core/font';
+import type { FontManifest, FontVariantEntry } from './types.js';
 
 // The manifest is a JSON file at the package root
 import manifest from '../manifest.json' with { type: 'json' };
 
-export type { FontManifest, FontFamilyEntry, FontVariantEntry } from './types.js';
+export type {
+  FontManifest,
+  FontFamilyEntry,
+  FontVariantEntry,
+  FontVariableGroup,
+  FontFallbackTable,
+} from './types.js';
 
 /** Get the companion package manifest. */
 export function getManifest(): FontManifest {
@@ -52,18 +65,24 @@ export async function registerOfflineFonts(
         Object.entries(entry.woff2).map(async ([variantKey, variant]) => {
           try {
             const url = new URL(variant.file, basePath).href;
-            const response = await fetch(url);
+            const response = await fetch(
+              url,
+              variant.integrity ? { integrity: variant.integrity } : undefined,
+            );
             if (!response.ok) return;
             const buffer = await response.arrayBuffer();
 
-            // Parse weight and style from variant key: "latin-400-normal"
-            const parts = variantKey.split('-');
-            const weight = parts[1] || '400';
-            const style = parts[2] || 'normal';
+            // Parse weight and style from variant key: "latin-ext-400-normal"
+            const { weight, style } = parseVariantKey(variantKey);
 
             const descriptors: FontFaceDescriptors = {};
-            if (weight !== '400') descriptors.weight = weight;
+            const weightRange = weightRangeDescriptor(variant.axes);
+            if (weightRange) descriptors.weight = weightRange;
+            else if (weight !== '400') descriptors.weight = weight;
             if (style !== 'normal') descriptors.style = style;
+            // Shards share weight/style; unicode-range tells the browser which
+            // shard covers which characters.
+            if (variant.unicodeRange) descriptors.unicodeRange = variant.unicodeRange;
 
             await loadFont(registerName, buffer, descriptors);
           } catch {
@@ -74,3 +93,83 @@ export async function registerOfflineFonts(
     }),
   );
 }
+
+/** Fetch a package file's bytes, or null if it can't be loaded. */
+async function fetchPackageFile(
+  { file, integrity }: FontVariantEntry,
+  basePath: string,
+): Promise<Uint8Array | null> {
+  try {
+    const response = await fetch(
+      new URL(file, basePath).href,
+      integrity ? { integrity } : undefined,
+    );
+    if (!response.ok) return null;
+    return new Uint8Array(await response.arrayBuffer());
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Load precomputed layout metrics for offline families.
+ *
+ * Fetches each family's per-face metrics tables (`metrics/*.bin`, written by
+ * the font pipeline's metrics stage) and merges them into one bundle for
+ * `FontMetricsDB.loadBundle()`. A face's pair-kerning table (`kerning/*.kern`)
+ * is attached as `kerning` when the manifest lists one. With no arguments,
+ * loads every family in the manifest. Tables that fail to load are skipped;
+ * a face whose kerning table fails to load is returned without kerning.
+ */
+export async function loadOfflineMetrics(
+  families?: string[],
+): Promise<FontMetricsBundle> {
+  const m = manifest as FontManifest;
+  const basePath = getBasePath();
+  const bundle: FontMetricsBundle = { version: 1, fonts: {} };
+
+  const keys = families
+    ? families
+        .map((f) => f.toLowerCase())
+        .filter((f) => f in m.families)
+    : Object.keys(m.families);
+
+  const tables = await Promise.all(
+    keys.flatMap((key) =>
+      Object.entries(m.families[key].metrics ?? {}).map(async ([variant, entry]) => {
+        const kerningEntry = m.families[key].kerning?.[variant];
+        const [metricsBytes, kerningBytes] = await Promise.all([
+          fetchPackageFile(entry, basePath),
+          kerningEntry ? fetchPackageFile(kerningEntry, basePath) : null,
+        ]);
+        if (!metricsBytes) return null;
+        let table: FontMetricsBundle;
+        try {
+          table = decodeMetricsBytes(metricsBytes);
+        } catch {
+          return null;
+        }
+        if (kerningBytes) {
+          try {
+            const kerning = decodeKerningTable(kerningBytes);
+            for (const faces of Object.values(table.fonts)) {
+              for (const face of faces) face.kerning = kerning;
+            }
+          } catch {
+            // Keep the face's metrics without kerning.
+          }
+        }
+        return table;
+      }),
+    ),
+  );
+
+  // Merge in manifest order so the result doesn't depend on fetch timing.
+  for (const table of tables) {
+    if (!table) continue;
+    for (const [family, faces] of Object.entries(table.fonts)) {
+      (bundle.fonts[family] ??= []).push(...faces);
+    }
+  }
+  return bundle;
+}
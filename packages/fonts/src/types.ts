@@ -1,20 +1,42 @@
 export interface FontVariantEntry {
   file: string; // relative path from package root
   size: number; // file size in bytes
+  unicodeRange?: string; // CSS unicode-range covered by this WOFF2 shard
+  axes?: Record<string, [number, number]>; // variable WOFF2: axis tag → [min, max] kept
+  integrity?: string; // Subresource Integrity hash of the file, "sha256-<base64>"
+  glyphs?: number; // glyph count (WOFF2 and TTF files)
+  coverage?: string; // WOFF2 shard: base64 bitmap of the unicodeRange codepoints it maps
+}
+
+export interface FontVariableGroup {
+  source: string; // variable source file the shards were cut from
+  axes: Record<string, [number, number]>; // axis ranges kept, e.g. { wght: [400, 700] }
+  instances: Record<string, Record<string, number>>; // variant → axis coordinates
 }
 
 export interface FontFamilyEntry {
   displayName: string;
   substituteFor?: string;
   license: string;
-  woff2: Record<string, FontVariantEntry>; // key: "{subset}-{weight}-{style}"
+  // key: "{subset}-{weight}-{style}"; subset may itself contain "-" ("latin-ext")
+  woff2: Record<string, FontVariantEntry>;
   ttf: Record<string, FontVariantEntry>; // key: "regular" | "bold" | "italic" | "boldItalic"
+  metrics?: Record<string, FontVariantEntry>; // per-face layout metrics tables, keyed like ttf
+  kerning?: Record<string, FontVariantEntry>; // per-face pair-kerning tables, keyed like ttf
+  variable?: Record<string, FontVariableGroup>; // key: CSS style; shards keyed "{subset}-var-{style}"
   weights: number[];
   styles: string[];
-  subsets: string[];
+  subsets: string[]; // unicode-range shards present, e.g. ["latin", "latin-ext"]
+}
+
+// Codepoint → fallback family: inclusive [start, end, index into families] runs
+export interface FontFallbackTable {
+  families: string[]; // family ids (keys of FontManifest.families), in fallback order
+  ranges: Array<[number, number, number]>;
 }
 
 export interface FontManifest {
   version: number;
   families: Record<string, FontFamilyEntry>;
+  fallback?: FontFallbackTable; // first family covering each bundle codepoint
 }
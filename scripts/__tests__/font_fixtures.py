@@ -0,0 +1,55 @@
+"""
+Shared fixtures for the font pipeline tests: a tiny TrueType font.
+
+Importing this module puts scripts/ on sys.path, so tests can import
+font_pipeline and deck_pipeline.
+"""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+# Characters the test font maps, and the pair it kerns with KERN_VALUE.
+CHARACTERS = {0x20: "space", 0x41: "A", 0x42: "B", 0x56: "V"}
+KERN_VALUE = -80
+
+
+def build_ttf(path, family="Pipeline Test", kerning=False):
+    """Write a 1000-UPM TrueType font mapping CHARACTERS to ``path``.
+
+    With ``kerning``, a GPOS kern feature moves "V" by KERN_VALUE after "A".
+    """
+    from fontTools.fontBuilder import FontBuilder
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+    glyph_order = [".notdef", *CHARACTERS.values()]
+    builder = FontBuilder(1000, isTTF=True)
+    builder.setupGlyphOrder(glyph_order)
+    builder.setupCharacterMap(CHARACTERS)
+
+    glyphs = {}
+    for index, name in enumerate(glyph_order):
+        pen = TTGlyphPen(None)
+        if name != "space":
+            right = 100 + 50 * index
+            pen.moveTo((50, 0))
+            pen.lineTo((50, 700))
+            pen.lineTo((right, 700))
+            pen.lineTo((right, 0))
+            pen.closePath()
+        glyphs[name] = pen.glyph()
+    builder.setupGlyf(glyphs)
+    builder.setupHorizontalMetrics({name: (500 + 10 * index, 50) for index, name in enumerate(glyph_order)})
+    builder.setupHorizontalHeader(ascent=800, descent=-200)
+    builder.setupNameTable({"familyName": family, "styleName": "Regular"})
+    builder.setupOS2(
+        sTypoAscender=800, sTypoDescender=-200, usWinAscent=800, usWinDescent=200, sxHeight=500, sCapHeight=700
+    )
+    builder.setupPost()
+    if kerning:
+        builder.addOpenTypeFeatures(f"feature kern {{ pos A V {KERN_VALUE}; }} kern;")
+    builder.save(str(path))
+    return path
@@ -0,0 +1,103 @@
+"""
+Tests for font_pipeline/cache.py subset cache keys and eviction.
+
+Run with: python3 -m unittest discover -s scripts/__tests__
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from font_fixtures import SCRIPTS_DIR  # noqa: F401  (puts scripts/ on sys.path)
+
+from fontTools import subset
+
+from font_pipeline.cache import SubsetCache, file_digest, subset_key
+
+
+class SubsetKeyTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.source = Path(tmp.name) / "source.ttf"
+        self.source.write_bytes(b"font bytes")
+        self.options = subset.Options()
+
+    def key(self, **overrides):
+        args = {"codepoints": {0x41, 0x42}, "options": self.options, "flavor": "woff2", "extra": ()}
+        args.update(overrides)
+        return subset_key(self.source, **args)
+
+    def test_same_inputs_give_the_same_key(self):
+        self.assertEqual(self.key(), self.key())
+        self.assertEqual(self.key(codepoints=[0x42, 0x41]), self.key())
+
+    def test_source_digest_can_be_passed_in(self):
+        self.assertEqual(self.key(source_digest=file_digest(self.source)), self.key())
+
+    def test_source_bytes_change_the_key(self):
+        before = self.key()
+        self.source.write_bytes(b"other font bytes")
+        self.assertNotEqual(self.key(), before)
+
+    def test_each_input_changes_the_key(self):
+        options = subset.Options()
+        options.hinting = not options.hinting
+        base = self.key()
+        for changed in (
+            self.key(codepoints={0x41}),
+            self.key(options=options),
+            self.key(flavor=None),
+            self.key(extra=("recalc-timestamp",)),
+        ):
+            self.assertNotEqual(changed, base)
+
+
+class SubsetCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = Path(tmp.name)
+
+    def test_get_after_put(self):
+        cache = SubsetCache(self.directory)
+        key = "ab" + "0" * 62
+        self.assertIsNone(cache.get(key))
+        cache.put(key, b"subset")
+        self.assertEqual(cache.get(key), b"subset")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(list(self.directory.glob("*/*")), [self.directory / "ab" / f"{key}.bin"])
+
+    def test_get_or_build_builds_once(self):
+        cache = SubsetCache(self.directory)
+        calls = []
+
+        def build():
+            calls.append(1)
+            return b"built"
+
+        self.assertEqual(cache.get_or_build("cd" + "0" * 62, build), b"built")
+        self.assertEqual(cache.get_or_build("cd" + "0" * 62, build), b"built")
+        self.assertEqual(len(calls), 1)
+
+    def test_prune_evicts_least_recently_used(self):
+        cache = SubsetCache(self.directory, max_bytes=20)
+        keys = [f"{index:02x}" + "0" * 62 for index in range(3)]
+        for age, key in enumerate(keys):
+            cache.put(key, b"x" * 10)
+            path = self.directory / key[:2] / f"{key}.bin"
+            os.utime(path, (1000 + age, 1000 + age))
+        cache.get(keys[0])  # now the most recently used
+
+        self.assertEqual(cache.prune(), 1)
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[2]))
+
+    def test_prune_of_a_missing_directory(self):
+        self.assertEqual(SubsetCache(self.directory / "missing").prune(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
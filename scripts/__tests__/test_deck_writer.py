@@ -0,0 +1,92 @@
+"""
+Tests for deck_pipeline/writer.py and save.py: byte-deterministic decks.
+
+Run with: python3 -m unittest discover -s scripts/__tests__
+"""
+
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from font_fixtures import SCRIPTS_DIR  # noqa: F401  (puts scripts/ on sys.path)
+
+from lxml import etree
+
+from deck_pipeline.save import EPOCH, ZIP_DATE_TIME, save_presentation
+from deck_pipeline.synthetic import build_deck, plan_deck
+from deck_pipeline.writer import DeckWriter, render_deck
+
+SLIDES = 3
+SHAPES = 6
+
+
+def canonical(xml):
+    """C14N form of ``xml``: equal for documents that differ only in attribute order."""
+    return etree.tostring(etree.fromstring(xml), method="c14n")
+
+
+class DeckWriterTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.plan = plan_deck(SLIDES, SHAPES, seed=7)
+
+    def write(self, name):
+        path = self.dir / name
+        with DeckWriter(path) as deck:
+            for slide_plan in self.plan:
+                deck.add_slide(slide_plan)
+        return path
+
+    def test_same_plan_gives_the_same_bytes(self):
+        first = self.write("first.pptx")
+        second = self.write("second.pptx")
+        self.assertEqual(first.read_bytes(), second.read_bytes())
+
+        with zipfile.ZipFile(first) as deck:
+            self.assertEqual({info.date_time for info in deck.infolist()}, {ZIP_DATE_TIME})
+            names = deck.namelist()
+        self.assertIn("ppt/slides/slide3.xml", names)
+        self.assertEqual(names[-1], "[Content_Types].xml")
+
+    def test_parallel_rendering_gives_the_same_slides(self):
+        serial = [xml for xml, _ in render_deck(SLIDES, SHAPES, seed=7)]
+        parallel = [xml for xml, _ in render_deck(SLIDES, SHAPES, seed=7, jobs=2)]
+        self.assertEqual(serial, parallel)
+
+    def test_slides_match_python_pptx(self):
+        path = self.write("streamed.pptx")
+        reference = self.dir / "reference.pptx"
+        save_presentation(build_deck(self.plan), reference, deterministic=True)
+
+        with zipfile.ZipFile(path) as streamed, zipfile.ZipFile(reference) as built:
+            self.assertEqual(sorted(streamed.namelist()), sorted(built.namelist()))
+            for index in range(1, SLIDES + 1):
+                name = f"ppt/slides/slide{index}.xml"
+                self.assertEqual(canonical(streamed.read(name)), canonical(built.read(name)), name)
+
+
+class SavePresentationTest(unittest.TestCase):
+    def test_deterministic_save_gives_the_same_bytes(self):
+        plan = plan_deck(2, SHAPES, seed=3)
+        with tempfile.TemporaryDirectory() as tmp:
+            first, second = Path(tmp) / "first.pptx", Path(tmp) / "second.pptx"
+            save_presentation(build_deck(plan), first, deterministic=True)
+            save_presentation(build_deck(plan), second, deterministic=True)
+            self.assertEqual(first.read_bytes(), second.read_bytes())
+
+            with zipfile.ZipFile(first) as deck:
+                self.assertEqual(deck.namelist()[0], "[Content_Types].xml")
+                self.assertEqual(deck.namelist()[1:], sorted(deck.namelist()[1:]))
+                self.assertEqual({info.date_time for info in deck.infolist()}, {ZIP_DATE_TIME})
+
+            from pptx import Presentation
+
+            props = Presentation(str(first)).core_properties
+            self.assertEqual((props.created, props.modified, props.revision), (EPOCH, EPOCH, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
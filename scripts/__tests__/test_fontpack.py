@@ -0,0 +1,91 @@
+"""
+Tests for font_pipeline/fontpack.py: the binary pack layout font-pack.ts reads.
+
+Run with: python3 -m unittest discover -s scripts/__tests__
+"""
+
+import contextlib
+import hashlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from font_fixtures import SCRIPTS_DIR  # noqa: F401  (puts scripts/ on sys.path)
+
+from font_pipeline.dedup import SharedFace
+from font_pipeline.fontpack import ALIGN, HEADER, MAGIC, read_font_pack_index, write_font_pack
+
+FAMILY = {
+    "register_as": "Pack Test",
+    "variants": {
+        "regular": "PackTest-Regular.ttf",
+        "bold": "PackTest-Bold.ttf",
+        "italic": "PackTest-Italic.ttf",
+        "boldItalic": "PackTest-BoldItalic.ttf",
+    },
+}
+
+
+class FontPackTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "pack-test.fontpack"
+
+    def write(self, variants, kind="woff2"):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return write_font_pack(self.path, kind, FAMILY, variants)
+
+    def test_round_trip(self):
+        variants = [("regular", b"regular bytes"), ("bold", b"bold!"), ("italic", b"i" * 17)]
+        self.write(variants)
+        data = self.path.read_bytes()
+
+        index = read_font_pack_index(data)
+        self.assertEqual(list(index), ["regular", "bold", "italic"])
+        for name, payload in variants:
+            offset, length, digest = index[name]
+            self.assertEqual(offset % ALIGN, 0)
+            self.assertEqual(data[offset:offset + length], payload)
+            self.assertEqual(digest, hashlib.sha256(payload).hexdigest())
+
+        magic, version, flavor, _, count, _, data_offset = HEADER.unpack_from(data)
+        self.assertEqual((magic, version, flavor, count), (MAGIC, 1, 1, 3))
+        self.assertEqual(data_offset, min(offset for offset, _, _ in index.values()))
+
+    def test_identical_variants_share_a_payload(self):
+        self.write([("regular", b"same bytes"), ("bold", b"other"), ("italic", b"same bytes")])
+        index = read_font_pack_index(self.path.read_bytes())
+        self.assertEqual(index["regular"], index["italic"])
+        self.assertNotEqual(index["regular"][0], index["bold"][0])
+
+    def test_shared_faces_are_left_out(self):
+        self.write([("regular", b"regular"), ("bold", SharedFace("other-family", "regular"))], kind="ttf")
+        data = self.path.read_bytes()
+        self.assertEqual(list(read_font_pack_index(data)), ["regular"])
+        self.assertEqual(HEADER.unpack_from(data)[2], 2)
+
+    def test_unchanged_pack_is_not_rewritten(self):
+        variants = [("regular", b"regular"), ("bold", b"bold")]
+        changed, digest = self.write(variants)
+        self.assertTrue(changed)
+        self.assertEqual(digest, hashlib.sha256(self.path.read_bytes()).hexdigest())
+        self.assertEqual(self.write(variants), (False, digest))
+
+    def test_long_variant_names_are_rejected(self):
+        family = {"variants": {"x" * 17: "Long.ttf"}}
+        with self.assertRaises(ValueError):
+            write_font_pack(self.path, "woff2", family, [("x" * 17, b"data")])
+
+    def test_invalid_headers_are_rejected(self):
+        with self.assertRaises(ValueError):
+            read_font_pack_index(b"ODFP")
+        with self.assertRaises(ValueError):
+            read_font_pack_index(b"WOF2" + bytes(12))
+        with self.assertRaises(ValueError):
+            read_font_pack_index(HEADER.pack(MAGIC, 1, 1, 0, 2, 0, 16))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Tests for font_pipeline/kerning.py: pair extraction and the binary table
+packages/core/src/font/data/kerning-decoder.ts reads.
+
+Run with: python3 -m unittest discover -s scripts/__tests__
+"""
+
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+
+from font_fixtures import KERN_VALUE, build_ttf
+
+from font_pipeline.kerning import encode_kerning, face_kerning
+
+# The decoder checks the magic as one little-endian u32.
+DECODER_MAGIC = 0x4E4B444F
+
+
+def decode_kerning(data):
+    """Decode a kerning table as kerning-decoder.ts does."""
+    magic, version, units_per_em, count = struct.unpack_from("<IHHI", data)
+    assert len(data) == 12 + count * 6, "unexpected table size"
+    keys = struct.unpack_from(f"<{count}I", data, 12)
+    values = struct.unpack_from(f"<{count}h", data, 12 + count * 4)
+    return magic, version, units_per_em, keys, values
+
+
+class EncodeKerningTest(unittest.TestCase):
+    def test_header_and_parallel_arrays(self):
+        pairs = [[0x41, 0x56, -80], [0x54, 0x6F, -120], [0x56, 0x41, 75]]
+        magic, version, units_per_em, keys, values = decode_kerning(encode_kerning(pairs, 2048))
+        self.assertEqual((magic, version, units_per_em), (DECODER_MAGIC, 1, 2048))
+        self.assertEqual(keys, (0x00410056, 0x0054006F, 0x00560041))
+        self.assertEqual(list(keys), sorted(keys))
+        self.assertEqual(values, (-80, -120, 75))
+
+    def test_values_are_clamped_to_int16(self):
+        *_, values = decode_kerning(encode_kerning([[0x41, 0x41, -40000], [0x41, 0x42, 40000]], 1000))
+        self.assertEqual(values, (-0x8000, 0x7FFF))
+
+    def test_empty_table(self):
+        self.assertEqual(encode_kerning([], 1000), b"ODKN\x01\x00\xe8\x03\x00\x00\x00\x00")
+
+
+class FaceKerningTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+
+    def kerning(self, **kwargs):
+        from fontTools.ttLib import TTFont
+
+        return face_kerning(TTFont(build_ttf(self.dir / "test.ttf", **kwargs)), codepoints={0x20, 0x41, 0x42, 0x56})
+
+    def test_gpos_kern_feature(self):
+        self.assertEqual(self.kerning(kerning=True), [[0x41, 0x56, KERN_VALUE]])
+
+    def test_face_without_kerning(self):
+        self.assertEqual(self.kerning(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+Tests for font_pipeline/metrics.py: face metrics and the delta+varint
+binary format packages/core/src/font/data/metrics-decoder.ts reads.
+
+Run with: python3 -m unittest discover -s scripts/__tests__
+"""
+
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+
+from font_fixtures import build_ttf
+
+from font_pipeline.metrics import encode_metrics, face_metrics, merge_metrics
+
+STYLE_NAMES = ["regular", "bold", "italic", "boldItalic"]
+
+METRICS = {
+    "unitsPerEm": 1000,
+    "ascender": 800,
+    "descender": -200,
+    "capHeight": 700,
+    "lineHeight": 1.2,
+    "lineGap": 0,
+    "defaultWidth": 500,
+    "widths": [[0x41, 600], [0x42, 610]],
+}
+
+
+def read_varint(data, offset):
+    result = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return result, offset
+
+
+def decode_metrics(data):
+    """Decode a metrics bundle step by step, as metrics-decoder.ts does."""
+    version = data[0]
+    count, offset = read_varint(data, 1)
+    faces = []
+    for _ in range(count):
+        length, offset = read_varint(data, offset)
+        family = data[offset:offset + length].decode("utf-8")
+        offset += length
+        style = STYLE_NAMES[data[offset]]
+        offset += 1
+        face = {"family": family, "style": style}
+        face["unitsPerEm"], offset = read_varint(data, offset)
+        for field in ("ascender", "descender", "capHeight"):
+            raw, offset = read_varint(data, offset)
+            face[field] = (raw >> 1) ^ -(raw & 1)
+        flags = data[offset]
+        offset += 1
+        for bit, field in ((1, "lineHeight"), (2, "lineGap")):
+            if flags & bit:
+                face[field] = round(struct.unpack_from("<f", data, offset)[0], 4)
+                offset += 4
+        face["defaultWidth"], offset = read_varint(data, offset)
+        width_count, offset = read_varint(data, offset)
+        widths = []
+        codepoint = 0
+        for _ in range(width_count):
+            delta, offset = read_varint(data, offset)
+            codepoint += delta
+            width, offset = read_varint(data, offset)
+            widths.append([codepoint, width])
+        face["widths"] = widths
+        faces.append(face)
+    assert offset == len(data), "trailing bytes"
+    return version, faces
+
+
+class EncodeMetricsTest(unittest.TestCase):
+    def test_encoding_is_stable(self):
+        self.assertEqual(
+            encode_metrics([("Ab", "bold", METRICS)]).hex(),
+            "0101024162"  # version, 1 face, name "Ab"
+            "01e807"  # bold, unitsPerEm 1000
+            "c00c8f03f80a"  # zigzag 800, -200, 700
+            "039a99993f00000000"  # both floats present: 1.2, 0.0
+            "f40302"  # defaultWidth 500, 2 widths
+            "41d804" "01e204",  # U+0041 → 600, +1 → 610
+        )
+
+    def test_round_trip(self):
+        faces = [
+            ("Calibri", "regular", METRICS),
+            ("Über Sans", "boldItalic", dict(METRICS, descender=-1, widths=[[0x20, 250], [0x2192, 9000]])),
+        ]
+        version, decoded = decode_metrics(encode_metrics(faces))
+        self.assertEqual(version, 1)
+        self.assertEqual(decoded, [{"family": family, "style": style, **metrics} for family, style, metrics in faces])
+
+    def test_merge_matches_a_bundle_of_the_same_faces(self):
+        faces = [("A", "regular", METRICS), ("B", "italic", METRICS)]
+        tables = [encode_metrics([face]) for face in faces]
+        self.assertEqual(merge_metrics(tables), encode_metrics(faces))
+        with self.assertRaises(ValueError):
+            merge_metrics([encode_metrics(faces)])
+
+
+class FaceMetricsTest(unittest.TestCase):
+    def test_metrics_of_a_built_font(self):
+        from fontTools.ttLib import TTFont
+
+        with tempfile.TemporaryDirectory() as tmp:
+            metrics = face_metrics(TTFont(build_ttf(Path(tmp) / "test.ttf")))
+
+        self.assertEqual(
+            metrics,
+            {
+                "unitsPerEm": 1000,
+                "ascender": 800,
+                "descender": -200,
+                "capHeight": 700,
+                "lineHeight": 1.0,
+                "lineGap": 0.0,
+                "defaultWidth": 510,
+                "widths": [[0x20, 510], [0x41, 520], [0x42, 530], [0x56, 540]],
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
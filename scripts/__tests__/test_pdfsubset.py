@@ -0,0 +1,68 @@
+"""
+Tests for font_pipeline/pdfsubset.py batch subsetting.
+
+Run with: python3 -m unittest discover -s scripts/__tests__
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from font_fixtures import build_ttf
+
+from font_pipeline import pdfsubset
+
+
+class SubsetBatchTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.fonts_dir = Path(tmp.name)
+        patcher = mock.patch.object(pdfsubset, "FONTS_DIR", self.fonts_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_corrupt_face_does_not_fail_the_batch(self):
+        build_ttf(self.fonts_dir / "Caladea-Regular.ttf")
+        # A TrueType header with a table directory pointing past the end of the file.
+        (self.fonts_dir / "Carlito-Regular.ttf").write_bytes(b"\x00\x01\x00\x00\x00\x05" + b"\xff" * 40)
+
+        results = list(pdfsubset.subset_batch([
+            {"family": "Calibri", "text": "AB"},
+            {"family": "Cambria", "text": "AB"},
+            {"family": "Nonexistent", "text": "AB"},
+        ]))
+
+        by_family = {result["family"]: result for result in results}
+        self.assertEqual(set(by_family), {"carlito", "caladea", "Nonexistent"})
+        self.assertIn("error", by_family["carlito"])
+        self.assertNotIn("data", by_family["carlito"])
+        self.assertIn("unknown font family", by_family["Nonexistent"]["error"])
+
+        caladea = by_family["caladea"]
+        self.assertNotIn("error", caladea)
+        self.assertEqual(caladea["codepoints"], 2)
+        self.assertTrue(caladea["data"].startswith(b"\x00\x01\x00\x00"))
+
+    def test_truncated_face_reports_an_error(self):
+        (self.fonts_dir / "Carlito-Regular.ttf").write_bytes(b"\x00\x01")
+
+        [result] = pdfsubset.subset_batch([{"family": "carlito", "codepoints": [65]}])
+        self.assertEqual(result["family"], "carlito")
+        self.assertIn("error", result)
+
+    def test_requests_for_one_face_are_merged(self):
+        build_ttf(self.fonts_dir / "Carlito-Regular.ttf")
+
+        results = list(pdfsubset.subset_batch([
+            {"family": "Calibri", "text": "A"},
+            {"family": "carlito", "codepoints": [0x42], "glyphIds": [1]},
+        ]))
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["codepoints"], 2)
+        self.assertEqual(results[0]["glyphIds"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
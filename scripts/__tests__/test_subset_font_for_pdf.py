@@ -0,0 +1,42 @@
+"""
+Tests for subset-font-for-pdf.py argument parsing.
+
+Run with: python3 -m unittest discover -s scripts/__tests__
+"""
+
+import importlib.util
+import sys
+import unittest
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+_spec = importlib.util.spec_from_file_location("subset_font_for_pdf", SCRIPTS_DIR / "subset-font-for-pdf.py")
+subset_font_for_pdf = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(subset_font_for_pdf)
+parse_codepoints = subset_font_for_pdf.parse_codepoints
+
+UPPERCASE = set(range(0x41, 0x5B))
+
+
+class ParseCodepointsTest(unittest.TestCase):
+    def test_unicode_range_end_is_hex(self):
+        self.assertEqual(parse_codepoints("U+0041-005A"), UPPERCASE)
+
+    def test_unicode_range_with_prefixed_end(self):
+        self.assertEqual(parse_codepoints("U+0041-U+005A"), UPPERCASE)
+
+    def test_plain_numbers_keep_their_base(self):
+        self.assertEqual(parse_codepoints("65-90"), UPPERCASE)
+        self.assertEqual(parse_codepoints("0x41-0x5A"), UPPERCASE)
+
+    def test_mixed_list(self):
+        self.assertEqual(parse_codepoints("U+0041-0043, 0x20,65,"), {0x20, 0x41, 0x42, 0x43})
+
+    def test_single_codepoint(self):
+        self.assertEqual(parse_codepoints("U+00E9"), {0xE9})
+
+
+if __name__ == "__main__":
+    unittest.main()
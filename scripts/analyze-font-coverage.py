@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Report which bundle codepoints each font face covers, and what falls back.
+
+Reads the cmap of every FONT_FAMILIES source in fonts/, intersected with
+the bundle codepoints (UNICODE_RANGES), and prints per substitute family
+(entries with ``substitute_for``; --all for every family) how many
+codepoints its regular face maps. It also lists the ones it lacks, split
+into those a fallback family covers and those no bundled face covers. The
+latter render as tofu (see font_pipeline/coverage.py).
+
+Usage: python3 scripts/analyze-font-coverage.py [--all] [--family SUBSTR] [--jobs N]
+           [--json PATH] [--table PATH] [--no-cache]
+
+  --all           Report every family, not just Office substitutes.
+  --family SUBSTR Only families whose id contains SUBSTR.
+  --json PATH     Write the full report: the codepoint → faces index
+                  (as runs of codepoints sharing one face list), per-family
+                  gaps with their fallback family, and the fallback table.
+  --table PATH    Write only the compact fallback table, the same one
+                  generate-font-package.py stores in manifest.json.
+
+Exits 1 if no source fonts are found. Coverage is cached by content hash
+(see font_pipeline/cache.py).
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from font_pipeline import FONTS_DIR
+from font_pipeline.cache import add_cache_arguments, cache_from_args, report_cache
+from font_pipeline.coverage import (
+    collect_coverage,
+    coverage_gaps,
+    coverage_index,
+    fallback_groups,
+    fallback_table,
+    family_coverage,
+    format_ranges,
+)
+from font_pipeline.families import CODEPOINTS, FONT_FAMILIES, codepoint_ranges
+from font_pipeline.parallel import add_jobs_argument, resolve_jobs
+
+
+def check_dependencies():
+    """Verify required Python packages are available."""
+    try:
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        print("ERROR: fontTools not found.")
+        print("Install with: pip3 install fonttools brotli")
+        sys.exit(1)
+
+
+def index_runs(index):
+    """``[[start, end, [faces]]]``: runs of consecutive codepoints with the same face list."""
+    runs = []
+    for cp, faces in index.items():
+        if runs and runs[-1][1] == cp - 1 and runs[-1][2] == faces:
+            runs[-1][1] = cp
+        else:
+            runs.append([cp, cp, faces])
+    return runs
+
+
+def gap_report(gaps):
+    """JSON-ready per-family gaps: fallback family → codepoint ranges, plus uncovered ranges."""
+    report = {}
+    for family_id, family_gaps in gaps.items():
+        report[family_id] = {
+            "covered": family_gaps.covered,
+            "fallback": {coverer: codepoint_ranges(cps) for coverer, cps in fallback_groups(family_gaps).items()},
+            "uncovered": codepoint_ranges(family_gaps.uncovered),
+        }
+    return report
+
+
+def print_family(family_id, family_gaps):
+    """Print one family's coverage line and its gaps."""
+    family_def = FONT_FAMILIES[family_id]
+    name = family_def["register_as"]
+    if family_def.get("substitute_for"):
+        name += f" ({family_def['substitute_for']})"
+    missing = len(family_gaps.fallback) + len(family_gaps.uncovered)
+    print(f"\n{name} [{family_id}]: {family_gaps.covered}/{len(CODEPOINTS)} codepoints, {missing} missing")
+    for coverer, cps in fallback_groups(family_gaps).items():
+        print(f"  → {coverer}: {len(cps)} ({format_ranges(cps)})")
+    if family_gaps.uncovered:
+        print(f"  uncovered: {len(family_gaps.uncovered)} ({format_ranges(family_gaps.uncovered)})")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Report font coverage gaps and build the fallback table.")
+    parser.add_argument("--all", action="store_true", help="report every family, not just Office substitutes")
+    parser.add_argument("--family", help="only families whose id contains this substring")
+    parser.add_argument("--json", type=Path, help="write the full coverage report as JSON")
+    parser.add_argument("--table", type=Path, help="write the compact fallback table as JSON")
+    add_jobs_argument(parser, "number of worker processes for reading font coverage")
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+    resolve_jobs(parser, args)
+    return args
+
+
+def main():
+    args = parse_args()
+    check_dependencies()
+    if not FONTS_DIR.exists():
+        print(f"ERROR: fonts/ directory not found at {FONTS_DIR}")
+        print("Run 'pnpm fonts:download' first to download font sources (or 'pnpm fonts:fetch --mirror PATH' offline).")
+        sys.exit(1)
+
+    cache = cache_from_args(args)
+    coverage = collect_coverage(cache=cache, jobs=args.jobs)
+    if not coverage:
+        print(f"ERROR: no FONT_FAMILIES sources found in {FONTS_DIR}")
+        sys.exit(1)
+    families = family_coverage(coverage)
+    gaps = coverage_gaps(families)
+    table = fallback_table(families)
+
+    reported = [
+        family_id
+        for family_id in FONT_FAMILIES
+        if family_id in gaps
+        and (args.all or FONT_FAMILIES[family_id].get("substitute_for"))
+        and (args.family is None or args.family in family_id)
+    ]
+    for family_id in reported:
+        print_family(family_id, gaps[family_id])
+
+    uncovered = CODEPOINTS - set().union(*families.values())
+    print(f"\n=== Coverage: {len(coverage)} faces, {len(families)} families ===")
+    print(f"  Bundle codepoints: {len(CODEPOINTS)}, covered by some family: {len(CODEPOINTS) - len(uncovered)}")
+    if uncovered:
+        print(f"  Uncovered by every family: {len(uncovered)} ({format_ranges(uncovered)})")
+    print(f"  Fallback table: {len(table['families'])} families, {len(table['ranges'])} ranges")
+
+    if args.table:
+        args.table.parent.mkdir(parents=True, exist_ok=True)
+        args.table.write_text(json.dumps(table, separators=(",", ":")) + "\n", encoding="utf-8")
+        print(f"  Table: {args.table}")
+    if args.json:
+        report = {
+            "faces": len(coverage),
+            "index": index_runs(coverage_index(coverage)),
+            "families": gap_report({family_id: gaps[family_id] for family_id in reported}),
+            "uncovered": codepoint_ranges(uncovered),
+            "fallback": table,
+        }
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"  Report: {args.json}")
+    report_cache(cache)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+bench-font-build.py — Time the font build per face and stage, and catch regressions.
+
+Runs every source face through the WOFF2 bundle, TTF bundle and companion
+package code paths, timing the load / subset / compress / encode / write
+stages and recording peak RSS and output bytes (see font_pipeline/bench.py).
+Results are compared with tools/perf/baselines/font-build-baselines.json; the
+script exits 1 if any face's total time, output size or peak RSS regresses
+past its threshold, so a fontTools upgrade or a UNICODE_RANGES edit can't
+silently bloat the bundles. A missing baseline fails the run too: record one
+with --update-baselines (pnpm perf:fonts:update) and commit it.
+
+Usage:
+    python3 scripts/bench-font-build.py [--update-baselines] [--repeat N]
+        [--family SUBSTR] [--case woff2|ttf|package ...] [--json PATH]
+        [--time-threshold PCT] [--size-threshold PCT] [--rss-threshold PCT]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from font_pipeline import FONTS_DIR
+from font_pipeline.bench import (
+    BASELINE_PATH,
+    CASES,
+    RSS_THRESHOLD,
+    SIZE_THRESHOLD,
+    TIME_THRESHOLD,
+    compare,
+    load_baselines,
+    run_benchmarks,
+    save_baselines,
+    source_faces,
+)
+
+
+def percent(value):
+    """argparse type: a percentage, returned as a fraction."""
+    return float(value) / 100
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the font build against committed baselines.")
+    parser.add_argument(
+        "--update-baselines",
+        action="store_true",
+        help="write the results as the new baseline instead of comparing",
+    )
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="baseline JSON path")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per face; stage times are medians (default: 3)")
+    parser.add_argument("--family", help="only benchmark families whose id contains this substring")
+    parser.add_argument(
+        "--case",
+        action="append",
+        choices=CASES,
+        help="benchmark only this case (repeatable; default: all)",
+    )
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    parser.add_argument(
+        "--time-threshold",
+        type=percent,
+        default=TIME_THRESHOLD,
+        help=f"allowed total-time increase in percent (default: {TIME_THRESHOLD * 100:.0f})",
+    )
+    parser.add_argument(
+        "--size-threshold",
+        type=percent,
+        default=SIZE_THRESHOLD,
+        help=f"allowed output-size increase in percent (default: {SIZE_THRESHOLD * 100:.0f})",
+    )
+    parser.add_argument(
+        "--rss-threshold",
+        type=percent,
+        default=RSS_THRESHOLD,
+        help=f"allowed peak-RSS increase in percent (default: {RSS_THRESHOLD * 100:.0f})",
+    )
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be >= 1")
+    return args
+
+
+def main():
+    args = parse_args()
+
+    if not FONTS_DIR.exists():
+        print(f"ERROR: fonts/ directory not found at {FONTS_DIR}")
+        print("Run 'pnpm fonts:download' first to download font sources (or 'pnpm fonts:fetch --mirror PATH' offline).")
+        sys.exit(1)
+
+    try:
+        import brotli  # noqa: F401
+        from fontTools.ttLib import TTFont  # noqa: F401
+    except ImportError:
+        print("ERROR: fontTools and brotli are required.")
+        print("Install with: pip3 install fonttools brotli")
+        sys.exit(1)
+
+    cases = tuple(args.case) if args.case else CASES
+    print(f"Benchmarking font build ({', '.join(cases)}; {args.repeat} runs per face)...\n")
+    results = run_benchmarks(source_faces(args.family), cases, args.repeat)
+    if not results:
+        print("ERROR: no source faces found to benchmark")
+        sys.exit(1)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    total_ms = sum(r["total_ms"] for r in results.values())
+    total_bytes = sum(r["bytes"] for r in results.values())
+    print(f"\n  Faces x cases: {len(results)}")
+    print(f"  Total time:    {total_ms / 1000:.2f} s")
+    print(f"  Output:        {total_bytes / 1024 / 1024:.2f} MB")
+
+    if args.update_baselines:
+        save_baselines(results, args.baseline)
+        print(f"\nBaselines written to {args.baseline}")
+        print(f"  {len(results)} benchmark(s) recorded.")
+        return
+
+    baselines = load_baselines(args.baseline)
+    if not baselines:
+        print(f"\nERROR: no baselines in {args.baseline}, so nothing can be checked for regressions.")
+        print("Record them from a trusted build with 'pnpm perf:fonts:update' and commit the file.")
+        sys.exit(1)
+
+    new_keys = [key for key in results if key not in baselines]
+    if new_keys:
+        print(f"\nERROR: {len(new_keys)} benchmark(s) have no baseline:")
+        for key in new_keys:
+            print(f"  {key}")
+        print("Record them with 'pnpm perf:fonts:update' and commit the baseline file.")
+        sys.exit(1)
+
+    regressions = compare(results, baselines, args.time_threshold, args.size_threshold, args.rss_threshold)
+    if not regressions:
+        print(f"\nNo regressions against {args.baseline}")
+        return
+
+    print(f"\nREGRESSIONS ({len(regressions)}):")
+    for key, metric, old, new, change in regressions:
+        print(f"  {key}: {metric} {old} → {new} (+{change * 100:.1f}%)")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
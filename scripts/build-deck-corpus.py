@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Build a seeded regression corpus of synthetic PPTX decks plus an index.
+
+test-data/corpus/ holds a handful of real-world files. This builds as many
+decks as asked for, each focused on one feature family (connectors,
+effects, gradients, tables, text, bundled fonts, or a mix of everything),
+sized by a profile. Every deck comes from deck_pipeline/synthetic.py and is
+written by deck_pipeline/writer.py (see deck_pipeline/corpus.py).
+
+Usage:
+    python3 scripts/build-deck-corpus.py [--count N] [--seed S]
+        [--profile small|medium|large|mixed] [--jobs N] [-o DIR]
+    # Output: test-data/synthetic-corpus/deck-*.pptx + index.json
+
+  --count N        Number of decks (default: 1000).
+  --seed S         Corpus seed (default: 0).
+  --profile NAME   Deck sizes: small (1-5 slides × 5-20 shapes), medium
+                   (5-30 × 20-60), large (30-200 × 50-150), or mixed
+                   (default: a 6:3:1 blend of the three).
+  --jobs N         Write decks on N worker processes (0 = one per CPU core).
+  -o DIR           Output directory (default: test-data/synthetic-corpus).
+
+index.json lists every deck: path, seed, focus feature, shape kinds
+exercised, slide and per-kind shape counts, text characters, table cells,
+font families, byte size and SHA-256. The same count, seed and profile
+regenerate identical decks and an identical index, so perf baselines
+measured on the corpus stay comparable across rebuilds.
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+from deck_pipeline import ROOT, TEST_DATA_DIR
+from deck_pipeline.corpus import PROFILE_CHOICES, corpus_index, plan_corpus, write_corpus_deck
+
+DEFAULT_OUTPUT = TEST_DATA_DIR / "synthetic-corpus"
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {number}")
+    return number
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build a seeded regression corpus of synthetic PPTX decks.")
+    parser.add_argument("--count", type=positive_int, default=1000, help="number of decks (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed (default: 0)")
+    parser.add_argument("--profile", choices=PROFILE_CHOICES, default="mixed", help="deck sizes (default: mixed)")
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="worker processes writing decks (0 = one per CPU core, default: 1)",
+    )
+    parser.add_argument("-o", "--output", type=Path, default=DEFAULT_OUTPUT, help="output directory")
+    args = parser.parse_args()
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    return args
+
+
+def main():
+    args = parse_args()
+    args.output.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    specs = plan_corpus(args.count, args.seed, args.profile)
+    if args.jobs <= 1:
+        entries = [write_corpus_deck(spec, args.output) for spec in specs]
+    else:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            entries = list(pool.map(write_corpus_deck, specs, repeat(args.output), chunksize=4))
+    elapsed = time.perf_counter() - start
+
+    index = corpus_index(entries, args.count, args.seed, args.profile)
+    index_path = args.output / "index.json"
+    index_path.write_text(json.dumps(index, indent=2) + "\n", encoding="utf-8")
+
+    totals = index["totals"]
+    output = args.output.resolve()
+    print(f"Built corpus: {output.relative_to(ROOT) if output.is_relative_to(ROOT) else output}")
+    print(f"  Decks: {args.count} ({', '.join(f'{name} {n}' for name, n in totals['features'].items())})")
+    print(f"  Slides: {totals['slides']}, shapes: {totals['shapes']}")
+    print(f"  Size: {totals['bytes'] / 1024 / 1024:.1f} MB")
+    print(f"  Time: {elapsed:.2f}s ({args.jobs} job{'s' if args.jobs > 1 else ''})")
+    print(f"  Index: {index_path}")
+
+
+if __name__ == "__main__":
+    main()
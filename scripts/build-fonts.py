@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+build-fonts.py — Build every font artifact with one parse per face.
+
+Each unique source file referenced by FONT_FAMILIES is loaded and subset
+once; the same subset TTFont is then saved as WOFF2 and as raw TTF, and the
+results feed all three outputs (the companion package's per-unicode-range
+WOFF2 shards are additional subsets of the same source bytes):
+
+- packages/core/src/font/data/woff2/  (same as bundle-woff2-fonts.py)
+- packages/core/src/font/data/ttf/    (same as bundle-ttf-fonts.py)
+- packages/fonts/                     (same as generate-font-package.py,
+                                       including per-face metrics and kerning
+                                       tables and core's metrics-bundle.ts)
+
+With --format pack the core bundles are written as binary font packs to
+data/woff2-pack/ and data/ttf-pack/ instead (see font_pipeline/fontpack.py).
+
+Faces shared between families are stored once in every output (see
+font_pipeline/dedup.py). The individual scripts remain for rebuilding a
+single artifact.
+
+With --profile render (optionally --quantize UNITS), the WOFF2 outputs drop
+hinting and extra names for Canvas2D rendering while the TTF bundle stays
+hinted for PDF embedding (see font_pipeline/profiles.py). The core WOFF2 is
+then a second subset of the same parsed source, and each face's size is
+reported against the default-profile WOFF2.
+
+Usage:
+    python3 scripts/build-fonts.py [--jobs N] [--format ts|pack] [--no-shards] [--no-metrics] [--profile default|render] [--quantize UNITS] [--hashed-filenames] [--precompress] [--no-cache] [--cache-dir DIR] [--cache-max-mb N]
+"""
+
+import argparse
+import sys
+
+from font_pipeline import FONTS_DIR
+from font_pipeline.cache import add_cache_arguments, cache_from_args, report_cache
+from font_pipeline.coverage import package_fallback_table
+from font_pipeline.dedup import dedupe_package_files, family_aliases, shared_faces
+from font_pipeline.families import FONT_FAMILIES
+from font_pipeline.fontpack import add_format_argument, bundle_format
+from font_pipeline.incremental import write_if_changed
+from font_pipeline.package import (
+    OUTPUT_DIR as PACKAGE_DIR,
+    add_package_arguments,
+    annotate_package_files,
+    clean_outputs,
+    family_entry,
+    new_variant_result,
+    package_shards,
+    shard_codepoints,
+    write_manifest,
+    write_package_metrics_bundle,
+    write_variant,
+)
+from font_pipeline.metrics import expected_faces, subset_face_shards_with_metrics
+from font_pipeline.parallel import add_jobs_argument, map_ordered, resolve_jobs
+from font_pipeline.precompress import format_savings, package_files, precompress_files
+from font_pipeline.profiles import (
+    DEFAULT_PROFILE,
+    add_profile_arguments,
+    describe_profile,
+    format_profile_savings,
+    profile_from_args,
+)
+from font_pipeline.subset import FLAVORS, subset_face, subset_face_shards
+from font_pipeline.typescript import BUNDLES
+
+
+def build_face(ttf_filename, cache=None, shards=None, metrics=True, profile=DEFAULT_PROFILE):
+    """Subset one source face to every flavor and every package shard.
+
+    Runs in a worker process when --jobs > 1. Returns None if the source is
+    missing, else a dict with "data" ({flavor: bytes} or None), "shards"
+    ({shard name: WOFF2 bytes} or None), "metrics" (``face_metrics()`` dict,
+    read from the font parsed for the shards, or None), "baseline" (default
+    profile WOFF2 size when ``profile`` isn't the default, else None),
+    "error" and cache hit/miss counts. ``profile`` applies to the WOFF2
+    outputs only; the TTF flavor always uses the default profile.
+    """
+    ttf_path = FONTS_DIR / ttf_filename
+    if not ttf_path.exists():
+        return None
+    if shards is None:
+        shards = package_shards()
+
+    hits_before, misses_before = (cache.hits, cache.misses) if cache is not None else (0, 0)
+    face = {"data": None, "shards": None, "metrics": None, "baseline": None, "error": None}
+    try:
+        face["data"] = subset_face(ttf_path, FLAVORS, cache)
+        if profile != DEFAULT_PROFILE:
+            face["baseline"] = len(face["data"]["woff2"])
+            face["data"]["woff2"] = subset_face(ttf_path, ("woff2",), cache, profile=profile)["woff2"]
+        if metrics:
+            face["shards"], face["metrics"] = subset_face_shards_with_metrics(
+                ttf_path, shard_codepoints(shards), "woff2", cache, profile
+            )
+        else:
+            face["shards"] = subset_face_shards(
+                ttf_path, shard_codepoints(shards), "woff2", cache, profile=profile
+            )
+    except Exception as e:
+        face["error"] = str(e)
+    face["cache_hits"] = cache.hits - hits_before if cache is not None else 0
+    face["cache_misses"] = cache.misses - misses_before if cache is not None else 0
+    return face
+
+
+def build_faces(jobs, cache=None, shards=None, metrics=True, profile=DEFAULT_PROFILE):
+    """Subset every unique source file in FONT_FAMILIES.
+
+    Returns {ttf_filename: build_face() result}.
+    """
+    filenames = sorted({
+        ttf_filename
+        for family_def in FONT_FAMILIES.values()
+        for ttf_filename in family_def["variants"].values()
+    })
+
+    if jobs <= 1:
+        return {filename: build_face(filename, cache, shards, metrics, profile) for filename in filenames}
+
+    print(f"Subsetting {len(filenames)} faces with {jobs} workers...")
+    tasks = [(filename, cache, shards, metrics, profile) for filename in filenames]
+    results = map_ordered(build_face, tasks, jobs)
+
+    # Workers count hits on their own copy of the cache; fold them back in.
+    if cache is not None:
+        for result in results:
+            if result is not None:
+                cache.hits += result["cache_hits"]
+                cache.misses += result["cache_misses"]
+    return dict(zip(filenames, results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build all font bundles and the companion package in one pass.")
+    add_jobs_argument(parser, "number of worker processes for subsetting and precompression")
+    add_format_argument(parser)
+    add_package_arguments(parser)
+    add_profile_arguments(parser)
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+    resolve_jobs(parser, args)
+    profile = profile_from_args(parser, args)
+
+    if not FONTS_DIR.exists():
+        print(f"ERROR: fonts/ directory not found at {FONTS_DIR}")
+        print("Run 'pnpm fonts:download' first to download font sources (or 'pnpm fonts:fetch --mirror PATH' offline).")
+        sys.exit(1)
+
+    cache = cache_from_args(args)
+    shards = package_shards(sharded=not args.no_shards)
+    faces = build_faces(args.jobs, cache, shards, not args.no_metrics, profile)
+
+    clean_outputs()
+    outputs = {kind: bundle_format(kind, args.format) for kind in BUNDLES}
+    for output in outputs.values():
+        output["output_dir"].mkdir(parents=True, exist_ok=True)
+
+    manifest_families = {}
+    modules_written = 0
+    shared = shared_faces()
+
+    for family_id, family_def in sorted(FONT_FAMILIES.items()):
+        register_as = family_def["register_as"]
+        print(f"\n{register_as} ({family_id})")
+
+        bundle_variants = {kind: {} for kind in BUNDLES}
+        variant_results = {}
+        aliases = family_aliases(family_id, shared)
+
+        for variant_name, ttf_filename in family_def["variants"].items():
+            result = new_variant_result()
+            variant_results[variant_name] = result
+            face = faces[ttf_filename]
+            if face is None:
+                result["log"].append(f"  WARN: {FONTS_DIR / ttf_filename} not found, skipping {variant_name}")
+                continue
+            result["found"] = True
+            result["cached"] = face["cache_misses"] == 0 and face["cache_hits"] > 0
+
+            if face["error"] is not None:
+                result["log"].append(f"  WARN: subsetting failed for {variant_name} ({ttf_filename}): {face['error']}")
+            else:
+                for kind in BUNDLES:
+                    bundle_variants[kind][variant_name] = aliases.get(variant_name, face["data"][kind])
+                if face["baseline"] is not None:
+                    result["log"].append(
+                        f"  Profile {variant_name}: {format_profile_savings(face['baseline'], len(face['data']['woff2']))}"
+                    )
+
+            write_variant(family_id, variant_name, ttf_filename, face["shards"], result, shards, face["metrics"])
+
+        entry = family_entry(family_id, family_def, variant_results, shards)
+        if entry is not None:
+            manifest_families[family_id] = entry
+
+        for kind, output in outputs.items():
+            output_path = output["output_dir"] / f"{family_id}{output['suffix']}"
+            changed, _ = output["write"](output_path, kind, family_def, bundle_variants[kind].items())
+            if changed:
+                modules_written += 1
+
+    for output in outputs.values():
+        write_if_changed(output["output_dir"] / "manifest.ts", output["manifest"](shared))
+    deduped_files, deduped_bytes = dedupe_package_files(manifest_families, PACKAGE_DIR)
+    annotate_package_files(manifest_families, args.hashed_filenames)
+    manifest_path = write_manifest(manifest_families, package_fallback_table(manifest_families, cache, args.jobs))
+    if not args.no_metrics:
+        metrics_faces, metrics_changed = write_package_metrics_bundle(manifest_families)
+    if args.precompress:
+        sidecars = precompress_files(package_files(manifest_families, PACKAGE_DIR, manifest_path), args.jobs)
+
+    print(f"\n=== Font build complete ===")
+    print(f"  Faces: {sum(1 for face in faces.values() if face is not None)} (one parse each)")
+    print(f"  Families: {len(manifest_families)}")
+    print(f"  Shared faces: {len(shared)} aliased in the bundles, {deduped_files} package files "
+          f"({deduped_bytes / 1024:.1f} KB saved)")
+    print(f"  {'Font packs' if args.format == 'pack' else 'TS modules'} written: {modules_written}")
+    if profile != DEFAULT_PROFILE:
+        built = [face for face in faces.values() if face is not None and face["baseline"] is not None]
+        baseline = sum(face["baseline"] for face in built)
+        size = sum(len(face["data"]["woff2"]) for face in built)
+        print(f"  Profile: {describe_profile(profile)}, core WOFF2 {format_profile_savings(baseline, size)} vs default")
+    for kind, bundle in BUNDLES.items():
+        print(f"  {bundle['label']} bundles: {outputs[kind]['output_dir']}")
+    print(f"  Package: {PACKAGE_DIR} ({manifest_path.name})")
+    if args.precompress:
+        print(f"  Precompressed: {format_savings(sidecars)}")
+    if not args.no_metrics:
+        if metrics_changed is None:
+            print(f"  Metrics: {metrics_faces}/{expected_faces()} faces; metrics-bundle.ts not updated")
+        else:
+            print(f"  Metrics: {metrics_faces} faces → metrics-bundle.ts{'' if metrics_changed else ' (unchanged)'}")
+    report_cache(cache)
+
+
+if __name__ == "__main__":
+    main()
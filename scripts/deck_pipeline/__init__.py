@@ -0,0 +1,20 @@
+"""
+Shared helpers for the Python PPTX generator scripts.
+
+The generators (generate-*-stress-test.py, generate-synthetic-deck.py,
+build-deck-corpus.py) have hyphenated names and can't import each other,
+so code they share lives in this package, as font_pipeline/ does for the
+font scripts.
+
+- shapes.py — DrawingML helpers: labels, fills, gradients, connectors, effects, table cells
+- fonts.py — the bundled font families, by category
+- synthetic.py — seeded N slides × M shapes workload plans, built with shapes.py
+- writer.py — streaming PPTX writer: slide plans rendered straight to XML, one slide at a time
+- save.py — byte-deterministic saving (--deterministic)
+- corpus.py — seeded corpora of feature-focused synthetic decks and their index
+"""
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+TEST_DATA_DIR = ROOT / "test-data"
@@ -0,0 +1,127 @@
+"""
+Seeded regression corpora: thousands of synthetic decks plus an index.
+
+``plan_corpus()`` draws one spec per deck from a single RNG seeded with the
+corpus seed: the feature the deck focuses on (FEATURES), its size (from a
+PROFILES entry) and a deck seed for synthetic.py. Features mirror the
+hand-laid stress decks:
+
+- connector, effect, gradient, table, text: that shape kind dominates the
+  mix, with a few plain shapes and labels around it
+- font: text boxes only, in every bundled text family (fonts.py) instead
+  of the eight Office names synthetic decks normally use
+- mixed: synthetic.py's DEFAULT_MIX
+
+``write_corpus_deck()`` plans and writes one deck with ``DeckWriter``, whose
+output doesn't depend on when or where it runs, and returns its index
+entry. The same count, seed and profile therefore regenerate the same
+files and index byte for byte (given the same zlib), so perf baselines
+measured on a corpus stay comparable across rebuilds.
+"""
+
+import hashlib
+import random
+
+from .fonts import TEXT_FAMILIES
+from .synthetic import DEFAULT_MIX, FONTS, SHAPE_KINDS, SYNTHETIC_VERSION, plan_slide, workload
+from .writer import DeckWriter
+
+CORPUS_VERSION = 1
+
+FEATURES = {
+    "connector": {"connector": 6, "rect": 1, "text": 1},
+    "effect": {"effect": 6, "rect": 1, "text": 1},
+    "gradient": {"gradient": 6, "rect": 1, "text": 1},
+    "table": {"table": 3, "text": 1},
+    "text": {"text": 6, "rect": 1},
+    "font": {"text": 1},
+    "mixed": DEFAULT_MIX,
+}
+
+# Inclusive (low, high) ranges of slides per deck and shapes per slide.
+PROFILES = {
+    "small": {"slides": (1, 5), "shapes": (5, 20)},
+    "medium": {"slides": (5, 30), "shapes": (20, 60)},
+    "large": {"slides": (30, 200), "shapes": (50, 150)},
+}
+# "mixed" draws a profile per deck with these weights.
+MIXED_PROFILE = {"small": 6, "medium": 3, "large": 1}
+PROFILE_CHOICES = (*PROFILES, "mixed")
+
+
+def plan_corpus(count, seed=0, profile="mixed"):
+    """One spec per deck: ``{"name", "seed", "feature", "profile", "slides", "shapes"}``.
+
+    Specs are drawn in deck order, so a larger corpus with the same seed
+    and profile starts with the decks of a smaller one.
+    """
+    rng = random.Random(f"corpus:{seed}")
+    features = list(FEATURES)
+    specs = []
+    for index in range(count):
+        # Features rotate so every one is covered even in a small corpus.
+        feature = features[index % len(features)]
+        size = profile
+        if profile == "mixed":
+            size = rng.choices(list(MIXED_PROFILE), list(MIXED_PROFILE.values()))[0]
+        slides, shapes = PROFILES[size]["slides"], PROFILES[size]["shapes"]
+        specs.append({
+            "name": f"deck-{index:05d}-{feature}.pptx",
+            "seed": rng.getrandbits(32),
+            "feature": feature,
+            "profile": size,
+            "slides": rng.randint(*slides),
+            "shapes": rng.randint(*shapes),
+        })
+    return specs
+
+
+def write_corpus_deck(spec, out_dir):
+    """Write the deck ``spec`` describes into ``out_dir``; returns its index entry."""
+    mix = FEATURES[spec["feature"]]
+    fonts = TEXT_FAMILIES if spec["feature"] == "font" else FONTS
+    path = out_dir / spec["name"]
+    families = set()
+    with DeckWriter(path) as deck:
+        def planned():
+            for index in range(spec["slides"]):
+                plan = plan_slide(spec["seed"], index, spec["shapes"], mix, fonts)
+                deck.add_slide(plan)
+                families.update(shape["font"] for shape in plan if shape["kind"] == "text")
+                yield plan
+
+        summary = workload(planned(), spec["seed"], mix)
+    data = path.read_bytes()
+    return {
+        "path": spec["name"],
+        "seed": spec["seed"],
+        "feature": spec["feature"],
+        "profile": spec["profile"],
+        "features": [kind for kind in SHAPE_KINDS if summary["totals"][kind]],
+        "slides": spec["slides"],
+        "shapes": summary["totals"],
+        "text_characters": summary["text"]["characters"],
+        "table_cells": summary["tables"]["cells"],
+        "font_families": len(families),
+        "bytes": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+
+
+def corpus_index(entries, count, seed, profile):
+    """JSON-ready index of a corpus, for ``index.json`` next to the decks."""
+    return {
+        "generator": "build-deck-corpus.py",
+        "version": CORPUS_VERSION,
+        "synthetic_version": SYNTHETIC_VERSION,
+        "seed": seed,
+        "profile": profile,
+        "count": count,
+        "totals": {
+            "slides": sum(entry["slides"] for entry in entries),
+            "shapes": sum(entry["shapes"]["shapes"] for entry in entries),
+            "bytes": sum(entry["bytes"] for entry in entries),
+            "features": {feature: sum(1 for entry in entries if entry["feature"] == feature) for feature in FEATURES},
+        },
+        "decks": entries,
+    }
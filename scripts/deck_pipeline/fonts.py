@@ -0,0 +1,69 @@
+"""
+The bundled font families, as the PPTX generators name them.
+
+Office names map to their metric-compatible substitutes; the rest are the
+Google Fonts shipped in packages/fonts. Each entry is ``(family, note)``.
+"""
+
+# All 42 bundled font families grouped by category
+OFFICE_SUBSTITUTES = [
+    ("Calibri", "Carlito substitute"),
+    ("Calibri Light", "Carlito Light substitute"),
+    ("Cambria", "Caladea substitute"),
+    ("Arial", "Liberation Sans substitute"),
+    ("Arial Narrow", "Liberation Sans Narrow substitute"),
+    ("Times New Roman", "Liberation Serif substitute"),
+    ("Courier New", "Liberation Mono substitute"),
+    ("Segoe UI", "Selawik substitute"),
+    ("Segoe UI Light", "Selawik Light substitute"),
+    ("Segoe UI Semibold", "Selawik Semibold substitute"),
+    ("Segoe UI Semilight", "Selawik Semilight substitute"),
+    ("Georgia", "Gelasio substitute"),
+    ("Palatino Linotype", "TeX Gyre Pagella substitute"),
+    ("Bookman Old Style", "TeX Gyre Bonum substitute"),
+    ("Century Schoolbook", "TeX Gyre Schola substitute"),
+]
+
+GOOGLE_FONTS_SANS = [
+    ("Arimo", "sans-serif"),
+    ("Barlow", "sans-serif"),
+    ("Barlow Light", "sans-serif, light weight"),
+    ("Comfortaa", "rounded sans-serif"),
+    ("Lato", "sans-serif"),
+    ("Lato Light", "sans-serif, light weight"),
+    ("Montserrat", "geometric sans-serif"),
+    ("Noto Sans", "sans-serif"),
+    ("Open Sans", "humanist sans-serif"),
+    ("Oswald", "narrow sans-serif"),
+    ("Poppins", "geometric sans-serif"),
+    ("Raleway", "elegant sans-serif"),
+    ("Roboto", "neo-grotesque sans-serif"),
+    ("Source Sans Pro", "sans-serif"),
+    ("Ubuntu", "humanist sans-serif"),
+    ("Play", "sans-serif"),
+]
+
+GOOGLE_FONTS_SERIF = [
+    ("Noto Serif", "serif"),
+    ("Playfair Display", "transitional serif"),
+    ("Roboto Slab", "slab serif"),
+    ("Roboto Slab Light", "slab serif, light weight"),
+    ("Roboto Slab SemiBold", "slab serif, semibold weight"),
+    ("Tinos", "transitional serif"),
+]
+
+GOOGLE_FONTS_MONO = [
+    ("Courier Prime", "monospace"),
+    ("Fira Code", "monospace"),
+    ("Roboto Mono", "monospace"),
+    ("Source Code Pro", "monospace"),
+]
+
+GOOGLE_FONTS_SYMBOL = [
+    ("Noto Sans Symbols", "symbols & arrows"),
+]
+
+# Families for body text: everything but the symbol font.
+TEXT_FAMILIES = tuple(
+    family for family, _ in OFFICE_SUBSTITUTES + GOOGLE_FONTS_SANS + GOOGLE_FONTS_SERIF + GOOGLE_FONTS_MONO
+)
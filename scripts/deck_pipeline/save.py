@@ -0,0 +1,70 @@
+"""
+Byte-deterministic PPTX output.
+
+``prs.save()`` stamps every zip entry with the current time, so
+regenerating an unchanged deck changes its bytes and busts content-hash
+caches downstream. ``save_presentation(..., deterministic=True)`` saves
+the same package with:
+
+- every zip entry dated EPOCH (1980-01-01, the earliest a zip can record)
+  and given fixed attributes, whatever the host's clock, time zone or OS
+- entries in a fixed order: ``[Content_Types].xml`` first, then by name
+- the core properties' created and modified dates set to EPOCH and the
+  revision to 1
+
+Shape ids need nothing extra: python-pptx gives each new shape the
+slide's highest id + 1, and ``add_connector()`` follows the same rule.
+
+``DeckWriter`` (writer.py) always writes its entries with ``zip_info()``
+and stable core properties.
+"""
+
+import datetime
+import io
+import zipfile
+
+EPOCH = datetime.datetime(1980, 1, 1)
+ZIP_DATE_TIME = EPOCH.timetuple()[:6]
+
+
+def zip_info(name):
+    """A deflated ``ZipInfo`` for ``name`` with a fixed timestamp and attributes."""
+    info = zipfile.ZipInfo(name, date_time=ZIP_DATE_TIME)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.create_system = 3
+    info.external_attr = 0o600 << 16
+    return info
+
+
+def stabilize_core_properties(prs):
+    """Pin the document dates and revision in ``prs``'s core properties."""
+    props = prs.core_properties
+    props.created = EPOCH
+    props.modified = EPOCH
+    props.revision = 1
+
+
+def _entry_order(name):
+    return (name != "[Content_Types].xml", name)
+
+
+def save_presentation(prs, path, deterministic=False):
+    """Save ``prs`` to ``path``; with ``deterministic``, the same deck always gives the same bytes."""
+    if not deterministic:
+        prs.save(str(path))
+        return
+    stabilize_core_properties(prs)
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    with zipfile.ZipFile(buffer) as source, zipfile.ZipFile(path, "w") as target:
+        for name in sorted(source.namelist(), key=_entry_order):
+            target.writestr(zip_info(name), source.read(name))
+
+
+def add_deterministic_argument(parser):
+    """Register the shared --deterministic option."""
+    parser.add_argument(
+        "--deterministic",
+        action="store_true",
+        help="fixed zip timestamps, entry order and document dates, so unchanged decks keep their hash",
+    )
@@ -0,0 +1,441 @@
+"""
+DrawingML helpers shared by the PPTX generators.
+
+The generate-*-stress-test.py scripts and the synthetic deck generator
+(synthetic.py) build slides from these: text labels, solid and gradient
+fills, outlines, connectors, effects and table cell formatting. Colors are
+``RGBColor`` values or ``(r, g, b)`` tuples; sizes are inches and points
+as in python-pptx.
+"""
+
+from pptx.util import Inches, Pt, Emu
+from pptx.dml.color import RGBColor
+from pptx.oxml.ns import qn
+
+SLIDE_WIDTH = Emu(12192000)   # 13.333 inches
+SLIDE_HEIGHT = Emu(6858000)   # 7.5 inches
+
+LOREM = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit. Sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam, "
+    "quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat."
+)
+
+LOREM_SHORT = "The quick brown fox jumps over the lazy dog. Pack my box with five dozen liquor jugs."
+
+
+def add_label(slide, x, y, w, h, text, font_size=10, color=None):
+    """Add a text label to the slide."""
+    txBox = slide.shapes.add_textbox(Inches(x), Inches(y), Inches(w), Inches(h))
+    tf = txBox.text_frame
+    tf.word_wrap = True
+    p = tf.paragraphs[0]
+    run = p.add_run()
+    run.text = text
+    run.font.size = Pt(font_size)
+    run.font.name = "Calibri"
+    run.font.color.rgb = color or RGBColor(0x33, 0x33, 0x33)
+    return txBox
+
+
+def set_shape_fill(shape, color):
+    """Set solid fill on a shape."""
+    spPr = shape._element.spPr
+    for child in list(spPr):
+        tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
+        if tag in ("solidFill", "gradFill", "noFill", "pattFill", "blipFill"):
+            spPr.remove(child)
+    solidFill = spPr.makeelement(qn("a:solidFill"), {})
+    srgbClr = solidFill.makeelement(qn("a:srgbClr"), {
+        "val": "%02X%02X%02X" % (color[0], color[1], color[2])
+    })
+    solidFill.append(srgbClr)
+    spPr.append(solidFill)
+
+
+def set_shape_outline(shape, color, width_pt=1):
+    """Set outline on a shape."""
+    spPr = shape._element.spPr
+    for child in list(spPr):
+        tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
+        if tag == "ln":
+            spPr.remove(child)
+    ln = spPr.makeelement(qn("a:ln"), {"w": str(int(width_pt * 12700))})
+    solidFill = ln.makeelement(qn("a:solidFill"), {})
+    srgbClr = solidFill.makeelement(qn("a:srgbClr"), {
+        "val": "%02X%02X%02X" % (color[0], color[1], color[2])
+    })
+    solidFill.append(srgbClr)
+    ln.append(solidFill)
+    spPr.append(ln)
+
+
+def add_endpoint_dot(slide, x_inches, y_inches, color=(0x99, 0x99, 0x99)):
+    """Add a small circle to mark a connector endpoint."""
+    dot = slide.shapes.add_shape(
+        9,  # OVAL
+        Inches(x_inches) - Emu(36000),
+        Inches(y_inches) - Emu(36000),
+        Emu(72000), Emu(72000)
+    )
+    spPr = dot._element.spPr
+    for child in list(spPr):
+        tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
+        if tag in ("solidFill", "gradFill", "noFill"):
+            spPr.remove(child)
+    solidFill = spPr.makeelement(qn("a:solidFill"), {})
+    srgbClr = solidFill.makeelement(qn("a:srgbClr"), {
+        "val": "%02X%02X%02X" % (color[0], color[1], color[2])
+    })
+    solidFill.append(srgbClr)
+    spPr.append(solidFill)
+    # Remove outline
+    for child in list(spPr):
+        tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
+        if tag == "ln":
+            spPr.remove(child)
+    return dot
+
+
+def add_connector(slide, x1, y1, x2, y2, connector_type="straight",
+                  color=(0x00, 0x00, 0x00), width_pt=1.5,
+                  head_end=None, tail_end=None,
+                  dash_style=None):
+    """
+    Add a connector shape between two points.
+    connector_type: "straight", "bent", or "curved"
+    head_end/tail_end: arrow type string or None
+    dash_style: "solid", "dash", "dot", "dashDot", "lgDash", "lgDashDot" etc.
+    """
+    # Connector type mapping for cxnSp
+    type_map = {
+        "straight": "line",
+        "bent": "bentConnector3",
+        "curved": "curvedConnector3",
+    }
+    prst = type_map.get(connector_type, "line")
+
+    # Calculate position and size
+    left = min(Inches(x1), Inches(x2))
+    top = min(Inches(y1), Inches(y2))
+    width = abs(Inches(x2) - Inches(x1))
+    height = abs(Inches(y2) - Inches(y1))
+
+    # Determine if we need to flip
+    flipH = "1" if x2 < x1 else "0"
+    flipV = "1" if y2 < y1 else "0"
+
+    # Ensure minimum size
+    if width == 0:
+        width = Emu(1)
+    if height == 0:
+        height = Emu(1)
+
+    # Build cxnSp element
+    nsmap_local = {
+        "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+        "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+        "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    }
+
+    from lxml import etree
+
+    # Same id and name scheme python-pptx uses for its own shapes.
+    shape_id = slide._element.spTree.max_shape_id + 1
+
+    cxnSp = etree.SubElement(
+        slide._element.spTree,
+        qn("p:cxnSp")
+    )
+
+    # nvCxnSpPr
+    nvCxnSpPr = etree.SubElement(cxnSp, qn("p:nvCxnSpPr"))
+    cNvPr = etree.SubElement(nvCxnSpPr, qn("p:cNvPr"))
+    cNvPr.set("id", str(shape_id))
+    cNvPr.set("name", f"Connector {shape_id - 1}")
+    cNvCxnSpPr = etree.SubElement(nvCxnSpPr, qn("p:cNvCxnSpPr"))
+    nvPr = etree.SubElement(nvCxnSpPr, qn("p:nvPr"))
+
+    # spPr
+    spPr = etree.SubElement(cxnSp, qn("p:spPr"))
+
+    xfrm = etree.SubElement(spPr, qn("a:xfrm"))
+    if flipH == "1":
+        xfrm.set("flipH", "1")
+    if flipV == "1":
+        xfrm.set("flipV", "1")
+
+    off = etree.SubElement(xfrm, qn("a:off"))
+    off.set("x", str(int(left)))
+    off.set("y", str(int(top)))
+    ext = etree.SubElement(xfrm, qn("a:ext"))
+    ext.set("cx", str(int(width)))
+    ext.set("cy", str(int(height)))
+
+    prstGeom = etree.SubElement(spPr, qn("a:prstGeom"))
+    prstGeom.set("prst", prst)
+    avLst = etree.SubElement(prstGeom, qn("a:avLst"))
+
+    # Line properties
+    ln = etree.SubElement(spPr, qn("a:ln"))
+    ln.set("w", str(int(width_pt * 12700)))
+
+    solidFill = etree.SubElement(ln, qn("a:solidFill"))
+    srgbClr = etree.SubElement(solidFill, qn("a:srgbClr"))
+    srgbClr.set("val", "%02X%02X%02X" % (color[0], color[1], color[2]))
+
+    # Dash style
+    if dash_style and dash_style != "solid":
+        prstDash = etree.SubElement(ln, qn("a:prstDash"))
+        prstDash.set("val", dash_style)
+
+    # Head end (arrow at start)
+    if head_end:
+        headEnd = etree.SubElement(ln, qn("a:headEnd"))
+        headEnd.set("type", head_end)
+        headEnd.set("w", "med")
+        headEnd.set("len", "med")
+
+    # Tail end (arrow at end)
+    if tail_end:
+        tailEnd = etree.SubElement(ln, qn("a:tailEnd"))
+        tailEnd.set("type", tail_end)
+        tailEnd.set("w", "med")
+        tailEnd.set("len", "med")
+
+    return cxnSp
+
+
+def set_linear_gradient(shape, angle_deg, stops):
+    """
+    Set a linear gradient fill on a shape.
+    stops: list of (position_pct, RGBColor) tuples, position 0-100.
+    angle_deg: rotation angle in degrees.
+    """
+    spPr = shape._element.spPr
+    # Remove any existing fill
+    for child in list(spPr):
+        tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
+        if tag in ("solidFill", "gradFill", "noFill", "pattFill", "blipFill"):
+            spPr.remove(child)
+
+    # Build gradFill element
+    gradFill = spPr.makeelement(qn("a:gradFill"), {})
+    gsLst = gradFill.makeelement(qn("a:gsLst"), {})
+
+    for pos_pct, color in stops:
+        gs = gsLst.makeelement(qn("a:gs"), {"pos": str(int(pos_pct * 1000))})
+        srgbClr = gs.makeelement(qn("a:srgbClr"), {"val": "%02X%02X%02X" % (color[0], color[1], color[2])})
+        gs.append(srgbClr)
+        gsLst.append(gs)
+
+    gradFill.append(gsLst)
+
+    lin = gradFill.makeelement(qn("a:lin"), {
+        "ang": str(int(angle_deg * 60000)),
+        "scaled": "1"
+    })
+    gradFill.append(lin)
+
+    spPr.append(gradFill)
+
+
+def set_radial_gradient(shape, stops, focus_x=50, focus_y=50):
+    """
+    Set a radial (path) gradient fill on a shape.
+    stops: list of (position_pct, (r,g,b)) tuples.
+    focus_x, focus_y: center position in percent (0-100).
+    """
+    spPr = shape._element.spPr
+    for child in list(spPr):
+        tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
+        if tag in ("solidFill", "gradFill", "noFill", "pattFill", "blipFill"):
+            spPr.remove(child)
+
+    gradFill = spPr.makeelement(qn("a:gradFill"), {})
+    gsLst = gradFill.makeelement(qn("a:gsLst"), {})
+
+    for pos_pct, color in stops:
+        gs = gsLst.makeelement(qn("a:gs"), {"pos": str(int(pos_pct * 1000))})
+        srgbClr = gs.makeelement(qn("a:srgbClr"), {"val": "%02X%02X%02X" % (color[0], color[1], color[2])})
+        gs.append(srgbClr)
+        gsLst.append(gs)
+
+    gradFill.append(gsLst)
+
+    # Path gradient (radial)
+    path = gradFill.makeelement(qn("a:path"), {"path": "circle"})
+    l_pct = int(focus_x * 1000)
+    t_pct = int(focus_y * 1000)
+    r_pct = int(focus_x * 1000)
+    b_pct = int(focus_y * 1000)
+    fillToRect = path.makeelement(qn("a:fillToRect"), {
+        "l": str(l_pct), "t": str(t_pct),
+        "r": str(r_pct), "b": str(b_pct)
+    })
+    path.append(fillToRect)
+    gradFill.append(path)
+
+    spPr.append(gradFill)
+
+
+def set_gradient_line(shape, angle_deg, stops, width_pt=3):
+    """Set a gradient stroke on a shape's outline."""
+    spPr = shape._element.spPr
+    # Remove existing line
+    for child in list(spPr):
+        tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
+        if tag == "ln":
+            spPr.remove(child)
+
+    ln = spPr.makeelement(qn("a:ln"), {"w": str(int(width_pt * 12700))})
+    gradFill = ln.makeelement(qn("a:gradFill"), {})
+    gsLst = gradFill.makeelement(qn("a:gsLst"), {})
+
+    for pos_pct, color in stops:
+        gs = gsLst.makeelement(qn("a:gs"), {"pos": str(int(pos_pct * 1000))})
+        srgbClr = gs.makeelement(qn("a:srgbClr"), {"val": "%02X%02X%02X" % (color[0], color[1], color[2])})
+        gs.append(srgbClr)
+        gsLst.append(gs)
+
+    gradFill.append(gsLst)
+
+    lin = gradFill.makeelement(qn("a:lin"), {
+        "ang": str(int(angle_deg * 60000)),
+        "scaled": "1"
+    })
+    gradFill.append(lin)
+
+    ln.append(gradFill)
+    spPr.append(ln)
+
+
+def add_drop_shadow(shape, dist_pt, blur_pt, angle_deg, color, alpha_pct=50):
+    """
+    Add a drop shadow effect to a shape.
+    dist_pt: shadow distance in points
+    blur_pt: blur radius in points
+    angle_deg: direction angle in degrees
+    color: (r, g, b) tuple
+    alpha_pct: opacity 0-100
+    """
+    spPr = shape._element.spPr
+
+    # Get or create effectLst
+    effectLst = spPr.find(qn("a:effectLst"))
+    if effectLst is None:
+        effectLst = spPr.makeelement(qn("a:effectLst"), {})
+        spPr.append(effectLst)
+
+    outerShdw = effectLst.makeelement(qn("a:outerShdw"), {
+        "blurRad": str(int(blur_pt * 12700)),
+        "dist": str(int(dist_pt * 12700)),
+        "dir": str(int(angle_deg * 60000)),
+        "algn": "bl",
+        "rotWithShape": "0",
+    })
+
+    srgbClr = outerShdw.makeelement(qn("a:srgbClr"), {
+        "val": "%02X%02X%02X" % (color[0], color[1], color[2])
+    })
+    alpha = srgbClr.makeelement(qn("a:alpha"), {"val": str(int(alpha_pct * 1000))})
+    srgbClr.append(alpha)
+    outerShdw.append(srgbClr)
+    effectLst.append(outerShdw)
+
+
+def add_outer_glow(shape, blur_pt, color, alpha_pct=40):
+    """Add an outer glow effect to a shape."""
+    spPr = shape._element.spPr
+
+    effectLst = spPr.find(qn("a:effectLst"))
+    if effectLst is None:
+        effectLst = spPr.makeelement(qn("a:effectLst"), {})
+        spPr.append(effectLst)
+
+    glow = effectLst.makeelement(qn("a:glow"), {
+        "rad": str(int(blur_pt * 12700)),
+    })
+
+    srgbClr = glow.makeelement(qn("a:srgbClr"), {
+        "val": "%02X%02X%02X" % (color[0], color[1], color[2])
+    })
+    alpha = srgbClr.makeelement(qn("a:alpha"), {"val": str(int(alpha_pct * 1000))})
+    srgbClr.append(alpha)
+    glow.append(srgbClr)
+    effectLst.append(glow)
+
+
+def add_reflection(shape, blur_pt=1, start_alpha_pct=50, end_pos_pct=50, dist_pt=0, dir_deg=90, fade_dir_deg=90):
+    """Add a reflection effect to a shape."""
+    spPr = shape._element.spPr
+
+    effectLst = spPr.find(qn("a:effectLst"))
+    if effectLst is None:
+        effectLst = spPr.makeelement(qn("a:effectLst"), {})
+        spPr.append(effectLst)
+
+    reflection = effectLst.makeelement(qn("a:reflection"), {
+        "blurRad": str(int(blur_pt * 12700)),
+        "stA": str(int(start_alpha_pct * 1000)),
+        "endA": "0",
+        "endPos": str(int(end_pos_pct * 1000)),
+        "dist": str(int(dist_pt * 12700)),
+        "dir": str(int(dir_deg * 60000)),
+        "fadeDir": str(int(fade_dir_deg * 60000)),
+        "algn": "bl",
+        "rotWithShape": "0",
+    })
+    effectLst.append(reflection)
+
+
+def add_soft_edge(shape, radius_pt):
+    """Add a soft edge effect to a shape."""
+    spPr = shape._element.spPr
+
+    effectLst = spPr.find(qn("a:effectLst"))
+    if effectLst is None:
+        effectLst = spPr.makeelement(qn("a:effectLst"), {})
+        spPr.append(effectLst)
+
+    softEdge = effectLst.makeelement(qn("a:softEdge"), {
+        "rad": str(int(radius_pt * 12700)),
+    })
+    effectLst.append(softEdge)
+
+
+def set_cell_fill(cell, color):
+    """Set a solid fill on a table cell. color is an RGBColor."""
+    tcPr = cell._tc.get_or_add_tcPr()
+    # Remove existing fill
+    for child in list(tcPr):
+        tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
+        if tag in ("solidFill", "gradFill", "noFill"):
+            tcPr.remove(child)
+    solidFill = tcPr.makeelement(qn("a:solidFill"), {})
+    srgbClr = solidFill.makeelement(qn("a:srgbClr"), {
+        "val": str(color)
+    })
+    solidFill.append(srgbClr)
+    tcPr.append(solidFill)
+
+
+def set_cell_borders(cell, color=RGBColor(0x00, 0x00, 0x00), width_pt=1):
+    """Set borders on a table cell."""
+    tcPr = cell._tc.get_or_add_tcPr()
+    width_emu = int(width_pt * 12700)
+    color_str = str(color)
+
+    for border_name in ["lnL", "lnR", "lnT", "lnB"]:
+        # Remove existing
+        for child in list(tcPr):
+            tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
+            if tag == border_name:
+                tcPr.remove(child)
+
+        ln = tcPr.makeelement(qn(f"a:{border_name}"), {"w": str(width_emu)})
+        solidFill = ln.makeelement(qn("a:solidFill"), {})
+        srgbClr = solidFill.makeelement(qn("a:srgbClr"), {"val": color_str})
+        solidFill.append(srgbClr)
+        ln.append(solidFill)
+        tcPr.append(ln)
@@ -0,0 +1,346 @@
+"""
+Seeded synthetic decks of N slides × M shapes for renderer load testing.
+
+Generation is split in two:
+
+- ``plan_deck()`` draws every shape as plain data (a ``dict`` per shape,
+  positions in inches) from a seeded RNG. Each slide has its own RNG,
+  seeded from ``(seed, slide index)``, so a slide's contents don't depend on
+  how many slides come before it or on the order slides are built in.
+- ``build_deck()`` turns a plan into a python-pptx ``Presentation`` with the
+  helpers in shapes.py, the same ones the stress-test decks use.
+  ``DeckWriter`` (writer.py) writes the same slides straight into the zip
+  one at a time, for decks too large to hold in memory.
+
+Shape kinds (SHAPE_KINDS) are picked per shape from a weighted ``mix``:
+
+- text: a text box of 1-4 Lorem paragraphs in a random bundled font
+- rect: a preset autoshape with a solid fill and outline
+- gradient: a linear or radial gradient fill, 2-4 stops
+- effect: a filled shape with a drop shadow, glow, soft edge or reflection
+- connector: a straight, bent or curved connector, possibly dashed/arrowed
+- table: a 2-5 × 2-4 table with a header row, banded fills and borders
+
+Shapes are laid out on a grid sized to M, one shape per cell, so every
+shape stays visible. ``workload()`` summarizes a plan (shape, text, table
+cell and effect counts, per slide and in total) for the JSON sidecar.
+"""
+
+import math
+import random
+
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.util import Inches, Pt
+
+from .shapes import (
+    SLIDE_HEIGHT,
+    SLIDE_WIDTH,
+    add_connector,
+    add_drop_shadow,
+    add_label,
+    add_outer_glow,
+    add_reflection,
+    add_soft_edge,
+    set_cell_borders,
+    set_cell_fill,
+    set_linear_gradient,
+    set_radial_gradient,
+    set_shape_fill,
+    set_shape_outline,
+)
+
+SYNTHETIC_VERSION = 2
+
+SHAPE_KINDS = ("text", "rect", "gradient", "effect", "connector", "table")
+DEFAULT_MIX = {"text": 4, "rect": 3, "gradient": 2, "effect": 2, "connector": 2, "table": 1}
+
+# Fonts drawn for text shapes: Office names the renderer maps to bundled faces.
+FONTS = ("Calibri", "Arial", "Times New Roman", "Cambria", "Georgia", "Courier New", "Verdana", "Segoe UI")
+GEOMETRIES = ("RECTANGLE", "ROUNDED_RECTANGLE", "OVAL", "ISOSCELES_TRIANGLE", "DIAMOND", "HEXAGON", "CHEVRON")
+EFFECTS = ("shadow", "glow", "soft_edge", "reflection")
+CONNECTOR_TYPES = ("straight", "bent", "curved")
+DASHES = ("solid", "solid", "dash", "dot", "dashDot", "lgDash")
+ARROWS = (None, None, "triangle", "stealth", "arrow", "oval")
+
+# Drawing area in inches: the 13.333 × 7.5 slide less a margin.
+MARGIN = 0.3
+AREA_WIDTH = 13.333 - 2 * MARGIN
+AREA_HEIGHT = 7.5 - 2 * MARGIN
+
+WORDS = (
+    "Lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut "
+    "labore et dolore magna aliqua Ut enim ad minim veniam quis nostrud exercitation ullamco "
+    "laboris nisi ut aliquip ex ea commodo consequat"
+).split()
+
+
+def parse_mix(text):
+    """``"text=4,table=1"`` → ``{"text": 4, "table": 1}``; raises ValueError on bad input."""
+    mix = {}
+    for item in text.split(","):
+        name, sep, weight = item.partition("=")
+        name = name.strip()
+        if name not in SHAPE_KINDS:
+            raise ValueError(f"unknown shape kind {name!r} (expected one of {', '.join(SHAPE_KINDS)})")
+        if not sep or not weight.strip().isdigit():
+            raise ValueError(f"{item!r}: expected KIND=WEIGHT with a non-negative integer weight")
+        mix[name] = int(weight)
+    if not any(mix.values()):
+        raise ValueError("at least one shape kind needs a positive weight")
+    return mix
+
+
+def grid(shapes):
+    """``(columns, rows)`` of a grid with at least ``shapes`` cells, roughly matching the slide aspect."""
+    columns = max(1, round(math.sqrt(shapes * AREA_WIDTH / AREA_HEIGHT)))
+    return columns, math.ceil(shapes / columns)
+
+
+def _color(rng):
+    return [rng.randrange(256) for _ in range(3)]
+
+
+def _round(value):
+    return round(value, 3)
+
+
+def _sentence(rng, low, high):
+    start = rng.randrange(len(WORDS))
+    count = rng.randint(low, high)
+    return " ".join(WORDS[(start + i) % len(WORDS)] for i in range(count))
+
+
+def _plan_shape(rng, kind, x, y, w, h, fonts):
+    shape = {"kind": kind, "x": _round(x), "y": _round(y), "w": _round(w), "h": _round(h)}
+    if kind == "text":
+        shape.update(
+            font=rng.choice(fonts),
+            size=rng.choice((8, 10, 11, 12, 14, 18, 24)),
+            bold=rng.random() < 0.25,
+            italic=rng.random() < 0.15,
+            color=_color(rng),
+            paragraphs=[_sentence(rng, 3, 24) for _ in range(rng.randint(1, 4))],
+        )
+    elif kind == "rect":
+        shape.update(
+            geometry=rng.choice(GEOMETRIES),
+            fill=_color(rng),
+            outline=_color(rng),
+            outline_pt=rng.choice((0.5, 1, 2, 3)),
+        )
+    elif kind == "gradient":
+        stops = sorted(rng.sample(range(0, 101, 5), rng.randint(2, 4)))
+        shape.update(
+            geometry=rng.choice(GEOMETRIES),
+            style=rng.choice(("linear", "radial")),
+            angle=rng.randrange(0, 360, 15),
+            stops=[[position, _color(rng)] for position in stops],
+        )
+    elif kind == "effect":
+        effect = rng.choice(EFFECTS)
+        shape.update(geometry=rng.choice(GEOMETRIES), fill=_color(rng), effect=effect, effect_color=_color(rng))
+        if effect == "shadow":
+            shape.update(
+                dist=rng.choice((2, 4, 6, 8)), blur=rng.choice((2, 4, 8, 12)), angle=rng.randrange(0, 360, 45),
+            )
+        elif effect == "glow":
+            shape.update(blur=rng.choice((4, 8, 12, 18)))
+        elif effect == "soft_edge":
+            shape.update(radius=rng.choice((2, 4, 8)))
+    elif kind == "connector":
+        shape.update(
+            flip=rng.random() < 0.5,
+            type=rng.choice(CONNECTOR_TYPES),
+            color=_color(rng),
+            width_pt=rng.choice((0.75, 1, 1.5, 2, 3)),
+            dash=rng.choice(DASHES),
+            head=rng.choice(ARROWS),
+            tail=rng.choice(ARROWS),
+        )
+    elif kind == "table":
+        rows, columns = rng.randint(2, 5), rng.randint(2, 4)
+        shape.update(
+            rows=rows,
+            columns=columns,
+            header=_color(rng),
+            bands=[_color(rng), _color(rng)],
+            border=_color(rng),
+            cells=[[_sentence(rng, 1, 2) if r == 0 else str(rng.randrange(10000)) for _ in range(columns)]
+                   for r in range(rows)],
+        )
+    return shape
+
+
+def plan_slide(seed, index, shapes, mix=DEFAULT_MIX, fonts=FONTS):
+    """Shape specs for slide ``index`` (0-based) of a deck seeded with ``seed``.
+
+    Text shapes draw their font from ``fonts``.
+    """
+    rng = random.Random(f"{seed}:{index}")
+    kinds = [kind for kind in SHAPE_KINDS if mix.get(kind)]
+    weights = [mix[kind] for kind in kinds]
+    columns, rows = grid(shapes)
+    cell_w, cell_h = AREA_WIDTH / columns, AREA_HEIGHT / rows
+    plan = []
+    for i, kind in enumerate(rng.choices(kinds, weights, k=shapes)):
+        w = cell_w * rng.uniform(0.6, 0.92)
+        h = cell_h * rng.uniform(0.6, 0.92)
+        x = MARGIN + (i % columns) * cell_w + rng.uniform(0, cell_w - w)
+        y = MARGIN + (i // columns) * cell_h + rng.uniform(0, cell_h - h)
+        plan.append(_plan_shape(rng, kind, x, y, w, h, fonts))
+    return plan
+
+
+def plan_deck(slides, shapes, seed=0, mix=DEFAULT_MIX, fonts=FONTS):
+    """Shape specs for every slide: ``[[shape, ...], ...]``."""
+    return [plan_slide(seed, index, shapes, mix, fonts) for index in range(slides)]
+
+
+def _add_autoshape(slide, spec):
+    return slide.shapes.add_shape(
+        getattr(MSO_SHAPE, spec["geometry"]),
+        Inches(spec["x"]), Inches(spec["y"]), Inches(spec["w"]), Inches(spec["h"]),
+    )
+
+
+def _add_text(slide, spec):
+    color = RGBColor(*spec["color"])
+    box = add_label(
+        slide, spec["x"], spec["y"], spec["w"], spec["h"], spec["paragraphs"][0], spec["size"], color
+    )
+    text_frame = box.text_frame
+    for i, text in enumerate(spec["paragraphs"]):
+        paragraph = text_frame.paragraphs[0] if i == 0 else text_frame.add_paragraph()
+        run = paragraph.runs[0] if i == 0 else paragraph.add_run()
+        if i > 0:
+            run.text = text
+            run.font.size = Pt(spec["size"])
+            run.font.color.rgb = color
+        run.font.name = spec["font"]
+        run.font.bold = spec["bold"]
+        run.font.italic = spec["italic"]
+
+
+def _add_table(slide, spec):
+    frame = slide.shapes.add_table(
+        spec["rows"], spec["columns"],
+        Inches(spec["x"]), Inches(spec["y"]), Inches(spec["w"]), Inches(spec["h"]),
+    )
+    border = RGBColor(*spec["border"])
+    for r, row in enumerate(spec["cells"]):
+        fill = RGBColor(*(spec["header"] if r == 0 else spec["bands"][r % 2]))
+        for c, text in enumerate(row):
+            cell = frame.table.cell(r, c)
+            cell.text = text
+            for paragraph in cell.text_frame.paragraphs:
+                for run in paragraph.runs:
+                    run.font.size = Pt(9)
+                    run.font.bold = r == 0
+            set_cell_fill(cell, fill)
+            set_cell_borders(cell, border, 0.75)
+
+
+def add_shape(slide, spec):
+    """Add one planned shape to ``slide``."""
+    kind = spec["kind"]
+    if kind == "text":
+        _add_text(slide, spec)
+    elif kind == "table":
+        _add_table(slide, spec)
+    elif kind == "connector":
+        # A flipped connector runs from the top-right to the bottom-left corner.
+        x1, x2 = spec["x"], spec["x"] + spec["w"]
+        if spec["flip"]:
+            x1, x2 = x2, x1
+        add_connector(
+            slide, x1, spec["y"], x2, spec["y"] + spec["h"], spec["type"],
+            tuple(spec["color"]), spec["width_pt"], spec["head"], spec["tail"], spec["dash"],
+        )
+    else:
+        shape = _add_autoshape(slide, spec)
+        if kind == "rect":
+            set_shape_fill(shape, spec["fill"])
+            set_shape_outline(shape, spec["outline"], spec["outline_pt"])
+        elif kind == "gradient":
+            stops = [(position, RGBColor(*color)) for position, color in spec["stops"]]
+            if spec["style"] == "linear":
+                set_linear_gradient(shape, spec["angle"], stops)
+            else:
+                set_radial_gradient(shape, stops)
+        elif kind == "effect":
+            set_shape_fill(shape, spec["fill"])
+            color = spec["effect_color"]
+            if spec["effect"] == "shadow":
+                add_drop_shadow(shape, spec["dist"], spec["blur"], spec["angle"], color)
+            elif spec["effect"] == "glow":
+                add_outer_glow(shape, spec["blur"], color)
+            elif spec["effect"] == "soft_edge":
+                add_soft_edge(shape, spec["radius"])
+            else:
+                add_reflection(shape)
+
+
+def new_presentation():
+    """An empty widescreen ``Presentation``, as the stress-test decks use."""
+    prs = Presentation()
+    prs.slide_width = SLIDE_WIDTH
+    prs.slide_height = SLIDE_HEIGHT
+    return prs
+
+
+def build_slide(prs, plan):
+    """Append one blank slide holding the shapes of ``plan``."""
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    for spec in plan:
+        add_shape(slide, spec)
+    return slide
+
+
+def build_deck(plan):
+    """A ``Presentation`` with one slide per entry of ``plan_deck()`` output."""
+    prs = new_presentation()
+    for slide_plan in plan:
+        build_slide(prs, slide_plan)
+    return prs
+
+
+def workload(plan, seed, mix):
+    """JSON-ready description of a deck plan, for the sidecar next to the .pptx.
+
+    ``plan`` is read once, so it can be a generator of slide plans that are
+    written as they are drawn (see writer.py).
+    """
+    per_slide = []
+    shapes_per_slide = paragraphs = characters = cells = 0
+    effects = dict.fromkeys(EFFECTS, 0)
+    for slide in plan:
+        if not per_slide:
+            shapes_per_slide = len(slide)
+        per_slide.append([sum(1 for spec in slide if spec["kind"] == kind) for kind in SHAPE_KINDS])
+        for spec in slide:
+            if spec["kind"] == "text":
+                paragraphs += len(spec["paragraphs"])
+                characters += sum(len(text) for text in spec["paragraphs"])
+            elif spec["kind"] == "table":
+                cells += spec["rows"] * spec["columns"]
+            elif spec["kind"] == "effect":
+                effects[spec["effect"]] += 1
+    return {
+        "generator": "generate-synthetic-deck.py",
+        "version": SYNTHETIC_VERSION,
+        "seed": seed,
+        "slides": len(per_slide),
+        "shapes_per_slide": shapes_per_slide,
+        "mix": {kind: mix.get(kind, 0) for kind in SHAPE_KINDS},
+        "totals": {
+            "shapes": sum(map(sum, per_slide)),
+            **{kind: sum(counts[i] for counts in per_slide) for i, kind in enumerate(SHAPE_KINDS)},
+        },
+        "text": {"paragraphs": paragraphs, "characters": characters},
+        "tables": {"cells": cells},
+        "effects": effects,
+        "kinds": list(SHAPE_KINDS),
+        "per_slide": per_slide,
+    }
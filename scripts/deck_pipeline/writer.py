@@ -0,0 +1,383 @@
+"""
+Streaming PPTX writer for synthetic decks.
+
+``build_deck()`` goes through python-pptx: every shape is an lxml tree
+patched by the shapes.py helpers, and the whole ``Presentation`` stays in
+memory until it is saved, so a 1,000-slide deck is slow and large.
+``DeckWriter`` instead renders each slide's XML as a string straight from
+its plan (the shape ``dict``s of synthetic.py) and writes it into the zip
+as soon as the slide is added. Memory stays at one slide regardless of
+deck size and time grows linearly with the number of shapes.
+
+The slide XML matches what ``build_slide()`` makes of the same plan,
+element for element: the same shape ids and names (the slide's highest id
++ 1), attribute values and child order as the helpers append them. Only
+attribute order, zip entry order and compression can differ. Master,
+layouts, theme and document properties are copied from an empty
+``new_presentation()``, so both paths share one template;
+``ppt/presentation.xml``, its relationships and ``[Content_Types].xml`` are
+written last, once the slide count is known.
+Entries are written in a fixed order with fixed timestamps and stable
+core properties (save.py), so the same slides always give the same file,
+byte for byte.
+
+``render_deck()`` plans and renders the slides of a seeded deck on a
+process pool for ``DeckWriter.add_slide_xml()``. A slide's XML depends only
+on its plan: shape ids are scoped to the slide, and the slide's one
+relationship (rId1, its layout) is fixed. Package-level ids (the
+presentation's slide rIds and ``sldId``s) are assigned by the writer in
+slide order. The result is the same part for part for any number of jobs.
+Zip compression stays in the writing process, so it bounds the speedup
+(about a third of the serial time).
+"""
+
+import io
+import posixpath
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape
+
+from lxml import etree
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.oxml.ns import qn
+from pptx.shapes.autoshape import AutoShapeType
+from pptx.util import Inches
+
+from .save import stabilize_core_properties, zip_info
+from .synthetic import DEFAULT_MIX, new_presentation, plan_slide
+
+XML_HEADER = "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n"
+
+NS_A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+NS_P = "http://schemas.openxmlformats.org/presentationml/2006/main"
+NS_R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+NS_TYPES = "http://schemas.openxmlformats.org/package/2006/content-types"
+RT_SLIDE = NS_R + "/slide"
+RT_SLIDE_LAYOUT = NS_R + "/slideLayout"
+URI_TABLE = "http://schemas.openxmlformats.org/drawingml/2006/table"
+CT_SLIDE = "application/vnd.openxmlformats-officedocument.presentationml.slide+xml"
+
+SLIDE_OPEN = (
+    f'{XML_HEADER}<p:sld xmlns:a="{NS_A}" xmlns:p="{NS_P}" xmlns:r="{NS_R}"><p:cSld><p:spTree>'
+    '<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr><p:grpSpPr/>'
+)
+SLIDE_CLOSE = "</p:spTree></p:cSld><p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sld>"
+
+# Written by python-pptx's add_shape() after spPr, before the text body.
+AUTOSHAPE_STYLE = (
+    '<p:style><a:lnRef idx="1"><a:schemeClr val="accent1"/></a:lnRef>'
+    '<a:fillRef idx="3"><a:schemeClr val="accent1"/></a:fillRef>'
+    '<a:effectRef idx="2"><a:schemeClr val="accent1"/></a:effectRef>'
+    '<a:fontRef idx="minor"><a:schemeClr val="lt1"/></a:fontRef></p:style>'
+    '<p:txBody><a:bodyPr rtlCol="0" anchor="ctr"/><a:lstStyle/><a:p><a:pPr algn="ctr"/></a:p></p:txBody>'
+)
+TABLE_STYLE_ID = "{5C22544A-7EE6-4342-B048-85BDC9FD1C3A}"
+# Slides per render_deck() task, and tasks in flight per worker.
+BATCH_SLIDES = 8
+BATCHES_PER_JOB = 2
+
+CONNECTOR_PRESETS = {"straight": "line", "bent": "bentConnector3", "curved": "curvedConnector3"}
+
+# add_reflection() with its defaults.
+REFLECTION = (
+    '<a:reflection blurRad="12700" stA="50000" endA="0" endPos="50000" dist="0" '
+    'dir="5400000" fadeDir="5400000" algn="bl" rotWithShape="0"/>'
+)
+
+
+def _attr(value):
+    return escape(str(value), {'"': "&quot;"})
+
+
+def _rgb(color):
+    return "%02X%02X%02X" % (color[0], color[1], color[2])
+
+
+def _solid(color):
+    return f'<a:solidFill><a:srgbClr val="{_rgb(color)}"/></a:solidFill>'
+
+
+def _xfrm(spec, tag="a:xfrm"):
+    return (
+        f'<{tag}><a:off x="{Inches(spec["x"])}" y="{Inches(spec["y"])}"/>'
+        f'<a:ext cx="{Inches(spec["w"])}" cy="{Inches(spec["h"])}"/></{tag}>'
+    )
+
+
+def _gradient(spec):
+    stops = "".join(
+        f'<a:gs pos="{int(position * 1000)}"><a:srgbClr val="{_rgb(color)}"/></a:gs>'
+        for position, color in spec["stops"]
+    )
+    if spec["style"] == "linear":
+        shade = f'<a:lin ang="{int(spec["angle"] * 60000)}" scaled="1"/>'
+    else:
+        shade = '<a:path path="circle"><a:fillToRect l="50000" t="50000" r="50000" b="50000"/></a:path>'
+    return f"<a:gradFill><a:gsLst>{stops}</a:gsLst>{shade}</a:gradFill>"
+
+
+def _effect(spec):
+    color = _rgb(spec["effect_color"])
+    effect = spec["effect"]
+    if effect == "shadow":
+        body = (
+            f'<a:outerShdw blurRad="{int(spec["blur"] * 12700)}" dist="{int(spec["dist"] * 12700)}" '
+            f'dir="{int(spec["angle"] * 60000)}" algn="bl" rotWithShape="0">'
+            f'<a:srgbClr val="{color}"><a:alpha val="50000"/></a:srgbClr></a:outerShdw>'
+        )
+    elif effect == "glow":
+        body = (
+            f'<a:glow rad="{int(spec["blur"] * 12700)}">'
+            f'<a:srgbClr val="{color}"><a:alpha val="40000"/></a:srgbClr></a:glow>'
+        )
+    elif effect == "soft_edge":
+        body = f'<a:softEdge rad="{int(spec["radius"] * 12700)}"/>'
+    else:
+        body = REFLECTION
+    return f"<a:effectLst>{body}</a:effectLst>"
+
+
+def _autoshape(spec, shape_id):
+    shape_type = AutoShapeType(getattr(MSO_SHAPE, spec["geometry"]))
+    kind = spec["kind"]
+    if kind == "rect":
+        fill = _solid(spec["fill"]) + f'<a:ln w="{int(spec["outline_pt"] * 12700)}">{_solid(spec["outline"])}</a:ln>'
+    elif kind == "gradient":
+        fill = _gradient(spec)
+    else:
+        fill = _solid(spec["fill"]) + _effect(spec)
+    return (
+        f'<p:sp><p:nvSpPr><p:cNvPr id="{shape_id}" name="{_attr(shape_type.basename)} {shape_id - 1}"/>'
+        f"<p:cNvSpPr/><p:nvPr/></p:nvSpPr><p:spPr>{_xfrm(spec)}"
+        f'<a:prstGeom prst="{shape_type.prst}"><a:avLst/></a:prstGeom>{fill}</p:spPr>'
+        f"{AUTOSHAPE_STYLE}</p:sp>"
+    )
+
+
+def _text(spec, shape_id):
+    flags = f'b="{int(spec["bold"])}" i="{int(spec["italic"])}"'
+    run_props = (
+        f'<a:rPr sz="{spec["size"] * 100}" {flags}>{_solid(spec["color"])}'
+        f'<a:latin typeface="{_attr(spec["font"])}"/></a:rPr>'
+    )
+    paragraphs = "".join(f"<a:p><a:r>{run_props}<a:t>{escape(text)}</a:t></a:r></a:p>" for text in spec["paragraphs"])
+    return (
+        f'<p:sp><p:nvSpPr><p:cNvPr id="{shape_id}" name="TextBox {shape_id - 1}"/>'
+        f'<p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr><p:spPr>{_xfrm(spec)}'
+        '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom><a:noFill/></p:spPr>'
+        f'<p:txBody><a:bodyPr wrap="square"><a:spAutoFit/></a:bodyPr><a:lstStyle/>{paragraphs}</p:txBody></p:sp>'
+    )
+
+
+def _split(total, count):
+    """python-pptx's table grid: equal parts, the last one absorbing the remainder."""
+    part = total // count
+    return [part] * (count - 1) + [total - (count - 1) * part]
+
+
+def _table(spec, shape_id):
+    rows, columns = spec["rows"], spec["columns"]
+    border = _solid(spec["border"])
+    borders = "".join(f'<a:{side} w="9525">{border}</a:{side}>' for side in ("lnL", "lnR", "lnT", "lnB"))
+    grid = "".join(f'<a:gridCol w="{width}"/>' for width in _split(Inches(spec["w"]), columns))
+    body = []
+    for r, (height, row) in enumerate(zip(_split(Inches(spec["h"]), rows), spec["cells"])):
+        fill = _solid(spec["header"] if r == 0 else spec["bands"][r % 2])
+        body.append(f'<a:tr h="{height}">')
+        for text in row:
+            run = f'<a:r><a:rPr sz="900" b="{int(r == 0)}"/><a:t>{escape(text)}</a:t></a:r>' if text else ""
+            body.append(
+                f"<a:tc><a:txBody><a:bodyPr/><a:lstStyle/><a:p>{run}</a:p></a:txBody>"
+                f"<a:tcPr>{fill}{borders}</a:tcPr></a:tc>"
+            )
+        body.append("</a:tr>")
+    return (
+        f'<p:graphicFrame><p:nvGraphicFramePr><p:cNvPr id="{shape_id}" name="Table {shape_id - 1}"/>'
+        '<p:cNvGraphicFramePr><a:graphicFrameLocks noGrp="1"/></p:cNvGraphicFramePr><p:nvPr/></p:nvGraphicFramePr>'
+        f'{_xfrm(spec, "p:xfrm")}<a:graphic><a:graphicData uri="{URI_TABLE}">'
+        f'<a:tbl><a:tblPr firstRow="1" bandRow="1"><a:tableStyleId>{TABLE_STYLE_ID}</a:tableStyleId></a:tblPr>'
+        f'<a:tblGrid>{grid}</a:tblGrid>{"".join(body)}</a:tbl></a:graphicData></a:graphic></p:graphicFrame>'
+    )
+
+
+def _connector(spec, shape_id):
+    # Mirrors add_connector(): endpoints are converted to EMU one at a time.
+    x1, x2 = spec["x"], spec["x"] + spec["w"]
+    if spec["flip"]:
+        x1, x2 = x2, x1
+    y1, y2 = spec["y"], spec["y"] + spec["h"]
+    left, top = min(Inches(x1), Inches(x2)), min(Inches(y1), Inches(y2))
+    width = abs(Inches(x2) - Inches(x1)) or 1
+    height = abs(Inches(y2) - Inches(y1)) or 1
+    flips = (' flipH="1"' if x2 < x1 else "") + (' flipV="1"' if y2 < y1 else "")
+    line = _solid(spec["color"])
+    if spec["dash"] and spec["dash"] != "solid":
+        line += f'<a:prstDash val="{spec["dash"]}"/>'
+    if spec["head"]:
+        line += f'<a:headEnd type="{spec["head"]}" w="med" len="med"/>'
+    if spec["tail"]:
+        line += f'<a:tailEnd type="{spec["tail"]}" w="med" len="med"/>'
+    return (
+        f'<p:cxnSp><p:nvCxnSpPr><p:cNvPr id="{shape_id}" name="Connector {shape_id - 1}"/><p:cNvCxnSpPr/><p:nvPr/>'
+        f'</p:nvCxnSpPr><p:spPr><a:xfrm{flips}><a:off x="{left}" y="{top}"/><a:ext cx="{width}" cy="{height}"/>'
+        f'</a:xfrm><a:prstGeom prst="{CONNECTOR_PRESETS.get(spec["type"], "line")}"><a:avLst/></a:prstGeom>'
+        f'<a:ln w="{int(spec["width_pt"] * 12700)}">{line}</a:ln></p:spPr></p:cxnSp>'
+    )
+
+
+def render_slide(plan):
+    """The ``ppt/slides/slideN.xml`` bytes ``build_slide()`` would produce for ``plan``."""
+    parts = [SLIDE_OPEN]
+    for shape_id, spec in enumerate(plan, 2):
+        kind = spec["kind"]
+        if kind == "connector":
+            parts.append(_connector(spec, shape_id))
+        elif kind == "text":
+            parts.append(_text(spec, shape_id))
+        elif kind == "table":
+            parts.append(_table(spec, shape_id))
+        else:
+            parts.append(_autoshape(spec, shape_id))
+    parts.append(SLIDE_CLOSE)
+    return "".join(parts).encode("utf-8")
+
+
+def _render_slides(seed, start, stop, shapes, mix):
+    result = []
+    for index in range(start, stop):
+        plan = plan_slide(seed, index, shapes, mix)
+        result.append((render_slide(plan), plan))
+    return result
+
+
+def render_deck(slides, shapes, seed=0, mix=DEFAULT_MIX, jobs=1):
+    """``(slide XML, plan)`` for every slide of a seeded deck, in slide order.
+
+    With ``jobs`` > 1, batches of BATCH_SLIDES slides are planned and
+    rendered on that many processes. Only BATCHES_PER_JOB × ``jobs``
+    batches are in flight at a time, so memory stays bounded when the pool
+    runs ahead of the caller.
+    """
+    batches = (
+        (seed, start, min(start + BATCH_SLIDES, slides), shapes, mix) for start in range(0, slides, BATCH_SLIDES)
+    )
+    if jobs <= 1:
+        for batch in batches:
+            yield from _render_slides(*batch)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.submit(_render_slides, *batch))
+            if len(pending) >= BATCHES_PER_JOB * jobs:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _serialize(element):
+    return etree.tostring(element, encoding="UTF-8", standalone=True)
+
+
+def _next_rids(rels, count):
+    """``count`` relationship ids not used in ``rels``, lowest first, as python-pptx assigns them."""
+    used = {rel.get("Id") for rel in rels}
+    rids, number = [], 1
+    while len(rids) < count:
+        rid = f"rId{number}"
+        if rid not in used:
+            rids.append(rid)
+        number += 1
+    return rids
+
+
+class DeckWriter:
+    """Write a PPTX one slide at a time.
+
+        with DeckWriter(path) as deck:
+            for plan in plans:
+                deck.add_slide(plan)
+
+    If the block raises, the zip is closed without the presentation part
+    and the file at ``path`` is not a valid deck.
+    """
+
+    def __init__(self, path):
+        buffer = io.BytesIO()
+        prs = new_presentation()
+        stabilize_core_properties(prs)
+        prs.save(buffer)
+        # Slides use the blank layout, as build_slide() does.
+        self._layout = posixpath.relpath(prs.slide_layouts[6].part.partname, "/ppt/slides")
+        with zipfile.ZipFile(buffer) as template:
+            self._template = {name: template.read(name) for name in template.namelist()}
+        self._deferred = ("[Content_Types].xml", "ppt/presentation.xml", "ppt/_rels/presentation.xml.rels")
+        self._zip = zipfile.ZipFile(path, "w")
+        for name, data in self._template.items():
+            if name not in self._deferred:
+                self._write(name, data)
+        self.slides = 0
+
+    def _write(self, name, data):
+        self._zip.writestr(zip_info(name), data)
+
+    def add_slide(self, plan):
+        """Render ``plan`` (one ``plan_slide()`` entry) and write it as the next slide."""
+        self.add_slide_xml(render_slide(plan))
+
+    def add_slide_xml(self, xml):
+        """Write already-rendered slide XML (``render_slide()`` output) as the next slide."""
+        self.slides += 1
+        name = f"ppt/slides/slide{self.slides}.xml"
+        rels = (
+            f'{XML_HEADER}<Relationships xmlns="{NS_RELS}">'
+            f'<Relationship Id="rId1" Type="{RT_SLIDE_LAYOUT}" Target="{self._layout}"/></Relationships>'
+        )
+        self._write(name, xml)
+        self._write(f"ppt/slides/_rels/slide{self.slides}.xml.rels", rels)
+
+    def close(self):
+        """Write the presentation part, its relationships and content types, then close the zip."""
+        rels = etree.fromstring(self._template["ppt/_rels/presentation.xml.rels"])
+        rids = _next_rids(rels, self.slides)
+        for index, rid in enumerate(rids, 1):
+            etree.SubElement(
+                rels, f"{{{NS_RELS}}}Relationship", Id=rid, Type=RT_SLIDE, Target=f"slides/slide{index}.xml"
+            )
+
+        presentation = etree.fromstring(self._template["ppt/presentation.xml"])
+        anchor = presentation.find(qn("p:sldMasterIdLst"))
+        for tag in ("p:notesMasterIdLst", "p:handoutMasterIdLst"):
+            if presentation.find(qn(tag)) is not None:
+                anchor = presentation.find(qn(tag))
+        slide_ids = etree.Element(qn("p:sldIdLst"))
+        for index, rid in enumerate(rids):
+            etree.SubElement(slide_ids, qn("p:sldId"), {"id": str(256 + index), qn("r:id"): rid})
+        if self.slides:
+            anchor.addnext(slide_ids)
+
+        # Overrides sorted by part name, as python-pptx writes them.
+        types = etree.fromstring(self._template["[Content_Types].xml"])
+        overrides = types.findall(f"{{{NS_TYPES}}}Override")
+        for index in range(1, self.slides + 1):
+            overrides.append(
+                etree.Element(f"{{{NS_TYPES}}}Override", PartName=f"/ppt/slides/slide{index}.xml", ContentType=CT_SLIDE)
+            )
+        for override in sorted(overrides, key=lambda override: override.get("PartName")):
+            types.append(override)
+
+        self._write("ppt/presentation.xml", _serialize(presentation))
+        self._write("ppt/_rels/presentation.xml.rels", _serialize(rels))
+        self._write("[Content_Types].xml", _serialize(types))
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._zip.close()
@@ -23,42 +23,6 @@ download() {
   curl -fsSL -o "$dest" "$url" || { echo "  FAIL: $(basename "$dest")"; return 1; }
 }
 
-# Instance a variable font to a static instance.
-# Usage: instance <input.ttf> <output.ttf> <wght> [<wdth>]
-instance() {
-  local input="$1" output="$2" wght="$3" wdth="${4:-}"
-  if [ -f "$output" ]; then
-    echo "  SKIP (exists): $(basename "$output")"
-    return
-  fi
-  if [ ! -f "$input" ]; then
-    echo "  SKIP (no source): $(basename "$input")"
-    return
-  fi
-  local script_file
-  script_file=$(mktemp /tmp/font-instance-XXXXXX.py)
-  if [ -n "$wdth" ]; then
-    cat > "$script_file" << PYEOF
-from fontTools.varLib.instancer import instantiateVariableFont
-from fontTools.ttLib import TTFont
-font = TTFont('$input')
-result = instantiateVariableFont(font, {'wght': $wght, 'wdth': $wdth})
-result.save('$output')
-PYEOF
-  else
-    cat > "$script_file" << PYEOF
-from fontTools.varLib.instancer import instantiateVariableFont
-from fontTools.ttLib import TTFont
-font = TTFont('$input')
-result = instantiateVariableFont(font, {'wght': $wght})
-result.save('$output')
-PYEOF
-  fi
-  python3 "$script_file" 2>/dev/null
-  rm -f "$script_file"
-  echo "  INST: $(basename "$output") (wght=$wght${wdth:+, wdth=$wdth})"
-}
-
 echo "=== Downloading Google Fonts (variable → static instancing) ==="
 
 # ─── Single-axis [wght] variable fonts ────────────────────────────────
@@ -66,108 +30,62 @@ echo "=== Downloading Google Fonts (variable → static instancing) ==="
 # Fira Code (no italic)
 echo "Fira Code..."
 download "$GF_RAW/ofl/firacode/FiraCode%5Bwght%5D.ttf" "$VAR_DIR/FiraCode[wght].ttf"
-instance "$VAR_DIR/FiraCode[wght].ttf" "$FONTS_DIR/FiraCode-Regular.ttf" 400
-instance "$VAR_DIR/FiraCode[wght].ttf" "$FONTS_DIR/FiraCode-Bold.ttf" 700
 
 # Montserrat
 echo "Montserrat..."
 download "$GF_RAW/ofl/montserrat/Montserrat%5Bwght%5D.ttf" "$VAR_DIR/Montserrat[wght].ttf"
 download "$GF_RAW/ofl/montserrat/Montserrat-Italic%5Bwght%5D.ttf" "$VAR_DIR/Montserrat-Italic[wght].ttf"
-instance "$VAR_DIR/Montserrat[wght].ttf" "$FONTS_DIR/Montserrat-Regular.ttf" 400
-instance "$VAR_DIR/Montserrat[wght].ttf" "$FONTS_DIR/Montserrat-Bold.ttf" 700
-instance "$VAR_DIR/Montserrat-Italic[wght].ttf" "$FONTS_DIR/Montserrat-Italic.ttf" 400
-instance "$VAR_DIR/Montserrat-Italic[wght].ttf" "$FONTS_DIR/Montserrat-BoldItalic.ttf" 700
 
 # Oswald (no italic)
 echo "Oswald..."
 download "$GF_RAW/ofl/oswald/Oswald%5Bwght%5D.ttf" "$VAR_DIR/Oswald[wght].ttf"
-instance "$VAR_DIR/Oswald[wght].ttf" "$FONTS_DIR/Oswald-Regular.ttf" 400
-instance "$VAR_DIR/Oswald[wght].ttf" "$FONTS_DIR/Oswald-Bold.ttf" 700
 
 # Playfair Display
 echo "Playfair Display..."
 download "$GF_RAW/ofl/playfairdisplay/PlayfairDisplay%5Bwght%5D.ttf" "$VAR_DIR/PlayfairDisplay[wght].ttf"
 download "$GF_RAW/ofl/playfairdisplay/PlayfairDisplay-Italic%5Bwght%5D.ttf" "$VAR_DIR/PlayfairDisplay-Italic[wght].ttf"
-instance "$VAR_DIR/PlayfairDisplay[wght].ttf" "$FONTS_DIR/PlayfairDisplay-Regular.ttf" 400
-instance "$VAR_DIR/PlayfairDisplay[wght].ttf" "$FONTS_DIR/PlayfairDisplay-Bold.ttf" 700
-instance "$VAR_DIR/PlayfairDisplay-Italic[wght].ttf" "$FONTS_DIR/PlayfairDisplay-Italic.ttf" 400
-instance "$VAR_DIR/PlayfairDisplay-Italic[wght].ttf" "$FONTS_DIR/PlayfairDisplay-BoldItalic.ttf" 700
 
 # Raleway
 echo "Raleway..."
 download "$GF_RAW/ofl/raleway/Raleway%5Bwght%5D.ttf" "$VAR_DIR/Raleway[wght].ttf"
 download "$GF_RAW/ofl/raleway/Raleway-Italic%5Bwght%5D.ttf" "$VAR_DIR/Raleway-Italic[wght].ttf"
-instance "$VAR_DIR/Raleway[wght].ttf" "$FONTS_DIR/Raleway-Regular.ttf" 400
-instance "$VAR_DIR/Raleway[wght].ttf" "$FONTS_DIR/Raleway-Bold.ttf" 700
-instance "$VAR_DIR/Raleway-Italic[wght].ttf" "$FONTS_DIR/Raleway-Italic.ttf" 400
-instance "$VAR_DIR/Raleway-Italic[wght].ttf" "$FONTS_DIR/Raleway-BoldItalic.ttf" 700
 
 # Roboto Mono
 echo "Roboto Mono..."
 download "$GF_RAW/ofl/robotomono/RobotoMono%5Bwght%5D.ttf" "$VAR_DIR/RobotoMono[wght].ttf"
 download "$GF_RAW/ofl/robotomono/RobotoMono-Italic%5Bwght%5D.ttf" "$VAR_DIR/RobotoMono-Italic[wght].ttf"
-instance "$VAR_DIR/RobotoMono[wght].ttf" "$FONTS_DIR/RobotoMono-Regular.ttf" 400
-instance "$VAR_DIR/RobotoMono[wght].ttf" "$FONTS_DIR/RobotoMono-Bold.ttf" 700
-instance "$VAR_DIR/RobotoMono-Italic[wght].ttf" "$FONTS_DIR/RobotoMono-Italic.ttf" 400
-instance "$VAR_DIR/RobotoMono-Italic[wght].ttf" "$FONTS_DIR/RobotoMono-BoldItalic.ttf" 700
 
 # Source Code Pro
 echo "Source Code Pro..."
 download "$GF_RAW/ofl/sourcecodepro/SourceCodePro%5Bwght%5D.ttf" "$VAR_DIR/SourceCodePro[wght].ttf"
 download "$GF_RAW/ofl/sourcecodepro/SourceCodePro-Italic%5Bwght%5D.ttf" "$VAR_DIR/SourceCodePro-Italic[wght].ttf"
-instance "$VAR_DIR/SourceCodePro[wght].ttf" "$FONTS_DIR/SourceCodePro-Regular.ttf" 400
-instance "$VAR_DIR/SourceCodePro[wght].ttf" "$FONTS_DIR/SourceCodePro-Bold.ttf" 700
-instance "$VAR_DIR/SourceCodePro-Italic[wght].ttf" "$FONTS_DIR/SourceCodePro-Italic.ttf" 400
-instance "$VAR_DIR/SourceCodePro-Italic[wght].ttf" "$FONTS_DIR/SourceCodePro-BoldItalic.ttf" 700
 
 # Source Sans 3 (registered as "Source Sans Pro" for backward compat)
 echo "Source Sans 3..."
 download "$GF_RAW/ofl/sourcesans3/SourceSans3%5Bwght%5D.ttf" "$VAR_DIR/SourceSans3[wght].ttf"
 download "$GF_RAW/ofl/sourcesans3/SourceSans3-Italic%5Bwght%5D.ttf" "$VAR_DIR/SourceSans3-Italic[wght].ttf"
-instance "$VAR_DIR/SourceSans3[wght].ttf" "$FONTS_DIR/SourceSans3-Regular.ttf" 400
-instance "$VAR_DIR/SourceSans3[wght].ttf" "$FONTS_DIR/SourceSans3-Bold.ttf" 700
-instance "$VAR_DIR/SourceSans3-Italic[wght].ttf" "$FONTS_DIR/SourceSans3-Italic.ttf" 400
-instance "$VAR_DIR/SourceSans3-Italic[wght].ttf" "$FONTS_DIR/SourceSans3-BoldItalic.ttf" 700
 
 # Comfortaa (no italic)
 echo "Comfortaa..."
 download "$GF_RAW/ofl/comfortaa/Comfortaa%5Bwght%5D.ttf" "$VAR_DIR/Comfortaa[wght].ttf"
-instance "$VAR_DIR/Comfortaa[wght].ttf" "$FONTS_DIR/Comfortaa-Regular.ttf" 400
-instance "$VAR_DIR/Comfortaa[wght].ttf" "$FONTS_DIR/Comfortaa-Bold.ttf" 700
-instance "$VAR_DIR/Comfortaa[wght].ttf" "$FONTS_DIR/Comfortaa-Light.ttf" 300
 
 # Gelasio (Georgia substitute)
 echo "Gelasio..."
 download "$GF_RAW/ofl/gelasio/Gelasio%5Bwght%5D.ttf" "$VAR_DIR/Gelasio[wght].ttf"
 download "$GF_RAW/ofl/gelasio/Gelasio-Italic%5Bwght%5D.ttf" "$VAR_DIR/Gelasio-Italic[wght].ttf"
-instance "$VAR_DIR/Gelasio[wght].ttf" "$FONTS_DIR/Gelasio-Regular.ttf" 400
-instance "$VAR_DIR/Gelasio[wght].ttf" "$FONTS_DIR/Gelasio-Bold.ttf" 700
-instance "$VAR_DIR/Gelasio-Italic[wght].ttf" "$FONTS_DIR/Gelasio-Italic.ttf" 400
-instance "$VAR_DIR/Gelasio-Italic[wght].ttf" "$FONTS_DIR/Gelasio-BoldItalic.ttf" 700
 
 # Arimo (Arial substitute, under apache/)
 echo "Arimo..."
 download "$GF_RAW/apache/arimo/Arimo%5Bwght%5D.ttf" "$VAR_DIR/Arimo[wght].ttf"
 download "$GF_RAW/apache/arimo/Arimo-Italic%5Bwght%5D.ttf" "$VAR_DIR/Arimo-Italic[wght].ttf"
-instance "$VAR_DIR/Arimo[wght].ttf" "$FONTS_DIR/Arimo-Regular.ttf" 400
-instance "$VAR_DIR/Arimo[wght].ttf" "$FONTS_DIR/Arimo-Bold.ttf" 700
-instance "$VAR_DIR/Arimo-Italic[wght].ttf" "$FONTS_DIR/Arimo-Italic.ttf" 400
-instance "$VAR_DIR/Arimo-Italic[wght].ttf" "$FONTS_DIR/Arimo-BoldItalic.ttf" 700
 
 # Noto Sans Symbols (no italic)
 echo "Noto Sans Symbols..."
 download "$GF_RAW/ofl/notosanssymbols/NotoSansSymbols%5Bwght%5D.ttf" "$VAR_DIR/NotoSansSymbols[wght].ttf"
-instance "$VAR_DIR/NotoSansSymbols[wght].ttf" "$FONTS_DIR/NotoSansSymbols-Regular.ttf" 400
-instance "$VAR_DIR/NotoSansSymbols[wght].ttf" "$FONTS_DIR/NotoSansSymbols-Bold.ttf" 700
 
 # Roboto Slab (under apache/, no italic)
 echo "Roboto Slab..."
 download "$GF_RAW/apache/robotoslab/RobotoSlab%5Bwght%5D.ttf" "$VAR_DIR/RobotoSlab[wght].ttf"
-instance "$VAR_DIR/RobotoSlab[wght].ttf" "$FONTS_DIR/RobotoSlab-Regular.ttf" 400
-instance "$VAR_DIR/RobotoSlab[wght].ttf" "$FONTS_DIR/RobotoSlab-Bold.ttf" 700
-instance "$VAR_DIR/RobotoSlab[wght].ttf" "$FONTS_DIR/RobotoSlab-Light.ttf" 300
-instance "$VAR_DIR/RobotoSlab[wght].ttf" "$FONTS_DIR/RobotoSlab-Medium.ttf" 500
-instance "$VAR_DIR/RobotoSlab[wght].ttf" "$FONTS_DIR/RobotoSlab-SemiBold.ttf" 600
 
 # ─── Two-axis [wdth,wght] variable fonts ──────────────────────────────
 
@@ -175,35 +93,26 @@ instance "$VAR_DIR/RobotoSlab[wght].ttf" "$FONTS_DIR/RobotoSlab-SemiBold.ttf" 60
 echo "Noto Sans..."
 download "$GF_RAW/ofl/notosans/NotoSans%5Bwdth%2Cwght%5D.ttf" "$VAR_DIR/NotoSans[wdth,wght].ttf"
 download "$GF_RAW/ofl/notosans/NotoSans-Italic%5Bwdth%2Cwght%5D.ttf" "$VAR_DIR/NotoSans-Italic[wdth,wght].ttf"
-instance "$VAR_DIR/NotoSans[wdth,wght].ttf" "$FONTS_DIR/NotoSans-Regular.ttf" 400 100
-instance "$VAR_DIR/NotoSans[wdth,wght].ttf" "$FONTS_DIR/NotoSans-Bold.ttf" 700 100
-instance "$VAR_DIR/NotoSans-Italic[wdth,wght].ttf" "$FONTS_DIR/NotoSans-Italic.ttf" 400 100
-instance "$VAR_DIR/NotoSans-Italic[wdth,wght].ttf" "$FONTS_DIR/NotoSans-BoldItalic.ttf" 700 100
 
 # Noto Serif
 echo "Noto Serif..."
 download "$GF_RAW/ofl/notoserif/NotoSerif%5Bwdth%2Cwght%5D.ttf" "$VAR_DIR/NotoSerif[wdth,wght].ttf"
 download "$GF_RAW/ofl/notoserif/NotoSerif-Italic%5Bwdth%2Cwght%5D.ttf" "$VAR_DIR/NotoSerif-Italic[wdth,wght].ttf"
-instance "$VAR_DIR/NotoSerif[wdth,wght].ttf" "$FONTS_DIR/NotoSerif-Regular.ttf" 400 100
-instance "$VAR_DIR/NotoSerif[wdth,wght].ttf" "$FONTS_DIR/NotoSerif-Bold.ttf" 700 100
-instance "$VAR_DIR/NotoSerif-Italic[wdth,wght].ttf" "$FONTS_DIR/NotoSerif-Italic.ttf" 400 100
-instance "$VAR_DIR/NotoSerif-Italic[wdth,wght].ttf" "$FONTS_DIR/NotoSerif-BoldItalic.ttf" 700 100
 
 # Roboto
 echo "Roboto..."
 download "$GF_RAW/ofl/roboto/Roboto%5Bwdth%2Cwght%5D.ttf" "$VAR_DIR/Roboto[wdth,wght].ttf"
 download "$GF_RAW/ofl/roboto/Roboto-Italic%5Bwdth%2Cwght%5D.ttf" "$VAR_DIR/Roboto-Italic[wdth,wght].ttf"
-instance "$VAR_DIR/Roboto[wdth,wght].ttf" "$FONTS_DIR/Roboto-Regular.ttf" 400 100
-instance "$VAR_DIR/Roboto[wdth,wght].ttf" "$FONTS_DIR/Roboto-Bold.ttf" 700 100
-instance "$VAR_DIR/Roboto-Italic[wdth,wght].ttf" "$FONTS_DIR/Roboto-Italic.ttf" 400 100
-instance "$VAR_DIR/Roboto-Italic[wdth,wght].ttf" "$FONTS_DIR/Roboto-BoldItalic.ttf" 700 100
 
 # Open Sans (two-axis)
 echo "Open Sans..."
 download "$GF_RAW/ofl/opensans/OpenSans%5Bwdth%2Cwght%5D.ttf" "$VAR_DIR/OpenSans[wdth,wght].ttf"
-instance "$VAR_DIR/OpenSans[wdth,wght].ttf" "$FONTS_DIR/OpenSans-Regular.ttf" 400 100
-instance "$VAR_DIR/OpenSans[wdth,wght].ttf" "$FONTS_DIR/OpenSans-Bold.ttf" 700 100
-instance "$VAR_DIR/OpenSans[wdth,wght].ttf" "$FONTS_DIR/OpenSans-ExtraBold.ttf" 800 100
+
+# ─── Static instances of the variable fonts above ─────────────────────
+# Weights and widths come from VARIABLE_INSTANCES in font_pipeline/families.py.
+
+echo "Instancing variable fonts..."
+python3 "$(dirname "$0")/instance-variable-fonts.py"
 
 # ─── Static weight downloads (not variable on Google Fonts) ───────────
 
@@ -342,3 +251,16 @@ echo ""
 echo "=== Download and instancing complete ==="
 echo "Fonts directory: $FONTS_DIR"
 find "$FONTS_DIR" -maxdepth 1 \( -name "*.ttf" -o -name "*.otf" \) | wc -l | xargs -I{} echo "Total font files: {}"
+
+# ─── Source lockfile ──────────────────────────────────────────────────
+# The first download records each source's SHA-256 for fetch-font-sources.py
+# (commit it); later runs check fonts/ against the committed lockfile.
+
+LOCK="$(dirname "$0")/font-sources.lock.json"
+echo ""
+if [ -f "$LOCK" ]; then
+  python3 "$(dirname "$0")/fetch-font-sources.py" --verify
+else
+  python3 "$(dirname "$0")/fetch-font-sources.py" --update-lock
+  echo "Commit $(basename "$LOCK") so pnpm fonts:fetch can verify sources."
+fi
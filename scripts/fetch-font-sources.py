@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Populate fonts/ from a local mirror, verified against a lockfile.
+
+For offline, hermetic builds: instead of downloading every source
+(download-google-fonts.sh), copy them from a directory or tarball laid out
+like fonts/ and check each one against the SHA-256 recorded in
+scripts/font-sources.lock.json (see font_pipeline/sources.py).
+
+Usage: python3 scripts/fetch-font-sources.py --mirror PATH [--lock PATH] [--jobs N]
+           [--link reflink|hardlink|copy]
+       python3 scripts/fetch-font-sources.py --verify [--lock PATH] [--jobs N]
+       python3 scripts/fetch-font-sources.py --update-lock [--lock PATH] [--jobs N]
+
+  --mirror PATH  Directory or .tar/.tar.gz/.tgz/.tar.xz mirror of fonts/.
+                 Defaults to $OPENDOCKIT_FONT_MIRROR. Files already in
+                 fonts/ with the locked hash are skipped; the rest are
+                 verified, then moved into place.
+  --link MODE    How files from a directory mirror are placed: "reflink"
+                 (default) clones them copy-on-write where the filesystem
+                 supports it (btrfs, XFS), "hardlink" shares the mirror's
+                 files (only for read-only or throwaway mirrors: writing a
+                 source in place would change the mirror too), "copy"
+                 always copies. Reflinks and hardlinks fall back to copies.
+  --verify       Only check fonts/ against the lockfile.
+  --update-lock  Write the lockfile from the sources currently in fonts/,
+                 to be committed. pnpm fonts:download runs this when no
+                 lockfile exists yet, and --verify otherwise.
+  --jobs N       Hash and copy files in N worker processes (0 = one per
+                 CPU core). Tarballs are always read in one pass.
+
+Exits 1 if any locked file is missing from the mirror, doesn't match its
+hash, or (with --verify) is missing or modified in fonts/. Without a
+lockfile, --mirror and --verify exit 1 and ask for pnpm fonts:download first.
+"""
+
+import argparse
+import sys
+
+from font_pipeline import FONTS_DIR
+from font_pipeline.parallel import add_jobs_argument, resolve_jobs
+from font_pipeline.sources import acquire, add_mirror_arguments, load_lock, verify, write_lock
+
+LINKED = ("reflink", "hardlink")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Populate fonts/ from a local mirror, verified against a lockfile.")
+    add_mirror_arguments(parser)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--verify", action="store_true", help="only check fonts/ against the lockfile")
+    mode.add_argument("--update-lock", action="store_true", help="write the lockfile from the sources in fonts/")
+    add_jobs_argument(parser, "number of worker processes for hashing and copying sources")
+    args = parser.parse_args()
+    resolve_jobs(parser, args)
+    if not (args.verify or args.update_lock) and args.mirror is None:
+        parser.error("--mirror (or $OPENDOCKIT_FONT_MIRROR) is required unless --verify or --update-lock")
+    return args
+
+
+def read_lock(path):
+    """Load the lockfile, exiting with a hint if it is missing or invalid."""
+    if not path.exists():
+        print(f"ERROR: lockfile not found at {path}")
+        print("--mirror and --verify check sources against it. Create it from trusted sources")
+        print("with 'pnpm fonts:download' (which writes it) and commit it.")
+        sys.exit(1)
+    try:
+        return load_lock(path)
+    except (ValueError, KeyError) as e:
+        print(f"ERROR: invalid lockfile {path}: {e}")
+        sys.exit(1)
+
+
+def main():
+    args = parse_args()
+
+    if args.update_lock:
+        if not FONTS_DIR.exists():
+            print(f"ERROR: fonts/ directory not found at {FONTS_DIR}")
+            sys.exit(1)
+        count = write_lock(FONTS_DIR, args.lock, args.jobs)
+        print(f"Locked {count} source files → {args.lock}")
+        return
+
+    lock = read_lock(args.lock)
+
+    if args.verify:
+        bad = [name for name, ok in verify(lock, FONTS_DIR, args.jobs).items() if not ok]
+        for name in bad:
+            print(f"  BAD: {name}")
+        print(f"Verified {len(lock) - len(bad)}/{len(lock)} source files in {FONTS_DIR}")
+        sys.exit(1 if bad else 0)
+
+    if not args.mirror.exists():
+        print(f"ERROR: mirror not found at {args.mirror}")
+        sys.exit(1)
+
+    print(f"Fetching {len(lock)} source files from {args.mirror}...")
+    results = acquire(lock, args.mirror, FONTS_DIR, args.jobs, args.link)
+    failed = [result for result in results if result.action in ("missing", "mismatch")]
+    for result in failed:
+        label = "not in mirror" if result.action == "missing" else "hash mismatch"
+        print(f"  FAIL: {result.path} ({label})")
+
+    counts = {}
+    for result in results:
+        counts[result.action] = counts.get(result.action, 0) + 1
+    written = [result for result in results if result.action not in ("unchanged", "missing", "mismatch")]
+    linked = sum(1 for result in written if result.action in LINKED)
+    copied = sum(result.size for result in written if result.action not in LINKED)
+
+    print(f"\n{'=' * 50}")
+    print(f"Font source fetch complete")
+    print(f"{'=' * 50}")
+    print(f"  Unchanged: {counts.get('unchanged', 0)}")
+    print(f"  Written:   {len(written)} ({linked} linked, {copied / 1024 / 1024:.1f} MB copied)")
+    if failed:
+        print(f"  Failed:    {len(failed)}")
+    print(f"  Output:    {FONTS_DIR}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Shared helpers for the Python font pipeline scripts.
+
+The pipeline entry points (bundle-woff2-fonts.py, bundle-ttf-fonts.py,
+generate-font-package.py) have hyphenated names and can't import each other,
+so code they share lives in this package. Python puts the script's directory
+on sys.path, which makes ``import font_pipeline`` work from any of them.
+
+- families.py — FONT_FAMILIES, UNICODE_RANGES / CODEPOINTS, VARIANT_MAP
+- subset.py — single-pass subsetting engine (one parse per face)
+- typescript.py — base64 TypeScript modules + manifest.ts for packages/core
+- package.py — @opendockit/fonts companion package files + manifest.json
+- cache.py — content-addressed subset cache
+- incremental.py — input fingerprints and write-if-changed outputs
+- corpus.py — per-face codepoint usage scanned from PPTX/DOCX documents
+- fontpack.py — binary per-family font packs (alternative to typescript.py)
+- metrics.py — per-face layout metrics tables and metrics-bundle.ts
+- kerning.py — flattened per-face pair-kerning tables
+- variable.py — variable-font instancing and variable WOFF2 shards
+- dedup.py — content-hash deduplication of faces shared between families
+- profiles.py — default / render-optimized (hinting-free) subset profiles
+- coverage.py — per-face codepoint coverage, fallback table and coverage gaps
+- precompress.py — .br/.gz sidecars for the companion package
+- memory.py — per-face peak RSS and the memory-bounded worker pool
+- sources.py — source lockfile and offline acquisition from a local mirror
+- pdfsubset.py — per-document PDF subsets with stable glyph IDs
+- bench.py — per-stage build benchmarks against committed baselines
+"""
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+FONTS_DIR = ROOT / "fonts"
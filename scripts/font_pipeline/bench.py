@@ -0,0 +1,222 @@
+"""
+Stage-level benchmarks for the font build, with committed regression baselines.
+
+Each source face is run through the same code paths the build scripts use,
+timing every stage separately:
+
+- load      parse the source TTF and decompile the tables the subsetter keeps
+- subset    ``Subsetter`` with ``subset_options()``
+- compress  serialize via ``save_font()`` (brotli for WOFF2, plain sfnt for TTF)
+- encode    base64, as ``write_family_module()`` does (bundle cases only)
+- write     write the output bytes to disk
+
+Cases mirror the outputs: ``woff2`` (bundle-woff2-fonts.py), ``ttf``
+(bundle-ttf-fonts.py) and ``package`` (generate-font-package.py's
+per-unicode-range shards, stages summed over shards). The subset cache is
+bypassed so fontTools always runs.
+
+Every face runs in a fresh worker process, so ``peak_rss_kb`` is that face's
+own high-water mark rather than the whole run's. Stage times are the median
+over ``repeat`` runs, after one discarded warm-up run.
+
+Baselines live in tools/perf/baselines/font-build-baselines.json, keyed
+``"{case} > {source file}"`` like the vitest bench baselines next to it.
+"""
+
+import base64
+import json
+import multiprocessing
+import platform
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+from io import BytesIO
+from pathlib import Path
+
+from . import FONTS_DIR, ROOT
+from .families import CODEPOINTS, FONT_FAMILIES
+from .memory import peak_rss_kb
+from .package import package_shards, shard_codepoints
+from .subset import save_font, subset_options
+
+BASELINE_PATH = ROOT / "tools" / "perf" / "baselines" / "font-build-baselines.json"
+BASELINE_COMMENT = "Auto-generated. Do not edit manually. Run: pnpm perf:fonts:update"
+
+CASES = ("woff2", "ttf", "package")
+STAGES = ("load", "subset", "compress", "encode", "write")
+
+# Default regression thresholds, as a fraction of the baseline value.
+TIME_THRESHOLD = 0.25
+SIZE_THRESHOLD = 0.01
+RSS_THRESHOLD = 0.25
+
+# Time regressions smaller than this are treated as noise.
+MIN_TIME_DELTA_MS = 5.0
+
+
+def _run_once(source, case, out_dir):
+    """One timed pass over a face: ``({stage: seconds}, output bytes)``."""
+    from fontTools.subset import Subsetter
+    from fontTools.ttLib import TTFont
+
+    timings = dict.fromkeys(STAGES, 0.0)
+    if case == "package":
+        targets = shard_codepoints(package_shards())
+        flavor = "woff2"
+    else:
+        targets = [(case, CODEPOINTS)]
+        flavor = case
+
+    options = subset_options()
+    start = time.perf_counter()
+    source_bytes = Path(source).read_bytes()
+    if case == "package":
+        # Like subset_face_shards(): shards without glyphs aren't written.
+        covered = set(TTFont(BytesIO(source_bytes), lazy=True).getBestCmap() or {})
+        targets = [(name, codepoints) for name, codepoints in targets if covered & codepoints]
+    timings["load"] += time.perf_counter() - start
+    output_bytes = 0
+
+    for name, codepoints in targets:
+        start = time.perf_counter()
+        font = TTFont(BytesIO(source_bytes))
+        # Tables load lazily; pull in the ones subsetting will touch so their
+        # parse cost lands here rather than in "subset".
+        for tag in font.keys():
+            if tag not in options.drop_tables:
+                font[tag]
+        timings["load"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        subsetter = Subsetter(options=options)
+        subsetter.populate(unicodes=codepoints)
+        subsetter.subset(font)
+        timings["subset"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        data = save_font(font, flavor)
+        timings["compress"] += time.perf_counter() - start
+
+        if case != "package":
+            start = time.perf_counter()
+            data = base64.b64encode(data)
+            timings["encode"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        (Path(out_dir) / f"{name}.out").write_bytes(data)
+        timings["write"] += time.perf_counter() - start
+        output_bytes += len(data)
+
+    return timings, output_bytes
+
+
+def bench_face(source, case, repeat):
+    """Benchmark one face for one case; runs in its own worker process."""
+    runs = []
+    with tempfile.TemporaryDirectory(prefix="font-bench-") as out_dir:
+        # Warm-up: the first pass pays for fontTools' lazy table-module imports.
+        _run_once(source, case, out_dir)
+        for _ in range(repeat):
+            runs.append(_run_once(source, case, out_dir))
+
+    result = {}
+    for stage in STAGES:
+        result[f"{stage}_ms"] = round(statistics.median(t[stage] for t, _ in runs) * 1000, 2)
+    result["total_ms"] = round(sum(result[f"{stage}_ms"] for stage in STAGES), 2)
+    result["peak_rss_kb"] = peak_rss_kb()
+    result["bytes"] = runs[-1][1]
+    return result
+
+
+def source_faces(family_filter=None):
+    """Unique source files referenced by FONT_FAMILIES, sorted.
+
+    ``family_filter`` keeps only families whose id contains the substring.
+    """
+    return sorted({
+        ttf_filename
+        for family_id, family_def in FONT_FAMILIES.items()
+        if not family_filter or family_filter in family_id
+        for ttf_filename in family_def["variants"].values()
+    })
+
+
+def run_benchmarks(faces, cases=CASES, repeat=3, log=print):
+    """Benchmark every existing face in ``faces`` for each case.
+
+    Returns ``{"{case} > {file}": result}`` in case, then face order.
+    """
+    results = {}
+    # maxtasksperchild=1: a fresh process per face keeps peak RSS per face.
+    with multiprocessing.Pool(processes=1, maxtasksperchild=1) as pool:
+        for case in cases:
+            for ttf_filename in faces:
+                source = FONTS_DIR / ttf_filename
+                if not source.exists():
+                    continue
+                result = pool.apply(bench_face, (str(source), case, repeat))
+                key = f"{case} > {ttf_filename}"
+                results[key] = result
+                log(
+                    f"  {key}: {result['total_ms']:.1f} ms, "
+                    f"{result['bytes'] / 1024:.1f} KB, peak RSS {result['peak_rss_kb'] / 1024:.1f} MB"
+                )
+    return results
+
+
+def environment():
+    """Versions that explain baseline differences between machines."""
+    from fontTools import version as fonttools_version
+
+    return {
+        "python": platform.python_version(),
+        "fontTools": fonttools_version,
+        "platform": f"{platform.system()}-{platform.machine()}",
+    }
+
+
+def load_baselines(path=BASELINE_PATH):
+    """Baseline ``benchmarks`` dict, or {} if there is no baseline yet."""
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8")).get("benchmarks", {})
+    except FileNotFoundError:
+        return {}
+
+
+def save_baselines(results, path=BASELINE_PATH):
+    """Write ``results`` as the new baseline file."""
+    output = {
+        "_comment": BASELINE_COMMENT,
+        "updatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "benchmarks": results,
+    }
+    Path(path).write_text(json.dumps(output, indent=2) + "\n", encoding="utf-8")
+
+
+def compare(results, baselines, time_threshold=TIME_THRESHOLD, size_threshold=SIZE_THRESHOLD,
+            rss_threshold=RSS_THRESHOLD):
+    """Compare results against baselines.
+
+    Returns a list of ``(key, metric, baseline, current, change)`` tuples for
+    every metric past its threshold. Keys missing from either side are not
+    regressions.
+    """
+    regressions = []
+    for key, current in results.items():
+        baseline = baselines.get(key)
+        if baseline is None:
+            continue
+        checks = [
+            ("total_ms", time_threshold, MIN_TIME_DELTA_MS),
+            ("bytes", size_threshold, 0),
+            ("peak_rss_kb", rss_threshold, 0),
+        ]
+        for metric, threshold, min_delta in checks:
+            old, new = baseline.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            if new - old > min_delta and new > old * (1 + threshold):
+                regressions.append((key, metric, old, new, new / old - 1))
+    return regressions
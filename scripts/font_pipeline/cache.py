@@ -0,0 +1,195 @@
+"""
+Content-addressed on-disk cache for fontTools subset output.
+
+Entries are keyed by a SHA-256 over everything that determines the subset
+bytes: the source font bytes, the codepoint set, every fontTools ``Options``
+field, the output flavor and the fontTools version. An unchanged input is
+therefore never re-subset, and changing any one of them (e.g. editing
+UNICODE_RANGES or upgrading fontTools) misses the cache automatically.
+
+Layout: ``<cache-dir>/<key[:2]>/<key>.bin``. Reads bump the entry's mtime, and
+``prune()`` deletes least-recently-used entries until the cache fits in
+``max_bytes``. Writes go through a temp file + ``os.replace`` so concurrent
+worker processes never observe a partial entry.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+from . import ROOT
+
+DEFAULT_CACHE_DIR = ROOT / ".cache" / "font-subset"
+DEFAULT_MAX_MB = 512
+
+# Bump when the meaning of a cache entry changes in a way the key can't see.
+CACHE_FORMAT = 1
+
+
+def _canonical(value):
+    """Render an Options field as a stable string for hashing."""
+    if isinstance(value, (set, frozenset)):
+        return "{" + ",".join(sorted(_canonical(v) for v in value)) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_canonical(v) for v in value) + "]"
+    return repr(value)
+
+
+def file_digest(path):
+    """SHA-256 hex digest of a file, read in 1 MB chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def subset_key(source_path, codepoints, options, flavor, extra=(), source_digest=None):
+    """Hash every input that determines the bytes of a subset.
+
+    ``extra`` carries any post-subset save settings that affect the bytes
+    (e.g. whether head.modified is recalculated). Pass ``source_digest`` to
+    reuse an already-computed ``file_digest(source_path)``.
+    """
+    from fontTools import version as fonttools_version
+
+    if source_digest is None:
+        source_digest = file_digest(source_path)
+
+    h = hashlib.sha256()
+    h.update(f"format={CACHE_FORMAT}\n".encode())
+    h.update(f"fonttools={fonttools_version}\n".encode())
+    h.update(f"source={source_digest}\n".encode())
+    h.update(b"codepoints=")
+    h.update(",".join(f"{cp:x}" for cp in sorted(codepoints)).encode())
+    h.update(b"\n")
+    for name, value in sorted(vars(options).items()):
+        h.update(f"option.{name}={_canonical(value)}\n".encode())
+    h.update(f"flavor={flavor}\n".encode())
+    h.update(f"extra={_canonical(list(extra))}\n".encode())
+    return h.hexdigest()
+
+
+class SubsetCache:
+    """Size-bounded LRU cache of subset font bytes, shared across scripts."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, source_path, codepoints, options, flavor, extra=(), source_digest=None):
+        """Compute the cache key for subsetting ``source_path``."""
+        return subset_key(source_path, codepoints, options, flavor, extra, source_digest)
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.bin"
+
+    def get(self, key):
+        """Return cached bytes for ``key``, or None on a miss."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # mark as recently used for LRU pruning
+        except OSError:
+            pass
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """Store ``data`` under ``key`` atomically."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def get_or_build(self, key, build):
+        """Return cached bytes for ``key``, calling ``build()`` on a miss."""
+        data = self.get(key)
+        if data is None:
+            data = build()
+            self.put(key, data)
+        return data
+
+    def prune(self):
+        """Evict least-recently-used entries until the cache fits in max_bytes.
+
+        Returns the number of entries removed.
+        """
+        if not self.directory.exists():
+            return 0
+
+        entries = []
+        total = 0
+        for path in self.directory.glob("*/*.bin"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        removed = 0
+        for _mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+
+def add_cache_arguments(parser):
+    """Register the shared --cache-dir / --cache-max-mb / --no-cache options."""
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=Path(os.environ.get("OPENDOCKIT_FONT_CACHE", DEFAULT_CACHE_DIR)),
+        help="subset cache directory (default: $OPENDOCKIT_FONT_CACHE or .cache/font-subset)",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_MB,
+        help=f"evict least-recently-used cache entries above this size (default: {DEFAULT_MAX_MB})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always re-run fontTools instead of reusing cached subsets",
+    )
+
+
+def cache_from_args(args):
+    """Build a SubsetCache from parsed arguments, or None with --no-cache."""
+    if args.no_cache:
+        return None
+    return SubsetCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024)
+
+
+def report_cache(cache):
+    """Print a one-line cache summary and prune the cache to its size bound."""
+    if cache is None:
+        return
+    removed = cache.prune()
+    line = f"  Cache: {cache.hits} hits, {cache.misses} misses ({cache.directory})"
+    if removed:
+        line += f", evicted {removed}"
+    print(line)
@@ -0,0 +1,477 @@
+"""
+Collect the characters a document corpus actually renders, per font face.
+
+Scans .pptx and .docx files and records, for every run of text, the
+codepoints used under each (typeface, bold, italic) combination. Typefaces
+are resolved the way the renderer sees them: run properties first, then
+paragraph / list-style / slide-master defaults (PPTX) or the style chain and
+document defaults (DOCX), with theme references (``+mn-lt``, ``minorHAnsi``)
+replaced by the theme's major/minor Latin font. Bullet characters, field
+digits and all-caps runs are included so the subset can draw everything the
+renderer may emit, not just the literal run text.
+
+``resolve_usage()`` then maps typefaces onto FONT_FAMILIES (by
+``register_as`` or ``substitute_for``) and bold/italic onto variants, giving
+the codepoint set each bundled face needs for a known document set.
+"""
+
+import posixpath
+import string
+import zipfile
+from collections import defaultdict
+from pathlib import Path
+from xml.etree import ElementTree
+
+from .families import FONT_FAMILIES, family_index, pick_variant
+
+DOCUMENT_SUFFIXES = (".pptx", ".docx")
+
+A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+REL = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+
+# Characters an auto-numbered list or a slide-number / date field may render.
+NUMBERING_CHARS = string.digits + string.ascii_letters + ".)(-/:"
+
+# PPTX placeholder types that take the master's title / body text style.
+TITLE_PLACEHOLDERS = {"title", "ctrTitle"}
+OTHER_PLACEHOLDERS = {"dt", "ftr", "sldNum"}
+
+
+class FontUsage:
+    """Codepoints used per ``(typeface, bold, italic)`` across documents."""
+
+    def __init__(self):
+        self.faces = defaultdict(set)
+        self.documents = []
+        self.errors = []
+
+    def add(self, typeface, bold, italic, text, caps=False):
+        """Record ``text`` as rendered in the given face."""
+        if not typeface or not text:
+            return
+        if caps:
+            text += text.upper()
+        codepoints = {ord(ch) for ch in text if ord(ch) >= 0x20}
+        if codepoints:
+            self.faces[(typeface, bool(bold), bool(italic))] |= codepoints
+
+    def merge(self, other):
+        """Fold another FontUsage into this one."""
+        for face, codepoints in other.faces.items():
+            self.faces[face] |= codepoints
+        self.documents += other.documents
+        self.errors += other.errors
+
+
+# ---------------------------------------------------------------------------
+# OOXML package helpers
+# ---------------------------------------------------------------------------
+
+def _read_xml(zf, part):
+    """Parse a package part, or return None if it doesn't exist."""
+    try:
+        return ElementTree.fromstring(zf.read(part))
+    except KeyError:
+        return None
+
+
+def _part_rels(zf, part):
+    """``[(relationship type suffix, target part)]`` for a package part."""
+    directory, name = posixpath.split(part)
+    rels = _read_xml(zf, posixpath.join(directory, "_rels", name + ".rels"))
+    if rels is None:
+        return []
+    result = []
+    for rel in rels.iter(REL):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target", "")
+        if target.startswith("/"):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(directory, target))
+        result.append((rel.get("Type", "").rsplit("/", 1)[-1], target))
+    return result
+
+
+def _related(zf, part, rel_type):
+    """First target of ``rel_type`` from ``part``, or None."""
+    for kind, target in _part_rels(zf, part):
+        if kind == rel_type:
+            return target
+    return None
+
+
+def _theme_fonts(zf, theme_part):
+    """``{"major": typeface, "minor": typeface}`` from a theme part."""
+    fonts = {"major": None, "minor": None}
+    theme = _read_xml(zf, theme_part) if theme_part else None
+    if theme is None:
+        return fonts
+    for kind in fonts:
+        latin = theme.find(f".//{A}{kind}Font/{A}latin")
+        if latin is not None and latin.get("typeface"):
+            fonts[kind] = latin.get("typeface")
+    return fonts
+
+
+def _inherit(child, parent):
+    """Fill unset (None) properties of ``child`` from ``parent``."""
+    if parent is None:
+        return dict(child)
+    return {key: child.get(key) if child.get(key) is not None else parent.get(key)
+            for key in child.keys() | parent.keys()}
+
+
+# ---------------------------------------------------------------------------
+# PresentationML
+# ---------------------------------------------------------------------------
+
+def _dml_bool(value):
+    return None if value is None else value in ("1", "true")
+
+
+def _dml_typeface(typeface, theme):
+    """Resolve ``+mj-lt`` / ``+mn-lt`` theme references; drop ea/cs refs."""
+    if not typeface:
+        return None
+    if typeface.startswith("+"):
+        if typeface == "+mj-lt":
+            return theme["major"]
+        if typeface == "+mn-lt":
+            return theme["minor"]
+        return None
+    return typeface
+
+
+def _dml_run_props(rpr, theme):
+    """Properties set directly on an ``a:rPr`` / ``a:defRPr``."""
+    if rpr is None:
+        return {}
+    latin = rpr.find(f"{A}latin")
+    cap = rpr.get("cap")
+    return {
+        "typeface": _dml_typeface(latin.get("typeface") if latin is not None else None, theme),
+        "bold": _dml_bool(rpr.get("b")),
+        "italic": _dml_bool(rpr.get("i")),
+        "caps": None if cap is None else cap in ("all", "small"),
+    }
+
+
+def _dml_para_props(ppr, theme):
+    """Run defaults and bullet settings from an ``a:pPr`` / ``a:lvlNpPr``."""
+    if ppr is None:
+        return {}
+    props = _dml_run_props(ppr.find(f"{A}defRPr"), theme)
+    if ppr.find(f"{A}buNone") is not None:
+        props["bullet"] = ""
+    elif ppr.find(f"{A}buAutoNum") is not None:
+        props["bullet"] = NUMBERING_CHARS
+    elif ppr.find(f"{A}buChar") is not None:
+        props["bullet"] = ppr.find(f"{A}buChar").get("char", "")
+    bu_font = ppr.find(f"{A}buFont")
+    if bu_font is not None:
+        props["bullet_typeface"] = _dml_typeface(bu_font.get("typeface"), theme)
+    return props
+
+
+def _dml_list_style(lst, theme):
+    """``{level: props}`` from an ``a:lstStyle`` / ``p:titleStyle`` element."""
+    levels = {}
+    if lst is None:
+        return levels
+    for level in range(9):
+        ppr = lst.find(f"{A}lvl{level + 1}pPr")
+        if ppr is not None:
+            levels[level] = _dml_para_props(ppr, theme)
+    return levels
+
+
+def _master_styles(zf, master_part, theme):
+    """Master text styles: ``{"title" | "body" | "other": {level: props}}``."""
+    styles = {"title": {}, "body": {}, "other": {}}
+    master = _read_xml(zf, master_part) if master_part else None
+    if master is None:
+        return styles
+    tx_styles = master.find(f"{P}txStyles")
+    if tx_styles is not None:
+        for kind in styles:
+            styles[kind] = _dml_list_style(tx_styles.find(f"{P}{kind}Style"), theme)
+    return styles
+
+
+def _placeholder_kind(shape):
+    """Which master text style a shape inherits, and whether it's a placeholder."""
+    ph = shape.find(f"{P}nvSpPr/{P}nvPr/{P}ph") if shape is not None else None
+    if ph is None:
+        return "other", False
+    ph_type = ph.get("type")
+    if ph_type in TITLE_PLACEHOLDERS:
+        return "title", True
+    if ph_type in OTHER_PLACEHOLDERS:
+        return "other", True
+    return "body", True
+
+
+def _scan_dml_part(root, usage, theme, master_styles, skip_placeholders):
+    """Record every DrawingML paragraph in a slide, layout, chart or diagram part."""
+    parents = {child: parent for parent in root.iter() for child in parent}
+    default = {"typeface": theme["minor"], "bold": False, "italic": False, "caps": False}
+
+    for para in root.iter(f"{A}p"):
+        body = parents.get(para)
+        shape = body
+        while shape is not None and shape.tag != f"{P}sp":
+            shape = parents.get(shape)
+        kind, is_placeholder = _placeholder_kind(shape)
+        if is_placeholder and skip_placeholders:
+            # Layout/master placeholder text is prompt text, never rendered.
+            continue
+
+        ppr = para.find(f"{A}pPr")
+        level = int(ppr.get("lvl", "0")) if ppr is not None else 0
+        inherited = _inherit(master_styles[kind].get(level, {}), default)
+        lst = body.find(f"{A}lstStyle") if body is not None else None
+        inherited = _inherit(_dml_list_style(lst, theme).get(level, {}), inherited)
+        para_props = _inherit(_dml_para_props(ppr, theme), inherited)
+
+        first_typeface = None
+        for run in para:
+            if run.tag not in (f"{A}r", f"{A}fld"):
+                continue
+            props = _inherit(_dml_run_props(run.find(f"{A}rPr"), theme), para_props)
+            text = run.findtext(f"{A}t") or ""
+            if run.tag == f"{A}fld":
+                text += NUMBERING_CHARS
+            usage.add(props["typeface"], props["bold"], props["italic"], text, props["caps"])
+            first_typeface = first_typeface or props["typeface"]
+
+        bullet = para_props.get("bullet")
+        if bullet and first_typeface:
+            usage.add(para_props.get("bullet_typeface") or first_typeface, False, False, bullet)
+
+
+def _scan_pptx(zf, usage):
+    themes = sorted(n for n in zf.namelist() if n.startswith("ppt/theme/") and n.endswith(".xml"))
+    default_theme = themes[0] if themes else None
+
+    for part in sorted(zf.namelist()):
+        if not part.startswith("ppt/") or not part.endswith(".xml") or "/_rels/" in part:
+            continue
+        folder = posixpath.dirname(part)
+        if folder == "ppt/slides":
+            layout = _related(zf, part, "slideLayout")
+            master = _related(zf, layout, "slideMaster") if layout else None
+        elif folder == "ppt/slideLayouts":
+            master = _related(zf, part, "slideMaster")
+        elif folder == "ppt/slideMasters":
+            master = part
+        elif folder in ("ppt/charts", "ppt/diagrams"):
+            master = None
+        else:
+            continue
+
+        theme_part = (_related(zf, master, "theme") if master else None) or default_theme
+        theme = _theme_fonts(zf, theme_part)
+        root = _read_xml(zf, part)
+        _scan_dml_part(
+            root, usage, theme,
+            _master_styles(zf, master, theme),
+            skip_placeholders=folder in ("ppt/slideLayouts", "ppt/slideMasters"),
+        )
+
+
+# ---------------------------------------------------------------------------
+# WordprocessingML
+# ---------------------------------------------------------------------------
+
+def _w_bool(element):
+    if element is None:
+        return None
+    return element.get(f"{W}val", "true") not in ("0", "false", "off")
+
+
+def _w_run_props(rpr, theme):
+    """Properties set directly on a ``w:rPr``."""
+    if rpr is None:
+        return {}
+    typeface = None
+    fonts = rpr.find(f"{W}rFonts")
+    if fonts is not None:
+        theme_ref = fonts.get(f"{W}asciiTheme") or fonts.get(f"{W}hAnsiTheme")
+        if theme_ref:
+            typeface = theme["major" if theme_ref.startswith("major") else "minor"]
+        else:
+            typeface = fonts.get(f"{W}ascii") or fonts.get(f"{W}hAnsi")
+    caps = _w_bool(rpr.find(f"{W}caps"))
+    small_caps = _w_bool(rpr.find(f"{W}smallCaps"))
+    return {
+        "typeface": typeface,
+        "bold": _w_bool(rpr.find(f"{W}b")),
+        "italic": _w_bool(rpr.find(f"{W}i")),
+        "caps": None if caps is None and small_caps is None else bool(caps or small_caps),
+    }
+
+
+def _w_styles(zf, theme):
+    """``(defaults, {style id: (props, based on)}, default paragraph style id)``."""
+    defaults = {"typeface": theme["minor"], "bold": False, "italic": False, "caps": False}
+    styles = {}
+    default_para = None
+    root = _read_xml(zf, "word/styles.xml")
+    if root is None:
+        return defaults, styles, default_para
+
+    doc_rpr = root.find(f"{W}docDefaults/{W}rPrDefault/{W}rPr")
+    defaults = _inherit(_w_run_props(doc_rpr, theme), defaults)
+    for style in root.iter(f"{W}style"):
+        style_id = style.get(f"{W}styleId")
+        based_on = style.find(f"{W}basedOn")
+        styles[style_id] = (
+            _w_run_props(style.find(f"{W}rPr"), theme),
+            based_on.get(f"{W}val") if based_on is not None else None,
+        )
+        if style.get(f"{W}type") == "paragraph" and style.get(f"{W}default") in ("1", "true"):
+            default_para = style_id
+    return defaults, styles, default_para
+
+
+def _w_style_chain(styles, style_id):
+    """Run properties of a style, following ``w:basedOn``."""
+    props = {}
+    seen = set()
+    while style_id in styles and style_id not in seen:
+        seen.add(style_id)
+        own, style_id = styles[style_id]
+        props = _inherit(props, own)
+    return props
+
+
+def _w_own_runs(element):
+    """Runs belonging to a paragraph, not to paragraphs nested in text boxes."""
+    for child in element:
+        if child.tag == f"{W}r":
+            yield child
+        elif child.tag != f"{W}p":
+            yield from _w_own_runs(child)
+
+
+def _scan_w_numbering(zf, usage, theme, defaults):
+    """Record list bullet / number characters from numbering.xml."""
+    root = _read_xml(zf, "word/numbering.xml")
+    if root is None:
+        return
+    for level in root.iter(f"{W}lvl"):
+        props = _inherit(_w_run_props(level.find(f"{W}rPr"), theme), defaults)
+        fmt = level.find(f"{W}numFmt")
+        text = level.find(f"{W}lvlText")
+        chars = "".join(
+            ch for ch in (text.get(f"{W}val", "") if text is not None else "")
+            if ch != "%" and not ch.isdigit()
+        )
+        if fmt is not None and fmt.get(f"{W}val") not in ("bullet", "none"):
+            chars += NUMBERING_CHARS
+        usage.add(props["typeface"], props["bold"], props["italic"], chars)
+
+
+def _scan_docx(zf, usage):
+    theme = _theme_fonts(zf, "word/theme/theme1.xml")
+    defaults, styles, default_para = _w_styles(zf, theme)
+    _scan_w_numbering(zf, usage, theme, defaults)
+
+    for part in sorted(zf.namelist()):
+        name = posixpath.basename(part)
+        if posixpath.dirname(part) != "word" or not name.startswith(
+            ("document", "header", "footer", "footnotes", "endnotes")
+        ):
+            continue
+        root = _read_xml(zf, part)
+        for para in root.iter(f"{W}p"):
+            style = para.find(f"{W}pPr/{W}pStyle")
+            para_style = style.get(f"{W}val") if style is not None else default_para
+            para_props = _inherit(_w_style_chain(styles, para_style), defaults)
+
+            for run in _w_own_runs(para):
+                rpr = run.find(f"{W}rPr")
+                run_style = rpr.find(f"{W}rStyle") if rpr is not None else None
+                props = para_props
+                if run_style is not None:
+                    props = _inherit(_w_style_chain(styles, run_style.get(f"{W}val")), props)
+                props = _inherit(_w_run_props(rpr, theme), props)
+
+                text = "".join(t.text or "" for t in run.iter(f"{W}t"))
+                usage.add(props["typeface"], props["bold"], props["italic"], text, props["caps"])
+                for sym in run.iter(f"{W}sym"):
+                    try:
+                        usage.add(sym.get(f"{W}font") or props["typeface"], props["bold"],
+                                  props["italic"], chr(int(sym.get(f"{W}char", ""), 16)))
+                    except ValueError:
+                        pass
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def iter_documents(paths):
+    """Yield every .pptx/.docx under ``paths`` (files or directories), sorted."""
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from sorted(
+                p for p in path.rglob("*")
+                if p.suffix.lower() in DOCUMENT_SUFFIXES and not p.name.startswith("~$")
+            )
+        elif path.suffix.lower() in DOCUMENT_SUFFIXES:
+            yield path
+
+
+def scan_document(path):
+    """Return the FontUsage of a single .pptx or .docx file."""
+    usage = FontUsage()
+    try:
+        with zipfile.ZipFile(path) as zf:
+            if Path(path).suffix.lower() == ".docx":
+                _scan_docx(zf, usage)
+            else:
+                _scan_pptx(zf, usage)
+        usage.documents.append(str(path))
+    except (zipfile.BadZipFile, ElementTree.ParseError, OSError) as e:
+        usage.errors.append((str(path), str(e)))
+    return usage
+
+
+def scan_corpus(paths):
+    """Scan every document under ``paths`` and merge their FontUsage."""
+    usage = FontUsage()
+    for path in iter_documents(paths):
+        usage.merge(scan_document(path))
+    return usage
+
+
+def resolve_usage(usage):
+    """Map typeface usage onto bundled faces.
+
+    Returns ``(faces, unresolved)``: ``faces`` maps ``(family_id,
+    variant_name)`` → codepoint set, in FONT_FAMILIES order; ``unresolved``
+    maps typefaces with no bundled family → number of distinct codepoints.
+    """
+    index = family_index()
+    found = defaultdict(set)
+    unresolved = defaultdict(set)
+
+    for (typeface, bold, italic), codepoints in usage.faces.items():
+        family_id = index.get(typeface.lower())
+        if family_id is None:
+            unresolved[typeface] |= codepoints
+            continue
+        found[(family_id, pick_variant(FONT_FAMILIES[family_id], bold, italic))] |= codepoints
+
+    faces = {
+        (family_id, variant_name): found[(family_id, variant_name)]
+        for family_id, family_def in FONT_FAMILIES.items()
+        for variant_name in family_def["variants"]
+        if (family_id, variant_name) in found
+    }
+    return faces, {name: len(cps) for name, cps in sorted(unresolved.items())}
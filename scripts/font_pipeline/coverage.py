@@ -0,0 +1,178 @@
+"""
+Codepoint coverage of every bundled face, and the fallback table built from it.
+
+Each face's source cmap is intersected with CODEPOINTS (the union of
+UNICODE_RANGES), which is exactly what its subsets can draw. From that:
+
+- ``coverage_index()`` maps each codepoint to the faces that cover it.
+- ``fallback_table()`` gives each codepoint the first family that covers it,
+  in fallback order. The order is FALLBACK_FAMILIES first, then every other
+  family in declaration order. The table is stored in the companion
+  manifest as ``fallback``:
+
+      {"families": [family id, ...], "ranges": [[start, end, family index], ...]}
+
+  Ranges are sorted, inclusive runs of codepoints that share a fallback
+  family. Codepoints no family covers are left out. ``decodeFallbackTable()``
+  in packages/core/src/font/fallback-table.ts expands it into a map once,
+  so the runtime finds a fallback face for a missing character in O(1)
+  instead of probing fonts.
+- ``coverage_gaps()`` lists, per family, the codepoints its primary face
+  lacks, split into those a fallback family covers and those nothing
+  covers.
+
+A family's coverage is that of its primary (regular) face, which is what
+unstyled text renders with. Face coverage is cached next to the subsets.
+"""
+
+import json
+from collections import namedtuple
+
+from . import FONTS_DIR
+from .families import CODEPOINTS, FALLBACK_FAMILIES, FONT_FAMILIES, codepoint_ranges, pick_variant, range_codepoints
+from .parallel import map_ordered
+from .subset import subset_options
+
+COVERAGE_VERSION = 1
+
+# Codepoints a family's primary face lacks: ``fallback`` maps each one another
+# family covers to that family's id, ``uncovered`` are mapped by no family.
+FamilyGaps = namedtuple("FamilyGaps", ["covered", "fallback", "uncovered"])
+
+
+def face_coverage(source_path, cache=None):
+    """Codepoints of CODEPOINTS the face at ``source_path`` maps, as a set."""
+    from fontTools.ttLib import TTFont
+
+    key = None
+    if cache is not None:
+        key = cache.key(source_path, CODEPOINTS, subset_options(), "coverage", extra=(COVERAGE_VERSION,))
+        data = cache.get(key)
+        if data is not None:
+            return range_codepoints(json.loads(data))
+
+    font = TTFont(source_path, lazy=True)
+    covered = set(font.getBestCmap() or {}) & CODEPOINTS
+    if cache is not None:
+        cache.put(key, json.dumps(codepoint_ranges(covered), separators=(",", ":")).encode())
+    return covered
+
+
+def collect_coverage(families=FONT_FAMILIES, cache=None, jobs=1):
+    """``{(family id, variant): codepoint set}`` for every face whose source exists.
+
+    Each distinct source file is read once, on ``jobs`` processes.
+    """
+    faces = [
+        (family_id, variant_name, ttf_filename)
+        for family_id, family_def in families.items()
+        for variant_name, ttf_filename in family_def["variants"].items()
+        if (FONTS_DIR / ttf_filename).exists()
+    ]
+    filenames = sorted({ttf_filename for _, _, ttf_filename in faces})
+    tasks = [(FONTS_DIR / filename, cache) for filename in filenames]
+    if jobs <= 1:
+        results = [face_coverage(*task) for task in tasks]
+    else:
+        results = map_ordered(face_coverage, tasks, jobs)
+    by_file = dict(zip(filenames, results))
+    return {(family_id, variant_name): by_file[ttf_filename] for family_id, variant_name, ttf_filename in faces}
+
+
+def coverage_index(coverage):
+    """``{codepoint: ["family/variant", ...]}`` over ``collect_coverage()`` output.
+
+    Faces are listed in ``coverage`` order; codepoints no face maps are absent.
+    """
+    index = {}
+    for (family_id, variant_name), codepoints in coverage.items():
+        for cp in codepoints:
+            index.setdefault(cp, []).append(f"{family_id}/{variant_name}")
+    return dict(sorted(index.items()))
+
+
+def family_coverage(coverage, families=FONT_FAMILIES):
+    """``{family id: codepoint set}`` of each family's primary face.
+
+    Families whose primary face is missing are left out.
+    """
+    result = {}
+    for family_id, family_def in families.items():
+        primary = (family_id, pick_variant(family_def, False, False))
+        if primary in coverage:
+            result[family_id] = coverage[primary]
+    return result
+
+
+def fallback_order(family_ids):
+    """``family_ids`` ordered for fallback: FALLBACK_FAMILIES, then declaration order."""
+    preferred = [family_id for family_id in FALLBACK_FAMILIES if family_id in family_ids]
+    return preferred + [family_id for family_id in FONT_FAMILIES if family_id in family_ids and family_id not in preferred]
+
+
+def first_coverers(families):
+    """``{codepoint: family id}``: the first family in fallback order that covers each codepoint."""
+    first = {}
+    for family_id in fallback_order(families):
+        for cp in families[family_id]:
+            first.setdefault(cp, family_id)
+    return first
+
+
+def fallback_table(families):
+    """Compact fallback table (see module docstring) for ``family_coverage()`` output."""
+    first = first_coverers(families)
+    order = [family_id for family_id in fallback_order(families) if family_id in first.values()]
+    indices = {family_id: i for i, family_id in enumerate(order)}
+    ranges = []
+    for cp in sorted(first):
+        index = indices[first[cp]]
+        if ranges and ranges[-1][1] == cp - 1 and ranges[-1][2] == index:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp, index])
+    return {"families": order, "ranges": ranges}
+
+
+def package_fallback_table(family_ids, cache=None, jobs=1):
+    """``fallback_table()`` over the FONT_FAMILIES entries in ``family_ids`` (e.g. a manifest's)."""
+    families = {family_id: family_def for family_id, family_def in FONT_FAMILIES.items() if family_id in family_ids}
+    return fallback_table(family_coverage(collect_coverage(families, cache, jobs), families))
+
+
+def coverage_gaps(families):
+    """``{family id: FamilyGaps}`` for ``family_coverage()`` output.
+
+    A codepoint a family lacks falls back to the first other family, in
+    fallback order, that covers it.
+    """
+    order = fallback_order(families)
+    gaps = {}
+    for family_id in order:
+        fallback = {}
+        uncovered = set()
+        for cp in sorted(CODEPOINTS - families[family_id]):
+            coverer = next((other for other in order if other != family_id and cp in families[other]), None)
+            if coverer is None:
+                uncovered.add(cp)
+            else:
+                fallback[cp] = coverer
+        gaps[family_id] = FamilyGaps(len(families[family_id]), fallback, uncovered)
+    return gaps
+
+
+def fallback_groups(family_gaps):
+    """``{fallback family id: codepoint set}`` of one family's ``FamilyGaps``."""
+    groups = {}
+    for cp, coverer in family_gaps.fallback.items():
+        groups.setdefault(coverer, set()).add(cp)
+    return groups
+
+
+def format_ranges(codepoints, limit=8):
+    """``"U+2600-26FF, U+FFFC"``, with at most ``limit`` ranges listed."""
+    ranges = codepoint_ranges(codepoints)
+    parts = [f"U+{start:04X}" if start == end else f"U+{start:04X}-{end:04X}" for start, end in ranges[:limit]]
+    if len(ranges) > limit:
+        parts.append(f"... {len(ranges) - limit} more")
+    return ", ".join(parts)
@@ -0,0 +1,98 @@
+"""
+Content-hash deduplication of faces shared between families.
+
+Several FONT_FAMILIES entries point at the same source file; e.g.
+"calibri-light" maps ``regular`` to Carlito-Regular.ttf, which "carlito"
+ships too. Without deduplication those bytes are subset, compressed and
+embedded once per family.
+
+Core bundles: ``shared_faces()`` hashes every source file and assigns each
+distinct digest to the first face that uses it, in FONT_FAMILIES
+declaration order. Every face in a bundle is subset with the same
+codepoints and options, so faces with identical sources have identical
+output, and the plan is known before anything is subset (which also keeps
+it valid for skipped ``--incremental`` modules). Later faces become
+``SharedFace`` aliases: typescript.py emits them as re-exports from the
+owner's module, fontpack.py leaves them out of the pack, and both
+manifest.ts flavors list them under ``aliases``.
+
+Companion package: ``dedupe_package_files()`` runs after the files are
+written and hashes the files themselves. A file whose bytes match an
+earlier one is deleted, and its manifest entry points at the first copy.
+"""
+
+from collections import namedtuple
+
+from . import FONTS_DIR
+from .cache import file_digest
+from .families import FONT_FAMILIES
+
+# A face whose bytes are stored under another family's module / variant.
+SharedFace = namedtuple("SharedFace", ["module", "variant"])
+
+
+def shared_faces(families=FONT_FAMILIES):
+    """``{(family id, variant): SharedFace}`` for faces that repeat an earlier face.
+
+    Faces whose source file is missing are ignored.
+    """
+    digests = {}
+    owners = {}
+    shared = {}
+    for family_id, family_def in families.items():
+        for variant_name, ttf_filename in family_def["variants"].items():
+            ttf_path = FONTS_DIR / ttf_filename
+            if not ttf_path.exists():
+                continue
+            if ttf_filename not in digests:
+                digests[ttf_filename] = file_digest(ttf_path)
+            face = SharedFace(family_id, variant_name)
+            owner = owners.setdefault(digests[ttf_filename], face)
+            if owner != face:
+                shared[(family_id, variant_name)] = owner
+    return shared
+
+
+def family_aliases(family_id, shared):
+    """``{variant: SharedFace}`` for one family's entries in ``shared_faces()``."""
+    return {
+        variant_name: owner
+        for (alias_family, variant_name), owner in shared.items()
+        if alias_family == family_id
+    }
+
+
+def dedupe_package_files(manifest_families, output_dir):
+    """Replace byte-identical package files with references to the first copy.
+
+    Walks every ``{"file": ...}`` entry of ``manifest_families`` in
+    FONT_FAMILIES declaration order (like ``shared_faces()``), deletes files
+    whose SHA-256 matches an earlier file and rewrites the entry's ``file``
+    to the earlier path. Directories left empty are removed. Returns
+    ``(files removed, bytes saved)``.
+    """
+    first_by_digest = {}
+    removed = 0
+    saved = 0
+    for family_id in FONT_FAMILIES:
+        for section in manifest_families.get(family_id, {}).values():
+            if not isinstance(section, dict):
+                continue
+            for info in section.values():
+                if not isinstance(info, dict) or "file" not in info:
+                    continue
+                path = output_dir / info["file"]
+                size = path.stat().st_size
+                digest = file_digest(path)
+                first = first_by_digest.setdefault(digest, info["file"])
+                if first == info["file"]:
+                    continue
+                path.unlink()
+                try:
+                    path.parent.rmdir()
+                except OSError:
+                    pass  # not empty
+                info["file"] = first
+                removed += 1
+                saved += size
+    return removed, saved
@@ -0,0 +1,631 @@
+"""
+Font family definitions and subset codepoints shared by every font script.
+
+FONT_FAMILIES is the single source of truth for which faces get bundled:
+the key is the module / package family id, ``register_as`` is the name the
+face is registered under, ``substitute_for`` the Office font it stands in
+for, and ``variants`` maps variant name → source file in fonts/.
+"""
+
+# Unicode ranges to keep: Latin + symbols (same as metrics extraction)
+UNICODE_RANGES = [
+    (0x0020, 0x024F),   # Basic Latin through Latin Extended-B
+    (0x2000, 0x206F),   # General Punctuation
+    (0x20A0, 0x20CF),   # Currency Symbols
+    (0x2100, 0x214F),   # Letterlike Symbols
+    (0x2190, 0x21FF),   # Arrows
+    (0x2200, 0x22FF),   # Mathematical Operators
+    (0x2300, 0x23FF),   # Miscellaneous Technical
+    (0x25A0, 0x25FF),   # Geometric Shapes
+    (0x2600, 0x26FF),   # Miscellaneous Symbols
+    (0xFB00, 0xFB06),   # Alphabetic Presentation Forms (ligatures)
+    (0xFEFF, 0xFEFF),   # BOM / ZWNBS
+    (0xFFFC, 0xFFFD),   # Replacement characters
+]
+
+CODEPOINTS = set()
+for start, end in UNICODE_RANGES:
+    for cp in range(start, end + 1):
+        CODEPOINTS.add(cp)
+
+# Companion-package shards: each WOFF2 face is split into one file per shard
+# so the browser (via the CSS unicode-range descriptor) only fetches shards
+# whose characters a document uses. Together they cover UNICODE_RANGES
+# exactly; order here is the order of "subsets" in manifest.json.
+SHARDS = [
+    ("latin", [
+        (0x0020, 0x00FF),   # Basic Latin + Latin-1 Supplement
+        (0xFB00, 0xFB06),   # Alphabetic Presentation Forms (ligatures)
+        (0xFEFF, 0xFEFF),   # BOM / ZWNBS
+        (0xFFFC, 0xFFFD),   # Replacement characters
+    ]),
+    ("latin-ext", [
+        (0x0100, 0x024F),   # Latin Extended-A and -B
+    ]),
+    ("punctuation", [
+        (0x2000, 0x206F),   # General Punctuation
+        (0x20A0, 0x20CF),   # Currency Symbols
+        (0x2100, 0x214F),   # Letterlike Symbols
+    ]),
+    ("arrows-math", [
+        (0x2190, 0x21FF),   # Arrows
+        (0x2200, 0x22FF),   # Mathematical Operators
+        (0x2300, 0x23FF),   # Miscellaneous Technical
+    ]),
+    ("symbols", [
+        (0x25A0, 0x25FF),   # Geometric Shapes
+        (0x2600, 0x26FF),   # Miscellaneous Symbols
+    ]),
+]
+
+
+def range_codepoints(ranges):
+    """Expand [(start, end), ...] (inclusive) into a set of codepoints."""
+    return {cp for start, end in ranges for cp in range(start, end + 1)}
+
+
+def codepoint_ranges(codepoints):
+    """Collapse a codepoint set into sorted inclusive [(start, end), ...]."""
+    ranges = []
+    for cp in sorted(codepoints):
+        if ranges and cp == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], cp)
+        else:
+            ranges.append((cp, cp))
+    return ranges
+
+
+def css_unicode_range(ranges):
+    """Format [(start, end), ...] as a CSS unicode-range value."""
+    return ", ".join(
+        f"U+{start:04X}" if start == end else f"U+{start:04X}-{end:04X}"
+        for start, end in ranges
+    )
+
+
+assert set().union(*(range_codepoints(r) for _, r in SHARDS)) == CODEPOINTS, \
+    "SHARDS must cover UNICODE_RANGES exactly"
+
+# Variant name → (weight, style) mapping
+VARIANT_MAP = {
+    "regular": (400, "normal"),
+    "bold": (700, "normal"),
+    "italic": (400, "italic"),
+    "boldItalic": (700, "italic"),
+}
+
+# Font family definitions: module_name → { register_as, substitute_for, license, variants }
+FONT_FAMILIES = {
+    # Office core font substitutes
+    "carlito": {
+        "register_as": "Carlito",
+        "substitute_for": "Calibri",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "Carlito-Regular.ttf",
+            "bold": "Carlito-Bold.ttf",
+            "italic": "Carlito-Italic.ttf",
+            "boldItalic": "Carlito-BoldItalic.ttf",
+        },
+    },
+    "calibri-light": {
+        "register_as": "Calibri Light",
+        "substitute_for": "Calibri Light",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "Carlito-Regular.ttf",
+        },
+    },
+    "caladea": {
+        "register_as": "Caladea",
+        "substitute_for": "Cambria",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "Caladea-Regular.ttf",
+            "bold": "Caladea-Bold.ttf",
+            "italic": "Caladea-Italic.ttf",
+            "boldItalic": "Caladea-BoldItalic.ttf",
+        },
+    },
+    "liberation-sans": {
+        "register_as": "Liberation Sans",
+        "substitute_for": "Arial",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "LiberationSans-Regular.ttf",
+            "bold": "LiberationSans-Bold.ttf",
+            "italic": "LiberationSans-Italic.ttf",
+            "boldItalic": "LiberationSans-BoldItalic.ttf",
+        },
+    },
+    "liberation-serif": {
+        "register_as": "Liberation Serif",
+        "substitute_for": "Times New Roman",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "LiberationSerif-Regular.ttf",
+            "bold": "LiberationSerif-Bold.ttf",
+            "italic": "LiberationSerif-Italic.ttf",
+            "boldItalic": "LiberationSerif-BoldItalic.ttf",
+        },
+    },
+    "liberation-mono": {
+        "register_as": "Liberation Mono",
+        "substitute_for": "Courier New",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "LiberationMono-Regular.ttf",
+            "bold": "LiberationMono-Bold.ttf",
+            "italic": "LiberationMono-Italic.ttf",
+            "boldItalic": "LiberationMono-BoldItalic.ttf",
+        },
+    },
+    "selawik": {
+        "register_as": "Selawik",
+        "substitute_for": "Segoe UI",
+        "license": "MIT",
+        "variants": {
+            "regular": "Selawik-Regular.ttf",
+            "bold": "Selawik-Bold.ttf",
+        },
+    },
+    "selawik-light": {
+        "register_as": "Selawik Light",
+        "substitute_for": "Segoe UI Light",
+        "license": "MIT",
+        "variants": {
+            "regular": "Selawik-Light.ttf",
+        },
+    },
+    "selawik-semibold": {
+        "register_as": "Selawik Semibold",
+        "substitute_for": "Segoe UI Semibold",
+        "license": "MIT",
+        "variants": {
+            "regular": "Selawik-Semibold.ttf",
+        },
+    },
+    "selawik-semilight": {
+        "register_as": "Selawik Semilight",
+        "substitute_for": "Segoe UI Semilight",
+        "license": "MIT",
+        "variants": {
+            "regular": "Selawik-Semilight.ttf",
+        },
+    },
+    "gelasio": {
+        "register_as": "Gelasio",
+        "substitute_for": "Georgia",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "Gelasio-Regular.ttf",
+            "bold": "Gelasio-Bold.ttf",
+            "italic": "Gelasio-Italic.ttf",
+            "boldItalic": "Gelasio-BoldItalic.ttf",
+        },
+    },
+    "liberation-sans-narrow": {
+        "register_as": "Liberation Sans Narrow",
+        "substitute_for": "Arial Narrow",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "LiberationSansNarrow-Regular.ttf",
+            "bold": "LiberationSansNarrow-Bold.ttf",
+            "italic": "LiberationSansNarrow-Italic.ttf",
+            "boldItalic": "LiberationSansNarrow-BoldItalic.ttf",
+        },
+    },
+    "tex-gyre-pagella": {
+        "register_as": "TeX Gyre Pagella",
+        "substitute_for": "Palatino Linotype",
+        "license": "GUST-Font-License",
+        "variants": {
+            "regular": "texgyrepagella-regular.otf",
+            "bold": "texgyrepagella-bold.otf",
+            "italic": "texgyrepagella-italic.otf",
+            "boldItalic": "texgyrepagella-bolditalic.otf",
+        },
+    },
+    "tex-gyre-bonum": {
+        "register_as": "TeX Gyre Bonum",
+        "substitute_for": "Bookman Old Style",
+        "license": "GUST-Font-License",
+        "variants": {
+            "regular": "texgyrebonum-regular.otf",
+            "bold": "texgyrebonum-bold.otf",
+            "italic": "texgyrebonum-italic.otf",
+            "boldItalic": "texgyrebonum-bolditalic.otf",
+        },
+    },
+    "tex-gyre-schola": {
+        "register_as": "TeX Gyre Schola",
+        "substitute_for": "Century Schoolbook",
+        "license": "GUST-Font-License",
+        "variants": {
+            "regular": "texgyreschola-regular.otf",
+            "bold": "texgyreschola-bold.otf",
+            "italic": "texgyreschola-italic.otf",
+            "boldItalic": "texgyreschola-bolditalic.otf",
+        },
+    },
+    # Google Fonts families
+    "arimo": {
+        "register_as": "Arimo",
+        "license": "Apache-2.0",
+        "variants": {
+            "regular": "Arimo-Regular.ttf",
+            "bold": "Arimo-Bold.ttf",
+            "italic": "Arimo-Italic.ttf",
+            "boldItalic": "Arimo-BoldItalic.ttf",
+        },
+    },
+    "barlow": {
+        "register_as": "Barlow",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "Barlow-Regular.ttf",
+            "bold": "Barlow-Bold.ttf",
+            "italic": "Barlow-Italic.ttf",
+            "boldItalic": "Barlow-BoldItalic.ttf",
+        },
+    },
+    "barlow-light": {
+        "register_as": "Barlow Light",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "Barlow-Light.ttf",
+            "italic": "Barlow-LightItalic.ttf",
+        },
+    },
+    "barlow-medium": {
+        "register_as": "Barlow Medium",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "Barlow-Medium.ttf",
+        },
+    },
+    "comfortaa": {
+        "register_as": "Comfortaa",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "Comfortaa-Regular.ttf",
+            "bold": "Comfortaa-Bold.ttf",
+        },
+    },
+    "comfortaa-light": {
+        "register_as": "Comfortaa Light",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "Comfortaa-Light.ttf",
+        },
+    },
+    "courier-prime": {
+        "register_as": "Courier Prime",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "CourierPrime-Regular.ttf",
+            "bold": "CourierPrime-Bold.ttf",
+            "italic": "CourierPrime-Italic.ttf",
+            "boldItalic": "CourierPrime-BoldItalic.ttf",
+        },
+    },
+    "fira-code": {
+        "register_as": "Fira Code",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "FiraCode-Regular.ttf",
+            "bold": "FiraCode-Bold.ttf",
+        },
+    },
+    "lato": {
+        "register_as": "Lato",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "Lato-Regular.ttf",
+            "bold": "Lato-Bold.ttf",
+            "italic": "Lato-Italic.ttf",
+            "boldItalic": "Lato-BoldItalic.ttf",
+        },
+    },
+    "lato-light": {
+        "register_as": "Lato Light",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "Lato-Light.ttf",
+            "italic": "Lato-LightItalic.ttf",
+        },
+    },
+    "montserrat": {
+        "register_as": "Montserrat",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "Montserrat-Regular.ttf",
+            "bold": "Montserrat-Bold.ttf",
+            "italic": "Montserrat-Italic.ttf",
+            "boldItalic": "Montserrat-BoldItalic.ttf",
+        },
+    },
+    "noto-sans": {
+        "register_as": "Noto Sans",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "NotoSans-Regular.ttf",
+            "bold": "NotoSans-Bold.ttf",
+            "italic": "NotoSans-Italic.ttf",
+            "boldItalic": "NotoSans-BoldItalic.ttf",
+        },
+    },
+    "noto-sans-symbols": {
+        "register_as": "Noto Sans Symbols",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "NotoSansSymbols-Regular.ttf",
+            "bold": "NotoSansSymbols-Bold.ttf",
+        },
+    },
+    "noto-serif": {
+        "register_as": "Noto Serif",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "NotoSerif-Regular.ttf",
+            "bold": "NotoSerif-Bold.ttf",
+            "italic": "NotoSerif-Italic.ttf",
+            "boldItalic": "NotoSerif-BoldItalic.ttf",
+        },
+    },
+    "open-sans": {
+        "register_as": "Open Sans",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "OpenSans-Regular.ttf",
+            "bold": "OpenSans-Bold.ttf",
+        },
+    },
+    "open-sans-extrabold": {
+        "register_as": "Open Sans ExtraBold",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "OpenSans-ExtraBold.ttf",
+        },
+    },
+    "oswald": {
+        "register_as": "Oswald",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "Oswald-Regular.ttf",
+            "bold": "Oswald-Bold.ttf",
+        },
+    },
+    "play": {
+        "register_as": "Play",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "Play-Regular.ttf",
+            "bold": "Play-Bold.ttf",
+        },
+    },
+    "playfair-display": {
+        "register_as": "Playfair Display",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "PlayfairDisplay-Regular.ttf",
+            "bold": "PlayfairDisplay-Bold.ttf",
+            "italic": "PlayfairDisplay-Italic.ttf",
+            "boldItalic": "PlayfairDisplay-BoldItalic.ttf",
+        },
+    },
+    "poppins": {
+        "register_as": "Poppins",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "Poppins-Regular.ttf",
+            "bold": "Poppins-Bold.ttf",
+            "italic": "Poppins-Italic.ttf",
+            "boldItalic": "Poppins-BoldItalic.ttf",
+        },
+    },
+    "raleway": {
+        "register_as": "Raleway",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "Raleway-Regular.ttf",
+            "bold": "Raleway-Bold.ttf",
+            "italic": "Raleway-Italic.ttf",
+            "boldItalic": "Raleway-BoldItalic.ttf",
+        },
+    },
+    "roboto": {
+        "register_as": "Roboto",
+        "license": "Apache-2.0",
+        "variants": {
+            "regular": "Roboto-Regular.ttf",
+            "bold": "Roboto-Bold.ttf",
+            "italic": "Roboto-Italic.ttf",
+            "boldItalic": "Roboto-BoldItalic.ttf",
+        },
+    },
+    "roboto-mono": {
+        "register_as": "Roboto Mono",
+        "license": "Apache-2.0",
+        "variants": {
+            "regular": "RobotoMono-Regular.ttf",
+            "bold": "RobotoMono-Bold.ttf",
+            "italic": "RobotoMono-Italic.ttf",
+            "boldItalic": "RobotoMono-BoldItalic.ttf",
+        },
+    },
+    "roboto-slab": {
+        "register_as": "Roboto Slab",
+        "license": "Apache-2.0",
+        "variants": {
+            "regular": "RobotoSlab-Regular.ttf",
+            "bold": "RobotoSlab-Bold.ttf",
+        },
+    },
+    "roboto-slab-light": {
+        "register_as": "Roboto Slab Light",
+        "license": "Apache-2.0",
+        "variants": {
+            "regular": "RobotoSlab-Light.ttf",
+        },
+    },
+    "roboto-slab-medium": {
+        "register_as": "Roboto Slab Medium",
+        "license": "Apache-2.0",
+        "variants": {
+            "regular": "RobotoSlab-Medium.ttf",
+        },
+    },
+    "roboto-slab-semibold": {
+        "register_as": "Roboto Slab SemiBold",
+        "license": "Apache-2.0",
+        "variants": {
+            "regular": "RobotoSlab-SemiBold.ttf",
+        },
+    },
+    "source-code-pro": {
+        "register_as": "Source Code Pro",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "SourceCodePro-Regular.ttf",
+            "bold": "SourceCodePro-Bold.ttf",
+            "italic": "SourceCodePro-Italic.ttf",
+            "boldItalic": "SourceCodePro-BoldItalic.ttf",
+        },
+    },
+    "source-sans-pro": {
+        "register_as": "Source Sans Pro",
+        "license": "OFL-1.1",
+        "variants": {
+            "regular": "SourceSans3-Regular.ttf",
+            "bold": "SourceSans3-Bold.ttf",
+            "italic": "SourceSans3-Italic.ttf",
+            "boldItalic": "SourceSans3-BoldItalic.ttf",
+        },
+    },
+    "tinos": {
+        "register_as": "Tinos",
+        "license": "Apache-2.0",
+        "variants": {
+            "regular": "Tinos-Regular.ttf",
+            "bold": "Tinos-Bold.ttf",
+            "italic": "Tinos-Italic.ttf",
+            "boldItalic": "Tinos-BoldItalic.ttf",
+        },
+    },
+    "ubuntu": {
+        "register_as": "Ubuntu",
+        "license": "Ubuntu-Font-License-1.0",
+        "variants": {
+            "regular": "Ubuntu-Regular.ttf",
+            "bold": "Ubuntu-Bold.ttf",
+            "italic": "Ubuntu-Italic.ttf",
+            "boldItalic": "Ubuntu-BoldItalic.ttf",
+        },
+    },
+}
+
+# (bold, italic) → variant name, and the variants to fall back to, in order,
+# when a family doesn't ship the requested one (the browser synthesizes it).
+STYLE_VARIANTS = {
+    (False, False): ("regular",),
+    (True, False): ("bold", "regular"),
+    (False, True): ("italic", "regular"),
+    (True, True): ("boldItalic", "bold", "italic", "regular"),
+}
+
+# Families tried first, in order, for characters a face doesn't map; every
+# other family follows in declaration order (see coverage.py).
+FALLBACK_FAMILIES = ("noto-sans", "noto-sans-symbols", "noto-serif", "liberation-sans")
+
+
+# Static source file in fonts/ → (variable source in fonts/.variable/, axis
+# coordinates). These faces are only published as variable fonts upstream;
+# instance-variable-fonts.py cuts the statics, and generate-font-package.py
+# --variable can ship the variable source itself (see variable.py).
+VARIABLE_INSTANCES = {
+    "FiraCode-Regular.ttf": ("FiraCode[wght].ttf", {"wght": 400}),
+    "FiraCode-Bold.ttf": ("FiraCode[wght].ttf", {"wght": 700}),
+    "Montserrat-Regular.ttf": ("Montserrat[wght].ttf", {"wght": 400}),
+    "Montserrat-Bold.ttf": ("Montserrat[wght].ttf", {"wght": 700}),
+    "Montserrat-Italic.ttf": ("Montserrat-Italic[wght].ttf", {"wght": 400}),
+    "Montserrat-BoldItalic.ttf": ("Montserrat-Italic[wght].ttf", {"wght": 700}),
+    "Oswald-Regular.ttf": ("Oswald[wght].ttf", {"wght": 400}),
+    "Oswald-Bold.ttf": ("Oswald[wght].ttf", {"wght": 700}),
+    "PlayfairDisplay-Regular.ttf": ("PlayfairDisplay[wght].ttf", {"wght": 400}),
+    "PlayfairDisplay-Bold.ttf": ("PlayfairDisplay[wght].ttf", {"wght": 700}),
+    "PlayfairDisplay-Italic.ttf": ("PlayfairDisplay-Italic[wght].ttf", {"wght": 400}),
+    "PlayfairDisplay-BoldItalic.ttf": ("PlayfairDisplay-Italic[wght].ttf", {"wght": 700}),
+    "Raleway-Regular.ttf": ("Raleway[wght].ttf", {"wght": 400}),
+    "Raleway-Bold.ttf": ("Raleway[wght].ttf", {"wght": 700}),
+    "Raleway-Italic.ttf": ("Raleway-Italic[wght].ttf", {"wght": 400}),
+    "Raleway-BoldItalic.ttf": ("Raleway-Italic[wght].ttf", {"wght": 700}),
+    "RobotoMono-Regular.ttf": ("RobotoMono[wght].ttf", {"wght": 400}),
+    "RobotoMono-Bold.ttf": ("RobotoMono[wght].ttf", {"wght": 700}),
+    "RobotoMono-Italic.ttf": ("RobotoMono-Italic[wght].ttf", {"wght": 400}),
+    "RobotoMono-BoldItalic.ttf": ("RobotoMono-Italic[wght].ttf", {"wght": 700}),
+    "SourceCodePro-Regular.ttf": ("SourceCodePro[wght].ttf", {"wght": 400}),
+    "SourceCodePro-Bold.ttf": ("SourceCodePro[wght].ttf", {"wght": 700}),
+    "SourceCodePro-Italic.ttf": ("SourceCodePro-Italic[wght].ttf", {"wght": 400}),
+    "SourceCodePro-BoldItalic.ttf": ("SourceCodePro-Italic[wght].ttf", {"wght": 700}),
+    "SourceSans3-Regular.ttf": ("SourceSans3[wght].ttf", {"wght": 400}),
+    "SourceSans3-Bold.ttf": ("SourceSans3[wght].ttf", {"wght": 700}),
+    "SourceSans3-Italic.ttf": ("SourceSans3-Italic[wght].ttf", {"wght": 400}),
+    "SourceSans3-BoldItalic.ttf": ("SourceSans3-Italic[wght].ttf", {"wght": 700}),
+    "Comfortaa-Regular.ttf": ("Comfortaa[wght].ttf", {"wght": 400}),
+    "Comfortaa-Bold.ttf": ("Comfortaa[wght].ttf", {"wght": 700}),
+    "Comfortaa-Light.ttf": ("Comfortaa[wght].ttf", {"wght": 300}),
+    "Gelasio-Regular.ttf": ("Gelasio[wght].ttf", {"wght": 400}),
+    "Gelasio-Bold.ttf": ("Gelasio[wght].ttf", {"wght": 700}),
+    "Gelasio-Italic.ttf": ("Gelasio-Italic[wght].ttf", {"wght": 400}),
+    "Gelasio-BoldItalic.ttf": ("Gelasio-Italic[wght].ttf", {"wght": 700}),
+    "Arimo-Regular.ttf": ("Arimo[wght].ttf", {"wght": 400}),
+    "Arimo-Bold.ttf": ("Arimo[wght].ttf", {"wght": 700}),
+    "Arimo-Italic.ttf": ("Arimo-Italic[wght].ttf", {"wght": 400}),
+    "Arimo-BoldItalic.ttf": ("Arimo-Italic[wght].ttf", {"wght": 700}),
+    "NotoSansSymbols-Regular.ttf": ("NotoSansSymbols[wght].ttf", {"wght": 400}),
+    "NotoSansSymbols-Bold.ttf": ("NotoSansSymbols[wght].ttf", {"wght": 700}),
+    "RobotoSlab-Regular.ttf": ("RobotoSlab[wght].ttf", {"wght": 400}),
+    "RobotoSlab-Bold.ttf": ("RobotoSlab[wght].ttf", {"wght": 700}),
+    "RobotoSlab-Light.ttf": ("RobotoSlab[wght].ttf", {"wght": 300}),
+    "RobotoSlab-Medium.ttf": ("RobotoSlab[wght].ttf", {"wght": 500}),
+    "RobotoSlab-SemiBold.ttf": ("RobotoSlab[wght].ttf", {"wght": 600}),
+    "NotoSans-Regular.ttf": ("NotoSans[wdth,wght].ttf", {"wght": 400, "wdth": 100}),
+    "NotoSans-Bold.ttf": ("NotoSans[wdth,wght].ttf", {"wght": 700, "wdth": 100}),
+    "NotoSans-Italic.ttf": ("NotoSans-Italic[wdth,wght].ttf", {"wght": 400, "wdth": 100}),
+    "NotoSans-BoldItalic.ttf": ("NotoSans-Italic[wdth,wght].ttf", {"wght": 700, "wdth": 100}),
+    "NotoSerif-Regular.ttf": ("NotoSerif[wdth,wght].ttf", {"wght": 400, "wdth": 100}),
+    "NotoSerif-Bold.ttf": ("NotoSerif[wdth,wght].ttf", {"wght": 700, "wdth": 100}),
+    "NotoSerif-Italic.ttf": ("NotoSerif-Italic[wdth,wght].ttf", {"wght": 400, "wdth": 100}),
+    "NotoSerif-BoldItalic.ttf": ("NotoSerif-Italic[wdth,wght].ttf", {"wght": 700, "wdth": 100}),
+    "Roboto-Regular.ttf": ("Roboto[wdth,wght].ttf", {"wght": 400, "wdth": 100}),
+    "Roboto-Bold.ttf": ("Roboto[wdth,wght].ttf", {"wght": 700, "wdth": 100}),
+    "Roboto-Italic.ttf": ("Roboto-Italic[wdth,wght].ttf", {"wght": 400, "wdth": 100}),
+    "Roboto-BoldItalic.ttf": ("Roboto-Italic[wdth,wght].ttf", {"wght": 700, "wdth": 100}),
+    "OpenSans-Regular.ttf": ("OpenSans[wdth,wght].ttf", {"wght": 400, "wdth": 100}),
+    "OpenSans-Bold.ttf": ("OpenSans[wdth,wght].ttf", {"wght": 700, "wdth": 100}),
+    "OpenSans-ExtraBold.ttf": ("OpenSans[wdth,wght].ttf", {"wght": 800, "wdth": 100}),
+}
+
+
+def family_index():
+    """Lower-cased typeface → FONT_FAMILIES id.
+
+    Registered names win over ``substitute_for`` names; within each, the
+    first family in declaration order wins.
+    """
+    index = {}
+    for key in ("register_as", "substitute_for"):
+        for family_id, family_def in FONT_FAMILIES.items():
+            name = family_def.get(key)
+            if name:
+                index.setdefault(name.lower(), family_id)
+    return index
+
+
+def pick_variant(family_def, bold, italic):
+    """Bundled variant the renderer would use for a bold/italic run."""
+    for variant_name in STYLE_VARIANTS[(bool(bold), bool(italic))]:
+        if variant_name in family_def["variants"]:
+            return variant_name
+    return next(iter(family_def["variants"]))
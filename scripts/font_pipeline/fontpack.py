@@ -0,0 +1,238 @@
+"""
+Binary font packs: one file per family holding every variant's raw bytes.
+
+An alternative to the base64 TypeScript modules (see typescript.py): no 33%
+base64 overhead and no multi-MB string literals for bundlers to parse. The
+index sits at the front of the file, so a reader can range-fetch the header
+and then only the variant it needs, or map the whole file and take zero-copy
+views into it (packages/core/src/font/font-pack.ts).
+
+Layout (all integers little-endian):
+
+    header  16 bytes           magic "ODFP", u16 version, u8 flavor, u8 0,
+                               u16 entry count, u16 0, u32 data offset
+    index   count x 56 bytes   variant name (ASCII, NUL-padded to 16 bytes),
+                               u32 offset, u32 length, SHA-256 (32 bytes)
+    data    payloads in index order, each starting on an 8-byte boundary
+
+Offsets are from the start of the file. Index entries with identical bytes
+share one payload. Variants whose bytes another family's pack already holds
+(see dedup.py) are left out of the pack; the pack's ``manifest.ts``, a
+generated loader stub mapping family names to pack files, lists them under
+``aliases`` and loads them from the owning pack.
+"""
+
+import hashlib
+import json
+import struct
+
+from .dedup import SharedFace, family_aliases, shared_faces
+from .families import FONT_FAMILIES
+from .incremental import AtomicWriter
+from .typescript import BUNDLES, _alias_lines, _existing_variants, bundle_manifest, write_family_module
+
+MAGIC = b"ODFP"
+VERSION = 1
+FLAVOR_CODES = {"woff2": 1, "ttf": 2}
+EXTENSION = ".fontpack"
+
+# Bundle output formats selectable with --format.
+FORMATS = ("ts", "pack")
+
+NAME_SIZE = 16
+HEADER = struct.Struct("<4sHBBHHI")
+ENTRY = struct.Struct(f"<{NAME_SIZE}sII32s")
+ALIGN = 8
+
+
+def _align(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def write_font_pack(output_path, kind, family_def, variants):
+    """Write one family's pack to ``output_path``.
+
+    Same contract as ``write_family_module()``: ``variants`` yields
+    ``(variant_name, subset_bytes)`` pairs in pack order, the file is only
+    replaced if its content changed, and ``(changed, digest)`` is returned.
+    The index needs every length up front, so a family's variants (a few MB
+    at most) are collected before writing; nothing is encoded or joined.
+    ``SharedFace`` variants are skipped, and variants with identical bytes
+    are stored once.
+    """
+    bundle = BUNDLES[kind]
+    payloads = []
+    for variant_name, data in variants:
+        ttf_filename = family_def["variants"][variant_name]
+        if isinstance(data, SharedFace):
+            print(f"  {variant_name}: {ttf_filename} → shared with {data.module}.{data.variant}")
+            continue
+        name = variant_name.encode("ascii")
+        if len(name) > NAME_SIZE:
+            raise ValueError(f"variant name too long for a font pack: {variant_name}")
+        payloads.append((variant_name, name, data))
+
+    data_offset = _align(HEADER.size + ENTRY.size * len(payloads))
+    index = []
+    stored = {}  # sha256 → offset of the payload already laid out
+    blobs = []
+    offset = data_offset
+    for _, name, data in payloads:
+        digest = hashlib.sha256(data).digest()
+        if digest not in stored:
+            stored[digest] = offset
+            blobs.append(data)
+            offset = _align(offset + len(data))
+        index.append(ENTRY.pack(name, stored[digest], len(data), digest))
+
+    with AtomicWriter(output_path) as out:
+        out.write(HEADER.pack(MAGIC, VERSION, FLAVOR_CODES[kind], 0, len(payloads), 0, data_offset))
+        out.write(b"".join(index))
+        position = HEADER.size + ENTRY.size * len(payloads)
+        for data in blobs:
+            out.write(b"\0" * (_align(position) - position))
+            out.write(data)
+            position = _align(position) + len(data)
+
+    for variant_name, _, data in payloads:
+        ttf_filename = family_def["variants"][variant_name]
+        print(f"  {variant_name}: {ttf_filename} → {len(data) / 1024:.1f} KB {bundle['label']}")
+
+    return out.changed, out.digest
+
+
+def read_font_pack_index(data):
+    """Parse a pack's header and index: ``{variant: (offset, length, sha256 hex)}``.
+
+    Raises ValueError if ``data`` doesn't start with a valid pack header.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("truncated font pack header")
+    magic, version, _flavor, _, count, _, _data_offset = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not a version {VERSION} font pack")
+    if len(data) < HEADER.size + ENTRY.size * count:
+        raise ValueError("truncated font pack index")
+
+    index = {}
+    for i in range(count):
+        name, offset, length, digest = ENTRY.unpack_from(data, HEADER.size + ENTRY.size * i)
+        index[name.rstrip(b"\0").decode("ascii")] = (offset, length, digest.hex())
+    return index
+
+
+def pack_manifest(kind, shared=None):
+    """Generate the pack directory's manifest.ts loader stub.
+
+    Entries are keyed like the base64 bundle manifest: lowercase register
+    name, plus the lowercase Office name each family stands in for.
+    ``shared`` is a ``shared_faces()`` plan (computed if omitted).
+    """
+    bundle = BUNDLES[kind]
+    if shared is None:
+        shared = shared_faces()
+    interface = bundle["pack_interface"]
+    const = bundle["pack_const"]
+    lines = [
+        f"// Auto-generated by scripts/{bundle['script']} --format pack",
+        "",
+        "import { loadFontPackVariant } from '../../font-pack.js';",
+        "",
+        f"export interface {interface} {{",
+        "  /** Pack file relative to this directory. */",
+        "  pack: string;",
+        "  /** Font family name to register under. */",
+        "  registerAs: string;",
+        "  /** If this is a substitute for an Office font, the original name. */",
+        "  substituteFor?: string;",
+        "  /** Variant names available for the family. */",
+        "  variants: string[];",
+        "  /** Variants stored in another family's pack, and where their bytes live. */",
+        "  aliases?: Record<string, { pack: string; variant: string }>;",
+        "}",
+        "",
+        f"/** {bundle['description']} as binary packs, keyed by lowercase family name. */",
+        f"export const {const}: Record<string, {interface}> = {{",
+    ]
+
+    entries = []
+    for module_name, family_def in sorted(FONT_FAMILIES.items()):
+        entries.append((family_def["register_as"], module_name, family_def))
+    # Reverse lookup entries for substitute_for names
+    for module_name, family_def in sorted(FONT_FAMILIES.items()):
+        sub_for = family_def.get("substitute_for")
+        if sub_for and sub_for.lower() != family_def["register_as"].lower():
+            entries.append((sub_for, module_name, family_def))
+
+    for name, module_name, family_def in entries:
+        # Only include variants whose TTF actually exists
+        variants = _existing_variants(family_def)
+        if not variants:
+            continue
+        sub_for = family_def.get("substitute_for")
+        lines.append(f"  '{name.lower()}': {{")
+        lines.append(f"    pack: './{module_name}{EXTENSION}',")
+        lines.append(f"    registerAs: '{name}',")
+        if sub_for:
+            lines.append(f"    substituteFor: '{sub_for}',")
+        lines.append(f"    variants: {json.dumps(variants)},")
+        lines.extend(_alias_lines(family_aliases(module_name, shared), "pack", EXTENSION))
+        lines.append("  },")
+
+    lines += [
+        "};",
+        "",
+        "/**",
+        " * Load one variant of a bundled family from its pack.",
+        " *",
+        " * Range-fetches the pack index and then just the variant's bytes, from the",
+        " * owning family's pack for aliased variants. Returns null if the family or",
+        " * variant isn't bundled, or the fetch fails.",
+        " */",
+        f"export async function {bundle['pack_loader']}(",
+        "  family: string,",
+        "  variant: string,",
+        "): Promise<Uint8Array | null> {",
+        f"  const entry = {const}[family.toLowerCase()];",
+        "  if (!entry || !entry.variants.includes(variant)) return null;",
+        "  const alias = entry.aliases?.[variant];",
+        "  if (alias) return loadFontPackVariant(new URL(alias.pack, import.meta.url), alias.variant);",
+        "  return loadFontPackVariant(new URL(entry.pack, import.meta.url), variant);",
+        "}",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def add_format_argument(parser):
+    """Register the shared --format option of the core bundle scripts."""
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="ts",
+        help="base64 TypeScript modules (ts, default) or binary font packs with a loader stub (pack)",
+    )
+
+
+def bundle_format(kind, fmt):
+    """Where and how a bundle kind is written in output format ``fmt``.
+
+    Returns a dict with ``output_dir``, ``suffix`` (per-family file
+    extension), ``write`` (``write_family_module``-compatible writer) and
+    ``manifest`` (manifest.ts generator taking an optional ``shared_faces()``
+    plan).
+    """
+    bundle = BUNDLES[kind]
+    if fmt == "pack":
+        return {
+            "output_dir": bundle["pack_dir"],
+            "suffix": EXTENSION,
+            "write": write_font_pack,
+            "manifest": lambda shared=None: pack_manifest(kind, shared),
+        }
+    return {
+        "output_dir": bundle["output_dir"],
+        "suffix": ".ts",
+        "write": write_family_module,
+        "manifest": lambda shared=None: bundle_manifest(kind, shared),
+    }
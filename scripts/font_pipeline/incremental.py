@@ -0,0 +1,133 @@
+"""
+Incremental-output helpers for the font bundle scripts.
+
+Generated TypeScript modules feed ``tsc`` and vitest watchers, which invalidate
+on mtime. These helpers let a script skip a module whose inputs are unchanged
+(``BuildState``) and avoid touching a file whose content is unchanged
+(``AtomicWriter`` / ``write_if_changed``).
+"""
+
+import filecmp
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from . import ROOT
+from .cache import file_digest
+
+STATE_DIR = ROOT / ".cache" / "font-build"
+
+
+def fingerprint(*parts):
+    """Combine string-able ``parts`` into one SHA-256 hex digest."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def pipeline_digest():
+    """Digest of the font_pipeline sources, for output fingerprints."""
+    h = hashlib.sha256()
+    for path in sorted(Path(__file__).resolve().parent.glob("*.py")):
+        h.update(path.name.encode("utf-8"))
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+class AtomicWriter:
+    """Stream bytes to ``path`` through a temp file, committing only changes.
+
+    Use as a context manager. On a clean exit the temp file replaces ``path``
+    unless ``path`` already holds identical bytes, in which case it is left
+    untouched (mtime preserved). ``changed`` and ``digest`` (SHA-256 of the
+    written bytes) are set on exit; on an exception nothing is committed.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.changed = False
+        self.digest = None
+        self._hash = hashlib.sha256()
+        self._file = None
+        # A plain open() (not mkstemp) so the file gets the usual umask mode.
+        self._tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._tmp, "wb")
+        return self
+
+    def write(self, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._hash.update(data)
+        self._file.write(data)
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        if exc_type is not None:
+            os.unlink(self._tmp)
+            return False
+
+        self.digest = self._hash.hexdigest()
+        try:
+            same = filecmp.cmp(self._tmp, self.path, shallow=False)
+        except FileNotFoundError:
+            same = False
+        if same:
+            os.unlink(self._tmp)
+        else:
+            os.replace(self._tmp, self.path)
+            self.changed = True
+        return False
+
+
+def write_if_changed(path, data):
+    """Atomically write ``data`` unless ``path`` already holds exactly it.
+
+    Returns True if the file was (re)written.
+    """
+    with AtomicWriter(path) as out:
+        out.write(data)
+    return out.changed
+
+
+class BuildState:
+    """Per-output input fingerprints, persisted as JSON between runs.
+
+    Each entry records the fingerprint of the inputs an output was built from
+    and the digest of the bytes written, so an output is only considered
+    up to date if neither its inputs nor the file itself have changed.
+    """
+
+    def __init__(self, name, directory=STATE_DIR):
+        self.path = Path(directory) / f"{name}.json"
+        try:
+            self.outputs = json.loads(self.path.read_text(encoding="utf-8"))["outputs"]
+        except (FileNotFoundError, ValueError, KeyError):
+            self.outputs = {}
+
+    def is_current(self, output_path, input_fingerprint):
+        entry = self.outputs.get(Path(output_path).name)
+        if entry is None or entry["inputs"] != input_fingerprint:
+            return False
+        try:
+            return file_digest(output_path) == entry["content"]
+        except FileNotFoundError:
+            return False
+
+    def record(self, output_path, input_fingerprint, digest):
+        """Remember that ``output_path`` (SHA-256 ``digest``) came from these inputs."""
+        self.outputs[Path(output_path).name] = {
+            "inputs": input_fingerprint,
+            "content": digest,
+        }
+
+    def save(self):
+        write_if_changed(
+            self.path,
+            json.dumps({"version": 1, "outputs": self.outputs}, indent=2, sort_keys=True) + "\n",
+        )
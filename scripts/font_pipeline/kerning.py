@@ -0,0 +1,165 @@
+"""
+Pair-kerning tables: GPOS/kern pair adjustments flattened per face.
+
+The subsetter drops GPOS and kern from every bundled face, and the runtime
+never parses them, so text measured from the metrics DB (metrics.py) has
+no kerning. This stage resolves a face's pair adjustments once at build
+time into a flat table of ``(left codepoint, right codepoint) → advance
+delta`` in font units, restricted to the codepoints the bundles ship.
+
+Pairs come from the lookups of the GPOS ``kern`` feature (PairPos formats
+1 and 2, including extension lookups), applied like a shaper would: within
+a lookup the first subtable that covers a pair wins; adjustments of
+separate lookups add up. Faces without a GPOS kern feature fall back to
+the legacy ``kern`` table. Only the first glyph's XAdvance is used, which
+is what horizontal pair kerning amounts to.
+
+Binary layout (little-endian), read by packages/core/src/font/data/kerning-decoder.ts:
+
+    header  12 bytes     magic "ODKN", u16 version, u16 unitsPerEm, u32 count
+    keys    count x u32  (left << 16) | right, sorted ascending
+    values  count x i16  advance adjustment of the left glyph
+
+Keys and values are separate arrays so a reader can binary-search the keys
+as one flat Uint32Array. Codepoints are BMP-only, like the bundle ranges.
+"""
+
+import struct
+
+from .families import CODEPOINTS
+
+MAGIC = b"ODKN"
+KERNING_VERSION = 1
+EXTENSION = ".kern"
+HEADER = struct.Struct("<4sHHI")
+
+PAIR_ADJUSTMENT = 2
+EXTENSION_POSITIONING = 9
+
+
+def _x_advance(value_record):
+    if value_record is None:
+        return 0
+    return getattr(value_record, "XAdvance", 0) or 0
+
+
+def _pair_subtables(lookup):
+    """PairPos subtables of a GPOS lookup, unwrapping extension lookups."""
+    for subtable in lookup.SubTable:
+        if lookup.LookupType == EXTENSION_POSITIONING:
+            if subtable.ExtensionLookupType != PAIR_ADJUSTMENT:
+                continue
+            subtable = subtable.ExtSubTable
+        elif lookup.LookupType != PAIR_ADJUSTMENT:
+            continue
+        yield subtable
+
+
+def _lookup_pairs(lookup, glyphs):
+    """``{(left, right): XAdvance}`` for one lookup, first subtable wins."""
+    pairs = {}
+    # First glyphs a format 2 subtable has matched against every second glyph.
+    consumed = set()
+    for subtable in _pair_subtables(lookup):
+        if subtable.Format == 1:
+            for left, pair_set in zip(subtable.Coverage.glyphs, subtable.PairSet):
+                if left not in glyphs or left in consumed:
+                    continue
+                for record in pair_set.PairValueRecord:
+                    if record.SecondGlyph in glyphs:
+                        pairs.setdefault((left, record.SecondGlyph), _x_advance(record.Value1))
+        elif subtable.Format == 2:
+            class1 = subtable.ClassDef1.classDefs if subtable.ClassDef1 else {}
+            class2 = subtable.ClassDef2.classDefs if subtable.ClassDef2 else {}
+            by_class2 = {}
+            for right in glyphs:
+                by_class2.setdefault(class2.get(right, 0), []).append(right)
+            for left in subtable.Coverage.glyphs:
+                if left not in glyphs or left in consumed:
+                    continue
+                row = subtable.Class1Record[class1.get(left, 0)].Class2Record
+                for klass, rights in by_class2.items():
+                    value = _x_advance(row[klass].Value1) if klass < len(row) else 0
+                    for right in rights:
+                        pairs.setdefault((left, right), value)
+                consumed.add(left)
+    return pairs
+
+
+def _gpos_pairs(font, glyphs):
+    """Summed GPOS kern-feature adjustments, or None without a kern feature."""
+    if "GPOS" not in font:
+        return None
+    gpos = font["GPOS"].table
+    if not gpos.FeatureList or not gpos.LookupList:
+        return None
+    lookup_indices = sorted({
+        index
+        for record in gpos.FeatureList.FeatureRecord
+        if record.FeatureTag == "kern"
+        for index in record.Feature.LookupListIndex
+    })
+    if not lookup_indices:
+        return None
+
+    pairs = {}
+    for index in lookup_indices:
+        for pair, value in _lookup_pairs(gpos.LookupList.Lookup[index], glyphs).items():
+            pairs[pair] = pairs.get(pair, 0) + value
+    return pairs
+
+
+def _kern_table_pairs(font, glyphs):
+    """Summed adjustments from the legacy kern table's format 0 subtables."""
+    pairs = {}
+    if "kern" not in font:
+        return pairs
+    for subtable in font["kern"].kernTables:
+        if getattr(subtable, "format", None) != 0:
+            continue
+        # Only horizontal, non-cross-stream kerning (coverage bits 0-2).
+        if (getattr(subtable, "coverage", 1) & 0x7) != 1:
+            continue
+        for (left, right), value in subtable.kernTable.items():
+            if left in glyphs and right in glyphs:
+                pairs[(left, right)] = pairs.get((left, right), 0) + value
+    return pairs
+
+
+def face_kerning(font, codepoints=CODEPOINTS):
+    """Flattened pair kerning of a (possibly lazy) TTFont.
+
+    Returns sorted ``[left codepoint, right codepoint, adjustment]`` triples
+    with non-zero adjustments, for codepoints in both ``codepoints`` and the
+    face's cmap.
+    """
+    cmap = font.getBestCmap() or {}
+    codepoints_by_glyph = {}
+    for cp in sorted(codepoints):
+        if cp in cmap and cp <= 0xFFFF:
+            codepoints_by_glyph.setdefault(cmap[cp], []).append(cp)
+    glyphs = set(codepoints_by_glyph)
+
+    pairs = _gpos_pairs(font, glyphs)
+    if pairs is None:
+        pairs = _kern_table_pairs(font, glyphs)
+
+    table = []
+    for (left, right), value in pairs.items():
+        if not value:
+            continue
+        for left_cp in codepoints_by_glyph[left]:
+            for right_cp in codepoints_by_glyph[right]:
+                table.append([left_cp, right_cp, value])
+    table.sort()
+    return table
+
+
+def encode_kerning(pairs, units_per_em):
+    """Encode ``face_kerning()`` triples in the binary layout above."""
+    count = len(pairs)
+    keys = struct.pack(f"<{count}I", *((left << 16) | right for left, right, _ in pairs))
+    values = struct.pack(
+        f"<{count}h", *(max(-0x8000, min(0x7FFF, value)) for _, _, value in pairs)
+    )
+    return HEADER.pack(MAGIC, KERNING_VERSION, units_per_em, count) + keys + values
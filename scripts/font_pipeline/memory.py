@@ -0,0 +1,137 @@
+"""
+Memory accounting and bounds for the font build (--low-memory, --report-memory).
+
+Per-face peak RSS is measured by resetting the process high-water mark
+before a face and reading it afterwards. On Linux this uses
+``/proc/self/clear_refs`` and ``VmHWM``. Elsewhere the whole process's
+``ru_maxrss`` is the best available answer.
+
+``map_bounded()`` is the low-memory counterpart of ``map_ordered()`` in
+parallel.py, with two differences:
+
+- Every task runs in a fresh worker process, so memory a face leaves behind
+  (fontTools caches, allocator fragmentation) is returned to the OS
+  instead of accumulating in a long-lived worker.
+- Tasks are admitted only while the estimated peak RSS of the running
+  tasks fits the ``--max-rss-mb`` budget. The estimate comes from
+  ``estimate_face_kb()``: interpreter baseline plus a multiple of the source
+  size. A face whose estimate exceeds the whole budget runs alone.
+
+Results come back in task order, as with ``map_ordered()``.
+"""
+
+import gc
+import multiprocessing
+import queue
+import re
+import resource
+import sys
+
+DEFAULT_MAX_RSS_MB = 768
+
+# Per-face peak RSS ≈ interpreter + fontTools baseline + a multiple of the
+# source file size (measured with lazy loading; generous for CFF and
+# large-cmap fonts).
+BASE_RSS_KB = 48 * 1024
+RSS_PER_SOURCE_BYTE = 16
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process in KB."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, KB everywhere else.
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def reset_peak_rss():
+    """Reset this process's RSS high-water mark; False if the OS can't."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def face_peak_rss_kb():
+    """RSS high-water mark since the last ``reset_peak_rss()``, in KB."""
+    try:
+        with open("/proc/self/status") as f:
+            match = re.search(r"^VmHWM:\s+(\d+) kB", f.read(), re.MULTILINE)
+        if match:
+            return int(match.group(1))
+    except OSError:
+        pass
+    return peak_rss_kb()
+
+
+def release():
+    """Collect garbage between faces so fontTools objects are freed right away."""
+    gc.collect()
+
+
+def estimate_face_kb(source_path):
+    """Estimated peak RSS in KB for processing the face at ``source_path``."""
+    try:
+        size = source_path.stat().st_size
+    except OSError:
+        size = 0
+    return BASE_RSS_KB + RSS_PER_SOURCE_BYTE * size // 1024
+
+
+def map_bounded(fn, tasks, jobs, estimates_kb, budget_kb):
+    """Run ``fn(*task)`` for every task, one fresh process each, within ``budget_kb``.
+
+    At most ``jobs`` tasks run at once. A task is admitted only while the
+    sum of ``estimates_kb`` of the running tasks, its own included, fits
+    ``budget_kb``. Tasks are admitted in order. Returns results in task
+    order.
+    """
+    results = [None] * len(tasks)
+    finished = queue.Queue()
+    pending = list(range(len(tasks)))
+    running = {}
+    in_use = 0
+    # maxtasksperchild=1: a fresh process per face returns its memory to the OS.
+    with multiprocessing.Pool(processes=max(jobs, 1), maxtasksperchild=1) as pool:
+        while pending or running:
+            while pending and len(running) < jobs:
+                index = pending[0]
+                if running and in_use + estimates_kb[index] > budget_kb:
+                    break
+                pending.pop(0)
+                in_use += estimates_kb[index]
+                running[index] = pool.apply_async(
+                    fn, tasks[index],
+                    callback=lambda _, index=index: finished.put(index),
+                    error_callback=lambda _, index=index: finished.put(index),
+                )
+            index = finished.get()
+            in_use -= estimates_kb[index]
+            results[index] = running.pop(index).get()
+    return results
+
+
+def add_memory_arguments(parser):
+    """Register the shared --low-memory / --max-rss-mb / --report-memory options."""
+    parser.add_argument(
+        "--low-memory",
+        action="store_true",
+        help="release each face right after it is written, one fresh worker per face, within --max-rss-mb",
+    )
+    parser.add_argument(
+        "--max-rss-mb",
+        type=int,
+        default=DEFAULT_MAX_RSS_MB,
+        help=f"with --low-memory, estimated peak RSS budget for concurrent faces (default: {DEFAULT_MAX_RSS_MB})",
+    )
+    parser.add_argument(
+        "--report-memory",
+        action="store_true",
+        help="log each face's peak RSS",
+    )
+
+
+def format_rss(kb):
+    """``"45.2 MB"``."""
+    return f"{kb / 1024:.1f} MB"
@@ -0,0 +1,255 @@
+"""
+Layout metrics stage: per-face advance widths and vertical metrics.
+
+Reads hmtx, cmap, OS/2 (plus head/hhea) from the TTFont the package stage
+has already parsed for subsetting, so metrics no longer need a second pass
+over the font files (formerly scripts/extract-font-metrics.mjs, whose
+extraction rules this mirrors exactly).
+
+Metrics are written in the delta+varint binary format read by
+packages/core/src/font/data/metrics-decoder.ts:
+
+    u8 version, varint face count, then per face:
+    varint name length, UTF-8 family name, u8 style (0 regular, 1 bold,
+    2 italic, 3 boldItalic), varint unitsPerEm, zigzag varint ascender /
+    descender / capHeight, u8 flags (bit 0 lineHeight, bit 1 lineGap),
+    float32 LE lineHeight / lineGap, varint defaultWidth, varint width
+    count, then (varint codepoint delta, varint width) pairs in codepoint
+    order
+
+A per-face table is simply a one-face bundle; the full metrics-bundle.ts is
+every face's table under a single header.
+"""
+
+import base64
+import json
+import math
+import struct
+
+from . import ROOT
+from .families import CODEPOINTS, FONT_FAMILIES
+from .incremental import write_if_changed
+from .kerning import KERNING_VERSION, face_kerning
+from .profiles import DEFAULT_PROFILE
+from .subset import subset_face_shards, subset_options
+
+METRICS_VERSION = 1
+STYLE_CODES = {"regular": 0, "bold": 1, "italic": 2, "boldItalic": 3}
+
+METRICS_BUNDLE_PATH = ROOT / "packages" / "core" / "src" / "font" / "data" / "metrics-bundle.ts"
+
+# Codepoints whose widths are recorded (same as extract-font-metrics.mjs):
+# Basic Latin through Latin Extended-B, punctuation, currency, letterlike
+# symbols, arrows, math, misc technical, shapes, misc symbols, ligatures,
+# BOM and replacement characters.
+METRICS_RANGES = [
+    (0x0020, 0x024F),
+    (0x2000, 0x206F),
+    (0x20A0, 0x20CF),
+    (0x2100, 0x214F),
+    (0x2190, 0x21FF),
+    (0x2200, 0x22FF),
+    (0x2300, 0x23FF),
+    (0x25A0, 0x25FF),
+    (0x2600, 0x26FF),
+    (0xFB00, 0xFB06),
+    (0xFEFF, 0xFEFF),
+    (0xFFFC, 0xFFFD),
+]
+
+# Base64 characters per line in metrics-bundle.ts.
+BASE64_LINE_WIDTH = 100
+
+
+def _round4(value):
+    """Round half up to 4 places, like ``Math.round(v * 10000) / 10000``."""
+    return math.floor(value * 10000 + 0.5) / 10000
+
+
+def face_metrics(font):
+    """Extract one face's layout metrics from a (possibly lazy) TTFont.
+
+    Returns a JSON-safe dict with unitsPerEm, ascender, descender,
+    capHeight, lineHeight, lineGap, defaultWidth and ``widths`` as sorted
+    ``[codepoint, advance]`` pairs. Vertical metrics come from OS/2's typo
+    values when present, else hhea; lineHeight is
+    ``(ascender + |descender| + lineGap) / unitsPerEm``.
+    """
+    units_per_em = font["head"].unitsPerEm
+    hhea = font["hhea"]
+    ascender, descender, line_gap = hhea.ascent, hhea.descent, hhea.lineGap
+    cap_height = ascender
+    if "OS/2" in font:
+        os2 = font["OS/2"]
+        ascender = os2.sTypoAscender
+        descender = os2.sTypoDescender
+        line_gap = os2.sTypoLineGap
+        cap_height = os2.sCapHeight if os2.version >= 2 else ascender
+
+    hmtx = font["hmtx"]
+    cmap = {
+        cp: glyph_name
+        for cp, glyph_name in (font.getBestCmap() or {}).items()
+        if font.getGlyphID(glyph_name) != 0
+    }
+    widths = []
+    for start, end in METRICS_RANGES:
+        for cp in range(start, end + 1):
+            if cp in cmap:
+                widths.append([cp, hmtx[cmap[cp]][0]])
+
+    default_width = hmtx[cmap[0x20]][0] if 0x20 in cmap else round(units_per_em * 0.25)
+
+    return {
+        "unitsPerEm": units_per_em,
+        "ascender": ascender,
+        "descender": descender,
+        "capHeight": cap_height,
+        "lineHeight": _round4((ascender + abs(descender) + line_gap) / units_per_em),
+        "lineGap": _round4(line_gap / units_per_em),
+        "defaultWidth": default_width,
+        "widths": widths,
+    }
+
+
+def subset_face_shards_with_metrics(source_path, shards, flavor="woff2", cache=None, profile=DEFAULT_PROFILE):
+    """``subset_face_shards()`` plus ``face_metrics()`` from the same parse.
+
+    Returns ``(shard bytes dict, metrics dict)``; the metrics dict also
+    carries the face's ``face_kerning()`` pairs under ``kerning``. Metrics
+    are cached next to the subsets, so a fully cached build still opens no
+    fonts; only when the subsets are cached but the metrics aren't is the
+    face opened (lazily) just for metrics. Metrics are read from the source
+    font, so they don't depend on ``profile``.
+    """
+    from fontTools.ttLib import TTFont
+
+    key = None
+    metrics = None
+    if cache is not None:
+        key = cache.key(
+            source_path, CODEPOINTS, subset_options(), "metrics",
+            extra=(METRICS_VERSION, METRICS_RANGES, KERNING_VERSION),
+        )
+        data = cache.get(key)
+        if data is not None:
+            metrics = json.loads(data)
+
+    read = []
+
+    def read_metrics(font):
+        # Runs while the source is loaded for subsetting; the font isn't kept.
+        face = face_metrics(font)
+        face["kerning"] = face_kerning(font)
+        read.append(face)
+
+    subsets = subset_face_shards(
+        source_path, shards, flavor, cache, on_load=read_metrics if metrics is None else None,
+        profile=profile,
+    )
+    if metrics is None:
+        if not read:
+            read_metrics(TTFont(source_path, lazy=True))
+        metrics = read[0]
+        if cache is not None:
+            cache.put(key, json.dumps(metrics, separators=(",", ":")).encode())
+    return subsets, metrics
+
+
+def metrics_family(family_def):
+    """Family name metrics are recorded under: the Office name it stands in for, if any."""
+    return family_def.get("substitute_for") or family_def["register_as"]
+
+
+def _varint(value):
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _zigzag(value):
+    return (value << 1) ^ (value >> 31)
+
+
+def encode_face(family, style, metrics):
+    """Encode one face's record (without the bundle header)."""
+    name = family.encode("utf-8")
+    parts = [
+        _varint(len(name)),
+        name,
+        bytes([STYLE_CODES[style]]),
+        _varint(metrics["unitsPerEm"]),
+        _varint(_zigzag(metrics["ascender"])),
+        _varint(_zigzag(metrics["descender"])),
+        _varint(_zigzag(metrics["capHeight"])),
+        bytes([3]),
+        struct.pack("<ff", metrics["lineHeight"], metrics["lineGap"]),
+        _varint(metrics["defaultWidth"]),
+        _varint(len(metrics["widths"])),
+    ]
+    previous = 0
+    for cp, width in metrics["widths"]:
+        parts.append(_varint(cp - previous))
+        parts.append(_varint(width))
+        previous = cp
+    return b"".join(parts)
+
+
+def encode_metrics(faces):
+    """Encode ``[(family, style, metrics)]`` as a metrics bundle."""
+    records = [encode_face(family, style, metrics) for family, style, metrics in faces]
+    return bytes([METRICS_VERSION]) + _varint(len(records)) + b"".join(records)
+
+
+def merge_metrics(tables):
+    """Concatenate one-face tables (``encode_metrics()`` output) into a bundle."""
+    records = []
+    for table in tables:
+        if table[:2] != bytes([METRICS_VERSION, 1]):
+            raise ValueError("not a one-face metrics table")
+        records.append(table[2:])
+    return bytes([METRICS_VERSION]) + _varint(len(records)) + b"".join(records)
+
+
+def expected_faces():
+    """Number of faces in FONT_FAMILIES, i.e. in a complete metrics bundle."""
+    return sum(len(family_def["variants"]) for family_def in FONT_FAMILIES.values())
+
+
+def write_metrics_bundle(tables, families, path=METRICS_BUNDLE_PATH):
+    """Write metrics-bundle.ts from one-face ``tables``, in bundle order.
+
+    ``families`` is the number of distinct family names among them (for the
+    header comment). Returns True if the file content changed.
+    """
+    data = merge_metrics(tables)
+    encoded = base64.b64encode(data).decode("ascii")
+    lines = [encoded[i:i + BASE64_LINE_WIDTH] for i in range(0, len(encoded), BASE64_LINE_WIDTH)]
+
+    source = "\n".join([
+        "/**",
+        " * Precomputed font metrics bundle — auto-generated.",
+        " *",
+        " * Binary format: delta+varint encoded, base64 wrapped.",
+        " * Decoded at import time by metrics-decoder.ts.",
+        " *",
+        " * Generated by: python3 scripts/generate-font-package.py (or build-fonts.py)",
+        f" * Faces: {len(tables)} in {families} families",
+        " *",
+        " * Font metrics are dimensional data (not copyrightable creative expression).",
+        " */",
+        "",
+        "import type { FontMetricsBundle } from '../font-metrics-db.js';",
+        "import { decodeMetricsBundle } from './metrics-decoder.js';",
+        "",
+        "// prettier-ignore",
+        "const METRICS_DATA_B64 =",
+        "  '" + "' +\n  '".join(lines) + "';",
+        "",
+        "export const metricsBundle: FontMetricsBundle = decodeMetricsBundle(METRICS_DATA_B64);",
+        "",
+    ])
+    return write_if_changed(path, source)
@@ -0,0 +1,446 @@
+"""
+Output stage for the @opendockit/fonts companion package.
+
+Writes packages/fonts/woff2/{family}/{shard}-{weight}-{style}.woff2, copies
+the full source TTFs to packages/fonts/ttf/, writes each face's layout
+metrics table to packages/fonts/metrics/ (see metrics.py) and its pair
+kerning table to packages/fonts/kerning/ (see kerning.py), and assembles
+manifest.json. Each WOFF2 manifest entry carries the CSS unicode-range of its
+shard so the loader can register shards with the unicode-range descriptor and
+fetch only the ones a document needs. Variable WOFF2 shards (see variable.py)
+also carry the axis ranges they keep.
+
+Once every file is written, ``annotate_package_files()`` adds an SRI
+``integrity`` hash to each file entry, plus the glyph count (``glyphs``) of
+WOFF2 and TTF files and a ``coverage`` bitmap of the codepoints each WOFF2
+shard actually maps. The manifest also carries the fallback table of
+coverage.py, which maps each codepoint to the first family covering it.
+With ``--hashed-filenames`` it also renames every file
+to ``{name}.{hash}.{ext}`` so a CDN can serve them as immutable.
+"""
+
+import base64
+import hashlib
+import json
+import shutil
+from io import BytesIO
+
+from . import FONTS_DIR, ROOT
+from .families import FONT_FAMILIES, SHARDS, UNICODE_RANGES, VARIANT_MAP, css_unicode_range, range_codepoints
+from .kerning import EXTENSION as KERNING_EXTENSION, encode_kerning
+from .metrics import encode_metrics, expected_faces, metrics_family, write_metrics_bundle
+from .precompress import remove_sidecars
+from .variable import varied_axes
+
+OUTPUT_DIR = ROOT / "packages" / "fonts"
+WOFF2_DIR = OUTPUT_DIR / "woff2"
+TTF_DIR = OUTPUT_DIR / "ttf"
+METRICS_DIR = OUTPUT_DIR / "metrics"
+KERNING_DIR = OUTPUT_DIR / "kerning"
+
+
+def clean_outputs():
+    """Remove previously generated font files and recreate the output dirs."""
+    for subdir in [WOFF2_DIR, TTF_DIR, METRICS_DIR, KERNING_DIR]:
+        if subdir.exists():
+            shutil.rmtree(subdir)
+
+    remove_sidecars(OUTPUT_DIR / "manifest.json")
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    WOFF2_DIR.mkdir(parents=True, exist_ok=True)
+    TTF_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def package_shards(sharded=True):
+    """``(name, ranges)`` list describing the package's WOFF2 files per face.
+
+    Unsharded output is the original layout: one file per face covering every
+    range in UNICODE_RANGES, named "latin".
+    """
+    if sharded:
+        return SHARDS
+    return [("latin", UNICODE_RANGES)]
+
+
+def shard_codepoints(shards):
+    """``[(name, codepoint set)]`` for ``subset_face_shards()``."""
+    return [(name, range_codepoints(ranges)) for name, ranges in shards]
+
+
+def add_package_arguments(parser):
+    """Register companion-package output options."""
+    parser.add_argument(
+        "--no-shards",
+        action="store_true",
+        help="write one WOFF2 per face covering all ranges instead of per-unicode-range shards",
+    )
+    parser.add_argument(
+        "--no-metrics",
+        action="store_true",
+        help="skip the layout metrics stage (per-face metrics and kerning tables, metrics-bundle.ts)",
+    )
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="also write maximum-level .br/.gz sidecars of the TTFs, metrics, kerning tables and manifest",
+    )
+    parser.add_argument(
+        "--hashed-filenames",
+        action="store_true",
+        help="name every package file {name}.{content hash}.{ext} (cacheable as immutable)",
+    )
+
+
+def write_variant(family_id, variant_name, ttf_filename, woff2_shards, result, shards=SHARDS, metrics=None):
+    """Write one variant's package files and fill in ``result``.
+
+    ``woff2_shards`` maps shard name → subset WOFF2 bytes (shards the face has
+    no glyphs for are absent), or is None if subsetting failed. ``metrics``
+    is the face's ``face_metrics()`` dict (with ``kerning`` pairs), or None
+    to skip the metrics and kerning tables. Faces without kerning pairs get
+    no kerning table.
+    ``result`` is a variant result dict (see ``new_variant_result()``).
+    """
+    ttf_path = FONTS_DIR / ttf_filename
+    weight, style = VARIANT_MAP.get(variant_name, (400, "normal"))
+    log = result["log"]
+
+    # --- WOFF2: one file per unicode-range shard ---
+    if woff2_shards is not None:
+        result["woff2"] = {}
+        for shard_name, ranges in shards:
+            woff2_data = woff2_shards.get(shard_name)
+            if woff2_data is None:
+                continue
+            try:
+                woff2_subdir = WOFF2_DIR / family_id
+                woff2_subdir.mkdir(parents=True, exist_ok=True)
+                woff2_filename = f"{shard_name}-{weight}-{style}.woff2"
+                woff2_out = woff2_subdir / woff2_filename
+                woff2_out.write_bytes(woff2_data)
+                woff2_size = len(woff2_data)
+                result["woff2"][shard_name] = {
+                    "file": f"woff2/{family_id}/{woff2_filename}",
+                    "size": woff2_size,
+                    "unicodeRange": css_unicode_range(ranges),
+                }
+                log.append(
+                    f"  WOFF2 {variant_name} [{shard_name}]: {woff2_size / 1024:.1f} KB → {woff2_out.relative_to(OUTPUT_DIR)}"
+                    + (" (cached)" if result["cached"] else "")
+                )
+            except Exception as e:
+                log.append(f"  WARN: WOFF2 {shard_name} failed for {variant_name} ({ttf_filename}): {e}")
+
+    # --- TTF: copy full file (no subsetting) ---
+    try:
+        ttf_out_filename = f"{family_id}-{variant_name}.ttf"
+        ttf_out = TTF_DIR / ttf_out_filename
+        TTF_DIR.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(ttf_path, ttf_out)
+        ttf_size = ttf_out.stat().st_size
+        result["ttf"] = {
+            "file": f"ttf/{ttf_out_filename}",
+            "size": ttf_size,
+        }
+        log.append(f"  TTF  {variant_name}: {ttf_size / 1024:.1f} KB → {ttf_out.relative_to(OUTPUT_DIR)}")
+    except Exception as e:
+        log.append(f"  WARN: TTF copy failed for {variant_name} ({ttf_filename}): {e}")
+
+    # --- Metrics: one-face delta+varint table for metrics-decoder.ts ---
+    if metrics is not None:
+        metrics_data = encode_metrics([(metrics_family(FONT_FAMILIES[family_id]), variant_name, metrics)])
+        metrics_filename = f"{family_id}-{variant_name}.bin"
+        METRICS_DIR.mkdir(parents=True, exist_ok=True)
+        (METRICS_DIR / metrics_filename).write_bytes(metrics_data)
+        result["metrics"] = {
+            "file": f"metrics/{metrics_filename}",
+            "size": len(metrics_data),
+        }
+        log.append(f"  Metrics {variant_name}: {len(metrics['widths'])} widths, {len(metrics_data)} bytes")
+
+    # --- Kerning: flattened pair table for kerning-table.ts ---
+    if metrics is not None and metrics.get("kerning"):
+        kerning_data = encode_kerning(metrics["kerning"], metrics["unitsPerEm"])
+        kerning_filename = f"{family_id}-{variant_name}{KERNING_EXTENSION}"
+        KERNING_DIR.mkdir(parents=True, exist_ok=True)
+        (KERNING_DIR / kerning_filename).write_bytes(kerning_data)
+        result["kerning"] = {
+            "file": f"kerning/{kerning_filename}",
+            "size": len(kerning_data),
+        }
+        log.append(f"  Kerning {variant_name}: {len(metrics['kerning'])} pairs, {len(kerning_data)} bytes")
+
+    return result
+
+
+def new_variant_result():
+    """Empty per-variant result: what was written, plus deferred log lines."""
+    return {
+        "found": False,
+        "woff2": None,
+        "ttf": None,
+        "metrics": None,
+        "kerning": None,
+        "cached": False,
+        "baseline": None,
+        "peak_rss_kb": None,
+        "cache_hits": 0,
+        "cache_misses": 0,
+        "log": [],
+    }
+
+
+def new_variable_result(source, instances):
+    """Empty result for a variable group: one variable source, ``{variant: coordinates}``."""
+    return {
+        "source": source,
+        "instances": instances,
+        "axes": varied_axes(list(instances.values())),
+        "woff2": {},
+        "baseline": None,
+        "peak_rss_kb": None,
+        "cache_hits": 0,
+        "cache_misses": 0,
+        "log": [],
+    }
+
+
+def write_variable_group(family_id, style, woff2_shards, result, shards=SHARDS):
+    """Write a variable group's WOFF2 shards and fill in ``result``.
+
+    ``woff2_shards`` maps shard name → variable WOFF2 bytes for one CSS
+    ``style`` of the family; files are named ``{shard}-var-{style}.woff2``.
+    Each manifest entry carries the group's ``axes`` ranges, which loaders
+    register as a weight range. ``result`` is a ``new_variable_result()``.
+    """
+    axes_label = format_axis_ranges(result["axes"])
+    for shard_name, ranges in shards:
+        woff2_data = woff2_shards.get(shard_name)
+        if woff2_data is None:
+            continue
+        woff2_subdir = WOFF2_DIR / family_id
+        woff2_subdir.mkdir(parents=True, exist_ok=True)
+        woff2_filename = f"{shard_name}-var-{style}.woff2"
+        woff2_out = woff2_subdir / woff2_filename
+        woff2_out.write_bytes(woff2_data)
+        result["woff2"][shard_name] = {
+            "file": f"woff2/{family_id}/{woff2_filename}",
+            "size": len(woff2_data),
+            "unicodeRange": css_unicode_range(ranges),
+            "axes": result["axes"],
+        }
+        result["log"].append(
+            f"  WOFF2 variable {style} [{shard_name}] ({axes_label}): "
+            f"{len(woff2_data) / 1024:.1f} KB → {woff2_out.relative_to(OUTPUT_DIR)}"
+        )
+    return result
+
+
+def format_axis_ranges(axes):
+    """``{"wght": [400, 700]}`` → ``"wght 400-700"``."""
+    return ", ".join(f"{tag} {low:g}-{high:g}" for tag, (low, high) in axes.items())
+
+
+def family_entry(family_id, family_def, variant_results, shards=SHARDS, variable_results=None):
+    """Assemble one family's manifest entry from per-variant results.
+
+    Prints each variant's log lines. Iterates in FONT_FAMILIES declaration
+    order so the manifest doesn't depend on the order variants finished in.
+    ``variable_results`` maps CSS style → ``write_variable_group()`` result
+    for styles shipped as one variable font; their shards are listed under
+    ``{shard}-var-{style}`` keys and the group under ``variable``. Returns
+    None if no variant produced any output.
+    """
+    register_as = family_def["register_as"]
+    woff2_info = {}
+    ttf_info = {}
+    metrics_info = {}
+    kerning_info = {}
+    weights = set()
+    styles = set()
+    subsets = set()
+
+    for variant_name in family_def["variants"]:
+        result = variant_results[variant_name]
+        for line in result["log"]:
+            print(line)
+        if not result["found"]:
+            continue
+
+        weight, style = VARIANT_MAP.get(variant_name, (400, "normal"))
+        weights.add(weight)
+        styles.add(style)
+
+        if result["woff2"]:
+            for shard_name, woff2_entry in result["woff2"].items():
+                woff2_info[f"{shard_name}-{weight}-{style}"] = woff2_entry
+                subsets.add(shard_name)
+        if result["ttf"] is not None:
+            ttf_info[variant_name] = result["ttf"]
+        if result["metrics"] is not None:
+            metrics_info[variant_name] = result["metrics"]
+        if result["kerning"] is not None:
+            kerning_info[variant_name] = result["kerning"]
+
+    variable_info = {}
+    for style, result in (variable_results or {}).items():
+        for line in result["log"]:
+            print(line)
+        if not result["woff2"]:
+            continue
+        for shard_name, woff2_entry in result["woff2"].items():
+            woff2_info[f"{shard_name}-var-{style}"] = woff2_entry
+            subsets.add(shard_name)
+        variable_info[style] = {
+            "source": result["source"],
+            "axes": result["axes"],
+            "instances": result["instances"],
+        }
+
+    if not woff2_info and not ttf_info:
+        return None
+
+    entry = {
+        "displayName": register_as,
+        "substituteFor": family_def.get("substitute_for"),
+        "license": family_def.get("license", "Unknown"),
+        "woff2": woff2_info,
+        "ttf": ttf_info,
+        "weights": sorted(weights),
+        "styles": sorted(styles),
+        "subsets": [shard_name for shard_name, _ in shards if shard_name in subsets],
+    }
+    # Remove None substituteFor from manifest output
+    if entry["substituteFor"] is None:
+        del entry["substituteFor"]
+    if metrics_info:
+        entry["metrics"] = metrics_info
+    if kerning_info:
+        entry["kerning"] = kerning_info
+    if variable_info:
+        entry["variable"] = variable_info
+    return entry
+
+
+def file_integrity(data):
+    """Subresource Integrity value of ``data``: ``"sha256-<base64 digest>"``."""
+    return "sha256-" + base64.b64encode(hashlib.sha256(data).digest()).decode("ascii")
+
+
+def parse_unicode_range(value):
+    """Codepoints of a CSS unicode-range written by ``css_unicode_range()``, in order."""
+    codepoints = []
+    for token in value.split(","):
+        start, _, end = token.strip()[2:].partition("-")
+        codepoints.extend(range(int(start, 16), int(end or start, 16) + 1))
+    return codepoints
+
+
+def coverage_bitmap(unicode_range, cmap):
+    """Base64 bitmap of which ``unicode_range`` codepoints ``cmap`` maps.
+
+    Bit ``i`` (least significant bit first) stands for the i-th codepoint of
+    the range in the order it is written, so the client can decode it
+    against the entry's own ``unicodeRange`` (see ``decodeCoverage()`` in
+    bundled-font-loader.ts).
+    """
+    codepoints = parse_unicode_range(unicode_range)
+    bits = bytearray((len(codepoints) + 7) // 8)
+    for i, cp in enumerate(codepoints):
+        if cp in cmap:
+            bits[i >> 3] |= 1 << (i & 7)
+    return base64.b64encode(bytes(bits)).decode("ascii")
+
+
+def file_annotations(info, data):
+    """``integrity`` plus, for fonts, ``glyphs`` and shard ``coverage`` of one file entry."""
+    fields = {"integrity": file_integrity(data)}
+    if info["file"].endswith((".woff2", ".ttf")):
+        from fontTools.ttLib import TTFont
+
+        font = TTFont(BytesIO(data), lazy=True)
+        fields["glyphs"] = font["maxp"].numGlyphs
+        if "unicodeRange" in info:
+            fields["coverage"] = coverage_bitmap(info["unicodeRange"], set(font.getBestCmap() or {}))
+    return fields
+
+
+def hashed_filename(file, data):
+    """``woff2/x/latin-400-normal.woff2`` → ``woff2/x/latin-400-normal.{hash}.woff2``."""
+    stem, dot, extension = file.rpartition(".")
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{dot}{extension}"
+
+
+def annotate_package_files(manifest_families, hashed_filenames=False):
+    """Add integrity hashes, glyph counts and coverage bitmaps to file entries.
+
+    Every ``{"file": ...}`` entry gets ``integrity``; WOFF2 and TTF entries
+    get ``glyphs``, and WOFF2 shards with a ``unicodeRange`` get
+    ``coverage``. With ``hashed_filenames``, files are renamed to
+    ``{name}.{first 12 hex digits of SHA-256}.{ext}`` and the entries
+    updated. Entries sharing one file (see dedup.py) are handled once.
+    Returns the number of distinct files annotated.
+    """
+    done = {}  # original path → (final path, annotations)
+    for entry in manifest_families.values():
+        for section in entry.values():
+            if not isinstance(section, dict):
+                continue
+            for info in section.values():
+                if not isinstance(info, dict) or "file" not in info:
+                    continue
+                original = info["file"]
+                if original not in done:
+                    data = (OUTPUT_DIR / original).read_bytes()
+                    final = hashed_filename(original, data) if hashed_filenames else original
+                    if final != original:
+                        (OUTPUT_DIR / original).rename(OUTPUT_DIR / final)
+                    done[original] = (final, file_annotations(info, data))
+                final, fields = done[original]
+                info.update(fields)
+                info["file"] = final
+    return len(done)
+
+
+def write_manifest(manifest_families, fallback=None):
+    """Write manifest.json and return its path.
+
+    ``fallback`` is the package's ``fallback_table()`` (see coverage.py),
+    stored under ``fallback`` when given.
+    """
+    manifest = {
+        "version": 1,
+        "families": manifest_families,
+    }
+    if fallback is not None:
+        manifest["fallback"] = fallback
+
+    manifest_path = OUTPUT_DIR / "manifest.json"
+    manifest_path.write_text(
+        json.dumps(manifest, indent=2, ensure_ascii=False) + "\n",
+        encoding="utf-8",
+    )
+    return manifest_path
+
+
+def write_package_metrics_bundle(manifest_families):
+    """Rebuild core's metrics-bundle.ts from the package's per-face tables.
+
+    Faces are taken in FONT_FAMILIES declaration order. The bundle is only
+    written when every face has a table, so a partial fonts/ checkout can't
+    drop metrics for the faces it lacks. Returns ``(faces, changed)``;
+    ``changed`` is None if the bundle was not written.
+    """
+    tables = []
+    families = set()
+    for family_id, family_def in FONT_FAMILIES.items():
+        metrics_info = manifest_families.get(family_id, {}).get("metrics", {})
+        for variant_name in family_def["variants"]:
+            if variant_name in metrics_info:
+                tables.append((OUTPUT_DIR / metrics_info[variant_name]["file"]).read_bytes())
+                families.add(metrics_family(family_def))
+
+    if not tables or len(tables) < expected_faces():
+        return len(tables), None
+    return len(tables), write_metrics_bundle(tables, len(families))
@@ -0,0 +1,42 @@
+"""
+Process-pool helpers for fanning per-face work out across CPU cores.
+
+Workers only return plain data; callers assemble outputs in a fixed order,
+so results are identical for any --jobs value.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def add_jobs_argument(parser, help):
+    """Register the shared -j/--jobs option.
+
+    ``help`` says what the workers do, e.g. "number of worker processes for
+    subsetting"; the 0 and default notes are appended.
+    """
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help=f"{help} (0 = one per CPU core, default: 1)",
+    )
+
+
+def resolve_jobs(parser, args):
+    """Validate --jobs and expand 0 to the CPU count."""
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    return args.jobs
+
+
+def map_ordered(fn, tasks, jobs):
+    """Run ``fn(*task)`` for every task on ``jobs`` processes.
+
+    Returns results in task order, regardless of completion order.
+    """
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(fn, *task) for task in tasks]
+        return [future.result() for future in futures]
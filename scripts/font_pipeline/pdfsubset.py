@@ -0,0 +1,145 @@
+"""
+Per-document TTF subsetting for PDF export.
+
+The TTF bundles (bundle-ttf-fonts.py) keep the whole Latin + symbols block of
+every face so any document can be exported, which costs hundreds of KB per
+embedded font. A PDF only needs the glyphs its text actually uses, so the
+export collects codepoints (and, for shaped text, glyph IDs) per face and
+asks for a minimal subset here.
+
+Subsets are cut from the full source TTF in fonts/, not from the bundled
+subset, and keep the source's glyph IDs (``retain_gids``): unused glyphs are
+emptied rather than removed, so a GID read from the source cmap or from a
+shaper stays valid as an Identity-H CID in the PDF, and two subsets of the
+same face agree on every glyph they share. Hinting is dropped since PDF
+viewers rasterize at arbitrary sizes anyway.
+
+Each request names a face the way the exporter sees it: a FONT_FAMILIES id,
+register name or Office name it substitutes for, plus either a variant name
+or bold/italic flags (resolved with the renderer's fallbacks, see
+``pick_variant()``).
+"""
+
+from . import FONTS_DIR
+from .cache import file_digest
+from .families import FONT_FAMILIES, family_index, pick_variant
+from .subset import save_font, subset_options
+
+
+def pdf_subset_options():
+    """Subsetter options for PDF embedding: ``subset_options()`` with stable GIDs."""
+    options = subset_options()
+    options.retain_gids = True
+    options.notdef_outline = True
+    options.hinting = False
+    return options
+
+
+def resolve_face(family, variant=None, bold=False, italic=False):
+    """Resolve a family name and style to ``(family_id, variant_name, source_path)``.
+
+    ``family`` may be a FONT_FAMILIES id or (case-insensitively) a register
+    or substitute_for name. An explicit ``variant`` must exist in the family;
+    otherwise bold/italic pick the variant the renderer would use. Raises
+    ValueError if the face is unknown or its source file is missing.
+    """
+    family_id = family if family in FONT_FAMILIES else family_index().get(family.lower())
+    if family_id is None:
+        raise ValueError(f"unknown font family: {family}")
+    family_def = FONT_FAMILIES[family_id]
+
+    if variant is None:
+        variant = pick_variant(family_def, bold, italic)
+    elif variant not in family_def["variants"]:
+        raise ValueError(f"{family_id} has no {variant} variant")
+
+    source_path = FONTS_DIR / family_def["variants"][variant]
+    if not source_path.exists():
+        raise ValueError(f"source font not found: {source_path}")
+    return family_id, variant, source_path
+
+
+def subset_for_pdf(family, variant=None, codepoints=(), glyph_ids=(), bold=False, italic=False,
+                   cache=None):
+    """Subset one face to the given codepoints and glyph IDs; return TTF bytes.
+
+    Glyph IDs refer to the source face and are kept as-is in the output.
+    ``.notdef`` is always included. Results are cached like the bundle
+    subsets, with the glyph IDs as part of the key.
+    """
+    _family_id, _variant, source_path = resolve_face(family, variant, bold, italic)
+    codepoints = set(codepoints)
+    glyph_ids = sorted(set(glyph_ids))
+    options = pdf_subset_options()
+
+    key = None
+    if cache is not None:
+        key = cache.key(
+            source_path, codepoints, options, "ttf",
+            extra=("gids", *glyph_ids), source_digest=file_digest(source_path),
+        )
+        data = cache.get(key)
+        if data is not None:
+            return data
+
+    from fontTools.subset import Subsetter
+    from fontTools.ttLib import TTFont
+
+    font = TTFont(source_path)
+    if glyph_ids and glyph_ids[-1] >= font["maxp"].numGlyphs:
+        raise ValueError(f"glyph ID {glyph_ids[-1]} out of range for {source_path.name}")
+    subsetter = Subsetter(options=options)
+    subsetter.populate(unicodes=codepoints, gids=glyph_ids)
+    subsetter.subset(font)
+    data = save_font(font, "ttf")
+
+    if cache is not None:
+        cache.put(key, data)
+    return data
+
+
+def subset_batch(requests, cache=None):
+    """Subset every face a document uses in one call.
+
+    ``requests`` is an iterable of dicts with ``family`` and optionally
+    ``variant`` / ``bold`` / ``italic``, ``codepoints``, ``text`` and
+    ``glyphIds``.
+    Requests that resolve to the same face are merged, so each face is
+    subset once. Yields ``{"family", "variant", "error"}`` for each request
+    that doesn't resolve to a face, then one result per face in first-seen
+    order: ``{"family", "variant", "codepoints", "glyphIds", "data"}``, with
+    ``error`` in place of ``data`` if subsetting failed. One bad face doesn't
+    fail the batch: any exception from a face (a corrupt source raises
+    fontTools or struct errors, not just ValueError) becomes its ``error``.
+    """
+    faces = {}
+    errors = []
+    for request in requests:
+        family = request.get("family", "")
+        try:
+            family_id, variant, _ = resolve_face(
+                family, request.get("variant"), request.get("bold", False), request.get("italic", False)
+            )
+        except ValueError as e:
+            errors.append({"family": family, "variant": request.get("variant"), "error": str(e)})
+            continue
+        codepoints, glyph_ids = faces.setdefault((family_id, variant), (set(), set()))
+        codepoints.update(request.get("codepoints", ()))
+        codepoints.update(map(ord, request.get("text", "")))
+        glyph_ids.update(request.get("glyphIds", ()))
+
+    yield from errors
+    for (family_id, variant), (codepoints, glyph_ids) in faces.items():
+        result = {
+            "family": family_id,
+            "variant": variant,
+            "codepoints": len(codepoints),
+            "glyphIds": len(glyph_ids),
+        }
+        try:
+            result["data"] = subset_for_pdf(family_id, variant, codepoints, glyph_ids, cache=cache)
+        except ValueError as e:
+            result["error"] = str(e)
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        yield result
@@ -0,0 +1,94 @@
+"""
+Precompressed ``.br`` / ``.gz`` sidecars for the companion package.
+
+Static file servers (nginx ``brotli_static`` / ``gzip_static``, most CDNs'
+origin rules) serve ``file.br`` or ``file.gz`` in place of ``file`` when the
+client accepts that encoding, so compressing once at build time at maximum
+levels costs nothing per request. The full TTFs are the heaviest assets in
+the package and compress well; the manifest, metrics and kerning tables
+are included too. WOFF2 files are skipped: they are already Brotli
+compressed internally.
+
+Output is deterministic (gzip headers carry no timestamp or file name), and
+a sidecar is only kept when it is smaller than the file itself.
+"""
+
+import gzip
+
+from .parallel import map_ordered
+
+SIDECARS = (".br", ".gz")
+
+# Extensions worth precompressing, with the Brotli mode tuned for them.
+_BROTLI_MODES = {".ttf": "MODE_FONT", ".json": "MODE_TEXT"}
+_EXTENSIONS = (".ttf", ".json", ".bin", ".kern")
+
+
+def compressible(path):
+    """Whether ``path`` gets sidecars (not WOFF2, not a sidecar itself)."""
+    return path.suffix in _EXTENSIONS
+
+
+def compress_file(path):
+    """Write ``path``'s sidecars; return ``(original size, {suffix: size kept})``.
+
+    Sidecars that don't beat the original are removed rather than kept.
+    """
+    import brotli
+
+    data = path.read_bytes()
+    mode = getattr(brotli, _BROTLI_MODES.get(path.suffix, "MODE_GENERIC"))
+    encoded = {
+        ".br": brotli.compress(data, mode=mode, quality=11, lgwin=24),
+        ".gz": gzip.compress(data, compresslevel=9, mtime=0),
+    }
+    kept = {}
+    for suffix, compressed in encoded.items():
+        sidecar = path.with_name(path.name + suffix)
+        if len(compressed) < len(data):
+            sidecar.write_bytes(compressed)
+            kept[suffix] = len(compressed)
+        elif sidecar.exists():
+            sidecar.unlink()
+    return len(data), kept
+
+
+def remove_sidecars(path):
+    """Delete any sidecars left next to ``path`` by an earlier build."""
+    for suffix in SIDECARS:
+        sidecar = path.with_name(path.name + suffix)
+        if sidecar.exists():
+            sidecar.unlink()
+
+
+def package_files(manifest_families, output_dir, manifest_path):
+    """Distinct compressible files of a package: every manifest entry, then the manifest."""
+    paths = {}
+    for entry in manifest_families.values():
+        for section in entry.values():
+            if not isinstance(section, dict):
+                continue
+            for info in section.values():
+                if isinstance(info, dict) and "file" in info:
+                    path = output_dir / info["file"]
+                    if compressible(path):
+                        paths.setdefault(path, None)
+    paths.setdefault(manifest_path, None)
+    return list(paths)
+
+
+def precompress_files(paths, jobs=1):
+    """``compress_file()`` every path, on ``jobs`` processes; results in path order."""
+    if jobs <= 1:
+        return [compress_file(path) for path in paths]
+    return map_ordered(compress_file, [(path,) for path in paths], jobs)
+
+
+def format_savings(results):
+    """One-line summary of ``compress_file()`` results."""
+    total = sum(size for size, _ in results)
+    parts = [f"{len(results)} files, {total / 1024 / 1024:.1f} MB"]
+    for suffix in SIDECARS:
+        compressed = sum(kept.get(suffix, size) for size, kept in results)
+        parts.append(f"{suffix} {compressed / 1024 / 1024:.1f} MB")
+    return " → ".join([parts[0], ", ".join(parts[1:])])
@@ -0,0 +1,232 @@
+"""
+Offline font source acquisition: populate fonts/ from a local mirror.
+
+A lockfile records the SHA-256 and size of every source file under fonts/
+(statics and the variable sources in fonts/.variable/), keyed by path
+relative to fonts/:
+
+    {"version": 1, "files": {".variable/Arimo[wght].ttf": {"sha256": "...", "size": 123}, ...}}
+
+``acquire()`` makes fonts/ match the lockfile from a mirror, which is
+either a directory laid out like fonts/ or a tarball of one (.tar, .tar.gz,
+.tgz, .tar.bz2, .tar.xz; a leading ``fonts/`` in member names is ignored).
+Files already in fonts/ with the locked hash are left alone, so a warm CI
+workspace copies nothing. The rest are verified against the lockfile before
+they are moved into place:
+
+- From a directory mirror, source files are hashed on ``jobs`` processes and
+  then placed according to ``link`` (see LINK_MODES): by default reflinked
+  (a copy-on-write clone, Linux FICLONE) where the filesystem supports it
+  and copied otherwise. "hardlink" shares the mirror's inode instead, which
+  costs nothing on any filesystem but means a tool writing into a source
+  in place would also change the mirror, so it is opt-in for mirrors that
+  are read-only or disposable.
+- From a tarball, the needed members are streamed out in one pass, hashed
+  as they are written.
+
+Every file is written to a temp name and ``os.replace``d, so an interrupted
+run never leaves a truncated source behind.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tarfile
+from collections import namedtuple
+from pathlib import Path
+
+from . import FONTS_DIR, ROOT
+from .cache import file_digest
+from .parallel import map_ordered
+
+LOCK_PATH = ROOT / "scripts" / "font-sources.lock.json"
+LOCK_VERSION = 1
+SOURCE_SUFFIXES = (".ttf", ".otf")
+
+# Linux ioctl that clones a file's extents into another (btrfs, XFS, ...).
+FICLONE = 0x40049409
+
+# How directory mirror files are placed; each falls back to a plain copy.
+LINK_MODES = ("reflink", "hardlink", "copy")
+
+# ``action`` is one of "unchanged", "reflink", "hardlink", "copy",
+# "extract", "missing" (not in the mirror) or "mismatch" (wrong hash).
+Acquired = namedtuple("Acquired", ["path", "action", "size"])
+
+
+def source_files(fonts_dir=FONTS_DIR):
+    """Paths of every font source under ``fonts_dir``, relative and sorted."""
+    return sorted(
+        path.relative_to(fonts_dir).as_posix()
+        for path in fonts_dir.rglob("*")
+        if path.is_file() and path.suffix.lower() in SOURCE_SUFFIXES
+    )
+
+
+def load_lock(path=LOCK_PATH):
+    """``{relative path: {"sha256", "size"}}`` from a lockfile."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("version") != LOCK_VERSION:
+        raise ValueError(f"{path}: unsupported lockfile version {data.get('version')!r}")
+    return data["files"]
+
+
+def lock_entry(path):
+    """``{"sha256", "size"}`` of one file."""
+    return {"sha256": file_digest(path), "size": path.stat().st_size}
+
+
+def write_lock(fonts_dir=FONTS_DIR, path=LOCK_PATH, jobs=1):
+    """Lock every source under ``fonts_dir``; returns the number of files."""
+    names = source_files(fonts_dir)
+    tasks = [(fonts_dir / name,) for name in names]
+    entries = [lock_entry(*task) for task in tasks] if jobs <= 1 else map_ordered(lock_entry, tasks, jobs)
+    lock = {"version": LOCK_VERSION, "files": dict(zip(names, entries))}
+    path.write_text(json.dumps(lock, indent=2) + "\n", encoding="utf-8")
+    return len(names)
+
+
+def matches(path, entry):
+    """True if ``path`` exists with the size and hash ``entry`` locks."""
+    try:
+        if path.stat().st_size != entry["size"]:
+            return False
+    except OSError:
+        return False
+    return file_digest(path) == entry["sha256"]
+
+
+def verify(lock, fonts_dir=FONTS_DIR, jobs=1):
+    """``{relative path: True/False}``: whether each locked file in ``fonts_dir`` matches."""
+    tasks = [(fonts_dir / name, entry) for name, entry in lock.items()]
+    results = [matches(*task) for task in tasks] if jobs <= 1 else map_ordered(matches, tasks, jobs)
+    return dict(zip(lock, results))
+
+
+def _temp_path(dest):
+    return dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+
+
+def _reflink(src, dst):
+    import fcntl
+
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+
+
+def place(src, dest, link="reflink"):
+    """Put ``src``'s bytes at ``dest`` as ``link`` (a LINK_MODES entry); returns how it was done.
+
+    A reflink or hardlink the filesystem refuses falls back to a copy.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _temp_path(dest)
+    tmp.unlink(missing_ok=True)
+    action = "copy"
+    if link == "reflink" and sys.platform == "linux":
+        try:
+            _reflink(src, tmp)
+            action = "reflink"
+        except OSError:
+            tmp.unlink(missing_ok=True)
+    elif link == "hardlink":
+        try:
+            os.link(src, tmp)
+            action = "hardlink"
+        except OSError:
+            pass
+    if action == "copy":
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dest)
+    return action
+
+
+def _acquire_from_dir(name, entry, mirror, fonts_dir, link):
+    src = mirror / name
+    if not src.is_file():
+        return Acquired(name, "missing", 0)
+    if not matches(src, entry):
+        return Acquired(name, "mismatch", 0)
+    return Acquired(name, place(src, fonts_dir / name, link), entry["size"])
+
+
+def _member_name(member):
+    """Member path relative to the mirrored fonts/ directory."""
+    parts = Path(member.name).parts
+    if parts and parts[0] == ".":
+        parts = parts[1:]
+    if parts and parts[0] == "fonts":
+        parts = parts[1:]
+    return "/".join(parts)
+
+
+def _acquire_from_tar(needed, tarball, fonts_dir):
+    """Stream the ``needed`` (``{name: entry}``) members out of ``tarball`` in one pass."""
+    results = {}
+    with tarfile.open(tarball, "r:*") as tar:
+        for member in tar:
+            name = _member_name(member)
+            if not member.isfile() or name not in needed or name in results:
+                continue
+            entry = needed[name]
+            dest = fonts_dir / name
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            tmp = _temp_path(dest)
+            h = hashlib.sha256()
+            with tar.extractfile(member) as src, open(tmp, "wb") as out:
+                for chunk in iter(lambda: src.read(1 << 20), b""):
+                    h.update(chunk)
+                    out.write(chunk)
+            if h.hexdigest() != entry["sha256"]:
+                tmp.unlink()
+                results[name] = Acquired(name, "mismatch", 0)
+                continue
+            os.replace(tmp, dest)
+            results[name] = Acquired(name, "extract", entry["size"])
+    return [results.get(name, Acquired(name, "missing", 0)) for name in needed]
+
+
+def acquire(lock, mirror, fonts_dir=FONTS_DIR, jobs=1, link="reflink"):
+    """Make ``fonts_dir`` match ``lock`` from ``mirror``; returns one ``Acquired`` per locked file.
+
+    Files already matching the lockfile are reported as "unchanged" and not
+    touched. ``link`` applies to a directory mirror.
+    """
+    current = verify(lock, fonts_dir, jobs)
+    results = {name: Acquired(name, "unchanged", lock[name]["size"]) for name, ok in current.items() if ok}
+    needed = {name: entry for name, entry in lock.items() if name not in results}
+    if needed:
+        if mirror.is_dir():
+            tasks = [(name, entry, mirror, fonts_dir, link) for name, entry in needed.items()]
+            if jobs <= 1:
+                acquired = [_acquire_from_dir(*task) for task in tasks]
+            else:
+                acquired = map_ordered(_acquire_from_dir, tasks, jobs)
+        else:
+            acquired = _acquire_from_tar(needed, mirror, fonts_dir)
+        results.update((result.path, result) for result in acquired)
+    return [results[name] for name in lock]
+
+
+def add_mirror_arguments(parser):
+    """Register the --mirror / --lock / --link options."""
+    parser.add_argument(
+        "--mirror",
+        type=Path,
+        default=Path(os.environ["OPENDOCKIT_FONT_MIRROR"]) if os.environ.get("OPENDOCKIT_FONT_MIRROR") else None,
+        help="mirror directory or tarball laid out like fonts/ (default: $OPENDOCKIT_FONT_MIRROR)",
+    )
+    parser.add_argument(
+        "--lock",
+        type=Path,
+        default=LOCK_PATH,
+        help=f"lockfile of expected SHA-256 hashes (default: {LOCK_PATH.relative_to(ROOT)})",
+    )
+    parser.add_argument(
+        "--link",
+        choices=LINK_MODES,
+        default="reflink",
+        help="how files from a directory mirror are placed; falls back to copying (default: reflink)",
+    )
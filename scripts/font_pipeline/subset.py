@@ -0,0 +1,184 @@
+"""
+Single-pass subsetting engine shared by the font scripts.
+
+Each face is parsed and subset once; every requested output flavor is then
+saved from that same subset ``TTFont``. The subsetter options are identical
+for the WOFF2 bundles, the TTF bundles and the companion package (the
+``Options.flavor`` field only matters to fontTools' own CLI save step), so a
+build that needs WOFF2 + TTF costs one parse per face instead of one per
+output. Fonts are parsed lazily, as fontTools' own subset CLI does, so only
+the tables and glyphs a subset keeps are ever decompiled.
+"""
+
+from io import BytesIO
+from pathlib import Path
+
+from . import FONTS_DIR
+from .cache import file_digest
+from .families import CODEPOINTS
+from .profiles import DEFAULT_PROFILE, apply_profile, finish_subset, profile_extra
+
+# Output flavors understood by subset_face(): WOFF2 for the browser, raw sfnt
+# TrueType/CFF for PDF embedding.
+FLAVORS = ("woff2", "ttf")
+
+
+def subset_options(profile=DEFAULT_PROFILE):
+    """fontTools subsetter options used for every bundled face under ``profile``."""
+    from fontTools.subset import Options
+
+    options = Options()
+    options.desubroutinize = True
+    # Drop tables we don't need for rendering or PDF embedding
+    options.drop_tables += ["DSIG", "GPOS", "GSUB", "GDEF", "kern"]
+    options.no_subset_tables += ["OS/2"]
+    apply_profile(options, profile)
+    return options
+
+
+def save_font(font, flavor):
+    """Serialize a (subset) TTFont as ``flavor`` bytes."""
+    buf = BytesIO()
+    # "ttf" means plain sfnt output, not WOFF/WOFF2
+    font.flavor = "woff2" if flavor == "woff2" else None
+    # Keep head.modified from the source so the bytes depend only on the
+    # cache key inputs.
+    font.recalcTimestamp = False
+    font.save(buf)
+    return buf.getvalue()
+
+
+def subset_face(source_path, flavors=FLAVORS, cache=None, codepoints=CODEPOINTS, profile=DEFAULT_PROFILE):
+    """Subset one source face and return ``{flavor: bytes}``.
+
+    Cached flavors are served from ``cache`` without touching fontTools; the
+    font is only parsed if at least one flavor misses, and then only once.
+    """
+    options = subset_options(profile)
+    extra = profile_extra(profile)
+    results = {}
+    keys = {}
+
+    if cache is not None:
+        digest = file_digest(source_path)
+        for flavor in flavors:
+            keys[flavor] = cache.key(source_path, codepoints, options, flavor, extra=extra, source_digest=digest)
+            data = cache.get(keys[flavor])
+            if data is not None:
+                results[flavor] = data
+
+    missing = [flavor for flavor in flavors if flavor not in results]
+    if missing:
+        from fontTools.subset import Subsetter
+        from fontTools.ttLib import TTFont
+
+        font = TTFont(source_path, lazy=True)
+        subsetter = Subsetter(options=options)
+        subsetter.populate(unicodes=codepoints)
+        subsetter.subset(font)
+        finish_subset(font, profile)
+
+        for flavor in missing:
+            results[flavor] = save_font(font, flavor)
+            if cache is not None:
+                cache.put(keys[flavor], results[flavor])
+
+    return {flavor: results[flavor] for flavor in flavors}
+
+
+def subset_face_shards(source_path, shards, flavor="woff2", cache=None, on_load=None, transform=None,
+                       cache_extra=(), profile=DEFAULT_PROFILE):
+    """Subset one face once per shard; return ``{shard_name: bytes}``.
+
+    ``shards`` is a list of ``(name, codepoints)``. Shards the face has no
+    glyphs for are omitted rather than emitted as .notdef-only fonts. Every
+    shard needs its own subset of a fresh font, so the source bytes are read
+    once and re-parsed from memory per shard; the cmap is read once to find
+    empty shards. An empty shard is cached as zero bytes so cached rebuilds
+    don't need the cmap either.
+
+    ``on_load``, if given, is called with that lazily loaded source TTFont,
+    letting other stages (e.g. metrics) read it without parsing the file
+    again. It isn't called when every shard is served from the cache, and
+    the font is dropped once it returns, so read what you need inside
+    ``on_load`` rather than keeping the font. Each shard's font is likewise
+    freed as soon as its bytes are saved.
+
+    ``transform``, if given, maps the parsed source TTFont to the font that
+    is actually sharded (e.g. a variable font limited to an axis range, see
+    variable.py); ``cache_extra`` must then identify the transform in the
+    cache key.
+
+    ``profile`` (see profiles.py) applies to every shard.
+    """
+    options = subset_options(profile)
+    cache_extra = (*cache_extra, *profile_extra(profile))
+    digest = file_digest(source_path) if cache is not None else None
+    results = {}
+    pending = []
+
+    for name, codepoints in shards:
+        key = None
+        if cache is not None:
+            key = cache.key(source_path, codepoints, options, flavor, extra=cache_extra, source_digest=digest)
+            data = cache.get(key)
+            if data is not None:
+                results[name] = data
+                continue
+        pending.append((name, codepoints, key))
+
+    if pending:
+        from fontTools.ttLib import TTFont
+
+        source = Path(source_path).read_bytes()
+        if transform is not None:
+            source = save_font(transform(TTFont(BytesIO(source))), "ttf")
+        source_font = TTFont(BytesIO(source), lazy=True)
+        covered = set(source_font.getBestCmap() or {})
+        if on_load is not None:
+            on_load(source_font)
+        del source_font
+
+        for name, codepoints, key in pending:
+            data = b""
+            if covered & codepoints:
+                data = _subset_shard(source, codepoints, options, flavor, profile)
+            if cache is not None:
+                cache.put(key, data)
+            results[name] = data
+
+    return {name: results[name] for name, _ in shards if results[name]}
+
+
+def _subset_shard(source, codepoints, options, flavor, profile):
+    """Subset source bytes to ``codepoints``; the parsed font is freed on return."""
+    from fontTools.subset import Subsetter
+    from fontTools.ttLib import TTFont
+
+    font = TTFont(BytesIO(source), lazy=True)
+    subsetter = Subsetter(options=options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    finish_subset(font, profile)
+    return save_font(font, flavor)
+
+
+def iter_family_subsets(family_def, flavor, cache=None, aliases=None, profile=DEFAULT_PROFILE):
+    """Yield ``(variant_name, subset_bytes)`` for a family, one variant at a time.
+
+    Variants whose source file is missing are reported and skipped. Being a
+    generator, only the variant currently being written is held in memory.
+    Variants in ``aliases`` (``{variant: SharedFace}``, see dedup.py) yield
+    their ``SharedFace`` instead and are not subset. Every variant is subset
+    under ``profile``.
+    """
+    aliases = aliases or {}
+    for variant_name, ttf_filename in family_def["variants"].items():
+        if variant_name in aliases:
+            yield variant_name, aliases[variant_name]
+            continue
+        ttf_path = FONTS_DIR / ttf_filename
+        if not ttf_path.exists():
+            print(f"  WARN: {ttf_path} not found, skipping {variant_name}")
+            continue
+        yield variant_name, subset_face(ttf_path, (flavor,), cache, profile=profile)[flavor]
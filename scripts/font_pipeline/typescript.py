@@ -0,0 +1,214 @@
+"""
+Base64 TypeScript bundle modules for packages/core.
+
+Each bundle kind ("woff2", "ttf") gets one ``<module>.ts`` per family
+exporting a base64 string per variant, plus a ``manifest.ts`` that maps
+lowercase family names (and Office substitute names) to modules. Modules are
+streamed to disk variant by variant (see ``write_family_module``).
+
+A variant whose bytes another family already ships (see dedup.py) is
+re-exported from that family's module instead of embedded again, and
+listed under ``aliases`` in manifest.ts.
+"""
+
+import base64
+import json
+
+from . import FONTS_DIR, ROOT
+from .dedup import SharedFace, family_aliases, shared_faces
+from .families import FONT_FAMILIES
+from .incremental import AtomicWriter
+
+CORE_FONT_DATA_DIR = ROOT / "packages" / "core" / "src" / "font" / "data"
+
+# Bytes per base64 chunk: a multiple of 3 (no padding mid-stream), large
+# enough that per-write overhead is negligible.
+BASE64_CHUNK = 3 * 64 * 1024
+
+BUNDLES = {
+    "woff2": {
+        "script": "bundle-woff2-fonts.py",
+        "output_dir": CORE_FONT_DATA_DIR / "woff2",
+        "label": "WOFF2",
+        "interface": "BundledFontEntry",
+        "const": "BUNDLED_FONTS",
+        "description": "All bundled font families",
+        "pack_dir": CORE_FONT_DATA_DIR / "woff2-pack",
+        "pack_interface": "BundledFontPackEntry",
+        "pack_const": "BUNDLED_FONT_PACKS",
+        "pack_loader": "loadBundledFontPack",
+    },
+    "ttf": {
+        "script": "bundle-ttf-fonts.py",
+        "output_dir": CORE_FONT_DATA_DIR / "ttf",
+        "label": "TTF",
+        "interface": "BundledTTFEntry",
+        "const": "BUNDLED_TTF_FONTS",
+        "description": "All bundled TTF font families",
+        "pack_dir": CORE_FONT_DATA_DIR / "ttf-pack",
+        "pack_interface": "BundledTTFPackEntry",
+        "pack_const": "BUNDLED_TTF_PACKS",
+        "pack_loader": "loadBundledTTFPack",
+    },
+}
+
+
+def write_base64(out, data):
+    """Base64-encode ``data`` into ``out`` chunk by chunk.
+
+    Chunks are a multiple of 3 bytes, so they encode without padding and
+    concatenate to exactly ``base64.b64encode(data)``. Returns the number of
+    base64 characters written.
+    """
+    view = memoryview(data)
+    written = 0
+    for start in range(0, len(view), BASE64_CHUNK):
+        encoded = base64.b64encode(view[start:start + BASE64_CHUNK])
+        out.write(encoded)
+        written += len(encoded)
+    return written
+
+
+def write_family_module(output_path, kind, family_def, variants):
+    """Stream a family's TypeScript module to ``output_path``.
+
+    ``variants`` yields ``(variant_name, subset_bytes)`` pairs in export
+    order; pass a generator to keep only one variant's bytes alive at a time.
+    Each variant is base64-encoded straight into the file, so no full base64
+    string or joined module text is ever built in memory. A ``SharedFace``
+    in place of the bytes is written as a re-export of the owning module's
+    variant.
+
+    The file is only replaced if its content changed (see AtomicWriter).
+    Returns ``(changed, digest)``.
+    """
+    bundle = BUNDLES[kind]
+    with AtomicWriter(output_path) as out:
+        out.write(f"// Auto-generated by scripts/{bundle['script']} — {family_def['register_as']}\n")
+        out.write("// prettier-ignore\n")
+
+        for variant_name, data in variants:
+            ttf_filename = family_def["variants"][variant_name]
+            if isinstance(data, SharedFace):
+                out.write(_reexport(variant_name, data, output_path.stem))
+                print(f"  {variant_name}: {ttf_filename} → shared with {data.module}.{data.variant}")
+                continue
+
+            out.write(f"export const {variant_name} = '")
+            b64_len = write_base64(out, data)
+            out.write("';\n")
+
+            size_kb = len(data) / 1024
+            print(f"  {variant_name}: {ttf_filename} → {size_kb:.1f} KB {bundle['label']}, {b64_len} chars base64")
+
+    return out.changed, out.digest
+
+
+def _reexport(variant_name, owner, module_name):
+    """Export statement aliasing ``variant_name`` to a ``SharedFace``."""
+    binding = owner.variant if owner.variant == variant_name else f"{owner.variant} as {variant_name}"
+    if owner.module == module_name:
+        return f"export {{ {binding} }};\n"
+    return f"export {{ {binding} }} from './{owner.module}.js';\n"
+
+
+def _alias_lines(aliases, field, suffix):
+    """manifest.ts ``aliases`` property for a family's shared variants, if any.
+
+    Each alias names the owning family's file under ``field`` ("module" or
+    "pack") with ``suffix`` appended.
+    """
+    if not aliases:
+        return []
+    lines = ["    aliases: {"]
+    for variant_name, owner in aliases.items():
+        lines.append(f"      {variant_name}: {{ {field}: './{owner.module}{suffix}', variant: '{owner.variant}' }},")
+    lines.append("    },")
+    return lines
+
+
+def _existing_variants(family_def):
+    """Variant names whose source file exists, in declaration order."""
+    return [
+        variant_name
+        for variant_name, ttf_filename in family_def["variants"].items()
+        if (FONTS_DIR / ttf_filename).exists()
+    ]
+
+
+def bundle_manifest(kind, shared=None):
+    """Generate manifest.ts with family→module mapping.
+
+    ``shared`` is a ``shared_faces()`` plan (computed if omitted).
+    """
+    bundle = BUNDLES[kind]
+    if shared is None:
+        shared = shared_faces()
+    lines = [
+        f"// Auto-generated by scripts/{bundle['script']}",
+        "",
+        f"export interface {bundle['interface']} {{",
+        "  /** Module path relative to this directory (without extension). */",
+        "  module: string;",
+        "  /** Font family name to register under. */",
+        "  registerAs: string;",
+        "  /** If this is a substitute for an Office font, the original name. */",
+        "  substituteFor?: string;",
+        "  /** Available variant names (keys exported from the module). */",
+        "  variants: string[];",
+        "  /** Variants re-exported from another family's module, and where their bytes live. */",
+        "  aliases?: Record<string, { module: string; variant: string }>;",
+        "}",
+        "",
+        f"/** {bundle['description']}, keyed by lowercase family name. */",
+        f"export const {bundle['const']}: Record<string, {bundle['interface']}> = {{",
+    ]
+
+    for module_name, family_def in sorted(FONT_FAMILIES.items()):
+        register_as = family_def["register_as"]
+        key = register_as.lower()
+        # Only include variants whose TTF actually exists
+        existing_variants = _existing_variants(family_def)
+        if not existing_variants:
+            continue
+
+        sub_for = family_def.get("substitute_for")
+        variants_str = json.dumps(existing_variants)
+
+        lines.append(f"  '{key}': {{")
+        lines.append(f"    module: './{module_name}.js',")
+        lines.append(f"    registerAs: '{register_as}',")
+        if sub_for:
+            lines.append(f"    substituteFor: '{sub_for}',")
+        lines.append(f"    variants: {variants_str},")
+        lines.extend(_alias_lines(family_aliases(module_name, shared), "module", ".js"))
+        lines.append(f"  }},")
+
+    # Add reverse lookup entries for substitute_for names
+    for module_name, family_def in sorted(FONT_FAMILIES.items()):
+        sub_for = family_def.get("substitute_for")
+        if not sub_for:
+            continue
+        register_as = family_def["register_as"]
+        key_sub = sub_for.lower()
+        key_orig = register_as.lower()
+        # Skip if substitute name matches register name (already emitted above)
+        if key_sub == key_orig:
+            continue
+        existing_variants = _existing_variants(family_def)
+        if not existing_variants:
+            continue
+        variants_str = json.dumps(existing_variants)
+
+        lines.append(f"  '{key_sub}': {{")
+        lines.append(f"    module: './{module_name}.js',")
+        lines.append(f"    registerAs: '{sub_for}',")
+        lines.append(f"    substituteFor: '{sub_for}',")
+        lines.append(f"    variants: {variants_str},")
+        lines.extend(_alias_lines(family_aliases(module_name, shared), "module", ".js"))
+        lines.append(f"  }},")
+
+    lines.append("};")
+    lines.append("")
+
+    return "\n".join(lines) + "\n"
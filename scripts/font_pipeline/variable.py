@@ -0,0 +1,202 @@
+"""
+Variable-font stage: static instances and subset variable WOFF2s.
+
+Several families are only published as variable fonts. download-google-fonts.sh
+fetches those to fonts/.variable/, and ``instance_static()`` cuts the static
+weights FONT_FAMILIES lists from them (VARIABLE_INSTANCES in families.py).
+Instances are named either by an fvar named instance ("SemiBold") or by
+axis coordinates ("wght=600,wdth=100"); axes left out are pinned to their
+default, so the result is always a static font.
+
+For the companion package, ``variable_groups()`` finds families whose
+variants of one style are all instances of the same variable source. With
+``generate-font-package.py --variable`` such a group ships as one variable
+WOFF2 per unicode-range shard instead of one static WOFF2 per weight: the
+source is limited to the axis range its instances span (other axes
+pinned), then sharded like any other face. The manifest entries carry that
+range under ``axes``, which the loaders turn into a CSS weight range.
+"""
+
+from . import FONTS_DIR
+from .families import VARIABLE_INSTANCES, VARIANT_MAP
+from .profiles import DEFAULT_PROFILE
+from .subset import subset_face_shards
+
+VARIABLE_DIR = FONTS_DIR / ".variable"
+
+
+def axes(font):
+    """fvar axes as ``[{"tag", "name", "min", "default", "max"}]``."""
+    names = font["name"]
+    return [
+        {
+            "tag": axis.axisTag,
+            "name": names.getDebugName(axis.axisNameID) or axis.axisTag,
+            "min": axis.minValue,
+            "default": axis.defaultValue,
+            "max": axis.maxValue,
+        }
+        for axis in font["fvar"].axes
+    ]
+
+
+def named_instances(font):
+    """fvar named instances as ``{subfamily name: {axis tag: value}}``."""
+    names = font["name"]
+    return {
+        names.getDebugName(instance.subfamilyNameID): dict(instance.coordinates)
+        for instance in font["fvar"].instances
+    }
+
+
+def parse_coordinates(spec):
+    """Parse ``"wght=600,wdth=100"`` into ``{"wght": 600, "wdth": 100}``."""
+    coordinates = {}
+    for part in spec.split(","):
+        tag, sep, value = part.partition("=")
+        if not sep or not tag.strip():
+            raise ValueError(f"bad axis coordinate {part!r} (expected tag=value)")
+        try:
+            number = float(value)
+        except ValueError:
+            raise ValueError(f"bad value for axis {tag.strip()}: {value!r}") from None
+        coordinates[tag.strip()] = int(number) if number.is_integer() else number
+    return coordinates
+
+
+def resolve_instance(font, spec):
+    """Axis coordinates for a named instance or an ``axis=value,...`` spec.
+
+    Named instances match case-insensitively. Raises ValueError for a
+    static font, an unknown instance or axis, or an out-of-range value.
+    """
+    if "fvar" not in font:
+        raise ValueError("not a variable font (no fvar table)")
+    instances = named_instances(font)
+    for name, coordinates in instances.items():
+        if name and name.lower() == spec.lower():
+            return coordinates
+    if "=" not in spec:
+        raise ValueError(f"no named instance {spec!r} (have: {', '.join(filter(None, instances))})")
+
+    coordinates = parse_coordinates(spec)
+    limits = {axis["tag"]: axis for axis in axes(font)}
+    for tag, value in coordinates.items():
+        axis = limits.get(tag)
+        if axis is None:
+            raise ValueError(f"unknown axis {tag} (have: {', '.join(limits)})")
+        if not axis["min"] <= value <= axis["max"]:
+            raise ValueError(f"{tag}={value} outside the font's range {axis['min']:g}-{axis['max']:g}")
+    return coordinates
+
+
+def instance_static(font, coordinates):
+    """Instance a variable TTFont at ``coordinates``; unlisted axes take their default."""
+    from fontTools.varLib.instancer import instantiateVariableFont
+
+    limits = {axis.axisTag: coordinates.get(axis.axisTag) for axis in font["fvar"].axes}
+    static = instantiateVariableFont(font, limits)
+    # Keep head.modified from the source so re-instancing is reproducible.
+    static.recalcTimestamp = False
+    return static
+
+
+def instance_all(log=print):
+    """Cut every missing static in VARIABLE_INSTANCES from fonts/.variable/.
+
+    Existing statics are left alone, like the downloads. Returns the number
+    of files written.
+    """
+    from fontTools.ttLib import TTFont
+
+    written = 0
+    for static_name, (variable_name, coordinates) in VARIABLE_INSTANCES.items():
+        output = FONTS_DIR / static_name
+        source = VARIABLE_DIR / variable_name
+        if output.exists():
+            log(f"  SKIP (exists): {static_name}")
+            continue
+        if not source.exists():
+            log(f"  SKIP (no source): {variable_name}")
+            continue
+        instance_static(TTFont(source), coordinates).save(output)
+        written += 1
+        log(f"  INST: {static_name} ({format_coordinates(coordinates)})")
+    return written
+
+
+def format_coordinates(coordinates):
+    """``{"wght": 600, "wdth": 100}`` → ``"wght=600, wdth=100"``."""
+    return ", ".join(f"{tag}={value:g}" for tag, value in coordinates.items())
+
+
+def varied_axes(instances):
+    """``{tag: [min, max]}`` for the axes whose value differs between ``instances``."""
+    ranges = {}
+    for tag in sorted({tag for coordinates in instances for tag in coordinates}):
+        values = [coordinates[tag] for coordinates in instances if tag in coordinates]
+        if len(values) == len(instances) and min(values) != max(values):
+            ranges[tag] = [min(values), max(values)]
+    return ranges
+
+
+def limit_axes(font, instances):
+    """Limit a variable TTFont to the design space ``instances`` span.
+
+    Axes in ``varied_axes()`` keep just that range; every other axis is
+    pinned to the instances' shared value (or its default), so the result
+    only varies where the family needs it to.
+    """
+    from fontTools.varLib.instancer import instantiateVariableFont
+
+    ranges = varied_axes(instances)
+    limits = {}
+    for axis in font["fvar"].axes:
+        if axis.axisTag in ranges:
+            limits[axis.axisTag] = tuple(ranges[axis.axisTag])
+        else:
+            limits[axis.axisTag] = instances[0].get(axis.axisTag)
+    limited = instantiateVariableFont(font, limits)
+    limited.recalcTimestamp = False
+    return limited
+
+
+def variable_groups(family_def):
+    """Variants of a family that can ship as one variable font, by CSS style.
+
+    Returns ``{style: (variable source name, {variant name: coordinates})}``
+    for each style ("normal" / "italic") whose variants, at least two, are
+    all instances of one variable source present in fonts/.variable/.
+    """
+    by_style = {}
+    for variant_name, filename in family_def["variants"].items():
+        style = VARIANT_MAP.get(variant_name, (400, "normal"))[1]
+        by_style.setdefault(style, []).append((variant_name, VARIABLE_INSTANCES.get(filename)))
+
+    groups = {}
+    for style, members in by_style.items():
+        sources = {instance[0] if instance else None for _, instance in members}
+        if len(members) < 2 or len(sources) != 1 or None in sources:
+            continue
+        source = sources.pop()
+        if not (VARIABLE_DIR / source).exists():
+            continue
+        groups[style] = (source, {variant_name: instance[1] for variant_name, instance in members})
+    return groups
+
+
+def subset_variable_shards(variable_name, instances, shards, flavor="woff2", cache=None, profile=DEFAULT_PROFILE):
+    """Subset a variable source, limited to ``instances``, once per shard.
+
+    ``instances`` is a list of axis coordinate dicts. Returns
+    ``{shard name: bytes}`` like ``subset_face_shards()``, cached under the
+    limited design space. ``profile`` applies as for static faces, except
+    that variable outlines are never quantized.
+    """
+    source_path = VARIABLE_DIR / variable_name
+    cache_extra = ("variable", *(sorted(coordinates.items()) for coordinates in instances))
+    return subset_face_shards(
+        source_path, shards, flavor, cache,
+        transform=lambda font: limit_axes(font, instances), cache_extra=cache_extra, profile=profile,
+    )
+
@@ -6,15 +6,21 @@ Creates slides covering straight connectors with arrow styles, bent (elbow)
 connectors, curved connectors, and different line styles.
 
 Usage:
-    python3 scripts/generate-connector-stress-test.py
+    python3 scripts/generate-connector-stress-test.py [--deterministic]
     # Output: test-data/connector-stress-test.pptx
+
+  --deterministic  Save with fixed zip timestamps, entry order and document
+                   dates (deck_pipeline/save.py), so an unchanged deck keeps
+                   its bytes.
 """
 
+import argparse
+
 from pptx import Presentation
-from pptx.util import Inches, Pt, Emu
-from pptx.dml.color import RGBColor
-from pptx.enum.text import PP_ALIGN
-from pptx.oxml.ns import qn
+from pptx.util import Emu
+
+from deck_pipeline.save import add_deterministic_argument, save_presentation
+from deck_pipeline.shapes import add_label, add_endpoint_dot, add_connector
 
 ROOT = __import__("pathlib").Path(__file__).resolve().parent.parent
 
@@ -22,153 +28,6 @@ SLIDE_WIDTH = Emu(12192000)   # 13.333 inches
 SLIDE_HEIGHT = Emu(6858000)   # 7.5 inches
 
 
-def add_label(slide, x, y, w, h, text, font_size=10, color=None):
-    """Add a text label to the slide."""
-    txBox = slide.shapes.add_textbox(Inches(x), Inches(y), Inches(w), Inches(h))
-    tf = txBox.text_frame
-    tf.word_wrap = True
-    p = tf.paragraphs[0]
-    run = p.add_run()
-    run.text = text
-    run.font.size = Pt(font_size)
-    run.font.name = "Calibri"
-    run.font.color.rgb = color or RGBColor(0x33, 0x33, 0x33)
-    return txBox
-
-
-def add_endpoint_dot(slide, x_inches, y_inches, color=(0x99, 0x99, 0x99)):
-    """Add a small circle to mark a connector endpoint."""
-    dot = slide.shapes.add_shape(
-        9,  # OVAL
-        Inches(x_inches) - Emu(36000),
-        Inches(y_inches) - Emu(36000),
-        Emu(72000), Emu(72000)
-    )
-    spPr = dot._element.spPr
-    for child in list(spPr):
-        tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
-        if tag in ("solidFill", "gradFill", "noFill"):
-            spPr.remove(child)
-    solidFill = spPr.makeelement(qn("a:solidFill"), {})
-    srgbClr = solidFill.makeelement(qn("a:srgbClr"), {
-        "val": "%02X%02X%02X" % (color[0], color[1], color[2])
-    })
-    solidFill.append(srgbClr)
-    spPr.append(solidFill)
-    # Remove outline
-    for child in list(spPr):
-        tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
-        if tag == "ln":
-            spPr.remove(child)
-    return dot
-
-
-def add_connector(slide, x1, y1, x2, y2, connector_type="straight",
-                  color=(0x00, 0x00, 0x00), width_pt=1.5,
-                  head_end=None, tail_end=None,
-                  dash_style=None):
-    """
-    Add a connector shape between two points.
-    connector_type: "straight", "bent", or "curved"
-    head_end/tail_end: arrow type string or None
-    dash_style: "solid", "dash", "dot", "dashDot", "lgDash", "lgDashDot" etc.
-    """
-    # Connector type mapping for cxnSp
-    type_map = {
-        "straight": "line",
-        "bent": "bentConnector3",
-        "curved": "curvedConnector3",
-    }
-    prst = type_map.get(connector_type, "line")
-
-    # Calculate position and size
-    left = min(Inches(x1), Inches(x2))
-    top = min(Inches(y1), Inches(y2))
-    width = abs(Inches(x2) - Inches(x1))
-    height = abs(Inches(y2) - Inches(y1))
-
-    # Determine if we need to flip
-    flipH = "1" if x2 < x1 else "0"
-    flipV = "1" if y2 < y1 else "0"
-
-    # Ensure minimum size
-    if width == 0:
-        width = Emu(1)
-    if height == 0:
-        height = Emu(1)
-
-    # Build cxnSp element
-    nsmap_local = {
-        "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
-        "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
-        "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
-    }
-
-    from lxml import etree
-
-    cxnSp = etree.SubElement(
-        slide._element.spTree,
-        qn("p:cxnSp")
-    )
-
-    # nvCxnSpPr
-    nvCxnSpPr = etree.SubElement(cxnSp, qn("p:nvCxnSpPr"))
-    cNvPr = etree.SubElement(nvCxnSpPr, qn("p:cNvPr"))
-    cNvPr.set("id", str(100 + len(slide.shapes)))
-    cNvPr.set("name", f"Connector {len(slide.shapes)}")
-    cNvCxnSpPr = etree.SubElement(nvCxnSpPr, qn("p:cNvCxnSpPr"))
-    nvPr = etree.SubElement(nvCxnSpPr, qn("p:nvPr"))
-
-    # spPr
-    spPr = etree.SubElement(cxnSp, qn("p:spPr"))
-
-    xfrm = etree.SubElement(spPr, qn("a:xfrm"))
-    if flipH == "1":
-        xfrm.set("flipH", "1")
-    if flipV == "1":
-        xfrm.set("flipV", "1")
-
-    off = etree.SubElement(xfrm, qn("a:off"))
-    off.set("x", str(int(left)))
-    off.set("y", str(int(top)))
-    ext = etree.SubElement(xfrm, qn("a:ext"))
-    ext.set("cx", str(int(width)))
-    ext.set("cy", str(int(height)))
-
-    prstGeom = etree.SubElement(spPr, qn("a:prstGeom"))
-    prstGeom.set("prst", prst)
-    avLst = etree.SubElement(prstGeom, qn("a:avLst"))
-
-    # Line properties
-    ln = etree.SubElement(spPr, qn("a:ln"))
-    ln.set("w", str(int(width_pt * 12700)))
-
-    solidFill = etree.SubElement(ln, qn("a:solidFill"))
-    srgbClr = etree.SubElement(solidFill, qn("a:srgbClr"))
-    srgbClr.set("val", "%02X%02X%02X" % (color[0], color[1], color[2]))
-
-    # Dash style
-    if dash_style and dash_style != "solid":
-        prstDash = etree.SubElement(ln, qn("a:prstDash"))
-        prstDash.set("val", dash_style)
-
-    # Head end (arrow at start)
-    if head_end:
-        headEnd = etree.SubElement(ln, qn("a:headEnd"))
-        headEnd.set("type", head_end)
-        headEnd.set("w", "med")
-        headEnd.set("len", "med")
-
-    # Tail end (arrow at end)
-    if tail_end:
-        tailEnd = etree.SubElement(ln, qn("a:tailEnd"))
-        tailEnd.set("type", tail_end)
-        tailEnd.set("w", "med")
-        tailEnd.set("len", "med")
-
-    return cxnSp
-
-
 def slide1_straight_connectors(prs):
     """Slide 1: Straight connectors with different arrow styles."""
     slide = prs.slides.add_slide(prs.slide_layouts[6])
@@ -304,7 +163,14 @@ def slide4_line_styles(prs):
         pass  # Skip if no room
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate the connector stress-test PPTX.")
+    add_deterministic_argument(parser)
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
     prs = Presentation()
     prs.slide_width = SLIDE_WIDTH
     prs.slide_height = SLIDE_HEIGHT
@@ -316,7 +182,7 @@ def main():
 
     output_path = ROOT / "test-data" / "connector-stress-test.pptx"
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    prs.save(str(output_path))
+    save_presentation(prs, output_path, args.deterministic)
 
     print(f"Generated: {output_path}")
     print(f"  Slides: {len(prs.slides)}")
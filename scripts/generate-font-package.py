@@ -3,486 +3,122 @@
 Generate raw font files for @opendockit/fonts companion package.
 
 Reads TTF sources from fonts/ directory, produces:
-- packages/fonts/woff2/{family}/latin-{weight}-{style}.woff2
+- packages/fonts/woff2/{family}/{shard}-{weight}-{style}.woff2
 - packages/fonts/ttf/{family}-{variant}.ttf
+- packages/fonts/metrics/{family}-{variant}.bin
+- packages/fonts/kerning/{family}-{variant}.kern (faces with kerning)
 - packages/fonts/manifest.json
-
-Usage: python3 scripts/generate-font-package.py
+- packages/core/src/font/data/metrics-bundle.ts (when every face is present)
+
+Usage: python3 scripts/generate-font-package.py [--jobs N] [--no-shards] [--no-metrics] [--variable]
+       [--profile default|render] [--quantize UNITS] [--hashed-filenames] [--precompress]
+       [--low-memory] [--max-rss-mb MB] [--report-memory] [--no-cache]
+
+  --jobs N      Subset faces in N worker processes (0 = one per CPU core).
+                Defaults to 1, which processes faces serially in-process.
+  --no-shards   Write one latin-{weight}-{style}.woff2 per face covering every
+                range, instead of one file per unicode-range shard (SHARDS in
+                font_pipeline/families.py).
+  --no-metrics  Skip the layout metrics stage. By default advance widths and
+                vertical metrics are read from the TTFont already loaded for
+                subsetting and written as one delta+varint table per face
+                (font_pipeline/metrics.py), which metrics-decoder.ts reads,
+                plus a pair-kerning table for faces with kerning
+                (font_pipeline/kerning.py).
+  --variable    Where every variant of one style of a family is an instance
+                of the same variable font in fonts/.variable/ (e.g. Roboto
+                Slab regular + bold), ship one variable WOFF2 per shard,
+                limited to the weights used, instead of one static WOFF2 per
+                variant (font_pipeline/variable.py). TTF copies and metrics
+                still come from the static instances.
+  --profile render
+                Subset the WOFF2 shards for Canvas2D rendering only: strip
+                TrueType hinting and keep only the copyright, family and
+                subfamily names (font_pipeline/profiles.py). Each face's
+                WOFF2 bytes are reported against the default profile.
+                TTF copies are untouched.
+  --quantize UNITS
+                With --profile render, also snap outline points to a grid
+                of UNITS font units (e.g. 2 or 4) so the WOFF2 compresses
+                better. Advance widths are kept exactly.
+  --hashed-filenames
+                Name every file {name}.{content hash}.{ext}, so a CDN can
+                serve the package with Cache-Control: immutable.
+  --precompress Next to every TTF, metrics and kerning table and
+                manifest.json, write {file}.br (Brotli quality 11) and
+                {file}.gz (gzip -9) for static servers to send as-is
+                (font_pipeline/precompress.py). Uses --jobs workers.
+  --low-memory  Bound peak memory, e.g. for 1 GB CI containers: every face
+                is subset in a fresh worker process that exits once the
+                face is written, and faces only run concurrently (up to
+                --jobs) while their estimated peak RSS fits --max-rss-mb
+                (default 768). A face too big for the budget runs alone.
+                Output is identical to a normal build
+                (font_pipeline/memory.py).
+  --report-memory
+                Log each face's peak RSS, and the largest in the summary.
+
+Every manifest file entry carries an SRI "integrity" hash (sha256-...);
+WOFF2 and TTF entries also carry their glyph count, and WOFF2 shards a
+"coverage" bitmap of the codepoints they map (font_pipeline/package.py).
+The manifest's "fallback" table maps every bundle codepoint to the first
+family that covers it, for O(1) fallback lookups at runtime
+(font_pipeline/coverage.py; analyze-font-coverage.py reports the gaps).
+
+Files that are byte-identical across families (e.g. "calibri-light"
+reuses Carlito-Regular.ttf) are written once; the other families' manifest
+entries point at the shared file (font_pipeline/dedup.py).
+
+WOFF2 subsets are cached by content hash (see font_pipeline/cache.py); the
+shared --cache-dir / --cache-max-mb / --no-cache options control the cache.
+Family definitions and the subsetting engine live in font_pipeline/; use
+build-fonts.py to produce this package and the core bundles in one pass.
 """
 
-import json
-import os
-import shutil
+import argparse
 import sys
-from io import BytesIO
-from pathlib import Path
-
-ROOT = Path(__file__).resolve().parent.parent
-FONTS_DIR = ROOT / "fonts"
-OUTPUT_DIR = ROOT / "packages" / "fonts"
-WOFF2_DIR = OUTPUT_DIR / "woff2"
-TTF_DIR = OUTPUT_DIR / "ttf"
-
-# Unicode ranges to keep for WOFF2 subsetting: Latin + symbols
-# (same ranges as bundle-woff2-fonts.py)
-UNICODE_RANGES = [
-    (0x0020, 0x024F),   # Basic Latin through Latin Extended-B
-    (0x2000, 0x206F),   # General Punctuation
-    (0x20A0, 0x20CF),   # Currency Symbols
-    (0x2100, 0x214F),   # Letterlike Symbols
-    (0x2190, 0x21FF),   # Arrows
-    (0x2200, 0x22FF),   # Mathematical Operators
-    (0x2300, 0x23FF),   # Miscellaneous Technical
-    (0x25A0, 0x25FF),   # Geometric Shapes
-    (0x2600, 0x26FF),   # Miscellaneous Symbols
-    (0xFB00, 0xFB06),   # Alphabetic Presentation Forms (ligatures)
-    (0xFEFF, 0xFEFF),   # BOM / ZWNBS
-    (0xFFFC, 0xFFFD),   # Replacement characters
-]
-
-CODEPOINTS = set()
-for start, end in UNICODE_RANGES:
-    for cp in range(start, end + 1):
-        CODEPOINTS.add(cp)
-
-# Variant name → (weight, style) mapping
-VARIANT_MAP = {
-    "regular": (400, "normal"),
-    "bold": (700, "normal"),
-    "italic": (400, "italic"),
-    "boldItalic": (700, "italic"),
-}
-
-# Font family definitions — mirrors bundle-woff2-fonts.py exactly
-FONT_FAMILIES = {
-    # Office core font substitutes
-    "carlito": {
-        "register_as": "Carlito",
-        "substitute_for": "Calibri",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "Carlito-Regular.ttf",
-            "bold": "Carlito-Bold.ttf",
-            "italic": "Carlito-Italic.ttf",
-            "boldItalic": "Carlito-BoldItalic.ttf",
-        },
-    },
-    "calibri-light": {
-        "register_as": "Calibri Light",
-        "substitute_for": "Calibri Light",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "Carlito-Regular.ttf",
-        },
-    },
-    "caladea": {
-        "register_as": "Caladea",
-        "substitute_for": "Cambria",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "Caladea-Regular.ttf",
-            "bold": "Caladea-Bold.ttf",
-            "italic": "Caladea-Italic.ttf",
-            "boldItalic": "Caladea-BoldItalic.ttf",
-        },
-    },
-    "liberation-sans": {
-        "register_as": "Liberation Sans",
-        "substitute_for": "Arial",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "LiberationSans-Regular.ttf",
-            "bold": "LiberationSans-Bold.ttf",
-            "italic": "LiberationSans-Italic.ttf",
-            "boldItalic": "LiberationSans-BoldItalic.ttf",
-        },
-    },
-    "liberation-serif": {
-        "register_as": "Liberation Serif",
-        "substitute_for": "Times New Roman",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "LiberationSerif-Regular.ttf",
-            "bold": "LiberationSerif-Bold.ttf",
-            "italic": "LiberationSerif-Italic.ttf",
-            "boldItalic": "LiberationSerif-BoldItalic.ttf",
-        },
-    },
-    "liberation-mono": {
-        "register_as": "Liberation Mono",
-        "substitute_for": "Courier New",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "LiberationMono-Regular.ttf",
-            "bold": "LiberationMono-Bold.ttf",
-            "italic": "LiberationMono-Italic.ttf",
-            "boldItalic": "LiberationMono-BoldItalic.ttf",
-        },
-    },
-    "selawik": {
-        "register_as": "Selawik",
-        "substitute_for": "Segoe UI",
-        "license": "MIT",
-        "variants": {
-            "regular": "Selawik-Regular.ttf",
-            "bold": "Selawik-Bold.ttf",
-        },
-    },
-    "selawik-light": {
-        "register_as": "Selawik Light",
-        "substitute_for": "Segoe UI Light",
-        "license": "MIT",
-        "variants": {
-            "regular": "Selawik-Light.ttf",
-        },
-    },
-    "selawik-semibold": {
-        "register_as": "Selawik Semibold",
-        "substitute_for": "Segoe UI Semibold",
-        "license": "MIT",
-        "variants": {
-            "regular": "Selawik-Semibold.ttf",
-        },
-    },
-    "selawik-semilight": {
-        "register_as": "Selawik Semilight",
-        "substitute_for": "Segoe UI Semilight",
-        "license": "MIT",
-        "variants": {
-            "regular": "Selawik-Semilight.ttf",
-        },
-    },
-    "gelasio": {
-        "register_as": "Gelasio",
-        "substitute_for": "Georgia",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "Gelasio-Regular.ttf",
-            "bold": "Gelasio-Bold.ttf",
-            "italic": "Gelasio-Italic.ttf",
-            "boldItalic": "Gelasio-BoldItalic.ttf",
-        },
-    },
-    "liberation-sans-narrow": {
-        "register_as": "Liberation Sans Narrow",
-        "substitute_for": "Arial Narrow",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "LiberationSansNarrow-Regular.ttf",
-            "bold": "LiberationSansNarrow-Bold.ttf",
-            "italic": "LiberationSansNarrow-Italic.ttf",
-            "boldItalic": "LiberationSansNarrow-BoldItalic.ttf",
-        },
-    },
-    "tex-gyre-pagella": {
-        "register_as": "TeX Gyre Pagella",
-        "substitute_for": "Palatino Linotype",
-        "license": "GUST-Font-License",
-        "variants": {
-            "regular": "texgyrepagella-regular.otf",
-            "bold": "texgyrepagella-bold.otf",
-            "italic": "texgyrepagella-italic.otf",
-            "boldItalic": "texgyrepagella-bolditalic.otf",
-        },
-    },
-    "tex-gyre-bonum": {
-        "register_as": "TeX Gyre Bonum",
-        "substitute_for": "Bookman Old Style",
-        "license": "GUST-Font-License",
-        "variants": {
-            "regular": "texgyrebonum-regular.otf",
-            "bold": "texgyrebonum-bold.otf",
-            "italic": "texgyrebonum-italic.otf",
-            "boldItalic": "texgyrebonum-bolditalic.otf",
-        },
-    },
-    "tex-gyre-schola": {
-        "register_as": "TeX Gyre Schola",
-        "substitute_for": "Century Schoolbook",
-        "license": "GUST-Font-License",
-        "variants": {
-            "regular": "texgyreschola-regular.otf",
-            "bold": "texgyreschola-bold.otf",
-            "italic": "texgyreschola-italic.otf",
-            "boldItalic": "texgyreschola-bolditalic.otf",
-        },
-    },
-    # Google Fonts families
-    "arimo": {
-        "register_as": "Arimo",
-        "license": "Apache-2.0",
-        "variants": {
-            "regular": "Arimo-Regular.ttf",
-            "bold": "Arimo-Bold.ttf",
-            "italic": "Arimo-Italic.ttf",
-            "boldItalic": "Arimo-BoldItalic.ttf",
-        },
-    },
-    "barlow": {
-        "register_as": "Barlow",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "Barlow-Regular.ttf",
-            "bold": "Barlow-Bold.ttf",
-            "italic": "Barlow-Italic.ttf",
-            "boldItalic": "Barlow-BoldItalic.ttf",
-        },
-    },
-    "barlow-light": {
-        "register_as": "Barlow Light",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "Barlow-Light.ttf",
-            "italic": "Barlow-LightItalic.ttf",
-        },
-    },
-    "barlow-medium": {
-        "register_as": "Barlow Medium",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "Barlow-Medium.ttf",
-        },
-    },
-    "comfortaa": {
-        "register_as": "Comfortaa",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "Comfortaa-Regular.ttf",
-            "bold": "Comfortaa-Bold.ttf",
-        },
-    },
-    "comfortaa-light": {
-        "register_as": "Comfortaa Light",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "Comfortaa-Light.ttf",
-        },
-    },
-    "courier-prime": {
-        "register_as": "Courier Prime",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "CourierPrime-Regular.ttf",
-            "bold": "CourierPrime-Bold.ttf",
-            "italic": "CourierPrime-Italic.ttf",
-            "boldItalic": "CourierPrime-BoldItalic.ttf",
-        },
-    },
-    "fira-code": {
-        "register_as": "Fira Code",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "FiraCode-Regular.ttf",
-            "bold": "FiraCode-Bold.ttf",
-        },
-    },
-    "lato": {
-        "register_as": "Lato",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "Lato-Regular.ttf",
-            "bold": "Lato-Bold.ttf",
-            "italic": "Lato-Italic.ttf",
-            "boldItalic": "Lato-BoldItalic.ttf",
-        },
-    },
-    "lato-light": {
-        "register_as": "Lato Light",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "Lato-Light.ttf",
-            "italic": "Lato-LightItalic.ttf",
-        },
-    },
-    "montserrat": {
-        "register_as": "Montserrat",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "Montserrat-Regular.ttf",
-            "bold": "Montserrat-Bold.ttf",
-            "italic": "Montserrat-Italic.ttf",
-            "boldItalic": "Montserrat-BoldItalic.ttf",
-        },
-    },
-    "noto-sans": {
-        "register_as": "Noto Sans",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "NotoSans-Regular.ttf",
-            "bold": "NotoSans-Bold.ttf",
-            "italic": "NotoSans-Italic.ttf",
-            "boldItalic": "NotoSans-BoldItalic.ttf",
-        },
-    },
-    "noto-sans-symbols": {
-        "register_as": "Noto Sans Symbols",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "NotoSansSymbols-Regular.ttf",
-            "bold": "NotoSansSymbols-Bold.ttf",
-        },
-    },
-    "noto-serif": {
-        "register_as": "Noto Serif",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "NotoSerif-Regular.ttf",
-            "bold": "NotoSerif-Bold.ttf",
-            "italic": "NotoSerif-Italic.ttf",
-            "boldItalic": "NotoSerif-BoldItalic.ttf",
-        },
-    },
-    "open-sans": {
-        "register_as": "Open Sans",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "OpenSans-Regular.ttf",
-            "bold": "OpenSans-Bold.ttf",
-        },
-    },
-    "open-sans-extrabold": {
-        "register_as": "Open Sans ExtraBold",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "OpenSans-ExtraBold.ttf",
-        },
-    },
-    "oswald": {
-        "register_as": "Oswald",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "Oswald-Regular.ttf",
-            "bold": "Oswald-Bold.ttf",
-        },
-    },
-    "play": {
-        "register_as": "Play",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "Play-Regular.ttf",
-            "bold": "Play-Bold.ttf",
-        },
-    },
-    "playfair-display": {
-        "register_as": "Playfair Display",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "PlayfairDisplay-Regular.ttf",
-            "bold": "PlayfairDisplay-Bold.ttf",
-            "italic": "PlayfairDisplay-Italic.ttf",
-            "boldItalic": "PlayfairDisplay-BoldItalic.ttf",
-        },
-    },
-    "poppins": {
-        "register_as": "Poppins",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "Poppins-Regular.ttf",
-            "bold": "Poppins-Bold.ttf",
-            "italic": "Poppins-Italic.ttf",
-            "boldItalic": "Poppins-BoldItalic.ttf",
-        },
-    },
-    "raleway": {
-        "register_as": "Raleway",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "Raleway-Regular.ttf",
-            "bold": "Raleway-Bold.ttf",
-            "italic": "Raleway-Italic.ttf",
-            "boldItalic": "Raleway-BoldItalic.ttf",
-        },
-    },
-    "roboto": {
-        "register_as": "Roboto",
-        "license": "Apache-2.0",
-        "variants": {
-            "regular": "Roboto-Regular.ttf",
-            "bold": "Roboto-Bold.ttf",
-            "italic": "Roboto-Italic.ttf",
-            "boldItalic": "Roboto-BoldItalic.ttf",
-        },
-    },
-    "roboto-mono": {
-        "register_as": "Roboto Mono",
-        "license": "Apache-2.0",
-        "variants": {
-            "regular": "RobotoMono-Regular.ttf",
-            "bold": "RobotoMono-Bold.ttf",
-            "italic": "RobotoMono-Italic.ttf",
-            "boldItalic": "RobotoMono-BoldItalic.ttf",
-        },
-    },
-    "roboto-slab": {
-        "register_as": "Roboto Slab",
-        "license": "Apache-2.0",
-        "variants": {
-            "regular": "RobotoSlab-Regular.ttf",
-            "bold": "RobotoSlab-Bold.ttf",
-        },
-    },
-    "roboto-slab-light": {
-        "register_as": "Roboto Slab Light",
-        "license": "Apache-2.0",
-        "variants": {
-            "regular": "RobotoSlab-Light.ttf",
-        },
-    },
-    "roboto-slab-medium": {
-        "register_as": "Roboto Slab Medium",
-        "license": "Apache-2.0",
-        "variants": {
-            "regular": "RobotoSlab-Medium.ttf",
-        },
-    },
-    "roboto-slab-semibold": {
-        "register_as": "Roboto Slab SemiBold",
-        "license": "Apache-2.0",
-        "variants": {
-            "regular": "RobotoSlab-SemiBold.ttf",
-        },
-    },
-    "source-code-pro": {
-        "register_as": "Source Code Pro",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "SourceCodePro-Regular.ttf",
-            "bold": "SourceCodePro-Bold.ttf",
-            "italic": "SourceCodePro-Italic.ttf",
-            "boldItalic": "SourceCodePro-BoldItalic.ttf",
-        },
-    },
-    "source-sans-pro": {
-        "register_as": "Source Sans Pro",
-        "license": "OFL-1.1",
-        "variants": {
-            "regular": "SourceSans3-Regular.ttf",
-            "bold": "SourceSans3-Bold.ttf",
-            "italic": "SourceSans3-Italic.ttf",
-            "boldItalic": "SourceSans3-BoldItalic.ttf",
-        },
-    },
-    "tinos": {
-        "register_as": "Tinos",
-        "license": "Apache-2.0",
-        "variants": {
-            "regular": "Tinos-Regular.ttf",
-            "bold": "Tinos-Bold.ttf",
-            "italic": "Tinos-Italic.ttf",
-            "boldItalic": "Tinos-BoldItalic.ttf",
-        },
-    },
-    "ubuntu": {
-        "register_as": "Ubuntu",
-        "license": "Ubuntu-Font-License-1.0",
-        "variants": {
-            "regular": "Ubuntu-Regular.ttf",
-            "bold": "Ubuntu-Bold.ttf",
-            "italic": "Ubuntu-Italic.ttf",
-            "boldItalic": "Ubuntu-BoldItalic.ttf",
-        },
-    },
-}
+
+from font_pipeline import FONTS_DIR
+from font_pipeline.cache import add_cache_arguments, cache_from_args, report_cache
+from font_pipeline.coverage import package_fallback_table
+from font_pipeline.dedup import dedupe_package_files
+from font_pipeline.families import FONT_FAMILIES
+from font_pipeline.memory import (
+    add_memory_arguments,
+    estimate_face_kb,
+    face_peak_rss_kb,
+    format_rss,
+    map_bounded,
+    release,
+    reset_peak_rss,
+)
+from font_pipeline.package import (
+    OUTPUT_DIR,
+    add_package_arguments,
+    annotate_package_files,
+    clean_outputs,
+    family_entry,
+    new_variable_result,
+    new_variant_result,
+    package_shards,
+    shard_codepoints,
+    write_manifest,
+    write_package_metrics_bundle,
+    write_variable_group,
+    write_variant,
+)
+from font_pipeline.metrics import expected_faces, subset_face_shards_with_metrics
+from font_pipeline.parallel import add_jobs_argument, map_ordered, resolve_jobs
+from font_pipeline.precompress import format_savings, package_files, precompress_files
+from font_pipeline.profiles import (
+    DEFAULT_PROFILE,
+    add_profile_arguments,
+    describe_profile,
+    format_profile_savings,
+    profile_from_args,
+)
+from font_pipeline.subset import subset_face_shards
+from font_pipeline.variable import subset_variable_shards, variable_groups
 
 
 def check_dependencies():
@@ -503,126 +139,271 @@ def check_dependencies():
         sys.exit(1)
 
 
-def subset_to_woff2(ttf_path):
-    """Subset a TTF file to Latin+symbols and convert to WOFF2 bytes."""
-    from fontTools.subset import Subsetter, Options
-    from fontTools.ttLib import TTFont
+def subset_to_woff2_shards(ttf_path, shards, cache=None, metrics=True, profile=DEFAULT_PROFILE):
+    """Subset a TTF file to one WOFF2 per shard.
+
+    Returns ``({shard name: bytes}, face metrics or None)``; with ``metrics``
+    the layout metrics are read from the same parsed font.
+    """
+    if metrics:
+        return subset_face_shards_with_metrics(ttf_path, shard_codepoints(shards), "woff2", cache, profile)
+    return subset_face_shards(ttf_path, shard_codepoints(shards), "woff2", cache, profile=profile), None
+
 
-    font = TTFont(ttf_path)
+def profile_baseline(woff2_shards, subset_default, label, result):
+    """Record and log a face's default-profile WOFF2 size next to its profile size.
 
-    options = Options()
-    options.flavor = "woff2"
-    options.desubroutinize = True
-    options.drop_tables += ["DSIG", "GPOS", "GSUB", "GDEF", "kern"]
-    options.no_subset_tables += ["OS/2"]
+    ``subset_default()`` returns the face's shards under the default profile
+    (usually from the cache, if a default build has run). Sets
+    ``result["baseline"]`` to ``(default bytes, profile bytes)``.
+    """
+    size = sum(len(data) for data in woff2_shards.values())
+    baseline = sum(len(data) for data in subset_default().values())
+    result["baseline"] = (baseline, size)
+    result["log"].append(f"  Profile {label}: {format_profile_savings(baseline, size)}")
 
-    subsetter = Subsetter(options=options)
-    subsetter.populate(unicodes=CODEPOINTS)
-    subsetter.subset(font)
 
-    buf = BytesIO()
-    font.flavor = "woff2"
-    font.save(buf)
-    return buf.getvalue()
+def record_memory(result, label):
+    """Log the peak RSS since ``reset_peak_rss()`` and record it in ``result``."""
+    result["peak_rss_kb"] = face_peak_rss_kb()
+    result["log"].append(f"  Memory {label}: peak RSS {format_rss(result['peak_rss_kb'])}")
 
 
-def process_family(family_id, family_def):
-    """Process one font family: generate WOFF2 + copy TTF files.
+def process_variant(family_id, variant_name, ttf_filename, cache=None, shards=None, metrics=True,
+                    profile=DEFAULT_PROFILE, report_memory=False):
+    """Process one (family, variant) pair: WOFF2 shards, TTF copy and metrics table.
+
+    Safe to run in a worker process: it only writes its own output files and
+    returns plain data. Progress lines are collected in ``log`` rather than
+    printed so the caller can emit them in a stable order. With a
+    non-default ``profile``, the face's WOFF2 savings over the default
+    profile are logged and recorded in ``baseline``. With
+    ``report_memory``, the face's peak RSS is logged and recorded in
+    ``peak_rss_kb``.
+    """
+    ttf_path = FONTS_DIR / ttf_filename
+    result = new_variant_result()
+    if report_memory:
+        reset_peak_rss()
+
+    if not ttf_path.exists():
+        result["log"].append(f"  WARN: {ttf_path} not found, skipping {variant_name}")
+        return result
+    result["found"] = True
+
+    if shards is None:
+        shards = package_shards()
+
+    woff2_shards = None
+    face_metrics = None
+    try:
+        hits_before, misses_before = (cache.hits, cache.misses) if cache is not None else (0, 0)
+        woff2_shards, face_metrics = subset_to_woff2_shards(ttf_path, shards, cache, metrics, profile)
+        if woff2_shards and profile != DEFAULT_PROFILE:
+            profile_baseline(
+                woff2_shards,
+                lambda: subset_face_shards(ttf_path, shard_codepoints(shards), "woff2", cache),
+                variant_name, result,
+            )
+        if cache is not None:
+            result["cache_hits"] = cache.hits - hits_before
+            result["cache_misses"] = cache.misses - misses_before
+            result["cached"] = result["cache_misses"] == 0
+    except Exception as e:
+        result["log"].append(f"  WARN: WOFF2 failed for {variant_name} ({ttf_filename}): {e}")
+
+    write_variant(family_id, variant_name, ttf_filename, woff2_shards, result, shards, face_metrics)
+    if report_memory:
+        record_memory(result, variant_name)
+    return result
+
+
+def process_variable_group(family_id, style, source, instances, cache=None, shards=None,
+                           profile=DEFAULT_PROFILE, report_memory=False):
+    """Subset one variable group (see ``variable_groups()``) and write its WOFF2 shards."""
+    result = new_variable_result(source, instances)
+    if report_memory:
+        reset_peak_rss()
+    try:
+        hits_before, misses_before = (cache.hits, cache.misses) if cache is not None else (0, 0)
+        woff2_shards = subset_variable_shards(
+            source, list(instances.values()), shard_codepoints(shards), "woff2", cache, profile
+        )
+        if woff2_shards and profile != DEFAULT_PROFILE:
+            profile_baseline(
+                woff2_shards,
+                lambda: subset_variable_shards(
+                    source, list(instances.values()), shard_codepoints(shards), "woff2", cache
+                ),
+                f"variable {style}", result,
+            )
+        if cache is not None:
+            result["cache_hits"] = cache.hits - hits_before
+            result["cache_misses"] = cache.misses - misses_before
+    except Exception as e:
+        result["log"].append(f"  WARN: variable WOFF2 failed for {style} ({source}): {e}")
+        return result
+    write_variable_group(family_id, style, woff2_shards, result, shards)
+    if report_memory:
+        record_memory(result, f"variable {style}")
+    return result
+
+
+def grouped_variants(family_def, variable):
+    """A family's variable groups (only with ``variable``) and the variants they cover."""
+    groups = variable_groups(family_def) if variable else {}
+    return groups, {variant for _, instances in groups.values() for variant in instances}
+
+
+def process_family(family_id, family_def, variant_results=None, cache=None, shards=None, metrics=True,
+                   variable=False, profile=DEFAULT_PROFILE, savings=None, peaks=None):
+    """Process one font family: generate WOFF2, copy TTF files, write metrics.
+
+    ``variant_results`` maps variant name → ``process_variant()`` result when
+    the variants were already processed (e.g. by a worker pool); otherwise
+    each variant is processed here, in order. With ``variable``, styles
+    covered by a variable group get variable WOFF2 shards instead of static
+    ones. ``savings``, a ``[default bytes, profile bytes]`` list, accumulates
+    the WOFF2 totals of a non-default ``profile``. ``peaks``, a list, turns
+    on memory reporting and collects ``(peak RSS KB, "family/variant")`` per face.
+    Each face's fontTools objects are released before the next face is
+    loaded.
 
     Returns a dict with woff2 and ttf file info for the manifest,
     or None if no variants were processed.
     """
-    register_as = family_def["register_as"]
-    woff2_info = {}
-    ttf_info = {}
-    weights = set()
-    styles = set()
-
-    for variant_name, ttf_filename in family_def["variants"].items():
-        ttf_path = FONTS_DIR / ttf_filename
-        if not ttf_path.exists():
-            print(f"  WARN: {ttf_path} not found, skipping {variant_name}")
-            continue
-
-        weight, style = VARIANT_MAP.get(variant_name, (400, "normal"))
-        weights.add(weight)
-        styles.add(style)
-
-        # --- WOFF2: subset to latin, write raw binary ---
-        try:
-            woff2_data = subset_to_woff2(ttf_path)
-            woff2_subdir = WOFF2_DIR / family_id
-            woff2_subdir.mkdir(parents=True, exist_ok=True)
-            woff2_filename = f"latin-{weight}-{style}.woff2"
-            woff2_out = woff2_subdir / woff2_filename
-            woff2_out.write_bytes(woff2_data)
-            woff2_size = len(woff2_data)
-            woff2_key = f"latin-{weight}-{style}"
-            woff2_info[woff2_key] = {
-                "file": f"woff2/{family_id}/{woff2_filename}",
-                "size": woff2_size,
-            }
-            print(f"  WOFF2 {variant_name}: {woff2_size / 1024:.1f} KB → {woff2_out.relative_to(OUTPUT_DIR)}")
-        except Exception as e:
-            print(f"  WARN: WOFF2 failed for {variant_name} ({ttf_filename}): {e}")
-
-        # --- TTF: copy full file (no subsetting) ---
-        try:
-            ttf_out_filename = f"{family_id}-{variant_name}.ttf"
-            ttf_out = TTF_DIR / ttf_out_filename
-            TTF_DIR.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(ttf_path, ttf_out)
-            ttf_size = ttf_out.stat().st_size
-            ttf_info[variant_name] = {
-                "file": f"ttf/{ttf_out_filename}",
-                "size": ttf_size,
-            }
-            print(f"  TTF  {variant_name}: {ttf_size / 1024:.1f} KB → {ttf_out.relative_to(OUTPUT_DIR)}")
-        except Exception as e:
-            print(f"  WARN: TTF copy failed for {variant_name} ({ttf_filename}): {e}")
-
-    if not woff2_info and not ttf_info:
-        return None
-
-    return {
-        "displayName": register_as,
-        "substituteFor": family_def.get("substitute_for"),
-        "license": family_def.get("license", "Unknown"),
-        "woff2": woff2_info,
-        "ttf": ttf_info,
-        "weights": sorted(weights),
-        "styles": sorted(styles),
-        "subsets": ["latin"],
-    }
+    if shards is None:
+        shards = package_shards()
+    groups, grouped = grouped_variants(family_def, variable)
+    report_memory = peaks is not None
+    if variant_results is None:
+        variant_results = {}
+        for variant_name, ttf_filename in family_def["variants"].items():
+            variant_results[variant_name] = process_variant(
+                family_id, variant_name, ttf_filename, cache,
+                [] if variant_name in grouped else shards, metrics, profile, report_memory,
+            )
+            release()
+    variable_results = {}
+    for style, (source, instances) in groups.items():
+        variable_results[style] = process_variable_group(
+            family_id, style, source, instances, cache, shards, profile, report_memory
+        )
+        release()
+    if cache is not None:
+        for result in variable_results.values():
+            cache.hits += result["cache_hits"]
+            cache.misses += result["cache_misses"]
+    if savings is not None:
+        for result in [*variant_results.values(), *variable_results.values()]:
+            if result.get("baseline"):
+                savings[0] += result["baseline"][0]
+                savings[1] += result["baseline"][1]
+    if peaks is not None:
+        for name, result in [*variant_results.items(), *variable_results.items()]:
+            if result.get("peak_rss_kb"):
+                peaks.append((result["peak_rss_kb"], f"{family_id}/{name}"))
+    return family_entry(family_id, family_def, variant_results, shards, variable_results)
+
+
+def process_variants_parallel(jobs, cache=None, shards=None, metrics=True, variable=False,
+                              profile=DEFAULT_PROFILE, report_memory=False, max_rss_kb=None):
+    """Process every (family, variant) pair in FONT_FAMILIES on a process pool.
+
+    Variants covered by a variable group (with ``variable``) are processed
+    without static WOFF2 shards. With ``max_rss_kb`` (--low-memory), every
+    face gets a fresh worker and faces run concurrently only within that
+    estimated RSS budget (see ``map_bounded()``). Returns {family_id:
+    {variant_name: process_variant() result}}.
+    """
+    if shards is None:
+        shards = package_shards()
+    tasks = []
+    for family_id, family_def in sorted(FONT_FAMILIES.items()):
+        _, grouped = grouped_variants(family_def, variable)
+        for variant_name, ttf_filename in family_def["variants"].items():
+            variant_shards = [] if variant_name in grouped else shards
+            tasks.append((
+                family_id, variant_name, ttf_filename, cache, variant_shards, metrics, profile, report_memory,
+            ))
+
+    if max_rss_kb is None:
+        print(f"Processing {len(tasks)} faces with {jobs} workers...")
+        task_results = map_ordered(process_variant, tasks, jobs)
+    else:
+        print(f"Processing {len(tasks)} faces with up to {jobs} workers within {format_rss(max_rss_kb)}...")
+        estimates = [estimate_face_kb(FONTS_DIR / ttf_filename) for _, _, ttf_filename, *_ in tasks]
+        task_results = map_bounded(process_variant, tasks, jobs, estimates, max_rss_kb)
+
+    results = {family_id: {} for family_id in FONT_FAMILIES}
+    for (family_id, variant_name, *_), result in zip(tasks, task_results):
+        results[family_id][variant_name] = result
+
+    # Workers count hits on their own copy of the cache; fold them back in.
+    if cache is not None:
+        for family_results in results.values():
+            for result in family_results.values():
+                cache.hits += result["cache_hits"]
+                cache.misses += result["cache_misses"]
+    return results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate the @opendockit/fonts companion package.")
+    add_jobs_argument(parser, "number of worker processes for subsetting and precompression")
+    add_package_arguments(parser)
+    parser.add_argument(
+        "--variable",
+        action="store_true",
+        help="ship one variable WOFF2 per shard for families whose weights share a variable source",
+    )
+    add_profile_arguments(parser)
+    add_memory_arguments(parser)
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+    resolve_jobs(parser, args)
+    args.profile = profile_from_args(parser, args)
+    return args
 
 
 def main():
+    args = parse_args()
+
     if not FONTS_DIR.exists():
         print(f"ERROR: fonts/ directory not found at {FONTS_DIR}")
-        print("Run 'pnpm fonts:download' first to download font sources.")
+        print("Run 'pnpm fonts:download' first to download font sources (or 'pnpm fonts:fetch --mirror PATH' offline).")
         sys.exit(1)
 
     check_dependencies()
+    cache = cache_from_args(args)
+    shards = package_shards(sharded=not args.no_shards)
 
     # Clean previous output
-    for subdir in [WOFF2_DIR, TTF_DIR]:
-        if subdir.exists():
-            shutil.rmtree(subdir)
+    clean_outputs()
 
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    WOFF2_DIR.mkdir(parents=True, exist_ok=True)
-    TTF_DIR.mkdir(parents=True, exist_ok=True)
+    # --low-memory always hands faces to fresh worker processes, even with --jobs 1
+    variant_results = {}
+    if args.jobs > 1 or args.low_memory:
+        variant_results = process_variants_parallel(
+            args.jobs, cache, shards, not args.no_metrics, args.variable, args.profile, args.report_memory,
+            args.max_rss_mb * 1024 if args.low_memory else None,
+        )
 
     manifest_families = {}
     total_woff2_bytes = 0
     total_ttf_bytes = 0
     families_processed = 0
+    savings = [0, 0]
+    peaks = []
 
     for family_id, family_def in sorted(FONT_FAMILIES.items()):
         register_as = family_def["register_as"]
         print(f"\n{register_as} ({family_id})")
 
-        result = process_family(family_id, family_def)
+        result = process_family(
+            family_id, family_def, variant_results.get(family_id), cache, shards, not args.no_metrics,
+            args.variable, args.profile, savings, peaks if args.report_memory else None,
+        )
         if result is None:
             print(f"  SKIPPED (no source files found)")
             continue
@@ -630,35 +411,51 @@ def main():
         families_processed += 1
         manifest_families[family_id] = result
 
-        # Remove None substituteFor from manifest output
-        if result["substituteFor"] is None:
-            del result["substituteFor"]
-
         for entry in result["woff2"].values():
             total_woff2_bytes += entry["size"]
         for entry in result["ttf"].values():
             total_ttf_bytes += entry["size"]
 
-    # Write manifest.json
-    manifest = {
-        "version": 1,
-        "families": manifest_families,
-    }
+    # Files shared between families (e.g. Carlito Regular as Calibri Light) are stored once
+    deduped_files, deduped_bytes = dedupe_package_files(manifest_families, OUTPUT_DIR)
+    annotated_files = annotate_package_files(manifest_families, args.hashed_filenames)
 
-    manifest_path = OUTPUT_DIR / "manifest.json"
-    manifest_path.write_text(
-        json.dumps(manifest, indent=2, ensure_ascii=False) + "\n",
-        encoding="utf-8",
-    )
+    # Write manifest.json, with the codepoint → fallback family table
+    fallback = package_fallback_table(manifest_families, cache, args.jobs)
+    manifest_path = write_manifest(manifest_families, fallback)
+    if not args.no_metrics:
+        metrics_faces, metrics_changed = write_package_metrics_bundle(manifest_families)
+    if args.precompress:
+        sidecars = precompress_files(package_files(manifest_families, OUTPUT_DIR, manifest_path), args.jobs)
 
     print(f"\n{'=' * 50}")
     print(f"Font package generation complete")
     print(f"{'=' * 50}")
     print(f"  Families: {families_processed}")
     print(f"  WOFF2 total: {total_woff2_bytes / 1024 / 1024:.1f} MB")
+    if args.profile != DEFAULT_PROFILE:
+        print(f"  Profile:     {describe_profile(args.profile)}, WOFF2 {format_profile_savings(*savings)} vs default")
     print(f"  TTF total:   {total_ttf_bytes / 1024 / 1024:.1f} MB")
+    print(f"  Shared:      {deduped_files} duplicate files aliased ({deduped_bytes / 1024:.1f} KB saved)")
+    if args.variable:
+        variable_styles = sum(len(entry.get("variable", {})) for entry in manifest_families.values())
+        print(f"  Variable:    {variable_styles} family styles as variable WOFF2")
+    print(f"  Fallback:    {len(fallback['ranges'])} codepoint ranges over {len(fallback['families'])} families")
+    print(f"  Integrity:   {annotated_files} files hashed" + (", content-hashed names" if args.hashed_filenames else ""))
+    if args.precompress:
+        print(f"  Precompressed: {format_savings(sidecars)}")
+    if peaks:
+        peak_kb, face = max(peaks)
+        budget = f", budget {args.max_rss_mb} MB" if args.low_memory else ""
+        print(f"  Memory:      largest face peak RSS {format_rss(peak_kb)} ({face}){budget}")
     print(f"  Manifest:    {manifest_path}")
     print(f"  Output:      {OUTPUT_DIR}")
+    if not args.no_metrics:
+        if metrics_changed is None:
+            print(f"  Metrics:     {metrics_faces}/{expected_faces()} faces; metrics-bundle.ts not updated")
+        else:
+            print(f"  Metrics:     {metrics_faces} faces → metrics-bundle.ts{'' if metrics_changed else ' (unchanged)'}")
+    report_cache(cache)
 
 
 if __name__ == "__main__":
@@ -6,72 +6,29 @@ Creates slides with sample text in all 42 bundled families, including
 bold/italic variants, different sizes, and mixed-font paragraphs.
 
 Usage:
-    python3 scripts/generate-font-stress-test.py
+    python3 scripts/generate-font-stress-test.py [--deterministic]
     # Output: test-data/font-stress-test.pptx
+
+  --deterministic  Save with fixed zip timestamps, entry order and document
+                   dates (deck_pipeline/save.py), so an unchanged deck keeps
+                   its bytes.
 """
 
+import argparse
+
 from pptx import Presentation
 from pptx.util import Inches, Pt, Emu
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN
 
-# All 42 bundled font families grouped by category
-OFFICE_SUBSTITUTES = [
-    ("Calibri", "Carlito substitute"),
-    ("Calibri Light", "Carlito Light substitute"),
-    ("Cambria", "Caladea substitute"),
-    ("Arial", "Liberation Sans substitute"),
-    ("Arial Narrow", "Liberation Sans Narrow substitute"),
-    ("Times New Roman", "Liberation Serif substitute"),
-    ("Courier New", "Liberation Mono substitute"),
-    ("Segoe UI", "Selawik substitute"),
-    ("Segoe UI Light", "Selawik Light substitute"),
-    ("Segoe UI Semibold", "Selawik Semibold substitute"),
-    ("Segoe UI Semilight", "Selawik Semilight substitute"),
-    ("Georgia", "Gelasio substitute"),
-    ("Palatino Linotype", "TeX Gyre Pagella substitute"),
-    ("Bookman Old Style", "TeX Gyre Bonum substitute"),
-    ("Century Schoolbook", "TeX Gyre Schola substitute"),
-]
-
-GOOGLE_FONTS_SANS = [
-    ("Arimo", "sans-serif"),
-    ("Barlow", "sans-serif"),
-    ("Barlow Light", "sans-serif, light weight"),
-    ("Comfortaa", "rounded sans-serif"),
-    ("Lato", "sans-serif"),
-    ("Lato Light", "sans-serif, light weight"),
-    ("Montserrat", "geometric sans-serif"),
-    ("Noto Sans", "sans-serif"),
-    ("Open Sans", "humanist sans-serif"),
-    ("Oswald", "narrow sans-serif"),
-    ("Poppins", "geometric sans-serif"),
-    ("Raleway", "elegant sans-serif"),
-    ("Roboto", "neo-grotesque sans-serif"),
-    ("Source Sans Pro", "sans-serif"),
-    ("Ubuntu", "humanist sans-serif"),
-    ("Play", "sans-serif"),
-]
-
-GOOGLE_FONTS_SERIF = [
-    ("Noto Serif", "serif"),
-    ("Playfair Display", "transitional serif"),
-    ("Roboto Slab", "slab serif"),
-    ("Roboto Slab Light", "slab serif, light weight"),
-    ("Roboto Slab SemiBold", "slab serif, semibold weight"),
-    ("Tinos", "transitional serif"),
-]
-
-GOOGLE_FONTS_MONO = [
-    ("Courier Prime", "monospace"),
-    ("Fira Code", "monospace"),
-    ("Roboto Mono", "monospace"),
-    ("Source Code Pro", "monospace"),
-]
-
-GOOGLE_FONTS_SYMBOL = [
-    ("Noto Sans Symbols", "symbols & arrows"),
-]
+from deck_pipeline.fonts import (
+    GOOGLE_FONTS_MONO,
+    GOOGLE_FONTS_SANS,
+    GOOGLE_FONTS_SERIF,
+    GOOGLE_FONTS_SYMBOL,
+    OFFICE_SUBSTITUTES,
+)
+from deck_pipeline.save import add_deterministic_argument, save_presentation
 
 SLIDE_WIDTH = Emu(12192000)   # 10 inches (standard widescreen)
 SLIDE_HEIGHT = Emu(6858000)   # 7.5 inches
@@ -420,7 +377,14 @@ def add_full_alphabet_slide(prs, font_name, description):
     return slide
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate the font stress-test PPTX.")
+    add_deterministic_argument(parser)
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
     prs = Presentation()
     prs.slide_width = SLIDE_WIDTH
     prs.slide_height = SLIDE_HEIGHT
@@ -477,7 +441,7 @@ def main():
 
     output_path = ROOT / "test-data" / "font-stress-test.pptx"
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    prs.save(str(output_path))
+    save_presentation(prs, output_path, args.deterministic)
 
     slide_count = len(prs.slides)
     font_count = len(OFFICE_SUBSTITUTES) + len(GOOGLE_FONTS_SANS) + len(GOOGLE_FONTS_SERIF) + len(GOOGLE_FONTS_MONO) + len(GOOGLE_FONTS_SYMBOL)
@@ -6,16 +6,27 @@ Creates slides covering linear, radial, multi-stop, shape-specific, and
 line/stroke gradient fills.
 
 Usage:
-    python3 scripts/generate-gradient-stress-test.py
+    python3 scripts/generate-gradient-stress-test.py [--deterministic]
     # Output: test-data/gradient-stress-test.pptx
+
+  --deterministic  Save with fixed zip timestamps, entry order and document
+                   dates (deck_pipeline/save.py), so an unchanged deck keeps
+                   its bytes.
 """
 
+import argparse
+
 from pptx import Presentation
-from pptx.util import Inches, Pt, Emu
-from pptx.dml.color import RGBColor
-from pptx.enum.text import PP_ALIGN
-from pptx.oxml.ns import qn, nsmap
-import copy
+from pptx.util import Inches, Emu
+from pptx.oxml.ns import qn
+
+from deck_pipeline.save import add_deterministic_argument, save_presentation
+from deck_pipeline.shapes import (
+    add_label,
+    set_gradient_line,
+    set_linear_gradient,
+    set_radial_gradient,
+)
 
 ROOT = __import__("pathlib").Path(__file__).resolve().parent.parent
 
@@ -24,124 +35,6 @@ SLIDE_WIDTH = Emu(12192000)   # 13.333 inches
 SLIDE_HEIGHT = Emu(6858000)   # 7.5 inches
 
 
-def add_label(slide, x, y, w, h, text, font_size=10):
-    """Add a text label to the slide."""
-    txBox = slide.shapes.add_textbox(Inches(x), Inches(y), Inches(w), Inches(h))
-    tf = txBox.text_frame
-    tf.word_wrap = True
-    p = tf.paragraphs[0]
-    run = p.add_run()
-    run.text = text
-    run.font.size = Pt(font_size)
-    run.font.name = "Calibri"
-    run.font.color.rgb = RGBColor(0x33, 0x33, 0x33)
-    return txBox
-
-
-def set_linear_gradient(shape, angle_deg, stops):
-    """
-    Set a linear gradient fill on a shape.
-    stops: list of (position_pct, RGBColor) tuples, position 0-100.
-    angle_deg: rotation angle in degrees.
-    """
-    spPr = shape._element.spPr
-    # Remove any existing fill
-    for child in list(spPr):
-        tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
-        if tag in ("solidFill", "gradFill", "noFill", "pattFill", "blipFill"):
-            spPr.remove(child)
-
-    # Build gradFill element
-    gradFill = spPr.makeelement(qn("a:gradFill"), {})
-    gsLst = gradFill.makeelement(qn("a:gsLst"), {})
-
-    for pos_pct, color in stops:
-        gs = gsLst.makeelement(qn("a:gs"), {"pos": str(int(pos_pct * 1000))})
-        srgbClr = gs.makeelement(qn("a:srgbClr"), {"val": "%02X%02X%02X" % (color[0], color[1], color[2])})
-        gs.append(srgbClr)
-        gsLst.append(gs)
-
-    gradFill.append(gsLst)
-
-    lin = gradFill.makeelement(qn("a:lin"), {
-        "ang": str(int(angle_deg * 60000)),
-        "scaled": "1"
-    })
-    gradFill.append(lin)
-
-    spPr.append(gradFill)
-
-
-def set_radial_gradient(shape, stops, focus_x=50, focus_y=50):
-    """
-    Set a radial (path) gradient fill on a shape.
-    stops: list of (position_pct, (r,g,b)) tuples.
-    focus_x, focus_y: center position in percent (0-100).
-    """
-    spPr = shape._element.spPr
-    for child in list(spPr):
-        tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
-        if tag in ("solidFill", "gradFill", "noFill", "pattFill", "blipFill"):
-            spPr.remove(child)
-
-    gradFill = spPr.makeelement(qn("a:gradFill"), {})
-    gsLst = gradFill.makeelement(qn("a:gsLst"), {})
-
-    for pos_pct, color in stops:
-        gs = gsLst.makeelement(qn("a:gs"), {"pos": str(int(pos_pct * 1000))})
-        srgbClr = gs.makeelement(qn("a:srgbClr"), {"val": "%02X%02X%02X" % (color[0], color[1], color[2])})
-        gs.append(srgbClr)
-        gsLst.append(gs)
-
-    gradFill.append(gsLst)
-
-    # Path gradient (radial)
-    path = gradFill.makeelement(qn("a:path"), {"path": "circle"})
-    l_pct = int(focus_x * 1000)
-    t_pct = int(focus_y * 1000)
-    r_pct = int(focus_x * 1000)
-    b_pct = int(focus_y * 1000)
-    fillToRect = path.makeelement(qn("a:fillToRect"), {
-        "l": str(l_pct), "t": str(t_pct),
-        "r": str(r_pct), "b": str(b_pct)
-    })
-    path.append(fillToRect)
-    gradFill.append(path)
-
-    spPr.append(gradFill)
-
-
-def set_gradient_line(shape, angle_deg, stops, width_pt=3):
-    """Set a gradient stroke on a shape's outline."""
-    spPr = shape._element.spPr
-    # Remove existing line
-    for child in list(spPr):
-        tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
-        if tag == "ln":
-            spPr.remove(child)
-
-    ln = spPr.makeelement(qn("a:ln"), {"w": str(int(width_pt * 12700))})
-    gradFill = ln.makeelement(qn("a:gradFill"), {})
-    gsLst = gradFill.makeelement(qn("a:gsLst"), {})
-
-    for pos_pct, color in stops:
-        gs = gsLst.makeelement(qn("a:gs"), {"pos": str(int(pos_pct * 1000))})
-        srgbClr = gs.makeelement(qn("a:srgbClr"), {"val": "%02X%02X%02X" % (color[0], color[1], color[2])})
-        gs.append(srgbClr)
-        gsLst.append(gs)
-
-    gradFill.append(gsLst)
-
-    lin = gradFill.makeelement(qn("a:lin"), {
-        "ang": str(int(angle_deg * 60000)),
-        "scaled": "1"
-    })
-    gradFill.append(lin)
-
-    ln.append(gradFill)
-    spPr.append(ln)
-
-
 def slide1_linear_gradients(prs):
     """Slide 1: Linear gradients at 0, 45, 90, 135, 180 degrees."""
     slide = prs.slides.add_slide(prs.slide_layouts[6])
@@ -352,7 +245,14 @@ def slide5_gradient_lines(prs):
         add_label(slide, x, y + 2.6, 5.5, 0.4, label, 11)
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate the gradient stress-test PPTX.")
+    add_deterministic_argument(parser)
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
     prs = Presentation()
     prs.slide_width = SLIDE_WIDTH
     prs.slide_height = SLIDE_HEIGHT
@@ -365,7 +265,7 @@ def main():
 
     output_path = ROOT / "test-data" / "gradient-stress-test.pptx"
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    prs.save(str(output_path))
+    save_presentation(prs, output_path, args.deterministic)
 
     print(f"Generated: {output_path}")
     print(f"  Slides: {len(prs.slides)}")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic PPTX of N slides × M shapes for renderer load testing.
+
+Unlike the hand-laid generate-*-stress-test.py decks, every shape is drawn
+from a seeded RNG: text boxes, filled autoshapes, gradients, effects,
+connectors and tables in a weighted mix, built with the same helpers
+(deck_pipeline/shapes.py). The same seed, size and mix always give the
+same slides (see deck_pipeline/synthetic.py).
+
+With --stream, slides skip python-pptx: deck_pipeline/writer.py renders
+each one's XML directly and writes it into the zip as soon as it is drawn,
+so memory stays flat and time grows linearly with the deck. The slides are
+the same XML either way; use it for decks of hundreds of slides and up.
+--jobs N also plans and renders the slides on N processes; the writer
+merges them in slide order, so the deck doesn't depend on N.
+
+Usage:
+    python3 scripts/generate-synthetic-deck.py [--slides N] [--shapes M] [--seed S]
+        [--mix text=4,rect=3,gradient=2,effect=2,connector=2,table=1] [--stream] [--jobs N] [--deterministic] [-o PATH]
+    # Output: test-data/synthetic-deck.pptx + test-data/synthetic-deck.json
+
+  --slides N   Number of slides (default: 20).
+  --shapes M   Shapes per slide (default: 50). 500 × 100 gives a 50k-shape deck.
+  --seed S     RNG seed (default: 0).
+  --mix SPEC   Relative weights of the shape kinds; kinds left out are not
+               generated.
+  --stream     Write slides one at a time with the direct OOXML writer
+               instead of building the deck in python-pptx.
+  --jobs N     Render slides on N worker processes (0 = one per CPU core);
+               implies --stream.
+  --deterministic
+               Save with fixed zip timestamps, entry order and document
+               dates (deck_pipeline/save.py). Streamed decks always are.
+  -o PATH      Output .pptx; the workload sidecar is written next to it
+               with a .json suffix.
+
+The sidecar records the seed, size, mix and the resulting workload: shape
+counts per kind (in total and per slide), text paragraphs and characters,
+table cells and effects, plus the output size, so parse / layout / render
+benchmarks can report throughput per shape or per character.
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+from deck_pipeline import ROOT, TEST_DATA_DIR
+from deck_pipeline.save import add_deterministic_argument, save_presentation
+from deck_pipeline.synthetic import DEFAULT_MIX, build_deck, parse_mix, plan_deck, workload
+from deck_pipeline.writer import DeckWriter, render_deck
+
+DEFAULT_OUTPUT = TEST_DATA_DIR / "synthetic-deck.pptx"
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {number}")
+    return number
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate a seeded synthetic PPTX for renderer load testing.")
+    parser.add_argument("--slides", type=positive_int, default=20, help="number of slides (default: 20)")
+    parser.add_argument("--shapes", type=positive_int, default=50, help="shapes per slide (default: 50)")
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed (default: 0)")
+    parser.add_argument(
+        "--mix",
+        default=",".join(f"{kind}={weight}" for kind, weight in DEFAULT_MIX.items()),
+        help="shape kind weights, e.g. text=4,table=1 (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--stream", action="store_true", help="write slides one at a time, without python-pptx (large decks)"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="worker processes rendering slides, implies --stream (0 = one per CPU core, default: 1)",
+    )
+    add_deterministic_argument(parser)
+    parser.add_argument("-o", "--output", type=Path, default=DEFAULT_OUTPUT, help="output .pptx path")
+    args = parser.parse_args()
+    try:
+        args.mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(f"--mix: {e}")
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    if args.jobs > 1:
+        args.stream = True
+    return args
+
+
+def stream_deck(args):
+    """Render slides (on --jobs processes) and write them in order; returns the workload."""
+    with DeckWriter(args.output) as deck:
+        def planned():
+            for xml, plan in render_deck(args.slides, args.shapes, args.seed, args.mix, args.jobs):
+                deck.add_slide_xml(xml)
+                yield plan
+
+        return workload(planned(), args.seed, args.mix)
+
+
+def main():
+    args = parse_args()
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    if args.stream:
+        sidecar = stream_deck(args)
+        timing = f"write {time.perf_counter() - start:.2f}s ({args.jobs} job{'s' if args.jobs > 1 else ''})"
+    else:
+        plan = plan_deck(args.slides, args.shapes, args.seed, args.mix)
+        planned = time.perf_counter()
+        prs = build_deck(plan)
+        built = time.perf_counter()
+        save_presentation(prs, args.output, args.deterministic)
+        saved = time.perf_counter()
+        sidecar = workload(plan, args.seed, args.mix)
+        timing = f"plan {planned - start:.2f}s, build {built - planned:.2f}s, save {saved - built:.2f}s"
+
+    output = args.output.resolve()
+    sidecar["output"] = {
+        "file": str(output.relative_to(ROOT)) if output.is_relative_to(ROOT) else str(output),
+        "bytes": args.output.stat().st_size,
+    }
+    sidecar_path = args.output.with_suffix(".json")
+    sidecar_path.write_text(json.dumps(sidecar, indent=2) + "\n", encoding="utf-8")
+
+    totals = sidecar["totals"]
+    print(f"Generated: {args.output}")
+    print(f"  Slides: {sidecar['slides']}, shapes: {totals['shapes']} "
+          f"({', '.join(f'{kind} {totals[kind]}' for kind in sidecar['kinds'])})")
+    print(f"  Text: {sidecar['text']['characters']} characters, tables: {sidecar['tables']['cells']} cells")
+    print(f"  Size: {sidecar['output']['bytes'] / 1024 / 1024:.1f} MB")
+    print(f"  Time: {timing}")
+    print(f"  Workload: {sidecar_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,15 +6,23 @@ Creates slides covering simple tables, merged cells, text alignments,
 banded rows, and nested text formatting.
 
 Usage:
-    python3 scripts/generate-table-stress-test.py
+    python3 scripts/generate-table-stress-test.py [--deterministic]
     # Output: test-data/table-stress-test.pptx
+
+  --deterministic  Save with fixed zip timestamps, entry order and document
+                   dates (deck_pipeline/save.py), so an unchanged deck keeps
+                   its bytes.
 """
 
+import argparse
+
 from pptx import Presentation
 from pptx.util import Inches, Pt, Emu
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
-from pptx.oxml.ns import qn
+
+from deck_pipeline.save import add_deterministic_argument, save_presentation
+from deck_pipeline.shapes import add_label, set_cell_fill, set_cell_borders
 
 ROOT = __import__("pathlib").Path(__file__).resolve().parent.parent
 
@@ -22,57 +30,6 @@ SLIDE_WIDTH = Emu(12192000)   # 13.333 inches
 SLIDE_HEIGHT = Emu(6858000)   # 7.5 inches
 
 
-def add_label(slide, x, y, w, h, text, font_size=10):
-    """Add a text label to the slide."""
-    txBox = slide.shapes.add_textbox(Inches(x), Inches(y), Inches(w), Inches(h))
-    tf = txBox.text_frame
-    tf.word_wrap = True
-    p = tf.paragraphs[0]
-    run = p.add_run()
-    run.text = text
-    run.font.size = Pt(font_size)
-    run.font.name = "Calibri"
-    run.font.color.rgb = RGBColor(0x33, 0x33, 0x33)
-    return txBox
-
-
-def set_cell_fill(cell, color):
-    """Set a solid fill on a table cell. color is an RGBColor."""
-    tcPr = cell._tc.get_or_add_tcPr()
-    # Remove existing fill
-    for child in list(tcPr):
-        tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
-        if tag in ("solidFill", "gradFill", "noFill"):
-            tcPr.remove(child)
-    solidFill = tcPr.makeelement(qn("a:solidFill"), {})
-    srgbClr = solidFill.makeelement(qn("a:srgbClr"), {
-        "val": str(color)
-    })
-    solidFill.append(srgbClr)
-    tcPr.append(solidFill)
-
-
-def set_cell_borders(cell, color=RGBColor(0x00, 0x00, 0x00), width_pt=1):
-    """Set borders on a table cell."""
-    tcPr = cell._tc.get_or_add_tcPr()
-    width_emu = int(width_pt * 12700)
-    color_str = str(color)
-
-    for border_name in ["lnL", "lnR", "lnT", "lnB"]:
-        # Remove existing
-        for child in list(tcPr):
-            tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
-            if tag == border_name:
-                tcPr.remove(child)
-
-        ln = tcPr.makeelement(qn(f"a:{border_name}"), {"w": str(width_emu)})
-        solidFill = ln.makeelement(qn("a:solidFill"), {})
-        srgbClr = solidFill.makeelement(qn("a:srgbClr"), {"val": color_str})
-        solidFill.append(srgbClr)
-        ln.append(solidFill)
-        tcPr.append(ln)
-
-
 def slide1_simple_table(prs):
     """Slide 1: Simple 4x4 table with borders and cell fills."""
     slide = prs.slides.add_slide(prs.slide_layouts[6])
@@ -474,7 +431,14 @@ def slide5_nested_formatting(prs):
             set_cell_borders(table.cell(r, c), RGBColor(0x66, 0x66, 0x66), 1)
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate the table stress-test PPTX.")
+    add_deterministic_argument(parser)
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
     prs = Presentation()
     prs.slide_width = SLIDE_WIDTH
     prs.slide_height = SLIDE_HEIGHT
@@ -487,7 +451,7 @@ def main():
 
     output_path = ROOT / "test-data" / "table-stress-test.pptx"
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    prs.save(str(output_path))
+    save_presentation(prs, output_path, args.deterministic)
 
     print(f"Generated: {output_path}")
     print(f"  Slides: {len(prs.slides)}")
@@ -7,7 +7,11 @@
  *
  * Output: test-data/basic-shapes.pptx
  *
- * Usage: node scripts/generate-test-pptx.mjs
+ * Usage: node scripts/generate-test-pptx.mjs [--deterministic]
+ *
+ *   --deterministic  Date every zip entry 1980-01-01 instead of now, so an
+ *                    unchanged fixture keeps its bytes (as the Python
+ *                    generators do with deck_pipeline/save.py).
  */
 
 import { createRequire } from 'node:module';
@@ -22,6 +26,10 @@ const rootDir = resolve(__dirname, '..');
 const require = createRequire(resolve(rootDir, 'packages/core/node_modules/.package-lock.json'));
 const JSZip = require('jszip');
 
+const deterministic = process.argv.includes('--deterministic');
+// Earliest date a zip can record; JSZip writes entry times in UTC.
+const FIXED_DATE = new Date(Date.UTC(1980, 0, 1));
+
 // ── Helpers ──────────────────────────────────────────────────────────────────
 
 /** EMU (English Metric Unit): 1 inch = 914400 EMU, 1 cm = 360000 EMU */
@@ -664,6 +672,12 @@ async function main() {
   zip.file('ppt/slides/slide3.xml', slide3Xml());
   zip.file('ppt/slides/_rels/slide3.xml.rels', slideRelsXml());
 
+  if (deterministic) {
+    zip.forEach((_path, file) => {
+      file.date = FIXED_DATE;
+    });
+  }
+
   // Generate
   const buf = await zip.generateAsync({
     type: 'nodebuffer',
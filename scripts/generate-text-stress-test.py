@@ -6,76 +6,36 @@ Creates slides covering text alignment, bullet types, autofit, text body
 rotation, character spacing, and paragraph spacing.
 
 Usage:
-    python3 scripts/generate-text-stress-test.py
+    python3 scripts/generate-text-stress-test.py [--deterministic]
     # Output: test-data/text-stress-test.pptx
+
+  --deterministic  Save with fixed zip timestamps, entry order and document
+                   dates (deck_pipeline/save.py), so an unchanged deck keeps
+                   its bytes.
 """
 
+import argparse
+
 from pptx import Presentation
 from pptx.util import Inches, Pt, Emu
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN, MSO_AUTO_SIZE
 from pptx.oxml.ns import qn
 
+from deck_pipeline.save import add_deterministic_argument, save_presentation
+from deck_pipeline.shapes import (
+    LOREM,
+    LOREM_SHORT,
+    add_label,
+    set_shape_fill,
+    set_shape_outline,
+)
+
 ROOT = __import__("pathlib").Path(__file__).resolve().parent.parent
 
 SLIDE_WIDTH = Emu(12192000)   # 13.333 inches
 SLIDE_HEIGHT = Emu(6858000)   # 7.5 inches
 
-LOREM = (
-    "Lorem ipsum dolor sit amet, consectetur adipiscing elit. Sed do eiusmod "
-    "tempor incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam, "
-    "quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat."
-)
-
-LOREM_SHORT = "The quick brown fox jumps over the lazy dog. Pack my box with five dozen liquor jugs."
-
-
-def add_label(slide, x, y, w, h, text, font_size=10, color=None):
-    """Add a text label to the slide."""
-    txBox = slide.shapes.add_textbox(Inches(x), Inches(y), Inches(w), Inches(h))
-    tf = txBox.text_frame
-    tf.word_wrap = True
-    p = tf.paragraphs[0]
-    run = p.add_run()
-    run.text = text
-    run.font.size = Pt(font_size)
-    run.font.name = "Calibri"
-    run.font.color.rgb = color or RGBColor(0x33, 0x33, 0x33)
-    return txBox
-
-
-def set_shape_fill(shape, color):
-    """Set solid fill on a shape."""
-    spPr = shape._element.spPr
-    for child in list(spPr):
-        tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
-        if tag in ("solidFill", "gradFill", "noFill", "pattFill", "blipFill"):
-            spPr.remove(child)
-    solidFill = spPr.makeelement(qn("a:solidFill"), {})
-    srgbClr = solidFill.makeelement(qn("a:srgbClr"), {
-        "val": "%02X%02X%02X" % (color[0], color[1], color[2])
-    })
-    solidFill.append(srgbClr)
-    spPr.append(solidFill)
-
-
-def set_shape_outline(shape, color, width_pt=1):
-    """Set outline on a shape."""
-    spPr = shape._element.spPr
-    for child in list(spPr):
-        tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
-        if tag == "ln":
-            spPr.remove(child)
-    ln = spPr.makeelement(qn("a:ln"), {"w": str(int(width_pt * 12700))})
-    solidFill = ln.makeelement(qn("a:solidFill"), {})
-    srgbClr = solidFill.makeelement(qn("a:srgbClr"), {
-        "val": "%02X%02X%02X" % (color[0], color[1], color[2])
-    })
-    solidFill.append(srgbClr)
-    ln.append(solidFill)
-    spPr.append(ln)
-
-
 def slide1_text_alignments(prs):
     """Slide 1: All 5 text alignments."""
     slide = prs.slides.add_slide(prs.slide_layouts[6])
@@ -594,7 +554,14 @@ def slide6_paragraph_spacing(prs):
         y_offset += 1.5
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate the text stress-test PPTX.")
+    add_deterministic_argument(parser)
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
     prs = Presentation()
     prs.slide_width = SLIDE_WIDTH
     prs.slide_height = SLIDE_HEIGHT
@@ -608,7 +575,7 @@ def main():
 
     output_path = ROOT / "test-data" / "text-stress-test.pptx"
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    prs.save(str(output_path))
+    save_presentation(prs, output_path, args.deterministic)
 
     print(f"Generated: {output_path}")
     print(f"  Slides: {len(prs.slides)}")
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Instance variable fonts into statics, or subset them as variable WOFF2.
+
+With no source, cuts every static face FONT_FAMILIES needs from the
+variable sources in fonts/.variable/ (VARIABLE_INSTANCES in
+font_pipeline/families.py); download-google-fonts.sh runs this after
+fetching them. Existing statics are skipped.
+
+    python3 scripts/instance-variable-fonts.py
+
+For one variable font, instances are named by fvar named instance or by
+axis coordinates; axes left out are pinned to their default:
+
+    python3 scripts/instance-variable-fonts.py SOURCE.ttf --axes
+    python3 scripts/instance-variable-fonts.py SOURCE.ttf --instance SemiBold \\
+        --instance wght=300,wdth=100 [--format ttf|woff2] [--output-dir DIR]
+    python3 scripts/instance-variable-fonts.py SOURCE.ttf --variable \\
+        --instance wght=400 --instance wght=700 -o out.woff2
+
+--axes prints the axes and named instances as JSON. --instance writes one
+static per instance to DIR/{name}-{instance}.ttf, or a WOFF2 subset to the
+bundle codepoints with --format woff2. --variable instead writes one
+variable WOFF2 subset limited to the range the instances span and prints
+its manifest (axes kept, instance coordinates) as JSON; this is what
+generate-font-package.py --variable ships per shard (font_pipeline/variable.py).
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+from font_pipeline import FONTS_DIR
+from font_pipeline.families import CODEPOINTS
+from font_pipeline.subset import save_font, subset_options
+from font_pipeline.variable import (
+    axes,
+    format_coordinates,
+    instance_all,
+    instance_static,
+    limit_axes,
+    named_instances,
+    resolve_instance,
+    varied_axes,
+)
+
+
+def check_dependencies(woff2=False):
+    """Verify required Python packages are available."""
+    try:
+        from fontTools.varLib.instancer import instantiateVariableFont
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        print("ERROR: fontTools not found.")
+        print("Install with: pip3 install fonttools brotli")
+        sys.exit(1)
+
+    if woff2:
+        try:
+            import brotli  # noqa: F401
+        except ImportError:
+            print("ERROR: brotli not found (required for WOFF2 compression).")
+            print("Install with: pip3 install fonttools brotli")
+            sys.exit(1)
+
+
+def subset_bundle_codepoints(font, flavor):
+    """Subset ``font`` to the bundle codepoints and serialize it."""
+    from fontTools.subset import Subsetter
+
+    subsetter = Subsetter(options=subset_options())
+    subsetter.populate(unicodes=CODEPOINTS)
+    subsetter.subset(font)
+    return save_font(font, flavor)
+
+
+def instance_label(spec):
+    """File-name label for an instance spec: "SemiBold", "wght600-wdth100"."""
+    return "-".join(re.sub(r"[^0-9A-Za-z.]", "", part) for part in spec.split(","))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Instance variable fonts into statics, or subset them as one variable WOFF2."
+    )
+    parser.add_argument("source", nargs="?", help="variable TTF (default: every VARIABLE_INSTANCES face)")
+    parser.add_argument("--axes", action="store_true", help="print the source's axes and named instances")
+    parser.add_argument(
+        "--instance",
+        action="append",
+        default=[],
+        metavar="SPEC",
+        help='named instance ("SemiBold") or axis coordinates ("wght=600,wdth=100"); repeatable',
+    )
+    parser.add_argument(
+        "--variable",
+        action="store_true",
+        help="write one variable WOFF2 limited to the instances' range instead of statics",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["ttf", "woff2"],
+        default="ttf",
+        help="static output: full TTF (default) or WOFF2 subset to the bundle codepoints",
+    )
+    parser.add_argument("--output-dir", default=".", help="directory for static instances (default: .)")
+    parser.add_argument("-o", "--output", help="output path for --variable")
+    args = parser.parse_args()
+
+    if args.source is None:
+        if args.axes or args.instance or args.variable:
+            parser.error("--axes, --instance and --variable need a source font")
+    elif not args.axes and not args.instance:
+        parser.error("give --axes or at least one --instance")
+    if args.variable and not args.output:
+        parser.error("--variable requires -o/--output")
+    if args.variable and len(args.instance) < 2:
+        parser.error("--variable needs at least two --instance values to span")
+    return args
+
+
+def main():
+    args = parse_args()
+    check_dependencies(woff2=args.variable or args.format == "woff2")
+    from fontTools.ttLib import TTFont, TTLibError
+
+    if args.source is None:
+        if not FONTS_DIR.exists():
+            print(f"ERROR: fonts/ directory not found at {FONTS_DIR}")
+            print("Run 'pnpm fonts:download' first to download font sources (or 'pnpm fonts:fetch --mirror PATH' offline).")
+            sys.exit(1)
+        written = instance_all()
+        print(f"  Instanced {written} static faces")
+        return
+
+    source = Path(args.source)
+    try:
+        font = TTFont(source)
+    except (OSError, TTLibError) as e:
+        print(f"ERROR: could not read {source}: {e}")
+        sys.exit(1)
+    if "fvar" not in font:
+        print(f"ERROR: {source.name} is not a variable font (no fvar table)")
+        sys.exit(1)
+
+    if args.axes:
+        print(json.dumps({"axes": axes(font), "instances": named_instances(font)}, indent=2))
+        if not args.instance:
+            return
+
+    try:
+        instances = {spec: resolve_instance(font, spec) for spec in args.instance}
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    if args.variable:
+        data = subset_bundle_codepoints(limit_axes(font, list(instances.values())), "woff2")
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_bytes(data)
+        print(json.dumps({
+            "file": str(output),
+            "size": len(data),
+            "axes": varied_axes(list(instances.values())),
+            "instances": instances,
+        }, indent=2))
+        return
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stem = source.stem.split("[")[0]
+    for spec, coordinates in instances.items():
+        static = instance_static(font, coordinates)
+        data = save_font(static, "ttf") if args.format == "ttf" else subset_bundle_codepoints(static, "woff2")
+        output = output_dir / f"{stem}-{instance_label(spec)}.{args.format}"
+        output.write_bytes(data)
+        print(f"  {output.name}: {format_coordinates(coordinates)}, {len(data) / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
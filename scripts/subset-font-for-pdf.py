@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Subset bundled fonts to the glyphs a PDF export actually uses.
+
+Entry point for server-side PDF export (see font_pipeline/pdfsubset.py).
+Subsets come from the full source TTFs in fonts/ and keep their glyph IDs,
+so embedded fonts are a few KB instead of the ~12 MB TTF bundle.
+
+Single face:
+    python3 scripts/subset-font-for-pdf.py --family Carlito [--variant bold |
+        --bold --italic] [--text "Hello"] [--codepoints U+0041-005A,0x20]
+        [--gids 1,2,3] -o out.ttf
+
+Batch (a whole document's fonts in one call):
+    python3 scripts/subset-font-for-pdf.py --batch fonts.json --output-dir DIR
+
+    fonts.json is {"fonts": [{"family": "Calibri", "bold": true,
+    "codepoints": [72, 105], "text": "...", "glyphIds": [3]}, ...]}; "-" reads
+    it from stdin. Requests for the same face are merged. One TTF per face is
+    written to DIR/{family}-{variant}.ttf and a JSON summary is printed.
+
+Service mode:
+    python3 scripts/subset-font-for-pdf.py --stdio
+
+    Reads one batch object per line on stdin and answers each with one JSON
+    line: {"fonts": [{"family", "variant", "size", "sha256", "data"}]} where
+    data is base64 TTF, or {"error": ...} for a malformed line. Keeps fontTools
+    and the subset cache warm across documents.
+
+Subsets are cached by content hash (see font_pipeline/cache.py); the shared
+--cache-dir / --cache-max-mb / --no-cache options control the cache.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from font_pipeline import FONTS_DIR
+from font_pipeline.cache import add_cache_arguments, cache_from_args, report_cache
+from font_pipeline.pdfsubset import subset_batch, subset_for_pdf
+
+
+def check_dependencies():
+    """Verify required Python packages are available."""
+    try:
+        from fontTools.subset import Subsetter, Options
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        print("ERROR: fontTools not found.", file=sys.stderr)
+        print("Install with: pip3 install fonttools", file=sys.stderr)
+        sys.exit(1)
+
+
+def parse_codepoints(value):
+    """Parse "U+0041-005A,0x20,65" into a set of codepoints.
+
+    As in CSS unicode-range, the end of a "U+" range is hex without a prefix
+    of its own ("U+0041-005A"); "U+0041-U+005A" is accepted too.
+    """
+    codepoints = set()
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        hex_range = start.strip()[:2].upper() == "U+"
+        start = _parse_codepoint(start)
+        end = _parse_codepoint(end, hex_range) if end else start
+        codepoints.update(range(start, end + 1))
+    return codepoints
+
+
+def _parse_codepoint(text, hex_digits=False):
+    text = text.strip()
+    if text[:2].upper() == "U+":
+        return int(text[2:], 16)
+    return int(text, 16 if hex_digits else 0)
+
+
+def parse_gids(value):
+    """Parse "1,2,10" into a set of glyph IDs."""
+    return {int(part) for part in value.split(",") if part.strip()}
+
+
+def face_summary(result, data):
+    """Per-face result fields shared by --batch and --stdio output."""
+    return {
+        "family": result["family"],
+        "variant": result["variant"],
+        "codepoints": result["codepoints"],
+        "glyphIds": result["glyphIds"],
+        "size": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+
+
+def run_batch(requests, output_dir, cache):
+    """Subset a batch and write one TTF per face; return the JSON summary."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    fonts = []
+    for result in subset_batch(requests, cache):
+        if "data" not in result:
+            fonts.append(result)
+            continue
+        data = result["data"]
+        filename = f"{result['family']}-{result['variant']}.ttf"
+        (output_dir / filename).write_bytes(data)
+        fonts.append(dict(face_summary(result, data), file=filename))
+    return {"fonts": fonts}
+
+
+def serve(cache):
+    """Answer JSON-lines batch requests on stdin until EOF."""
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            requests = json.loads(line)["fonts"]
+            fonts = []
+            for result in subset_batch(requests, cache):
+                if "data" in result:
+                    data = result["data"]
+                    result = dict(face_summary(result, data), data=base64.b64encode(data).decode("ascii"))
+                fonts.append(result)
+            response = {"fonts": fonts}
+        except (ValueError, KeyError, TypeError) as e:
+            response = {"error": f"bad request: {e}"}
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Subset bundled fonts to the glyphs a PDF export uses, keeping glyph IDs stable."
+    )
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--family", help="family id, register name or Office name (e.g. Calibri)")
+    mode.add_argument("--batch", metavar="JSON", help='batch request file ({"fonts": [...]}, "-" for stdin)')
+    mode.add_argument("--stdio", action="store_true", help="serve JSON-lines batch requests on stdin/stdout")
+
+    face = parser.add_argument_group("single face")
+    face.add_argument("--variant", help="variant name (default: picked from --bold/--italic)")
+    face.add_argument("--bold", action="store_true", help="bold run")
+    face.add_argument("--italic", action="store_true", help="italic run")
+    face.add_argument("--codepoints", type=parse_codepoints, default=set(), help="e.g. U+0041-005A,0x20,65")
+    face.add_argument("--text", default="", help="keep the glyphs for this text")
+    face.add_argument("--gids", type=parse_gids, default=set(), help="source glyph IDs to keep, e.g. 1,2,10")
+    face.add_argument("-o", "--output", help="output TTF path")
+
+    parser.add_argument(
+        "--output-dir",
+        default=".",
+        help="directory for --batch output (default: current directory)",
+    )
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+    if args.family and not args.output:
+        parser.error("--family requires -o/--output")
+    return args
+
+
+def main():
+    args = parse_args()
+
+    if not FONTS_DIR.exists():
+        print(f"ERROR: fonts/ directory not found at {FONTS_DIR}", file=sys.stderr)
+        print("Run 'pnpm fonts:download' first to download font sources (or 'pnpm fonts:fetch --mirror PATH' offline).", file=sys.stderr)
+        sys.exit(1)
+
+    check_dependencies()
+    cache = cache_from_args(args)
+
+    if args.stdio:
+        serve(cache)
+        if cache is not None:
+            cache.prune()
+        return
+
+    if args.batch:
+        try:
+            if args.batch == "-":
+                requests = json.load(sys.stdin)["fonts"]
+            else:
+                requests = json.loads(Path(args.batch).read_text(encoding="utf-8"))["fonts"]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"ERROR: could not read batch request {args.batch}: {e}", file=sys.stderr)
+            sys.exit(1)
+        summary = run_batch(requests, Path(args.output_dir), cache)
+        print(json.dumps(summary, indent=2))
+        if cache is not None:
+            cache.prune()
+        if any("error" in font for font in summary["fonts"]):
+            sys.exit(1)
+        return
+
+    codepoints = args.codepoints | {ord(ch) for ch in args.text}
+    try:
+        data = subset_for_pdf(
+            args.family, args.variant, codepoints, args.gids, args.bold, args.italic, cache=cache
+        )
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_bytes(data)
+    print(f"  {args.family}: {len(codepoints)} codepoints, {len(args.gids)} glyph IDs → "
+          f"{len(data) / 1024:.1f} KB ({output})")
+    report_cache(cache)
+
+
+if __name__ == "__main__":
+    main()
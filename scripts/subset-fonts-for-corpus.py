@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Subset the bundled fonts to exactly what a document corpus uses.
+
+Scans .pptx/.docx files (default: test-data/corpus), collects the codepoints
+rendered in each bundled family/variant (see font_pipeline/corpus.py), and
+writes minimal per-deployment subsets in the @opendockit/fonts layout:
+
+- {output}/woff2/{family}/corpus-{weight}-{style}.woff2
+- {output}/ttf/{family}-{variant}.ttf
+- {output}/manifest.json
+
+The manifest has the companion-package shape, so the output directory can be
+served in place of packages/fonts. Each WOFF2 entry's unicodeRange lists the
+exact codepoints kept, letting the browser fall back for anything else. A
+"corpus" section records the scanned documents, per-face codepoint counts and
+typefaces that have no bundled family.
+
+Usage: python3 scripts/subset-fonts-for-corpus.py [paths...] [--output DIR]
+           [--flavors woff2,ttf] [--jobs N] [--no-cache]
+
+Subsets are cached by content hash (see font_pipeline/cache.py); the shared
+--cache-dir / --cache-max-mb / --no-cache options control the cache.
+"""
+
+import argparse
+import json
+import shutil
+import sys
+from pathlib import Path
+
+from font_pipeline import FONTS_DIR, ROOT
+from font_pipeline.cache import add_cache_arguments, cache_from_args, report_cache
+from font_pipeline.corpus import resolve_usage, scan_corpus
+from font_pipeline.families import FONT_FAMILIES, VARIANT_MAP, codepoint_ranges, css_unicode_range
+from font_pipeline.parallel import add_jobs_argument, map_ordered, resolve_jobs
+from font_pipeline.subset import FLAVORS, subset_face
+
+DEFAULT_CORPUS = ROOT / "test-data" / "corpus"
+DEFAULT_OUTPUT = ROOT / ".cache" / "corpus-fonts"
+SUBSET_NAME = "corpus"
+
+
+def check_dependencies():
+    """Verify required Python packages are available."""
+    try:
+        from fontTools.subset import Subsetter, Options
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        print("ERROR: fontTools not found.")
+        print("Install with: pip3 install fonttools brotli")
+        sys.exit(1)
+
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        print("ERROR: brotli not found (required for WOFF2 compression).")
+        print("Install with: pip3 install fonttools brotli")
+        sys.exit(1)
+
+
+def process_face(output_dir, family_id, variant_name, codepoints, flavors, cache=None):
+    """Subset one face to ``codepoints`` and write each flavor.
+
+    Safe to run in a worker process. Returns ``{"files": {flavor: {"file",
+    "size"}}}`` plus cache hit/miss counts, or None if the source file is
+    missing.
+    """
+    ttf_path = FONTS_DIR / FONT_FAMILIES[family_id]["variants"][variant_name]
+    if not ttf_path.exists():
+        return None
+
+    hits_before, misses_before = (cache.hits, cache.misses) if cache is not None else (0, 0)
+    subsets = subset_face(ttf_path, flavors, cache, codepoints=codepoints)
+    weight, style = VARIANT_MAP.get(variant_name, (400, "normal"))
+
+    result = {"files": {}, "cache_hits": 0, "cache_misses": 0}
+    for flavor, data in subsets.items():
+        if flavor == "woff2":
+            rel_path = f"woff2/{family_id}/{SUBSET_NAME}-{weight}-{style}.woff2"
+        else:
+            rel_path = f"ttf/{family_id}-{variant_name}.ttf"
+        out_path = output_dir / rel_path
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_bytes(data)
+        result["files"][flavor] = {"file": rel_path, "size": len(data)}
+
+    if cache is not None:
+        result["cache_hits"] = cache.hits - hits_before
+        result["cache_misses"] = cache.misses - misses_before
+    return result
+
+
+def new_family_entry(family_def):
+    """Empty companion-manifest family entry with a single "corpus" subset."""
+    entry = {
+        "displayName": family_def["register_as"],
+        "substituteFor": family_def.get("substitute_for"),
+        "license": family_def.get("license", "Unknown"),
+        "woff2": {},
+        "ttf": {},
+        "weights": [],
+        "styles": [],
+        "subsets": [SUBSET_NAME],
+    }
+    # Remove None substituteFor from manifest output
+    if entry["substituteFor"] is None:
+        del entry["substituteFor"]
+    return entry
+
+
+def display_path(path):
+    """``path`` relative to the repo root when it lives inside it."""
+    try:
+        return str(path.resolve().relative_to(ROOT))
+    except ValueError:
+        return str(path)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Subset the bundled fonts to the characters a PPTX/DOCX corpus uses."
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=[str(DEFAULT_CORPUS)],
+        help="documents or directories to scan (default: test-data/corpus)",
+    )
+    parser.add_argument(
+        "-o", "--output",
+        default=str(DEFAULT_OUTPUT),
+        help="output directory (default: .cache/corpus-fonts)",
+    )
+    parser.add_argument(
+        "--flavors",
+        default=",".join(FLAVORS),
+        help=f"comma-separated output flavors (default: {','.join(FLAVORS)})",
+    )
+    add_jobs_argument(parser, "number of worker processes for subsetting")
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+    resolve_jobs(parser, args)
+
+    args.flavors = tuple(f.strip() for f in args.flavors.split(",") if f.strip())
+    unknown = [f for f in args.flavors if f not in FLAVORS]
+    if not args.flavors or unknown:
+        parser.error(f"--flavors must be a subset of {','.join(FLAVORS)}")
+    return args
+
+
+def main():
+    args = parse_args()
+
+    if not FONTS_DIR.exists():
+        print(f"ERROR: fonts/ directory not found at {FONTS_DIR}")
+        print("Run 'pnpm fonts:download' first to download font sources (or 'pnpm fonts:fetch --mirror PATH' offline).")
+        sys.exit(1)
+
+    check_dependencies()
+    cache = cache_from_args(args)
+    output_dir = Path(args.output)
+
+    print(f"Scanning {', '.join(args.paths)}...")
+    usage = scan_corpus(args.paths)
+    for path, error in usage.errors:
+        print(f"  WARN: could not read {path}: {error}")
+    if not usage.documents:
+        print("ERROR: no readable .pptx/.docx documents found")
+        sys.exit(1)
+
+    faces, unresolved = resolve_usage(usage)
+    print(f"  {len(usage.documents)} documents, {len(faces)} bundled faces used")
+    for typeface, count in unresolved.items():
+        print(f"  NOTE: no bundled family for '{typeface}' ({count} codepoints)")
+
+    for subdir in ["woff2", "ttf"]:
+        if (output_dir / subdir).exists():
+            shutil.rmtree(output_dir / subdir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    tasks = [
+        (output_dir, family_id, variant_name, codepoints, args.flavors, cache)
+        for (family_id, variant_name), codepoints in faces.items()
+    ]
+    if args.jobs > 1:
+        print(f"Subsetting {len(tasks)} faces with {args.jobs} workers...")
+        results = map_ordered(process_face, tasks, args.jobs)
+    else:
+        results = [process_face(*task) for task in tasks]
+
+    manifest_families = {}
+    face_stats = {}
+    total_bytes = {flavor: 0 for flavor in args.flavors}
+    source_bytes = 0
+
+    for (_, family_id, variant_name, codepoints, *_), result in zip(tasks, results):
+        family_def = FONT_FAMILIES[family_id]
+        source = FONTS_DIR / family_def["variants"][variant_name]
+        if result is None:
+            print(f"  WARN: {source} not found, skipping {family_id} {variant_name}")
+            continue
+        if cache is not None and args.jobs > 1:
+            # Workers count hits on their own copy of the cache; fold them back in.
+            cache.hits += result["cache_hits"]
+            cache.misses += result["cache_misses"]
+
+        weight, style = VARIANT_MAP.get(variant_name, (400, "normal"))
+        if family_id not in manifest_families:
+            manifest_families[family_id] = new_family_entry(family_def)
+        entry = manifest_families[family_id]
+        if "woff2" in result["files"]:
+            entry["woff2"][f"{SUBSET_NAME}-{weight}-{style}"] = dict(
+                result["files"]["woff2"],
+                unicodeRange=css_unicode_range(codepoint_ranges(codepoints)),
+            )
+        if "ttf" in result["files"]:
+            entry["ttf"][variant_name] = result["files"]["ttf"]
+        entry["weights"] = sorted(set(entry["weights"]) | {weight})
+        entry["styles"] = sorted(set(entry["styles"]) | {style})
+
+        face_stats[f"{family_id}/{variant_name}"] = len(codepoints)
+        source_bytes += source.stat().st_size
+        sizes = []
+        for flavor, info in result["files"].items():
+            total_bytes[flavor] += info["size"]
+            sizes.append(f"{flavor} {info['size'] / 1024:.1f} KB")
+        print(f"  {family_id} {variant_name}: {len(codepoints)} codepoints → {', '.join(sizes)}")
+
+    manifest = {
+        "version": 1,
+        "families": manifest_families,
+        "corpus": {
+            "documents": [display_path(Path(p)) for p in usage.documents],
+            "faces": face_stats,
+            "unresolvedFonts": unresolved,
+        },
+    }
+    manifest_path = output_dir / "manifest.json"
+    manifest_path.write_text(
+        json.dumps(manifest, indent=2, ensure_ascii=False) + "\n",
+        encoding="utf-8",
+    )
+
+    print(f"\n{'=' * 50}")
+    print(f"Corpus font subsetting complete")
+    print(f"{'=' * 50}")
+    print(f"  Faces:       {len(face_stats)}")
+    print(f"  Source TTFs: {source_bytes / 1024 / 1024:.1f} MB")
+    for flavor, size in total_bytes.items():
+        ratio = f" ({source_bytes / size:.0f}x smaller)" if size else ""
+        print(f"  {flavor.upper():<5} total: {size / 1024:.1f} KB{ratio}")
+    print(f"  Manifest:    {manifest_path}")
+    report_cache(cache)
+
+
+if __name__ == "__main__":
+    main()